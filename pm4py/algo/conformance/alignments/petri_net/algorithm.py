@@ -26,6 +26,7 @@ from pm4py.objects.petri_net.utils import align_utils, check_soundness
 from pm4py.objects.conversion.log import converter as log_converter
 from pm4py.util.xes_constants import DEFAULT_NAME_KEY, DEFAULT_TRACEID_KEY
 from pm4py.objects.log.obj import Trace, Event
+from pm4py.objects.log.util import pandas_numpy_variants
 import time
 from pm4py.util.lp import solver
 from pm4py.util import exec_utils
@@ -68,6 +69,9 @@ class Parameters(Enum):
     SYNCHRONOUS = "synchronous_dijkstra"
     EXPONENT="theta"
     ENABLE_BEST_WORST_COST = "enable_best_worst_cost"
+    CHUNK_SIZE = "chunk_size"
+    WORKER_POOL = "worker_pool"
+    LP_HEURISTIC_CACHE = "lp_heuristic_cache"
 
 
 def __variant_mapper(variant):
@@ -80,6 +84,8 @@ def __variant_mapper(variant):
             variant = Variants.VERSION_DIJKSTRA_NO_HEURISTICS
         elif variant == "Variants.VERSION_DIJKSTRA_LESS_MEMORY":
             variant = Variants.VERSION_DIJKSTRA_LESS_MEMORY
+        elif variant == "Variants.VERSION_DISCOUNTED_A_STAR":
+            variant = Variants.VERSION_DISCOUNTED_A_STAR
 
     return variant
 
@@ -222,6 +228,8 @@ def apply_log(log, petri_net, initial_marking, final_marking, parameters=None, v
         best_worst_cost = __get_best_worst_cost(petri_net, initial_marking, final_marking, variant, parameters)
         parameters[Parameters.BEST_WORST_COST_INTERNAL] = best_worst_cost
 
+    __set_lp_heuristic_cache(variant, parameters)
+
     all_alignments = []
     for trace in one_tr_per_var:
         this_max_align_time = min(max_align_time_case, (max_align_time - (time.time() - start_time)) * 0.5)
@@ -239,7 +247,8 @@ def apply_log(log, petri_net, initial_marking, final_marking, parameters=None, v
 
 def apply_multiprocessing(log, petri_net, initial_marking, final_marking, parameters=None, variant=DEFAULT_VARIANT):
     """
-    Applies the alignments using a process pool (multiprocessing)
+    Applies the alignments using a process pool (multiprocessing).
+    The model is shipped once to every worker of the pool, and the variants of the log are sent in chunks.
 
     Parameters
     ---------------
@@ -252,7 +261,11 @@ def apply_multiprocessing(log, petri_net, initial_marking, final_marking, parame
     final_marking
         Final marking
     parameters
-        Parameters of the algorithm
+        Parameters of the algorithm, including:
+        - Parameters.CORES => number of worker processes
+        - Parameters.CHUNK_SIZE => number of variants sent to a worker in a single task
+        - Parameters.WORKER_POOL => (optional) an already started AlignmentWorkerPool on the same Petri net,
+        which is reused (and not closed) by the method
 
     Returns
     ----------------
@@ -262,41 +275,25 @@ def apply_multiprocessing(log, petri_net, initial_marking, final_marking, parame
     if parameters is None:
         parameters = {}
 
-    import multiprocessing
+    from pm4py.algo.conformance.alignments.petri_net.utils.worker_pool import AlignmentWorkerPool
 
     variant = __variant_mapper(variant)
 
-    num_cores = exec_utils.get_param_value(Parameters.CORES, parameters, multiprocessing.cpu_count() - 2)
-
-    enable_best_worst_cost = exec_utils.get_param_value(Parameters.ENABLE_BEST_WORST_COST, parameters, True)
+    worker_pool = exec_utils.get_param_value(Parameters.WORKER_POOL, parameters, None)
 
     variants_idxs, one_tr_per_var = __get_variants_structure(log, parameters)
+    progress = __get_progress_bar(len(one_tr_per_var), parameters)
 
-    if enable_best_worst_cost:
-        best_worst_cost = __get_best_worst_cost(petri_net, initial_marking, final_marking, variant, parameters)
-        parameters[Parameters.BEST_WORST_COST_INTERNAL] = best_worst_cost
-
-    all_alignments = []
+    if worker_pool is not None:
+        if worker_pool.petri_net is not petri_net:
+            raise Exception("the provided worker pool has been started on a different Petri net!")
+        all_alignments = worker_pool.align_variants(list(variants_idxs), progress=progress)
+    else:
+        with AlignmentWorkerPool(petri_net, initial_marking, final_marking, parameters=parameters,
+                                 variant=variant) as worker_pool:
+            all_alignments = worker_pool.align_variants(list(variants_idxs), progress=progress)
 
-    from concurrent.futures import ProcessPoolExecutor
-    with ProcessPoolExecutor(max_workers=num_cores) as executor:
-        futures = []
-        for trace in one_tr_per_var:
-            futures.append(executor.submit(apply_trace, trace, petri_net, initial_marking, final_marking, parameters, str(variant)))
-        progress = __get_progress_bar(len(one_tr_per_var), parameters)
-        if progress is not None:
-            alignments_ready = 0
-            while alignments_ready != len(futures):
-                current = 0
-                for index, variant in enumerate(futures):
-                    current = current + 1 if futures[index].done() else current
-                if current > alignments_ready:
-                    for i in range(0, current - alignments_ready):
-                        progress.update()
-                alignments_ready = current
-        for index, variant in enumerate(futures):
-            all_alignments.append(futures[index].result())
-        __close_progress_bar(progress)
+    __close_progress_bar(progress)
 
     alignments = __form_alignments(variants_idxs, all_alignments)
 
@@ -312,6 +309,17 @@ def __get_best_worst_cost(petri_net, initial_marking, final_marking, variant, pa
     return best_worst_cost
 
 
+def __set_lp_heuristic_cache(variant, parameters):
+    """
+    When the state equation A* variant is used, the solutions of the LPs
+    are shared by the alignments of all the variants of the log
+    """
+    if exec_utils.get_variant(variant) is variants.state_equation_a_star and exec_utils.get_param_value(
+            Parameters.LP_HEURISTIC_CACHE, parameters, None) is None:
+        from pm4py.algo.conformance.alignments.petri_net.utils.lp_heuristic import LpHeuristicCache
+        parameters[Parameters.LP_HEURISTIC_CACHE] = LpHeuristicCache()
+
+
 def __get_variants_structure(log, parameters):
     if parameters is None:
         parameters = {}
@@ -323,16 +331,15 @@ def __get_variants_structure(log, parameters):
 
     if pandas_utils.check_is_pandas_dataframe(log):
         case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, CASE_CONCEPT_NAME)
-        traces = [tuple(x) for x in log.groupby(case_id_key)[activity_key].agg(list).to_dict().values()]
-        for idx, trace in enumerate(traces):
-            if trace not in variants_idxs:
-                variants_idxs[trace] = [idx]
-                case = Trace()
-                for act in trace:
-                    case.append(Event({activity_key: act}))
-                one_tr_per_var.append(case)
-            else:
-                variants_idxs[trace].append(idx)
+        variant_index = pandas_numpy_variants.get_variant_index(log, parameters={
+            pandas_numpy_variants.Parameters.CASE_ID_KEY: case_id_key,
+            pandas_numpy_variants.Parameters.ACTIVITY_KEY: activity_key})
+        for trace, cases in zip(variant_index.get_variants(), variant_index.get_cases_per_variant()):
+            variants_idxs[trace] = cases.tolist()
+            case = Trace()
+            for act in trace:
+                case.append(Event({activity_key: act}))
+            one_tr_per_var.append(case)
     else:
         log = log_converter.apply(log, variant=log_converter.Variants.TO_EVENT_LOG, parameters=parameters)
         for idx, case in enumerate(log):
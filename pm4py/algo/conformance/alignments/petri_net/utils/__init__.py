@@ -19,4 +19,4 @@ visit <https://www.gnu.org/licenses/>.
 Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
-from pm4py.algo.conformance.alignments.petri_net.utils import log_enrichment
+from pm4py.algo.conformance.alignments.petri_net.utils import log_enrichment, lp_heuristic
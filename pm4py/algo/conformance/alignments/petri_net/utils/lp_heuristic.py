@@ -0,0 +1,427 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+import math
+import sys
+import time
+
+import numpy as np
+
+from pm4py.objects.petri_net import properties
+from pm4py.objects.petri_net.utils import align_utils as utils
+from pm4py.util.lp import solver as lp_solver
+
+# maximum number of solutions kept by default in a cache of the heuristic
+DEFAULT_MAX_CACHE_SIZE = 500000
+
+# kinds of the transitions of the synchronous product net
+MODEL_MOVE = 0
+LOG_MOVE = 1
+SYNC_MOVE = 2
+
+
+class LpHeuristicCache(object):
+    """
+    Cache of the solutions of the state equation, shared by the alignments of the traces of a batch
+    (e.g., the variants of an event log) against the same model.
+
+    The state equation of the synchronous product net, in a marking having the token of the trace net in the
+    place i, depends only on the marking of the model and on the suffix of the trace starting at i.
+    Hence, the solutions are stored by (model, trace suffix, marking of the model), and are reused
+    by all the traces sharing the same suffix.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_CACHE_SIZE):
+        self.max_size = max_size
+        self.solutions = {}
+        self.models = {}
+        self.model_names = {}
+        self.suffixes = {}
+
+    def get_model_id(self, fingerprint):
+        return self.models.setdefault(fingerprint, len(self.models))
+
+    def get_name_id(self, name):
+        return self.model_names.setdefault(name, len(self.model_names))
+
+    def get_suffix_id(self, suffix):
+        return self.suffixes.setdefault(suffix, len(self.suffixes))
+
+    def get(self, key):
+        return self.solutions.get(key)
+
+    def put(self, key, solution):
+        if len(self.solutions) < self.max_size:
+            self.solutions[key] = solution
+
+
+class LpSearchTuple(utils.SearchTuple):
+    # in addition to the properties of the search tuple:
+    # - r => reduced costs of the dual solution of the LP from which the state descends (None if not available)
+    # - d => lower bound on the remaining cost provided by such dual solution in the current marking
+    def __init__(self, f, g, h, m, p, t, x, trust, r=None, d=0.0):
+        utils.SearchTuple.__init__(self, f, g, h, m, p, t, x, trust)
+        self.r = r
+        self.d = d
+
+
+class StateEquationHeuristic(object):
+    """
+    Exact heuristic of the A* alignments, computed by solving the state equation of the synchronous product net.
+
+    The constraint matrix (the incidence matrix of the synchronous product net, in sparse form),
+    the bounds and the cost vector are built once; for every marking only the right-hand side
+    (final marking minus the current marking) changes.
+    The dual solution of every LP is kept: since it stays feasible for any right-hand side, it provides
+    to the descendants of the state a lower bound on the remaining cost that is at least as tight as
+    the one derived from the primal solution (see derive).
+    """
+
+    def __init__(self, sync_net, incidence_matrix, fin_vec, cost_vec, skip, cache=None):
+        """
+        Builds the heuristic on the given synchronous product net
+
+        Parameters
+        ---------------
+        sync_net
+            Synchronous product net
+        incidence_matrix
+            Incidence matrix of the synchronous product net
+        fin_vec
+            Final marking (as vector)
+        cost_vec
+            Costs of the transitions (as vector)
+        skip
+            Skip symbol
+        cache
+            (if provided) cache of the solutions shared between the traces of a batch
+        """
+        self.incidence_matrix = incidence_matrix
+        self.num_transitions = len(sync_net.transitions)
+        self.a_dense = np.array(incidence_matrix.a_matrix, dtype=np.float64).reshape(
+            (len(incidence_matrix.places), self.num_transitions))
+        self.fin_vec = np.array(fin_vec, dtype=np.float64)
+        self.cost_vec = [x * 1.0 for x in cost_vec]
+        self.cache = cache if cache is not None else LpHeuristicCache()
+        self.lp_solved = 0
+        self.lp_time = 0.0
+        self.cache_hits = 0
+
+        self.use_scipy = lp_solver.DEFAULT_LP_SOLVER_VARIANT == lp_solver.SCIPY
+        self.use_glpk = lp_solver.DEFAULT_LP_SOLVER_VARIANT == lp_solver.CVXOPT_SOLVER_CUSTOM_ALIGN
+        if self.use_scipy:
+            from scipy.sparse import csr_matrix
+            self.a_eq = csr_matrix(self.a_dense)
+            self.c = np.array(self.cost_vec)
+        elif self.use_glpk:
+            self.__prepare_glpk()
+        else:
+            self.__prepare_generic_solver()
+
+        # solutions that cannot be shared with other traces are kept only for the current net
+        self.local_solutions = {}
+        self.model_id = None
+        self.__prepare_canonical_form(sync_net, skip)
+
+    def __prepare_glpk(self):
+        # not available in the latest version of PM4Py
+        from cvxopt import matrix, spmatrix
+
+        rows, cols = np.nonzero(self.a_dense)
+        self.a_matrix = spmatrix(self.a_dense[rows, cols].tolist(), rows.tolist(), cols.tolist(),
+                                 size=self.a_dense.shape)
+        self.g_matrix = spmatrix(-1.0, range(self.num_transitions), range(self.num_transitions))
+        self.h_cvx = matrix(0.0, (self.num_transitions, 1))
+        self.c = matrix(self.cost_vec)
+
+    def __prepare_generic_solver(self):
+        self.use_cvxopt = lp_solver.DEFAULT_LP_SOLVER_VARIANT == lp_solver.CVXOPT_SOLVER_CUSTOM_ALIGN or \
+                          lp_solver.DEFAULT_LP_SOLVER_VARIANT == lp_solver.CVXOPT_SOLVER_CUSTOM_ALIGN_ILP
+        self.a_matrix = np.asmatrix(self.a_dense)
+        self.g_matrix = -np.eye(self.num_transitions)
+        self.h_cvx = np.matrix(np.zeros(self.num_transitions)).transpose()
+        self.c = self.cost_vec
+
+        if self.use_cvxopt:
+            # not available in the latest version of PM4Py
+            from cvxopt import matrix
+
+            self.a_matrix = matrix(self.a_matrix)
+            self.g_matrix = matrix(self.g_matrix)
+            self.h_cvx = matrix(self.h_cvx)
+            self.c = matrix(self.c)
+
+    def __prepare_canonical_form(self, sync_net, skip):
+        """
+        Expresses the places and the transitions of the synchronous product net in terms of the model and of the
+        positions of the trace, so that the solutions can be shared between different traces.
+        If the synchronous product net is not obtained from a trace net, or the names of the places/transitions of
+        the model are not unique, the solutions are cached only for the current net.
+        """
+        places = self.incidence_matrix.places
+        transitions = self.incidence_matrix.transitions
+
+        model_places = {}
+        trace_places = {}
+        for p, row in places.items():
+            if not isinstance(p.name, tuple) or len(p.name) != 2:
+                return
+            if p.name[0] == skip:
+                model_places[p.name[1]] = row
+            elif p.name[1] == skip:
+                trace_places[p.properties.get(properties.TRACE_NET_PLACE_INDEX, 0)] = row
+            else:
+                return
+
+        kind = np.zeros(self.num_transitions, dtype=np.int64)
+        name = np.full(self.num_transitions, -1, dtype=np.int64)
+        position = np.full(self.num_transitions, -1, dtype=np.int64)
+        model_transitions = {}
+        for t, col in transitions.items():
+            if not isinstance(t.name, tuple) or len(t.name) != 2:
+                return
+            if t.name[0] == skip:
+                if t.name[1] in model_transitions:
+                    return
+                model_transitions[t.name[1]] = col
+                kind[col] = MODEL_MOVE
+                name[col] = self.cache.get_name_id(t.name[1])
+            elif properties.TRACE_NET_TRANS_INDEX in t.properties:
+                position[col] = t.properties[properties.TRACE_NET_TRANS_INDEX]
+                if t.name[1] == skip:
+                    kind[col] = LOG_MOVE
+                else:
+                    kind[col] = SYNC_MOVE
+                    name[col] = self.cache.get_name_id(t.name[1])
+            else:
+                return
+
+        trace_length = len(trace_places) - 1
+        if len(model_places) + len(trace_places) != len(places) or sorted(trace_places) != list(
+                range(trace_length + 1)) or (position >= trace_length).any():
+            return
+
+        self.model_rows = np.array([model_places[n] for n in sorted(model_places)], dtype=np.int64)
+        self.trace_rows = np.array([trace_places[i] for i in range(trace_length + 1)], dtype=np.int64)
+        model_cols = np.array([model_transitions[n] for n in sorted(model_transitions)], dtype=np.int64)
+
+        # the model part of the state equation (structure, costs and final marking) identifies the model
+        fingerprint = (tuple(sorted(model_places)), tuple(sorted(model_transitions)),
+                       self.a_dense[np.ix_(self.model_rows, model_cols)].tobytes(),
+                       tuple(self.cost_vec[c] for c in model_cols), self.fin_vec[self.model_rows].tobytes())
+        self.model_id = self.cache.get_model_id(fingerprint)
+
+        # identifies every suffix of the trace with the labels and the costs of its log and sync moves
+        moves = [[] for i in range(trace_length)]
+        for col in np.nonzero(kind != MODEL_MOVE)[0]:
+            moves[position[col]].append((int(kind[col]), int(name[col]), self.cost_vec[col]))
+        self.suffix_ids = [0] * (trace_length + 1)
+        self.suffix_ids[trace_length] = self.cache.get_suffix_id(None)
+        for i in range(trace_length - 1, -1, -1):
+            self.suffix_ids[i] = self.cache.get_suffix_id((tuple(sorted(moves[i])), self.suffix_ids[i + 1]))
+
+        self.kind = kind
+        self.name = name
+        self.position = position
+        self.columns = {(int(kind[c]), int(name[c]), int(position[c])): c for c in range(self.num_transitions)}
+
+    def __get_key(self, m_vec):
+        """
+        Gets the key of the marking in the cache, along with the position of the token in the trace net
+        (-1 if the solution cannot be shared with other traces)
+        """
+        if self.model_id is not None:
+            m_vec = np.asarray(m_vec)
+            trace_marking = m_vec[self.trace_rows]
+            if trace_marking.sum() == 1:
+                pos = int(np.argmax(trace_marking))
+                return (self.model_id, self.suffix_ids[pos], m_vec[self.model_rows].tobytes()), pos
+        return tuple(m_vec), -1
+
+    def __solve(self, m_vec):
+        b_term = self.fin_vec - np.asarray(m_vec, dtype=np.float64)
+        r = None
+        d = 0.0
+
+        start_time = time.time()
+        if self.use_scipy:
+            from scipy.optimize import linprog
+
+            sol = linprog(self.c, A_eq=self.a_eq, b_eq=b_term, bounds=(0, None), method="highs")
+            if sol.status == 0:
+                h = round(sol.fun)
+                x = [round(y) for y in sol.x]
+                # the reduced costs of the variables (which are non-negative at the optimum) and the
+                # value of the dual solution
+                r = sol.lower.marginals
+                d = sol.fun
+            else:
+                h = sys.maxsize
+                x = [0.0] * self.num_transitions
+        elif self.use_glpk:
+            h, x, r, d = _solve_glpk(self, b_term)
+        else:
+            h, x = _solve_generic(self, b_term)
+            d = h
+        self.lp_time += time.time() - start_time
+        self.lp_solved += 1
+
+        return h, x, r, d
+
+    def compute(self, marking):
+        """
+        Computes the exact heuristic in the given marking (reusing the solutions of the cache when possible)
+
+        Parameters
+        ---------------
+        marking
+            Marking (or tuple of token counts ordered as the places of the incidence matrix)
+
+        Returns
+        ---------------
+        h
+            Value of the heuristic
+        x
+            Solution vector of the LP
+        r
+            Reduced costs of the dual solution (None if not available)
+        d
+            Lower bound on the remaining cost provided by the dual solution
+        """
+        m_vec = marking if isinstance(marking, tuple) else self.incidence_matrix.encode_marking(marking)
+        key, pos = self.__get_key(m_vec)
+
+        if pos < 0:
+            solution = self.local_solutions.get(key)
+            if solution is not None:
+                self.cache_hits += 1
+                return solution[0], list(solution[2]), None, solution[1]
+            h, x, r, d = self.__solve(m_vec)
+            self.local_solutions[key] = (h, d, x)
+            return h, x, r, d
+
+        solution = self.cache.get(key)
+        if solution is not None:
+            x = [0] * self.num_transitions
+            for kind, name, offset, value in solution[2]:
+                x[self.columns[(kind, name, offset + pos if offset >= 0 else -1)]] = value
+            self.cache_hits += 1
+            return solution[0], x, None, solution[1]
+
+        h, x, r, d = self.__solve(m_vec)
+        # the solution is stored relative to the position of the token in the trace net
+        cols = np.nonzero(np.asarray(x))[0]
+        offsets = np.where(self.position[cols] >= 0, self.position[cols] - pos, -1)
+        self.cache.put(key, (h, d, tuple(zip(self.kind[cols].tolist(), self.name[cols].tolist(), offsets.tolist(),
+                                             [x[col] for col in cols]))))
+
+        return h, x, r, d
+
+    def derive(self, state, t):
+        """
+        Derives the heuristic of the state reached by firing the transition t in the given state,
+        without solving the LP.
+        The solution vector of the parent is reduced by one firing of t, and the dual solution of the parent
+        is used to tighten the estimate (which matters when the derived solution vector is not feasible).
+
+        Parameters
+        ---------------
+        state
+            Search tuple of the parent state
+        t
+            Transition of the synchronous product net
+
+        Returns
+        ---------------
+        h
+            Estimated value of the heuristic
+        x
+            Derived solution vector
+        r
+            Reduced costs of the dual solution of the parent
+        d
+            Lower bound on the remaining cost provided by the dual solution of the parent
+        """
+        col = self.incidence_matrix.transitions[t]
+        cost = self.cost_vec[col]
+        x = state.x.copy()
+        x[col] -= 1
+        h = max(0, state.h - cost)
+        r = state.r
+        d = state.d - cost
+        if r is not None:
+            # since the dual solution is feasible for any marking, d stays a lower bound of the remaining cost
+            d += r[col]
+            h = max(h, math.floor(d + 1e-6))
+        return h, x, r, d
+
+    def get_statistics(self):
+        """
+        Gets the statistics on the LPs solved by the heuristic
+
+        Returns
+        ---------------
+        statistics
+            Dictionary containing the number of LPs solved (lp_solved), the number of
+            solutions taken from the cache (lp_cache_hits), and the total solving time (lp_solve_time)
+        """
+        return {"lp_solved": self.lp_solved, "lp_cache_hits": self.cache_hits, "lp_solve_time": self.lp_time}
+
+
+def _solve_glpk(heuristic, b_term):
+    """
+    Solves the state equation through GLPK (with the options of the custom alignments solver of CVXOPT)
+    """
+    from cvxopt import glpk, blas, matrix
+    from pm4py.util.lp.variants import cvxopt_solver_custom_align
+
+    status, x, z, y = glpk.lp(heuristic.c, heuristic.g_matrix, heuristic.h_cvx, heuristic.a_matrix,
+                              matrix(b_term), options=cvxopt_solver_custom_align.this_options)
+
+    if status != 'optimal':
+        return sys.maxsize, [0.0] * heuristic.num_transitions, None, 0.0
+
+    # the multipliers of the non-negativity constraints are the reduced costs of the variables,
+    # while the multipliers of the state equation (with the sign convention of CVXOPT) give the dual objective
+    return blas.dot(heuristic.c, x), list(x), np.array(z).ravel(), -float(np.dot(b_term, np.array(y).ravel()))
+
+
+def _solve_generic(heuristic, b_term):
+    """
+    Solves the state equation through the default LP solver of PM4Py (when it is not SciPy)
+    """
+    b_term = np.matrix(b_term).transpose()
+
+    if heuristic.use_cvxopt:
+        # not available in the latest version of PM4Py
+        from cvxopt import matrix
+
+        b_term = matrix(b_term)
+
+    sol = lp_solver.apply(heuristic.c, heuristic.g_matrix, heuristic.h_cvx, heuristic.a_matrix, b_term,
+                          parameters={"solver": "glpk"}, variant=lp_solver.DEFAULT_LP_SOLVER_VARIANT)
+    prim_obj = lp_solver.get_prim_obj_from_sol(sol, variant=lp_solver.DEFAULT_LP_SOLVER_VARIANT)
+    points = lp_solver.get_points_from_sol(sol, variant=lp_solver.DEFAULT_LP_SOLVER_VARIANT)
+
+    prim_obj = prim_obj if prim_obj is not None else sys.maxsize
+    points = points if points is not None else [0.0] * heuristic.num_transitions
+
+    return prim_obj, points
@@ -0,0 +1,232 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import copy
+from enum import Enum
+from typing import Optional, Dict, Any, Union, List, Tuple
+
+from pm4py.objects.log.obj import Trace, Event
+from pm4py.objects.petri_net.obj import PetriNet, Marking
+from pm4py.util import exec_utils, typing
+from pm4py.util.constants import PARAMETER_CONSTANT_ACTIVITY_KEY
+from pm4py.util.xes_constants import DEFAULT_NAME_KEY
+
+
+class Parameters(Enum):
+    ACTIVITY_KEY = PARAMETER_CONSTANT_ACTIVITY_KEY
+    CORES = "cores"
+    CHUNK_SIZE = "chunk_size"
+    BEST_WORST_COST_INTERNAL = "best_worst_cost_internal"
+    ENABLE_BEST_WORST_COST = "enable_best_worst_cost"
+    LP_HEURISTIC_CACHE = "lp_heuristic_cache"
+
+
+# state of the current worker process, set once by the initializer of the pool
+_WORKER_STATE = {}
+
+
+def _init_worker(petri_net, initial_marking, final_marking, parameters, variant):
+    """
+    Initializer of the worker processes: stores the model and the parameters
+    of the alignments, so they are transferred only once per worker
+    """
+    _WORKER_STATE["petri_net"] = petri_net
+    _WORKER_STATE["initial_marking"] = initial_marking
+    _WORKER_STATE["final_marking"] = final_marking
+    _WORKER_STATE["parameters"] = parameters
+    _WORKER_STATE["variant"] = variant
+
+
+def _align_chunk(chunk: List[Tuple[int, Tuple[str, ...]]]) -> List[Tuple[int, typing.AlignmentResult]]:
+    """
+    Aligns a chunk of variants inside a worker process
+
+    Parameters
+    ---------------
+    chunk
+        List of couples (index of the variant, activities of the variant)
+
+    Returns
+    ---------------
+    aligned_chunk
+        List of couples (index of the variant, alignment)
+    """
+    from pm4py.algo.conformance.alignments.petri_net import algorithm
+
+    parameters = _WORKER_STATE["parameters"]
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, DEFAULT_NAME_KEY)
+
+    ret = []
+    for index, activities in chunk:
+        trace = Trace()
+        for act in activities:
+            trace.append(Event({activity_key: act}))
+        ret.append((index, algorithm.apply_trace(trace, _WORKER_STATE["petri_net"], _WORKER_STATE["initial_marking"],
+                                                 _WORKER_STATE["final_marking"], parameters=copy(parameters),
+                                                 variant=_WORKER_STATE["variant"])))
+    return ret
+
+
+class AlignmentWorkerPool(object):
+    """
+    Persistent pool of processes computing the alignments of the variants of a log
+    against a fixed accepting Petri net.
+
+    The Petri net, the markings, the parameters and the best worst cost are shipped to the
+    workers once (through the initializer of the pool), while only the activities of the
+    variants travel with the tasks. The pool can be reused across different calls on the same model,
+    and should be closed (or used as a context manager) when it is no longer needed.
+    """
+
+    def __init__(self, petri_net: PetriNet, initial_marking: Marking, final_marking: Marking,
+                 parameters: Optional[Dict[Union[str, Parameters], Any]] = None, variant=None):
+        """
+        Starts the worker pool
+
+        Parameters
+        ---------------
+        petri_net
+            Petri net
+        initial_marking
+            Initial marking
+        final_marking
+            Final marking
+        parameters
+            Parameters of the alignments (the same accepted by the chosen variant), including:
+            - Parameters.CORES => number of worker processes
+            - Parameters.CHUNK_SIZE => number of variants sent to a worker in a single task
+            (default: split the variants in about four chunks per worker)
+        variant
+            Variant of the alignments algorithm (default: the default variant of the alignments)
+        """
+        from pm4py.algo.conformance.alignments.petri_net import algorithm
+
+        if parameters is None:
+            parameters = {}
+        parameters = copy(parameters)
+
+        if variant is None:
+            variant = algorithm.DEFAULT_VARIANT
+
+        self.petri_net = petri_net
+        self.initial_marking = initial_marking
+        self.final_marking = final_marking
+        self.variant = variant
+        self.num_cores = max(1, exec_utils.get_param_value(Parameters.CORES, parameters,
+                                                            multiprocessing.cpu_count() - 2))
+        self.chunk_size = exec_utils.get_param_value(Parameters.CHUNK_SIZE, parameters, None)
+
+        enable_best_worst_cost = exec_utils.get_param_value(Parameters.ENABLE_BEST_WORST_COST, parameters, True)
+        if enable_best_worst_cost and Parameters.BEST_WORST_COST_INTERNAL not in parameters and Parameters.BEST_WORST_COST_INTERNAL.value not in parameters:
+            parameters[Parameters.BEST_WORST_COST_INTERNAL] = exec_utils.get_variant(variant).get_best_worst_cost(
+                petri_net, initial_marking, final_marking, parameters=copy(parameters))
+        self.best_worst_cost = exec_utils.get_param_value(Parameters.BEST_WORST_COST_INTERNAL, parameters, None)
+
+        if exec_utils.get_variant(variant) is algorithm.variants.state_equation_a_star and exec_utils.get_param_value(
+                Parameters.LP_HEURISTIC_CACHE, parameters, None) is None:
+            # every worker receives its own (empty) cache of the solutions of the LPs,
+            # shared by all the variants aligned by the worker
+            from pm4py.algo.conformance.alignments.petri_net.utils.lp_heuristic import LpHeuristicCache
+            parameters[Parameters.LP_HEURISTIC_CACHE] = LpHeuristicCache()
+
+        self._executor = ProcessPoolExecutor(max_workers=self.num_cores, initializer=_init_worker,
+                                             initargs=(petri_net, initial_marking, final_marking, parameters,
+                                                       str(variant)))
+
+    def align_variants(self, variants: List[Tuple[str, ...]], progress=None) -> typing.ListAlignments:
+        """
+        Aligns a list of variants using the workers of the pool
+
+        Parameters
+        ---------------
+        variants
+            List of variants (each one expressed as a tuple of activities)
+        progress
+            (if provided) progress bar that is updated when a chunk of variants is completed
+
+        Returns
+        ---------------
+        alignments
+            List of alignments (in the same order as the provided variants)
+        """
+        if self._executor is None:
+            raise Exception("the alignment worker pool has already been closed!")
+
+        chunk_size = self.chunk_size
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(variants) / (4 * self.num_cores)))
+
+        indexed_variants = list(enumerate(variants))
+        futures = [self._executor.submit(_align_chunk, indexed_variants[i:i + chunk_size]) for i in
+                   range(0, len(indexed_variants), chunk_size)]
+
+        alignments = [None] * len(variants)
+        for future in as_completed(futures):
+            aligned_chunk = future.result()
+            for index, alignment in aligned_chunk:
+                alignments[index] = alignment
+            if progress is not None:
+                progress.update(len(aligned_chunk))
+
+        return alignments
+
+    def apply(self, log, parameters: Optional[Dict[Any, Any]] = None) -> typing.ListAlignments:
+        """
+        Aligns an event log (or dataframe) against the model of the pool
+
+        Parameters
+        ---------------
+        log
+            Event log / Pandas dataframe
+        parameters
+            Parameters used to extract the variants from the log (activity key, case ID key, progress bar)
+
+        Returns
+        ---------------
+        alignments
+            List of alignments (one for each case of the log)
+        """
+        from pm4py.algo.conformance.alignments.petri_net import algorithm
+
+        if parameters is None:
+            parameters = {}
+        parameters = copy(parameters)
+        parameters[algorithm.Parameters.WORKER_POOL] = self
+
+        return algorithm.apply_multiprocessing(log, self.petri_net, self.initial_marking, self.final_marking,
+                                               parameters=parameters, variant=self.variant)
+
+    def close(self):
+        """
+        Shuts down the worker processes
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
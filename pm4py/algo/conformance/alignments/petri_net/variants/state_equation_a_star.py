@@ -39,10 +39,11 @@ import time
 from copy import copy
 from enum import Enum
 
-import numpy as np
-
+from pm4py.algo.conformance.alignments.petri_net.utils.lp_heuristic import StateEquationHeuristic, LpHeuristicCache, \
+    LpSearchTuple
 from pm4py.objects.log import obj as log_implementation
 from pm4py.objects.petri_net.utils import align_utils as utils
+from pm4py.objects.petri_net.utils.compiled_net import CompiledPetriNet
 from pm4py.objects.petri_net.utils.incidence_matrix import construct as inc_mat_construct
 from pm4py.objects.petri_net.utils.synchronous_product import construct_cost_aware, construct
 from pm4py.objects.petri_net.utils.petri_utils import construct_trace_net_cost_aware, decorate_places_preset_trans, \
@@ -72,6 +73,8 @@ class Parameters(Enum):
     ACTIVITY_KEY = PARAMETER_CONSTANT_ACTIVITY_KEY
     VARIANTS_IDX = "variants_idx"
     RETURN_SYNC_COST_FUNCTION = "return_sync_cost_function"
+    USE_COMPILED_NET = "use_compiled_net"
+    LP_HEURISTIC_CACHE = "lp_heuristic_cache"
 
 
 PARAM_TRACE_COST_FUNCTION = Parameters.PARAM_TRACE_COST_FUNCTION.value
@@ -227,6 +230,8 @@ def apply_from_variants_dictionary(var_dictio, petri_net, initial_marking, final
     """
     if parameters is None:
         parameters = {}
+    if exec_utils.get_param_value(Parameters.LP_HEURISTIC_CACHE, parameters, None) is None:
+        parameters[Parameters.LP_HEURISTIC_CACHE] = LpHeuristicCache()
     dictio_alignments = {}
     for variant in var_dictio:
         dictio_alignments[variant] = apply_from_variant(variant, petri_net, initial_marking, final_marking,
@@ -263,6 +268,8 @@ def apply_from_variants_list(var_list, petri_net, initial_marking, final_marking
                                                 sys.maxsize)
     max_align_time_trace = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME_TRACE, parameters,
                                                       sys.maxsize)
+    if exec_utils.get_param_value(Parameters.LP_HEURISTIC_CACHE, parameters, None) is None:
+        parameters[Parameters.LP_HEURISTIC_CACHE] = LpHeuristicCache()
     dictio_alignments = {}
     for varitem in var_list:
         this_max_align_time = min(max_align_time_trace, (max_align_time - (time.time() - start_time)) * 0.5)
@@ -380,10 +387,13 @@ def apply_trace_net(petri_net, initial_marking, final_marking, trace_net, trace_
 
     max_align_time_trace = exec_utils.get_param_value(Parameters.PARAM_MAX_ALIGN_TIME_TRACE, parameters,
                                                       sys.maxsize)
+    use_compiled_net = exec_utils.get_param_value(Parameters.USE_COMPILED_NET, parameters, False)
+    lp_heuristic_cache = exec_utils.get_param_value(Parameters.LP_HEURISTIC_CACHE, parameters, None)
 
     alignment = apply_sync_prod(sync_prod, sync_initial_marking, sync_final_marking, cost_function,
                            utils.SKIP, ret_tuple_as_trans_desc=ret_tuple_as_trans_desc,
-                           max_align_time_trace=max_align_time_trace)
+                           max_align_time_trace=max_align_time_trace, use_compiled_net=use_compiled_net,
+                           lp_heuristic_cache=lp_heuristic_cache)
 
     return_sync_cost = exec_utils.get_param_value(Parameters.RETURN_SYNC_COST_FUNCTION, parameters, False)
     if return_sync_cost:
@@ -394,7 +404,7 @@ def apply_trace_net(petri_net, initial_marking, final_marking, trace_net, trace_
 
 
 def apply_sync_prod(sync_prod, initial_marking, final_marking, cost_function, skip, ret_tuple_as_trans_desc=False,
-                    max_align_time_trace=sys.maxsize):
+                    max_align_time_trace=sys.maxsize, use_compiled_net=False, lp_heuristic_cache=None):
     """
     Performs the basic alignment search on top of the synchronous product net, given a cost function and skip-symbol
 
@@ -405,18 +415,27 @@ def apply_sync_prod(sync_prod, initial_marking, final_marking, cost_function, sk
     final_marking: :class:`pm4py.objects.petri.net.Marking` final marking in the synchronous product net
     cost_function: :class:`dict` cost function mapping transitions to the synchronous product net
     skip: :class:`Any` symbol to use for skips in the alignment
+    use_compiled_net: :class:`bool` explores the markings of the compiled synchronous product net
+    (tuples of token counts) instead of :class:`pm4py.objects.petri.net.Marking` objects
+    lp_heuristic_cache: :class:`LpHeuristicCache` (optional) cache of the solutions of the state equation, shared
+    between the alignments of the traces of a batch against the same model
 
     Returns
     -------
-    dictionary : :class:`dict` with keys **alignment**, **cost**, **visited_states**, **queued_states**
-    and **traversed_arcs**
+    dictionary : :class:`dict` with keys **alignment**, **cost**, **visited_states**, **queued_states**,
+    **traversed_arcs**, **lp_solved**, **lp_cache_hits** and **lp_solve_time**
     """
+    if use_compiled_net:
+        return __search_compiled(sync_prod, initial_marking, final_marking, cost_function, skip,
+                                 ret_tuple_as_trans_desc=ret_tuple_as_trans_desc,
+                                 max_align_time_trace=max_align_time_trace, lp_heuristic_cache=lp_heuristic_cache)
     return __search(sync_prod, initial_marking, final_marking, cost_function, skip,
-                    ret_tuple_as_trans_desc=ret_tuple_as_trans_desc, max_align_time_trace=max_align_time_trace)
+                    ret_tuple_as_trans_desc=ret_tuple_as_trans_desc, max_align_time_trace=max_align_time_trace,
+                    lp_heuristic_cache=lp_heuristic_cache)
 
 
 def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=False,
-             max_align_time_trace=sys.maxsize):
+             max_align_time_trace=sys.maxsize, lp_heuristic_cache=None):
     start_time = time.time()
 
     decorate_transitions_prepostset(sync_net)
@@ -427,35 +446,16 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
 
     closed = set()
 
-    a_matrix = np.asmatrix(incidence_matrix.a_matrix).astype(np.float64)
-    g_matrix = -np.eye(len(sync_net.transitions))
-    h_cvx = np.matrix(np.zeros(len(sync_net.transitions))).transpose()
-    cost_vec = [x * 1.0 for x in cost_vec]
-
-    use_cvxopt = False
-    if lp_solver.DEFAULT_LP_SOLVER_VARIANT == lp_solver.CVXOPT_SOLVER_CUSTOM_ALIGN or lp_solver.DEFAULT_LP_SOLVER_VARIANT == lp_solver.CVXOPT_SOLVER_CUSTOM_ALIGN_ILP:
-        use_cvxopt = True
-
-    if use_cvxopt:
-        # not available in the latest version of PM4Py
-        from cvxopt import matrix
-
-        a_matrix = matrix(a_matrix)
-        g_matrix = matrix(g_matrix)
-        h_cvx = matrix(h_cvx)
-        cost_vec = matrix(cost_vec)
-
-    h, x = utils.__compute_exact_heuristic_new_version(sync_net, a_matrix, h_cvx, g_matrix, cost_vec, incidence_matrix,
-                                                       ini,
-                                                       fin_vec, lp_solver.DEFAULT_LP_SOLVER_VARIANT,
-                                                       use_cvxopt=use_cvxopt)
-    ini_state = utils.SearchTuple(0 + h, 0, h, ini, None, None, x, True)
+    # the constraints of the state equation are built once, only the marking changes between the LPs
+    heuristic = StateEquationHeuristic(sync_net, incidence_matrix, fin_vec, cost_vec, skip, cache=lp_heuristic_cache)
+
+    h, x, r, d = heuristic.compute(ini)
+    ini_state = LpSearchTuple(0 + h, 0, h, ini, None, None, x, True, r, d)
     open_set = [ini_state]
     heapq.heapify(open_set)
     visited = 0
     queued = 0
     traversed = 0
-    lp_solved = 1
 
     trans_empty_preset = set(t for t in sync_net.transitions if len(t.in_arcs) == 0)
 
@@ -477,15 +477,11 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
                 current_marking = curr.m
                 continue
 
-            h, x = utils.__compute_exact_heuristic_new_version(sync_net, a_matrix, h_cvx, g_matrix, cost_vec,
-                                                               incidence_matrix, curr.m,
-                                                               fin_vec, lp_solver.DEFAULT_LP_SOLVER_VARIANT,
-                                                               use_cvxopt=use_cvxopt)
-            lp_solved += 1
+            h, x, r, d = heuristic.compute(curr.m)
 
             # 11/10/19: shall not a state for which we compute the exact heuristics be
             # by nature a trusted solution?
-            tp = utils.SearchTuple(curr.g + h, curr.g, h, curr.m, curr.p, curr.t, x, True)
+            tp = LpSearchTuple(curr.g + h, curr.g, h, curr.m, curr.p, curr.t, x, True, r, d)
             # 11/10/2019 (optimization ZA) heappushpop is slightly more efficient than pushing
             # and popping separately
             curr = heapq.heappushpop(open_set, tp)
@@ -504,9 +500,10 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
         # (underestimation of the remaining cost) is 0. Low-hanging fruits
         if curr.h < 0.01:
             if current_marking == fin:
-                return utils.__reconstruct_alignment(curr, visited, queued, traversed,
-                                                     ret_tuple_as_trans_desc=ret_tuple_as_trans_desc,
-                                                     lp_solved=lp_solved)
+                alignment = utils.__reconstruct_alignment(curr, visited, queued, traversed,
+                                                          ret_tuple_as_trans_desc=ret_tuple_as_trans_desc)
+                alignment.update(heuristic.get_statistics())
+                return alignment
 
         closed.add(current_marking)
         visited += 1
@@ -529,9 +526,100 @@ def __search(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=Fa
             g = curr.g + cost
 
             queued += 1
-            h, x = utils.__derive_heuristic(incidence_matrix, cost_vec, curr.x, t, curr.h)
+            h, x, r, d = heuristic.derive(curr, t)
+            trustable = utils.__trust_solution(x)
+            new_f = g + h
+
+            tp = LpSearchTuple(new_f, g, h, new_marking, curr, t, x, trustable, r, d)
+            heapq.heappush(open_set, tp)
+
+
+def __search_compiled(sync_net, ini, fin, cost_function, skip, ret_tuple_as_trans_desc=False,
+                      max_align_time_trace=sys.maxsize, lp_heuristic_cache=None):
+    start_time = time.time()
+
+    incidence_matrix = inc_mat_construct(sync_net)
+    ini_vec, fin_vec, cost_vec = utils.__vectorize_initial_final_cost(incidence_matrix, ini, fin, cost_function)
+
+    # the places are ordered as in the incidence matrix, so the compiled markings are also the marking vectors
+    compiled = CompiledPetriNet(sync_net, place_order=sorted(incidence_matrix.places, key=incidence_matrix.places.get),
+                                transition_order=sorted(incidence_matrix.transitions,
+                                                        key=incidence_matrix.transitions.get))
+    ini_m = tuple(ini_vec)
+    fin_m = tuple(fin_vec)
+    transitions = compiled.transitions
+    to_visit = [not (utils.__is_log_move(t, skip) and utils.__is_model_move(t, skip)) for t in transitions]
+
+    closed = set()
+
+    # the constraints of the state equation are built once, only the marking changes between the LPs
+    heuristic = StateEquationHeuristic(sync_net, incidence_matrix, fin_vec, cost_vec, skip, cache=lp_heuristic_cache)
+
+    h, x, r, d = heuristic.compute(ini_m)
+    ini_state = LpSearchTuple(0 + h, 0, h, ini_m, None, None, x, True, r, d)
+    open_set = [ini_state]
+    heapq.heapify(open_set)
+    visited = 0
+    queued = 0
+    traversed = 0
+
+    while not len(open_set) == 0:
+        if (time.time() - start_time) > max_align_time_trace:
+            return None
+
+        curr = heapq.heappop(open_set)
+
+        current_marking = curr.m
+
+        while not curr.trust:
+            if (time.time() - start_time) > max_align_time_trace:
+                return None
+
+            already_closed = current_marking in closed
+            if already_closed:
+                curr = heapq.heappop(open_set)
+                current_marking = curr.m
+                continue
+
+            h, x, r, d = heuristic.compute(curr.m)
+
+            tp = LpSearchTuple(curr.g + h, curr.g, h, curr.m, curr.p, curr.t, x, True, r, d)
+            curr = heapq.heappushpop(open_set, tp)
+            current_marking = curr.m
+
+        # max allowed heuristics value (due to the numerical instability of some of our solvers)
+        if curr.h > lp_solver.MAX_ALLOWED_HEURISTICS:
+            continue
+
+        already_closed = current_marking in closed
+        if already_closed:
+            continue
+
+        if curr.h < 0.01:
+            if current_marking == fin_m:
+                alignment = utils.__reconstruct_alignment(curr, visited, queued, traversed,
+                                                          ret_tuple_as_trans_desc=ret_tuple_as_trans_desc)
+                alignment.update(heuristic.get_statistics())
+                return alignment
+
+        closed.add(current_marking)
+        visited += 1
+
+        for tid in compiled.enabled_transitions(current_marking):
+            if not to_visit[tid]:
+                continue
+            traversed += 1
+            new_marking = compiled.fire(tid, current_marking)
+
+            if new_marking in closed:
+                continue
+            t = transitions[tid]
+            g = curr.g + cost_function[t]
+
+            queued += 1
+            h, x, r, d = heuristic.derive(curr, t)
             trustable = utils.__trust_solution(x)
             new_f = g + h
 
-            tp = utils.SearchTuple(new_f, g, h, new_marking, curr, t, x, trustable)
+            tp = LpSearchTuple(new_f, g, h, new_marking, curr, t, x, trustable, r, d)
             heapq.heappush(open_set, tp)
@@ -22,7 +22,7 @@ Contact: info@processintelligence.solutions
 
 from pm4py.util import exec_utils
 from enum import Enum
-from pm4py.algo.conformance.declare.variants import classic
+from pm4py.algo.conformance.declare.variants import classic, vectorized
 from pm4py.objects.log.obj import EventLog
 import pandas as pd
 from typing import Union, Dict, Optional, Any, List
@@ -30,6 +30,7 @@ from typing import Union, Dict, Optional, Any, List
 
 class Variants(Enum):
     CLASSIC = classic
+    VECTORIZED = vectorized
 
 
 def apply(log: Union[EventLog, pd.DataFrame], model: Dict[str, Dict[Any, Dict[str, int]]], variant=Variants.CLASSIC,
@@ -46,6 +47,7 @@ def apply(log: Union[EventLog, pd.DataFrame], model: Dict[str, Dict[Any, Dict[st
     variant
         Variant to be used:
         - Variants.CLASSIC
+        - Variants.VECTORIZED (rules evaluated on the integer-coded variants with vectorized operations)
     parameters
         Variant-specific parameters
 
@@ -76,6 +78,7 @@ def get_diagnostics_dataframe(log, conf_result, variant=Variants.CLASSIC, parame
     variant
         Variant to be used:
         - Variants.CLASSIC
+        - Variants.VECTORIZED (rules evaluated on the integer-coded variants with vectorized operations)
     parameters
         Variant-specific parameters
 
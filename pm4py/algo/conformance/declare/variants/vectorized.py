@@ -0,0 +1,212 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+from enum import Enum
+from typing import Union, Dict, Optional, Any, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pm4py.algo.conformance.declare.variants import classic
+from pm4py.algo.discovery.declare import variant_positions
+from pm4py.algo.discovery.declare.templates import *
+from pm4py.objects.log.obj import EventLog
+from pm4py.util import exec_utils, constants, xes_constants
+
+
+class Parameters(Enum):
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    MULTIPROCESSING = "multiprocessing"
+    CORES = "cores"
+    MAX_CELLS_PER_CHUNK = "max_cells_per_chunk"
+
+
+# templates checked (in the order of the deviations of a case)
+CHECKED_TEMPLATES = [EXISTENCE, EXACTLY_ONE, INIT, RESPONDED_EXISTENCE, COEXISTENCE, NONCOEXISTENCE, RESPONSE,
+                     PRECEDENCE, SUCCESSION, ALTRESPONSE, CHAINRESPONSE, ALTPRECEDENCE, CHAINPRECEDENCE, ALTSUCCESSION,
+                     CHAINSUCCESSION, ABSENCE]
+
+ALTERNATION_TEMPLATES = {ALTRESPONSE: (variant_positions.STRIP_RESPONSE, False),
+                         CHAINRESPONSE: (variant_positions.STRIP_RESPONSE, True),
+                         ALTPRECEDENCE: (variant_positions.STRIP_PRECEDENCE, False),
+                         CHAINPRECEDENCE: (variant_positions.STRIP_PRECEDENCE, True),
+                         ALTSUCCESSION: (variant_positions.STRIP_NONE, False),
+                         CHAINSUCCESSION: (variant_positions.STRIP_NONE, True)}
+
+
+def __violations(positions: variant_positions.VariantPositions,
+                 constraints: List[Tuple[str, np.ndarray, np.ndarray]]) -> List[np.ndarray]:
+    """
+    Computes, for every variant of a chunk, the indexes of the violated constraints
+    (given as the template and the codes of the activities of each rule; -1 for activities which are not in the log)
+    """
+    num_activities = len(positions.activities)
+    count = positions.get_dense(positions.entry_count, 0)
+    first = positions.get_dense(positions.entry_first, np.iinfo(np.int64).max)
+    last = positions.get_dense(positions.entry_last, -1)
+    first_activity = positions.first_activity
+
+    violations = []
+    for template, acts1, acts2 in constraints:
+        a = np.where(acts1 >= 0, acts1, num_activities)
+        b = np.where(acts2 >= 0, acts2, num_activities)
+        present_a = count[:, a] > 0
+        present_b = count[:, b] > 0
+        if template == EXISTENCE:
+            dev = ~present_a
+        elif template == ABSENCE:
+            dev = present_a
+        elif template == EXACTLY_ONE:
+            dev = count[:, a] != 1
+        elif template == INIT:
+            dev = first_activity[:, None] != a[None, :]
+        elif template == RESPONDED_EXISTENCE:
+            dev = present_a & ~present_b
+        elif template == COEXISTENCE:
+            dev = present_a ^ present_b
+        elif template == NONCOEXISTENCE:
+            dev = present_a & present_b
+        elif template == RESPONSE:
+            dev = present_a & (~present_b | (last[:, a] > last[:, b]))
+        elif template == PRECEDENCE:
+            dev = present_b & (~present_a | (first[:, a] > first[:, b]))
+        elif template == SUCCESSION:
+            dev = ~present_a | ~present_b | (first[:, a] > first[:, b]) | (last[:, a] > last[:, b])
+        else:
+            strip, chain = ALTERNATION_TEMPLATES[template]
+            dev = np.zeros(present_a.shape, dtype=bool)
+            variants, cells = np.nonzero(present_a | present_b)
+            dev[variants, cells] = ~positions.check_alternation(variants, acts1[cells], acts2[cells], strip=strip,
+                                                                 chain=chain)
+        violations.append(dev)
+
+    violations = np.hstack(violations) if violations else np.zeros((len(positions), 0), dtype=bool)
+    return [np.flatnonzero(row) for row in violations]
+
+
+def apply(log: Union[EventLog, pd.DataFrame], model: Dict[str, Dict[Any, Dict[str, int]]],
+          parameters: Optional[Dict[Any, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Applies conformance checking against a DECLARE model, evaluating every rule on the integer-coded variants
+    of the log with vectorized operations (the outcome of a variant is then associated to all its cases).
+
+    The rules are checked as in the classic variant, with two differences: the alternate response rules
+    are checked for the couples of activities of the altresponse template (instead of the ones of the response
+    template), and the violations of the non co-existence rules are reported once.
+
+    Parameters
+    --------------
+    log
+        Event log / Pandas dataframe
+    model
+        DECLARE model
+    parameters
+        Possible parameters of the algorithm, including:
+        - Parameters.ACTIVITY_KEY => the attribute to be used as activity
+        - Parameters.CASE_ID_KEY => the attribute to be used as case identifier
+        - Parameters.MULTIPROCESSING => evaluates the chunks of variants in a pool of processes
+          (default: constants.ENABLE_MULTIPROCESSING_DEFAULT)
+        - Parameters.CORES => number of processes evaluating the chunks of variants (default: number of CPUs - 2 when
+          multiprocessing is enabled, 1 otherwise)
+        - Parameters.MAX_CELLS_PER_CHUNK => maximum number of (variant, rule) couples evaluated in a chunk
+          (default: 2^24)
+
+    Returns
+    -------------
+    lst_conf_res
+        List containing for every case a dictionary with different keys:
+        - no_constr_total => the total number of constraints of the DECLARE model
+        - deviations => a list of deviations
+        - no_dev_total => the total number of deviations
+        - dev_fitness => the fitness (1 - no_dev_total / no_constr_total)
+        - is_fit => True if the case is perfectly fit
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+    case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+    enable_multiprocessing = exec_utils.get_param_value(Parameters.MULTIPROCESSING, parameters, None)
+    cores = exec_utils.get_param_value(Parameters.CORES, parameters, None)
+    max_cells = exec_utils.get_param_value(Parameters.MAX_CELLS_PER_CHUNK, parameters, 1 << 24)
+
+    positions = variant_positions.build(log, parameters={variant_positions.Parameters.ACTIVITY_KEY: activity_key,
+                                                         variant_positions.Parameters.CASE_ID_KEY: case_id_key})
+
+    total_num_constraints = sum(len(model[k]) for k in model)
+
+    rules = []
+    constraints = []
+    for template in CHECKED_TEMPLATES:
+        if template in model and model[template]:
+            keys = list(model[template])
+            rules.extend([template, key] for key in keys)
+            if isinstance(keys[0], tuple):
+                acts1 = positions.get_activity_codes([key[0] for key in keys])
+                acts2 = positions.get_activity_codes([key[1] for key in keys])
+            else:
+                acts1 = positions.get_activity_codes(keys)
+                acts2 = acts1
+            constraints.append((template, acts1, acts2))
+
+    step = max(1, max_cells // max(1, len(rules)))
+    chunks = [(i, min(i + step, len(positions))) for i in range(0, len(positions), step)] or [(0, 0)]
+    chunks_params = {variant_positions.Parameters.MULTIPROCESSING: enable_multiprocessing,
+                     variant_positions.Parameters.CORES: cores}
+    chunks_params = {k: v for k, v in chunks_params.items() if v is not None}
+    variant_violations = []
+    for chunk_violations in variant_positions.apply_chunks(positions, __violations, (constraints,), chunks=chunks,
+                                                           parameters=chunks_params):
+        variant_violations.extend(chunk_violations)
+
+    conf_cases = []
+    for variant in positions.case_variant.tolist():
+        deviations = [list(rules[i]) for i in variant_violations[variant]]
+        ret = {}
+        ret["no_constr_total"] = total_num_constraints
+        ret["deviations"] = deviations
+        ret["no_dev_total"] = len(deviations)
+        ret["dev_fitness"] = 1.0 - ret["no_dev_total"] / ret["no_constr_total"] if ret["no_constr_total"] > 0 else 1.0
+        ret["is_fit"] = ret["no_dev_total"] == 0
+        conf_cases.append(ret)
+
+    return conf_cases
+
+
+def get_diagnostics_dataframe(log, conf_result, parameters=None) -> pd.DataFrame:
+    """
+    Gets the diagnostics dataframe from a log and the results
+    of DECLARE-based conformance checking
+
+    Parameters
+    --------------
+    log
+        Event log
+    conf_result
+        Results of conformance checking
+
+    Returns
+    --------------
+    diagn_dataframe
+        Diagnostics dataframe
+    """
+    return classic.get_diagnostics_dataframe(log, conf_result, parameters=parameters)
@@ -19,4 +19,4 @@ visit <https://www.gnu.org/licenses/>.
 Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
-from pm4py.algo.conformance.tokenreplay import variants, diagnostics, algorithm
+from pm4py.algo.conformance.tokenreplay import variants, diagnostics, algorithm, utils
@@ -0,0 +1,337 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+import io
+import math
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import copy
+from enum import Enum
+from typing import Optional, Dict, Any, Union, List, Tuple
+
+from pm4py.algo.conformance.tokenreplay.variants import token_replay
+from pm4py.objects.petri_net.obj import PetriNet, Marking
+from pm4py.objects.petri_net.utils.petri_utils import get_places_shortest_path_by_hidden, get_s_components_from_petri
+from pm4py.util import exec_utils
+
+
+class Parameters(Enum):
+    CORES = "cores"
+    CHUNK_SIZE = "chunk_size"
+    PLACES_SHORTEST_PATH_BY_HIDDEN = "places_shortest_path_by_hidden"
+    CLEANING_TOKEN_FLOOD = "cleaning_token_flood"
+
+
+# state of the current worker process, set once by the initializer of the pool
+_WORKER_STATE = {}
+
+
+class _ResultPickler(pickle.Pickler):
+    """
+    Pickles the outcome of a chunk, replacing the places, the transitions and the cases of the log
+    with references that are resolved (on the objects of the parent process) by _ResultUnpickler
+    """
+
+    def __init__(self, file, references):
+        pickle.Pickler.__init__(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.references = references
+
+    def persistent_id(self, obj):
+        return self.references.get(id(obj))
+
+
+class _ResultUnpickler(pickle.Unpickler):
+    """
+    Unpickles the outcome of a chunk, resolving the references to the places, the transitions
+    and the cases of the log
+    """
+
+    def __init__(self, file, places, transitions, log):
+        pickle.Unpickler.__init__(self, file)
+        self.places = places
+        self.transitions = transitions
+        self.log = log
+
+    def persistent_load(self, pid):
+        kind, index = pid
+        if kind == "p":
+            return self.places[index]
+        elif kind == "t":
+            return self.transitions[index]
+        return self.log[index]
+
+
+def _init_worker(net, initial_marking, final_marking, places, transitions, places_shortest_path_by_hidden,
+                 s_components):
+    """
+    Initializer of the worker processes: stores the model and the structures derived from it,
+    so they are transferred only once per worker.
+    Since they are unpickled together, the places and the transitions lists contain the same objects of the net.
+    """
+    _WORKER_STATE["net"] = net
+    _WORKER_STATE["initial_marking"] = initial_marking
+    _WORKER_STATE["final_marking"] = final_marking
+    _WORKER_STATE["trans_map"] = token_replay.get_transitions_map(net)
+    _WORKER_STATE["places_shortest_path_by_hidden"] = places_shortest_path_by_hidden
+    _WORKER_STATE["s_components"] = s_components
+    references = {id(places[i]): ("p", i) for i in range(len(places))}
+    references.update({id(transitions[i]): ("t", i) for i in range(len(transitions))})
+    _WORKER_STATE["references"] = references
+
+
+def _replay_chunk(chunk: List[Tuple[Tuple[str, ...], List[int]]], cases: Dict[int, Any], enable_pltr_fitness: bool,
+                  consider_remaining_in_fitness: bool, settings: Dict[str, Any]) -> bytes:
+    """
+    Replays a chunk of variants inside a worker process
+
+    Parameters
+    ---------------
+    chunk
+        List of couples (variant, positions of the cases of the variant)
+    cases
+        Cases of the chunk, indexed by their position in the log (only when the cases are replayed separately)
+    enable_pltr_fitness
+        Enables the place/transition-level diagnostics
+    consider_remaining_in_fitness
+        Considers the remaining tokens in the fitness
+    settings
+        Further settings of the replay (see token_replay.replay_variants)
+
+    Returns
+    ---------------
+    pickled_outcome
+        Pickled tuple (results, place fitness, transition fitness, activities not in the model)
+    """
+    net = _WORKER_STATE["net"]
+    initial_marking = _WORKER_STATE["initial_marking"]
+    final_marking = _WORKER_STATE["final_marking"]
+
+    s_components = []
+    if settings["cleaning_token_flood"]:
+        if _WORKER_STATE["s_components"] is None:
+            _WORKER_STATE["s_components"] = get_s_components_from_petri(net, initial_marking, final_marking)
+        s_components = _WORKER_STATE["s_components"]
+
+    place_fitness = {}
+    transition_fitness = {}
+    if enable_pltr_fitness:
+        place_fitness = token_replay.get_empty_place_fitness(net)
+        transition_fitness = token_replay.get_empty_transition_fitness(net)
+    notexisting_activities_in_model = {}
+
+    results = token_replay.replay_variants(chunk, cases, net, initial_marking, final_marking,
+                                           _WORKER_STATE["trans_map"], enable_pltr_fitness, place_fitness,
+                                           transition_fitness, notexisting_activities_in_model,
+                                           _WORKER_STATE["places_shortest_path_by_hidden"],
+                                           consider_remaining_in_fitness,
+                                           post_fix_caching=token_replay.PostFixCaching(),
+                                           marking_to_activity_caching=token_replay.MarkingToActivityCaching(),
+                                           s_components=s_components, **settings)
+
+    references = copy(_WORKER_STATE["references"])
+    references.update({id(case): ("c", position) for position, case in cases.items()})
+    buffer = io.BytesIO()
+    _ResultPickler(buffer, references).dump((results, place_fitness, transition_fitness,
+                                             notexisting_activities_in_model))
+    return buffer.getvalue()
+
+
+class TokenReplayWorkerPool(object):
+    """
+    Persistent pool of processes executing the token-based replay of the variants of a log
+    against a fixed accepting Petri net.
+
+    The Petri net, the markings, the shortest paths between places through hidden transitions
+    and (if needed) the S-components are shipped to the workers once (through the initializer of the pool),
+    while only the variants (or the cases, when the variants are disabled) travel with the tasks.
+    The diagnostics of the workers are merged in the order of the chunks, so the outcome does not depend
+    on the scheduling of the workers. The pool can be reused across different calls on the same model,
+    and should be closed (or used as a context manager) when it is no longer needed.
+    """
+
+    def __init__(self, net: PetriNet, initial_marking: Marking, final_marking: Marking,
+                 parameters: Optional[Dict[Union[str, Parameters], Any]] = None):
+        """
+        Starts the worker pool
+
+        Parameters
+        ---------------
+        net
+            Petri net
+        initial_marking
+            Initial marking
+        final_marking
+            Final marking
+        parameters
+            Parameters of the pool, including:
+            - Parameters.CORES => number of worker processes
+            - Parameters.CHUNK_SIZE => number of variants (or cases) sent to a worker in a single task
+            (default: split the variants in about four chunks per worker)
+            - Parameters.PLACES_SHORTEST_PATH_BY_HIDDEN => shortest paths between places through hidden transitions
+            (default: computed once when the pool is started)
+            - Parameters.CLEANING_TOKEN_FLOOD => computes the S-components of the net when the pool is started
+            (otherwise, they are computed by the workers at the first replay requiring them)
+        """
+        if parameters is None:
+            parameters = {}
+
+        self.net = net
+        self.initial_marking = initial_marking
+        self.final_marking = final_marking
+        self.num_cores = max(1, exec_utils.get_param_value(Parameters.CORES, parameters,
+                                                            multiprocessing.cpu_count() - 2))
+        self.chunk_size = exec_utils.get_param_value(Parameters.CHUNK_SIZE, parameters, None)
+
+        places_shortest_path_by_hidden = exec_utils.get_param_value(Parameters.PLACES_SHORTEST_PATH_BY_HIDDEN,
+                                                                    parameters, None)
+        if places_shortest_path_by_hidden is None:
+            places_shortest_path_by_hidden = get_places_shortest_path_by_hidden(
+                net, token_replay.TechnicalParameters.MAX_REC_DEPTH.value)
+
+        s_components = None
+        if exec_utils.get_param_value(Parameters.CLEANING_TOKEN_FLOOD, parameters, False):
+            s_components = get_s_components_from_petri(net, initial_marking, final_marking)
+
+        self.places = list(net.places)
+        self.transitions = list(net.transitions)
+
+        self._executor = ProcessPoolExecutor(max_workers=self.num_cores, initializer=_init_worker,
+                                             initargs=(net, initial_marking, final_marking, self.places,
+                                                       self.transitions, places_shortest_path_by_hidden,
+                                                       s_components))
+
+    def replay_variants(self, variants_cases: List[Tuple[Tuple[str, ...], List[int]]], log, enable_pltr_fitness: bool,
+                        consider_remaining_in_fitness: bool, place_fitness: Dict[Any, Any],
+                        transition_fitness: Dict[Any, Any], notexisting_activities_in_model: Dict[str, Any],
+                        settings: Dict[str, Any], progress=None) -> Dict[int, Dict[str, Any]]:
+        """
+        Replays a list of variants using the workers of the pool
+
+        Parameters
+        ---------------
+        variants_cases
+            List of couples (variant, positions of the cases of the variant)
+        log
+            Event log (accessed only when the cases are replayed separately)
+        enable_pltr_fitness
+            Enables the place/transition-level diagnostics
+        consider_remaining_in_fitness
+            Considers the remaining tokens in the fitness
+        place_fitness
+            Place-level diagnostics, in which the ones of the workers are merged
+        transition_fitness
+            Transition-level diagnostics, in which the ones of the workers are merged
+        notexisting_activities_in_model
+            Activities of the log not in the model, in which the ones of the workers are merged
+        settings
+            Further settings of the replay (see token_replay.replay_variants)
+        progress
+            (if provided) progress bar that is updated when a chunk is completed
+
+        Returns
+        ---------------
+        results
+            Dictionary associating to the position of every case the outcome of its replay
+        """
+        if self._executor is None:
+            raise Exception("the token-based replay worker pool has already been closed!")
+
+        replay_cases = settings["replay_cases"]
+        if replay_cases:
+            # the cases are distributed one by one (keeping the order of the sequential replay)
+            variants_cases = [(variant, [position]) for variant, positions in variants_cases for position in positions]
+
+        chunk_size = self.chunk_size
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(variants_cases) / (4 * self.num_cores)))
+
+        futures = {}
+        for index, i in enumerate(range(0, len(variants_cases), chunk_size)):
+            chunk = variants_cases[i:i + chunk_size]
+            cases = {}
+            if replay_cases:
+                cases = {positions[0]: log[positions[0]] for _, positions in chunk}
+            futures[self._executor.submit(_replay_chunk, chunk, cases, enable_pltr_fitness,
+                                          consider_remaining_in_fitness, settings)] = (index, len(chunk))
+
+        outcomes = [None] * len(futures)
+        for future in as_completed(futures):
+            index, count = futures[future]
+            outcomes[index] = _ResultUnpickler(io.BytesIO(future.result()), self.places, self.transitions,
+                                               log).load()
+            if progress is not None:
+                progress.update(count)
+
+        results = {}
+        for chunk_results, chunk_place_fitness, chunk_transition_fitness, chunk_notexisting in outcomes:
+            results.update(chunk_results)
+            for place, values in chunk_place_fitness.items():
+                target = place_fitness[place]
+                target["underfed_traces"].update(values["underfed_traces"])
+                target["overfed_traces"].update(values["overfed_traces"])
+                for key in ("m", "r", "c", "p"):
+                    target[key] += values[key]
+            for transition, values in chunk_transition_fitness.items():
+                for key in ("underfed_traces", "fit_traces"):
+                    for trace, events in values[key].items():
+                        transition_fitness[transition][key].setdefault(trace, []).extend(events)
+            for activity, traces in chunk_notexisting.items():
+                notexisting_activities_in_model.setdefault(activity, {}).update(traces)
+
+        return results
+
+    def apply(self, log, parameters: Optional[Dict[Any, Any]] = None):
+        """
+        Replays an event log (or dataframe) on the model of the pool
+
+        Parameters
+        ---------------
+        log
+            Event log / Pandas dataframe
+        parameters
+            Parameters of the token-based replay (the same accepted by token_replay.apply)
+
+        Returns
+        ---------------
+        replay_result
+            Outcome of the token-based replay (the same returned by token_replay.apply)
+        """
+        if parameters is None:
+            parameters = {}
+        parameters = copy(parameters)
+        parameters[token_replay.Parameters.WORKER_POOL] = self
+
+        return token_replay.apply(log, self.net, self.initial_marking, self.final_marking, parameters=parameters)
+
+    def close(self):
+        """
+        Shuts down the worker processes
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -23,6 +23,7 @@ from pm4py.util import xes_constants as xes_util
 from pm4py.objects.petri_net import semantics
 from pm4py.objects.petri_net.utils.petri_utils import get_places_shortest_path_by_hidden, get_s_components_from_petri
 from pm4py.objects.log import obj as log_implementation
+from pm4py.objects.log.util import pandas_numpy_variants
 from pm4py.objects.petri_net.utils import align_utils
 from copy import copy
 from enum import Enum
@@ -33,6 +34,7 @@ from typing import Optional, Dict, Any, Union
 from pm4py.objects.log.obj import EventLog
 import pandas as pd
 from pm4py.objects.petri_net.obj import PetriNet, Marking
+from pm4py.objects.trie.obj import Trie
 from pm4py.util import typing
 from collections import Counter
 from pm4py.objects.conversion.log import converter as log_converter
@@ -56,6 +58,11 @@ class Parameters(Enum):
     CONSIDER_ACTIVITIES_NOT_IN_MODEL_IN_FITNESS = "consider_activities_not_in_model_in_fitness"
     ENABLE_PLTR_FITNESS = "enable_pltr_fitness"
     SHOW_PROGRESS_BAR = "show_progress_bar"
+    USE_PREFIX_TRIE = "use_prefix_trie"
+    MULTIPROCESSING = "multiprocessing"
+    CORES = "cores"
+    CHUNK_SIZE = "chunk_size"
+    WORKER_POOL = "worker_pool"
 
 
 class TechnicalParameters(Enum):
@@ -372,28 +379,30 @@ def break_condition_final_marking(marking, final_marking):
     return final_marking_dict_keys.issubset(marking_dict_keys)
 
 
-def apply_trace(trace, net, initial_marking, final_marking, trans_map, enable_pltr_fitness, place_fitness,
-                transition_fitness, notexisting_activities_in_model,
-                places_shortest_path_by_hidden, consider_remaining_in_fitness, activity_key="concept:name",
-                try_to_reach_final_marking_through_hidden=True, stop_immediately_unfit=False,
-                walk_through_hidden_trans=True, post_fix_caching=None,
-                marking_to_activity_caching=None, is_reduction=False,
-                thread_maximum_ex_time=TechnicalParameters.MAX_DEF_THR_EX_TIME.value,
-                enable_postfix_cache=False, enable_marktoact_cache=False, cleaning_token_flood=False,
-                s_components=None, trace_occurrences=1, consider_activities_not_in_model_in_fitness=False):
+def replay_event(trace, event, net, marking, act_trans, vis_mark, transitions_with_problems, trans_map,
+                 enable_pltr_fitness, place_fitness, transition_fitness, notexisting_activities_in_model,
+                 places_shortest_path_by_hidden, current_event_map, current_remaining_map, activity_key="concept:name",
+                 stop_immediately_unfit=False, walk_through_hidden_trans=True, cleaning_token_flood=False,
+                 s_components=None, trace_occurrences=1):
     """
-    Apply the token replaying algorithm to a trace
+    Replays an event of a trace, starting from the given marking
 
     Parameters
     ----------
     trace
         Trace in the event log
+    event
+        Event of the trace to replay
     net
         Petri net
-    initial_marking
-        Initial marking
-    final_marking
-        Final marking
+    marking
+        Current marking (missing tokens are added to it)
+    act_trans
+        Transitions activated so far (the fired transitions are appended)
+    vis_mark
+        Markings visited so far (the visited markings are appended)
+    transitions_with_problems
+        Transitions fired with missing tokens (the problematic transition is appended)
     trans_map
         Map between transitions labels and transitions
     enable_pltr_fitness
@@ -406,187 +415,209 @@ def apply_trace(trace, net, initial_marking, final_marking, trans_map, enable_pl
         Map that stores the notexisting activities in the model
     places_shortest_path_by_hidden
         Shortest paths between places by hidden transitions
-    consider_remaining_in_fitness
-        Boolean value telling if the remaining tokens should be considered in fitness evaluation
+    current_event_map
+        Attributes of the events of the trace replayed so far
+    current_remaining_map
+        Remaining tokens removed by the cleaning of the token flood
     activity_key
         Name of the attribute that contains the activity
-    try_to_reach_final_marking_through_hidden
-        Boolean value that decides if we shall try to reach the final marking through hidden transitions
     stop_immediately_unfit
         Boolean value that decides if we shall stop immediately when a non-conformance is detected
     walk_through_hidden_trans
         Boolean value that decides if we shall walk through hidden transitions in order to enable visible transitions
-    post_fix_caching
-        Stores the post fix caching object
-    marking_to_activity_caching
-        Stores the marking-to-activity cache
-    is_reduction
-        Expresses if the token-based replay is called in a reduction attempt
-    thread_maximum_ex_time
-        Alignment threads maximum allowed execution time
-    enable_postfix_cache
-        Enables postfix cache
-    enable_marktoact_cache
-        Enables marking to activity cache
     cleaning_token_flood
         Decides if a cleaning of the token flood shall be operated
     s_components
         S-components of the Petri net (if workflow net)
+    trace_occurrences
+        Trace weight (number of occurrences)
+
+    Returns
+    ----------
+    marking
+        Marking reached after the event
+    act_trans
+        Activated transitions
+    vis_mark
+        Visited markings
+    missing
+        Number of missing tokens added while replaying the event
+    consumed
+        Number of tokens consumed while replaying the event
+    produced
+        Number of tokens produced while replaying the event
+    stop
+        Boolean value telling if the replay of the trace shall stop (non-conformance with stop_immediately_unfit)
     """
-    trace_activities = [event[activity_key] for event in trace]
-    act_trans = []
-    transitions_with_problems = []
-    vis_mark = []
-    activating_transition_index = {}
-    activating_transition_interval = []
-    used_postfix_cache = False
-    marking = copy(initial_marking)
-    vis_mark.append(marking)
     missing = 0
     consumed = 0
-    sum_tokens_im = 0
-    for place in initial_marking:
-        sum_tokens_im = sum_tokens_im + initial_marking[place]
-    sum_tokens_fm = 0
-    for place in final_marking:
-        sum_tokens_fm = sum_tokens_fm + final_marking[place]
-    produced = sum_tokens_im
-    current_event_map = {}
-    current_remaining_map = {}
-    for i in range(len(trace)):
-        if enable_postfix_cache and (str(trace_activities) in post_fix_caching.cache and
-                                     hash(marking) in post_fix_caching.cache[str(trace_activities)]):
-            trans_to_act = post_fix_caching.cache[str(trace_activities)][hash(marking)]["trans_to_activate"]
-            for z in range(len(trans_to_act)):
-                t = trans_to_act[z]
-                act_trans.append(t)
-            used_postfix_cache = True
-            marking = post_fix_caching.cache[str(trace_activities)][hash(marking)]["final_marking"]
-            break
+    produced = 0
+    if event[activity_key] in trans_map:
+        current_event_map.update(event)
+        # change 14/10/2020: to better support duplicate transitions with this approach, we check
+        # whether in the current marking there is at least one transition corresponding to the activity
+        # key without looking at the transition map (that contains one entry per label)
+        corr_en_t = [x for x in semantics.enabled_transitions(net, marking) if x.label == event[activity_key]]
+        if corr_en_t:
+            t = corr_en_t[0]
         else:
-            prev_len_activated_transitions = len(act_trans)
-            if enable_marktoact_cache and (hash(marking) in marking_to_activity_caching.cache and
-                                           trace[i][activity_key] in marking_to_activity_caching.cache[hash(marking)]
-                                           and trace[i - 1][activity_key] ==
-                                           marking_to_activity_caching.cache[hash(marking)][trace[i][activity_key]]
-                                           ["previousActivity"]):
-                this_end_marking = marking_to_activity_caching.cache[hash(marking)][trace[i][activity_key]][
-                    "end_marking"]
-                this_act_trans = marking_to_activity_caching.cache[hash(marking)][trace[i][activity_key]][
-                    "this_activated_transitions"]
-                this_vis_markings = marking_to_activity_caching.cache[hash(marking)][trace[i][activity_key]][
-                    "this_visited_markings"]
-                act_trans = act_trans + this_act_trans
-                vis_mark = vis_mark + this_vis_markings
-                marking = copy(this_end_marking)
-            else:
-                if trace[i][activity_key] in trans_map:
-                    current_event_map.update(trace[i])
-                    # change 14/10/2020: to better support duplicate transitions with this approach, we check
-                    # whether in the current marking there is at least one transition corresponding to the activity
-                    # key without looking at the transition map (that contains one entry per label)
-                    corr_en_t = [x for x in semantics.enabled_transitions(net, marking) if x.label == trace[i][activity_key]]
-                    if corr_en_t:
-                        t = corr_en_t[0]
-                    else:
-                        t = trans_map[trace[i][activity_key]]
-                    if walk_through_hidden_trans and not semantics.is_enabled(t, net,
-                                                                              marking):
-                        visited_transitions = set()
-                        prev_len_activated_transitions = len(act_trans)
-                        [net, new_marking, new_act_trans, new_vis_mark] = apply_hidden_trans(t, net,
-                                                                                             copy(marking),
-                                                                                             places_shortest_path_by_hidden,
-                                                                                             copy(act_trans),
-                                                                                             0,
-                                                                                             copy(visited_transitions),
-                                                                                             copy(vis_mark))
-                        for jj5 in range(len(act_trans), len(new_act_trans)):
-                            tt5 = new_act_trans[jj5]
-                            c, cmap = get_consumed_tokens(tt5)
-                            p, pmap = get_produced_tokens(tt5)
-                            if enable_pltr_fitness:
-                                for pl2 in cmap:
-                                    if pl2 in place_fitness:
-                                        place_fitness[pl2]["c"] += cmap[pl2] * trace_occurrences
-                                for pl2 in pmap:
-                                    if pl2 in place_fitness:
-                                        place_fitness[pl2]["p"] += pmap[pl2] * trace_occurrences
-                            consumed = consumed + c
-                            produced = produced + p
-                        marking, act_trans, vis_mark = new_marking, new_act_trans, new_vis_mark
-                    is_initially_enabled = True
-                    old_marking_names = [x.name for x in list(marking.keys())]
-                    if not semantics.is_enabled(t, net, marking):
-                        is_initially_enabled = False
-                        transitions_with_problems.append(t)
-                        if stop_immediately_unfit:
-                            missing = missing + 1
-                            break
-                        [m, tokens_added] = add_missing_tokens(t, marking)
-                        missing = missing + m
-                        if enable_pltr_fitness:
-                            for place in tokens_added.keys():
-                                if place in place_fitness:
-                                    place_fitness[place]["underfed_traces"].add(trace)
-                                place_fitness[place]["m"] += tokens_added[place]
-                            if trace not in transition_fitness[t]["underfed_traces"]:
-                                transition_fitness[t]["underfed_traces"][trace] = list()
-                            transition_fitness[t]["underfed_traces"][trace].append(current_event_map)
-                    elif enable_pltr_fitness:
-                        if trace not in transition_fitness[t]["fit_traces"]:
-                            transition_fitness[t]["fit_traces"][trace] = list()
-                        transition_fitness[t]["fit_traces"][trace].append(current_event_map)
-                    c, cmap = get_consumed_tokens(t)
-                    p, pmap = get_produced_tokens(t)
-                    consumed = consumed + c
-                    produced = produced + p
-                    if enable_pltr_fitness:
-                        for pl2 in cmap:
-                            if pl2 in place_fitness:
-                                place_fitness[pl2]["c"] += cmap[pl2] * trace_occurrences
-                        for pl2 in pmap:
-                            if pl2 in place_fitness:
-                                place_fitness[pl2]["p"] += pmap[pl2] * trace_occurrences
-                    if semantics.is_enabled(t, net, marking):
-                        marking = semantics.execute(t, net, marking)
-                        act_trans.append(t)
-                        vis_mark.append(marking)
-                    if not is_initially_enabled and cleaning_token_flood:
-                        # here, a routine for cleaning token flood shall go
-                        new_marking_names = [x.name for x in list(marking.keys())]
-                        new_marking_names_diff = [x for x in new_marking_names if x not in old_marking_names]
-                        new_marking_names_inte = [x for x in new_marking_names if x in old_marking_names]
-                        for p1 in new_marking_names_inte:
-                            for p2 in new_marking_names_diff:
-                                for comp in s_components:
-                                    if p1 in comp and p2 in comp:
-                                        place_to_delete = [place for place in list(marking.keys()) if place.name == p1]
-                                        if len(place_to_delete) == 1:
-                                            del marking[place_to_delete[0]]
-                                            if not place_to_delete[0] in current_remaining_map:
-                                                current_remaining_map[place_to_delete[0]] = 0
-                                            current_remaining_map[place_to_delete[0]] = current_remaining_map[
-                                                                                            place_to_delete[0]] + 1
-                        pass
-                else:
-                    if not trace[i][activity_key] in notexisting_activities_in_model:
-                        notexisting_activities_in_model[trace[i][activity_key]] = {}
-                    notexisting_activities_in_model[trace[i][activity_key]][trace] = current_event_map
-            del trace_activities[0]
-            if len(trace_activities) < TechnicalParameters.MAX_POSTFIX_SUFFIX_LENGTH.value:
-                activating_transition_index[str(trace_activities)] = {"index": len(act_trans),
-                                                                      "marking": hash(marking)}
-            if i > 0:
-                activating_transition_interval.append(
-                    [trace[i][activity_key], prev_len_activated_transitions, len(act_trans),
-                     trace[i - 1][activity_key]])
-            else:
-                activating_transition_interval.append(
-                    [trace[i][activity_key], prev_len_activated_transitions, len(act_trans),
-                     ""])
+            t = trans_map[event[activity_key]]
+        if walk_through_hidden_trans and not semantics.is_enabled(t, net,
+                                                                  marking):
+            visited_transitions = set()
+            [net, new_marking, new_act_trans, new_vis_mark] = apply_hidden_trans(t, net,
+                                                                                 copy(marking),
+                                                                                 places_shortest_path_by_hidden,
+                                                                                 copy(act_trans),
+                                                                                 0,
+                                                                                 copy(visited_transitions),
+                                                                                 copy(vis_mark))
+            for jj5 in range(len(act_trans), len(new_act_trans)):
+                tt5 = new_act_trans[jj5]
+                c, cmap = get_consumed_tokens(tt5)
+                p, pmap = get_produced_tokens(tt5)
+                if enable_pltr_fitness:
+                    for pl2 in cmap:
+                        if pl2 in place_fitness:
+                            place_fitness[pl2]["c"] += cmap[pl2] * trace_occurrences
+                    for pl2 in pmap:
+                        if pl2 in place_fitness:
+                            place_fitness[pl2]["p"] += pmap[pl2] * trace_occurrences
+                consumed = consumed + c
+                produced = produced + p
+            marking, act_trans, vis_mark = new_marking, new_act_trans, new_vis_mark
+        is_initially_enabled = True
+        old_marking_names = [x.name for x in list(marking.keys())]
+        if not semantics.is_enabled(t, net, marking):
+            is_initially_enabled = False
+            transitions_with_problems.append(t)
+            if stop_immediately_unfit:
+                missing = missing + 1
+                return [marking, act_trans, vis_mark, missing, consumed, produced, True]
+            [m, tokens_added] = add_missing_tokens(t, marking)
+            missing = missing + m
+            if enable_pltr_fitness:
+                for place in tokens_added.keys():
+                    if place in place_fitness:
+                        place_fitness[place]["underfed_traces"].add(trace)
+                    place_fitness[place]["m"] += tokens_added[place]
+                if trace not in transition_fitness[t]["underfed_traces"]:
+                    transition_fitness[t]["underfed_traces"][trace] = list()
+                transition_fitness[t]["underfed_traces"][trace].append(current_event_map)
+        elif enable_pltr_fitness:
+            if trace not in transition_fitness[t]["fit_traces"]:
+                transition_fitness[t]["fit_traces"][trace] = list()
+            transition_fitness[t]["fit_traces"][trace].append(current_event_map)
+        c, cmap = get_consumed_tokens(t)
+        p, pmap = get_produced_tokens(t)
+        consumed = consumed + c
+        produced = produced + p
+        if enable_pltr_fitness:
+            for pl2 in cmap:
+                if pl2 in place_fitness:
+                    place_fitness[pl2]["c"] += cmap[pl2] * trace_occurrences
+            for pl2 in pmap:
+                if pl2 in place_fitness:
+                    place_fitness[pl2]["p"] += pmap[pl2] * trace_occurrences
+        if semantics.is_enabled(t, net, marking):
+            marking = semantics.execute(t, net, marking)
+            act_trans.append(t)
+            vis_mark.append(marking)
+        if not is_initially_enabled and cleaning_token_flood:
+            # here, a routine for cleaning token flood shall go
+            new_marking_names = [x.name for x in list(marking.keys())]
+            new_marking_names_diff = [x for x in new_marking_names if x not in old_marking_names]
+            new_marking_names_inte = [x for x in new_marking_names if x in old_marking_names]
+            for p1 in new_marking_names_inte:
+                for p2 in new_marking_names_diff:
+                    for comp in s_components:
+                        if p1 in comp and p2 in comp:
+                            place_to_delete = [place for place in list(marking.keys()) if place.name == p1]
+                            if len(place_to_delete) == 1:
+                                del marking[place_to_delete[0]]
+                                if not place_to_delete[0] in current_remaining_map:
+                                    current_remaining_map[place_to_delete[0]] = 0
+                                current_remaining_map[place_to_delete[0]] = current_remaining_map[
+                                                                                place_to_delete[0]] + 1
+            pass
+    else:
+        if not event[activity_key] in notexisting_activities_in_model:
+            notexisting_activities_in_model[event[activity_key]] = {}
+        notexisting_activities_in_model[event[activity_key]][trace] = current_event_map
+
+    return [marking, act_trans, vis_mark, missing, consumed, produced, False]
+
+
+def complete_replay(trace, net, initial_marking, final_marking, marking, act_trans, vis_mark, missing, consumed,
+                    produced, enable_pltr_fitness, place_fitness, notexisting_activities_in_model,
+                    places_shortest_path_by_hidden, consider_remaining_in_fitness, current_remaining_map,
+                    try_to_reach_final_marking_through_hidden=True, trace_occurrences=1,
+                    consider_activities_not_in_model_in_fitness=False):
+    """
+    Completes the replay of a trace after its last event: tries to reach the final marking through hidden
+    transitions, and computes the remaining tokens and the fitness of the trace
+
+    Parameters
+    ----------
+    trace
+        Trace in the event log
+    net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+    marking
+        Marking reached after the last event (it is modified)
+    act_trans
+        Activated transitions (the fired hidden transitions are appended)
+    vis_mark
+        Visited markings (the visited markings are appended)
+    missing
+        Number of missing tokens
+    consumed
+        Number of consumed tokens
+    produced
+        Number of produced tokens
+    enable_pltr_fitness
+        Enable fitness retrieval at place/transition level
+    place_fitness
+        Current dictionary of places associated with unfit traces
+    notexisting_activities_in_model
+        Map that stores the notexisting activities in the model
+    places_shortest_path_by_hidden
+        Shortest paths between places by hidden transitions
+    consider_remaining_in_fitness
+        Boolean value telling if the remaining tokens should be considered in fitness evaluation
+    current_remaining_map
+        Remaining tokens removed by the cleaning of the token flood
+    try_to_reach_final_marking_through_hidden
+        Boolean value that decides if we shall try to reach the final marking through hidden transitions
+    trace_occurrences
+        Trace weight (number of occurrences)
+    consider_activities_not_in_model_in_fitness
+        Boolean value telling if the activities not in the model make the trace unfit
 
-    if try_to_reach_final_marking_through_hidden and not used_postfix_cache:
+    Returns
+    ----------
+    is_fit
+        Boolean value telling if the trace is fit
+    trace_fitness
+        Fitness of the trace
+    marking
+        Reached marking, without the tokens of the final marking
+    marking_before_cleaning
+        Reached marking
+    missing
+        Number of missing tokens
+    consumed
+        Number of consumed tokens
+    remaining
+        Number of remaining tokens
+    produced
+        Number of produced tokens
+    """
+    if try_to_reach_final_marking_through_hidden:
         for i in range(TechnicalParameters.MAX_IT_FINAL1.value):
             if not break_condition_final_marking(marking, final_marking):
                 hidden_transitions_to_enable = get_req_transitions_for_final_marking(marking, final_marking,
@@ -714,6 +745,157 @@ def apply_trace(trace, net, initial_marking, final_marking, trans_map, enable_pl
     else:
         trace_fitness = 1.0
 
+
+    return [is_fit, trace_fitness, marking, marking_before_cleaning, missing, consumed, remaining, produced]
+
+
+def apply_trace(trace, net, initial_marking, final_marking, trans_map, enable_pltr_fitness, place_fitness,
+                transition_fitness, notexisting_activities_in_model,
+                places_shortest_path_by_hidden, consider_remaining_in_fitness, activity_key="concept:name",
+                try_to_reach_final_marking_through_hidden=True, stop_immediately_unfit=False,
+                walk_through_hidden_trans=True, post_fix_caching=None,
+                marking_to_activity_caching=None, is_reduction=False,
+                thread_maximum_ex_time=TechnicalParameters.MAX_DEF_THR_EX_TIME.value,
+                enable_postfix_cache=False, enable_marktoact_cache=False, cleaning_token_flood=False,
+                s_components=None, trace_occurrences=1, consider_activities_not_in_model_in_fitness=False):
+    """
+    Apply the token replaying algorithm to a trace
+
+    Parameters
+    ----------
+    trace
+        Trace in the event log
+    net
+        Petri net
+    initial_marking
+        Initial marking
+    final_marking
+        Final marking
+    trans_map
+        Map between transitions labels and transitions
+    enable_pltr_fitness
+        Enable fitness retrieval at place/transition level
+    place_fitness
+        Current dictionary of places associated with unfit traces
+    transition_fitness
+        Current dictionary of transitions associated with unfit traces
+    notexisting_activities_in_model
+        Map that stores the notexisting activities in the model
+    places_shortest_path_by_hidden
+        Shortest paths between places by hidden transitions
+    consider_remaining_in_fitness
+        Boolean value telling if the remaining tokens should be considered in fitness evaluation
+    activity_key
+        Name of the attribute that contains the activity
+    try_to_reach_final_marking_through_hidden
+        Boolean value that decides if we shall try to reach the final marking through hidden transitions
+    stop_immediately_unfit
+        Boolean value that decides if we shall stop immediately when a non-conformance is detected
+    walk_through_hidden_trans
+        Boolean value that decides if we shall walk through hidden transitions in order to enable visible transitions
+    post_fix_caching
+        Stores the post fix caching object
+    marking_to_activity_caching
+        Stores the marking-to-activity cache
+    is_reduction
+        Expresses if the token-based replay is called in a reduction attempt
+    thread_maximum_ex_time
+        Alignment threads maximum allowed execution time
+    enable_postfix_cache
+        Enables postfix cache
+    enable_marktoact_cache
+        Enables marking to activity cache
+    cleaning_token_flood
+        Decides if a cleaning of the token flood shall be operated
+    s_components
+        S-components of the Petri net (if workflow net)
+    """
+    trace_activities = [event[activity_key] for event in trace]
+    act_trans = []
+    transitions_with_problems = []
+    vis_mark = []
+    activating_transition_index = {}
+    activating_transition_interval = []
+    used_postfix_cache = False
+    marking = copy(initial_marking)
+    vis_mark.append(marking)
+    missing = 0
+    consumed = 0
+    sum_tokens_im = 0
+    for place in initial_marking:
+        sum_tokens_im = sum_tokens_im + initial_marking[place]
+    sum_tokens_fm = 0
+    for place in final_marking:
+        sum_tokens_fm = sum_tokens_fm + final_marking[place]
+    produced = sum_tokens_im
+    current_event_map = {}
+    current_remaining_map = {}
+    for i in range(len(trace)):
+        if enable_postfix_cache and (str(trace_activities) in post_fix_caching.cache and
+                                     hash(marking) in post_fix_caching.cache[str(trace_activities)]):
+            trans_to_act = post_fix_caching.cache[str(trace_activities)][hash(marking)]["trans_to_activate"]
+            for z in range(len(trans_to_act)):
+                t = trans_to_act[z]
+                act_trans.append(t)
+            used_postfix_cache = True
+            marking = post_fix_caching.cache[str(trace_activities)][hash(marking)]["final_marking"]
+            break
+        else:
+            prev_len_activated_transitions = len(act_trans)
+            if enable_marktoact_cache and (hash(marking) in marking_to_activity_caching.cache and
+                                           trace[i][activity_key] in marking_to_activity_caching.cache[hash(marking)]
+                                           and trace[i - 1][activity_key] ==
+                                           marking_to_activity_caching.cache[hash(marking)][trace[i][activity_key]]
+                                           ["previousActivity"]):
+                this_end_marking = marking_to_activity_caching.cache[hash(marking)][trace[i][activity_key]][
+                    "end_marking"]
+                this_act_trans = marking_to_activity_caching.cache[hash(marking)][trace[i][activity_key]][
+                    "this_activated_transitions"]
+                this_vis_markings = marking_to_activity_caching.cache[hash(marking)][trace[i][activity_key]][
+                    "this_visited_markings"]
+                act_trans = act_trans + this_act_trans
+                vis_mark = vis_mark + this_vis_markings
+                marking = copy(this_end_marking)
+            else:
+                [marking, act_trans, vis_mark, m, c, p, stop] = replay_event(trace, trace[i], net, marking, act_trans,
+                                                                            vis_mark, transitions_with_problems,
+                                                                            trans_map, enable_pltr_fitness,
+                                                                            place_fitness, transition_fitness,
+                                                                            notexisting_activities_in_model,
+                                                                            places_shortest_path_by_hidden,
+                                                                            current_event_map, current_remaining_map,
+                                                                            activity_key=activity_key,
+                                                                            stop_immediately_unfit=stop_immediately_unfit,
+                                                                            walk_through_hidden_trans=walk_through_hidden_trans,
+                                                                            cleaning_token_flood=cleaning_token_flood,
+                                                                            s_components=s_components,
+                                                                            trace_occurrences=trace_occurrences)
+                missing = missing + m
+                consumed = consumed + c
+                produced = produced + p
+                if stop:
+                    break
+            del trace_activities[0]
+            if len(trace_activities) < TechnicalParameters.MAX_POSTFIX_SUFFIX_LENGTH.value:
+                activating_transition_index[str(trace_activities)] = {"index": len(act_trans),
+                                                                      "marking": hash(marking)}
+            if i > 0:
+                activating_transition_interval.append(
+                    [trace[i][activity_key], prev_len_activated_transitions, len(act_trans),
+                     trace[i - 1][activity_key]])
+            else:
+                activating_transition_interval.append(
+                    [trace[i][activity_key], prev_len_activated_transitions, len(act_trans),
+                     ""])
+
+    [is_fit, trace_fitness, marking, marking_before_cleaning, missing, consumed, remaining, produced] = \
+        complete_replay(trace, net, initial_marking, final_marking, marking, act_trans, vis_mark, missing, consumed,
+                        produced, enable_pltr_fitness, place_fitness, notexisting_activities_in_model,
+                        places_shortest_path_by_hidden, consider_remaining_in_fitness, current_remaining_map,
+                        try_to_reach_final_marking_through_hidden=try_to_reach_final_marking_through_hidden and not used_postfix_cache,
+                        trace_occurrences=trace_occurrences,
+                        consider_activities_not_in_model_in_fitness=consider_activities_not_in_model_in_fitness)
+
     if is_fit:
         for suffix in activating_transition_index:
             if suffix not in post_fix_caching.cache:
@@ -758,7 +940,8 @@ class ApplyTraceTokenReplay:
                  walk_through_hidden_trans=True, post_fix_caching=None,
                  marking_to_activity_caching=None, is_reduction=False,
                  thread_maximum_ex_time=TechnicalParameters.MAX_DEF_THR_EX_TIME.value,
-                 cleaning_token_flood=False, s_components=None, trace_occurrences=1, consider_activities_not_in_model_in_fitness=False):
+                 cleaning_token_flood=False, s_components=None, trace_occurrences=1, consider_activities_not_in_model_in_fitness=False,
+                 prefix_trie_replay=None):
         """
         Constructor
 
@@ -805,6 +988,8 @@ class ApplyTraceTokenReplay:
             S-components of the Petri net
         trace_occurrences
             Trace weight (number of occurrences)
+        prefix_trie_replay
+            (if provided) PrefixTrieReplay object, replaying the trace from the deepest prefix already replayed
         """
         self.thread_is_alive = True
         self.trace = trace
@@ -845,11 +1030,17 @@ class ApplyTraceTokenReplay:
         self.produced = None
         self.s_components = s_components
         self.trace_occurrences = trace_occurrences
+        self.prefix_trie_replay = prefix_trie_replay
 
     def run(self):
         """
         Runs the thread and stores the results
         """
+        if self.prefix_trie_replay is not None:
+            self.t_fit, self.t_value, self.act_trans, self.trans_probl, self.reached_marking, self.enabled_trans_in_mark, self.missing, self.consumed, self.remaining, self.produced = \
+                self.prefix_trie_replay.replay(self.trace, trace_occurrences=self.trace_occurrences)
+            self.thread_is_alive = False
+            return
         self.t_fit, self.t_value, self.act_trans, self.trans_probl, self.reached_marking, self.enabled_trans_in_mark, self.missing, self.consumed, self.remaining, self.produced = \
             apply_trace(self.trace, self.net, self.initial_marking, self.final_marking, self.trans_map,
                         self.enable_pltr_fitness, self.place_fitness, self.transition_fitness,
@@ -872,6 +1063,278 @@ class ApplyTraceTokenReplay:
         self.thread_is_alive = False
 
 
+class _PlaceFitnessRecorder(dict):
+    """
+    Records the place-level statistics of the replay of a prefix (for a placeholder trace with a single occurrence),
+    creating the entries of the places only when they are touched
+    """
+
+    def __init__(self, places):
+        dict.__init__(self)
+        self.places = places
+
+    def __contains__(self, place):
+        return place in self.places
+
+    def __missing__(self, place):
+        self[place] = {"underfed_traces": set(), "overfed_traces": set(), "m": 0, "r": 0, "c": 0, "p": 0}
+        return dict.__getitem__(self, place)
+
+
+class _TransitionFitnessRecorder(dict):
+    """
+    Records the transition-level statistics of the replay of a prefix (for a placeholder trace)
+    """
+
+    def __missing__(self, transition):
+        self[transition] = {"underfed_traces": {}, "fit_traces": {}}
+        return dict.__getitem__(self, transition)
+
+
+class _PrefixNodeState:
+    """
+    State of the replay after a node of the prefix trie
+    """
+
+    def __init__(self, marking, missing, consumed, produced, current_remaining_map, act_trans=None,
+                 transitions_with_problems=None, place_fitness=None, transition_fitness=None,
+                 notexisting_activities=None, in_model=False, stopped=False):
+        self.marking = marking
+        self.missing = missing
+        self.consumed = consumed
+        self.produced = produced
+        self.current_remaining_map = current_remaining_map
+        # transitions fired/problematic while replaying the event of the node (not the entire prefix)
+        self.act_trans = act_trans if act_trans is not None else []
+        self.transitions_with_problems = transitions_with_problems if transitions_with_problems is not None else []
+        # statistics recorded while replaying the event of the node
+        self.place_fitness = place_fitness
+        self.transition_fitness = transition_fitness
+        self.notexisting_activities = notexisting_activities
+        self.in_model = in_model
+        self.stopped = stopped
+
+
+class PrefixTrieReplay:
+    """
+    Token-based replay of the variants of a log along a prefix trie.
+
+    The trie is built while the variants are replayed: after every node, the reached marking, the counters
+    (missing, consumed, produced tokens), the fired transitions and the statistics at the place/transition level
+    are stored. A variant starts its replay from the deepest node of its prefix that is already in the trie,
+    so every distinct prefix is replayed only once. The completion of the replay (reaching the final marking,
+    computing the remaining tokens and the fitness) is done for every variant.
+    """
+
+    def __init__(self, net, initial_marking, final_marking, trans_map, enable_pltr_fitness, place_fitness,
+                 transition_fitness, notexisting_activities_in_model, places_shortest_path_by_hidden,
+                 consider_remaining_in_fitness, activity_key="concept:name", reach_mark_through_hidden=True,
+                 stop_immediately_when_unfit=False, walk_through_hidden_trans=True, cleaning_token_flood=False,
+                 s_components=None, consider_activities_not_in_model_in_fitness=False):
+        """
+        Constructor (the parameters are the same as ApplyTraceTokenReplay)
+        """
+        self.net = net
+        self.initial_marking = initial_marking
+        self.final_marking = final_marking
+        self.trans_map = trans_map
+        self.enable_pltr_fitness = enable_pltr_fitness
+        self.place_fitness = place_fitness
+        self.transition_fitness = transition_fitness
+        self.notexisting_activities_in_model = notexisting_activities_in_model
+        self.places_shortest_path_by_hidden = places_shortest_path_by_hidden
+        self.consider_remaining_in_fitness = consider_remaining_in_fitness
+        self.activity_key = activity_key
+        self.try_to_reach_final_marking_through_hidden = reach_mark_through_hidden
+        self.stop_immediately_when_unfit = stop_immediately_when_unfit
+        self.walk_through_hidden_trans = walk_through_hidden_trans
+        self.cleaning_token_flood = cleaning_token_flood
+        self.s_components = s_components
+        self.consider_activities_not_in_model_in_fitness = consider_activities_not_in_model_in_fitness
+        # placeholder for the trace in the statistics recorded while replaying the prefixes
+        self.placeholder_trace = log_implementation.Trace()
+
+        sum_tokens_im = 0
+        for place in initial_marking:
+            sum_tokens_im = sum_tokens_im + initial_marking[place]
+
+        # visible transitions eventually enabled by the reached markings
+        self.enabled_visible_cache = {}
+
+        self.root = Trie()
+        self.states = {self.root: _PrefixNodeState(copy(initial_marking), 0, 0, sum_tokens_im, {})}
+        self.children = {self.root: {}}
+
+    def __replay_node(self, parent, trace, index):
+        """
+        Replays the event at the given index of the trace, starting from the state of the parent node
+        """
+        parent_state = self.states[parent]
+        event = trace[index]
+        activity = event[self.activity_key]
+
+        state = _PrefixNodeState(copy(parent_state.marking), parent_state.missing, parent_state.consumed,
+                                 parent_state.produced, copy(parent_state.current_remaining_map),
+                                 in_model=activity in self.trans_map)
+        if self.enable_pltr_fitness:
+            state.place_fitness = _PlaceFitnessRecorder(self.place_fitness)
+            state.transition_fitness = _TransitionFitnessRecorder()
+        state.notexisting_activities = {}
+
+        [state.marking, state.act_trans, _, m, c, p, state.stopped] = replay_event(
+            self.placeholder_trace, event, self.net, state.marking, state.act_trans, [],
+            state.transitions_with_problems, self.trans_map, self.enable_pltr_fitness, state.place_fitness,
+            state.transition_fitness, state.notexisting_activities, self.places_shortest_path_by_hidden, {},
+            state.current_remaining_map, activity_key=self.activity_key,
+            stop_immediately_unfit=self.stop_immediately_when_unfit,
+            walk_through_hidden_trans=self.walk_through_hidden_trans, cleaning_token_flood=self.cleaning_token_flood,
+            s_components=self.s_components, trace_occurrences=1)
+        state.missing += m
+        state.consumed += c
+        state.produced += p
+
+        node = Trie(label=activity, parent=parent, depth=parent.depth + 1)
+        parent.children.append(node)
+        self.children[parent][activity] = node
+        self.children[node] = {}
+        self.states[node] = state
+        return node
+
+    def __walk(self, trace):
+        """
+        Walks the trie along the trace (replaying the events of the nodes that are not in the trie), until the
+        end of the trace or a node where the replay stops
+
+        Returns
+        ------------
+        path
+            Nodes of the trie visited for the events of the trace
+        """
+        node = self.root
+        path = []
+        for i in range(len(trace)):
+            if self.states[node].stopped:
+                break
+            activity = trace[i][self.activity_key]
+            child = self.children[node].get(activity)
+            if child is None:
+                child = self.__replay_node(node, trace, i)
+            node = child
+            path.append(node)
+        return path
+
+    def __apply_statistics(self, path, trace, trace_occurrences):
+        """
+        Applies the statistics recorded along the path of the trie to the given trace
+        """
+        # the events of the trace share the same map of attributes (as in apply_trace)
+        current_event_map = {}
+        for node in path:
+            if self.states[node].in_model:
+                current_event_map.update(trace[node.depth - 1])
+        for node in path:
+            state = self.states[node]
+            for activity in state.notexisting_activities:
+                if activity not in self.notexisting_activities_in_model:
+                    self.notexisting_activities_in_model[activity] = {}
+                self.notexisting_activities_in_model[activity][trace] = current_event_map
+            if self.enable_pltr_fitness:
+                for place, values in state.place_fitness.items():
+                    if values["underfed_traces"]:
+                        self.place_fitness[place]["underfed_traces"].add(trace)
+                    self.place_fitness[place]["m"] += values["m"]
+                    self.place_fitness[place]["c"] += values["c"] * trace_occurrences
+                    self.place_fitness[place]["p"] += values["p"] * trace_occurrences
+                for t, values in state.transition_fitness.items():
+                    for key in ("underfed_traces", "fit_traces"):
+                        for records in values[key].values():
+                            if trace not in self.transition_fitness[t][key]:
+                                self.transition_fitness[t][key][trace] = list()
+                            self.transition_fitness[t][key][trace] += [current_event_map] * len(records)
+
+    def replay(self, trace, trace_occurrences=1):
+        """
+        Replays a trace, reusing the replay of its prefixes that are already in the trie
+
+        Parameters
+        ------------
+        trace
+            Trace
+        trace_occurrences
+            Trace weight (number of occurrences)
+
+        Returns
+        ------------
+        result
+            List containing is_fit, trace_fitness, act_trans, transitions_with_problems, reached_marking,
+            enabled_transitions_in_marking, missing, consumed, remaining, produced (as apply_trace)
+        """
+        path = self.__walk(trace)
+        node = path[-1] if path else self.root
+        if len(path) == len(trace):
+            node.final = True
+
+        self.__apply_statistics(path, trace, trace_occurrences)
+
+        state = self.states[node]
+        act_trans = []
+        transitions_with_problems = []
+        for n in path:
+            act_trans.extend(self.states[n].act_trans)
+            transitions_with_problems.extend(self.states[n].transitions_with_problems)
+
+        [is_fit, trace_fitness, marking, marking_before_cleaning, missing, consumed, remaining, produced] = \
+            complete_replay(trace, self.net, self.initial_marking, self.final_marking, copy(state.marking), act_trans,
+                            [], state.missing, state.consumed, state.produced, self.enable_pltr_fitness,
+                            self.place_fitness, self.notexisting_activities_in_model,
+                            self.places_shortest_path_by_hidden, self.consider_remaining_in_fitness,
+                            copy(state.current_remaining_map),
+                            try_to_reach_final_marking_through_hidden=self.try_to_reach_final_marking_through_hidden,
+                            trace_occurrences=trace_occurrences,
+                            consider_activities_not_in_model_in_fitness=self.consider_activities_not_in_model_in_fitness)
+
+        return [is_fit, trace_fitness, act_trans, transitions_with_problems, marking_before_cleaning,
+                self.get_enabled_visible_transitions(marking_before_cleaning), missing, consumed, remaining, produced]
+
+    def replay_prefixes(self, trace):
+        """
+        Replays the prefixes of a trace (without completing the replay, i.e., without trying to reach the
+        final marking), reusing the prefixes that are already in the trie
+
+        Parameters
+        ------------
+        trace
+            Trace
+
+        Returns
+        ------------
+        prefixes
+            List containing, for every replayed prefix (from the shortest), the node of the trie, the number of
+            missing tokens and the reached marking (if the replay stops, the longer prefixes are not included)
+        """
+        return [(node, self.states[node].missing, self.states[node].marking) for node in self.__walk(trace)]
+
+    def get_enabled_visible_transitions(self, marking):
+        """
+        Gets the visible transitions eventually enabled by a marking (cached on the marking)
+
+        Parameters
+        ------------
+        marking
+            Marking
+
+        Returns
+        ------------
+        transitions
+            Set of visible transitions
+        """
+        marking_key = frozenset(marking.items())
+        if marking_key not in self.enabled_visible_cache:
+            self.enabled_visible_cache[marking_key] = align_utils.get_visible_transitions_eventually_enabled_by_marking(
+                self.net, marking)
+        return copy(self.enabled_visible_cache[marking_key])
+
+
 class PostFixCaching:
     """
     Post fix caching object
@@ -953,12 +1416,169 @@ def transcribe_result(t, return_object_names=True):
     return corr_value
 
 
+def get_transitions_map(net):
+    """
+    Gets the map between the labels and the transitions of the Petri net (if several transitions share the
+    same label, the one with the greatest name is kept)
+
+    Parameters
+    -------------
+    net
+        Petri net
+
+    Returns
+    -------------
+    trans_map
+        Map between transitions labels and transitions
+    """
+    trans_map = {}
+    for t in sorted(list(net.transitions), key=lambda x: x.name):
+        trans_map[t.label] = t
+    return trans_map
+
+
+def get_empty_place_fitness(net):
+    """
+    Gets the (empty) place-level fitness diagnostics of the Petri net
+
+    Parameters
+    -------------
+    net
+        Petri net
+
+    Returns
+    -------------
+    place_fitness
+        Dictionary associating to every place its diagnostics
+    """
+    return {place: {"underfed_traces": set(), "overfed_traces": set(), "m": 0, "r": 0, "c": 0, "p": 0} for place in
+            net.places}
+
+
+def get_empty_transition_fitness(net):
+    """
+    Gets the (empty) transition-level fitness diagnostics of the Petri net
+
+    Parameters
+    -------------
+    net
+        Petri net
+
+    Returns
+    -------------
+    transition_fitness
+        Dictionary associating to every visible transition its diagnostics
+    """
+    return {transition: {"underfed_traces": {}, "fit_traces": {}} for transition in net.transitions if
+            transition.label}
+
+
+def replay_variants(variants_cases, log, net, initial_marking, final_marking, trans_map, enable_pltr_fitness,
+                    place_fitness, transition_fitness, notexisting_activities_in_model, places_shortest_path_by_hidden,
+                    consider_remaining_in_fitness, activity_key="concept:name", reach_mark_through_hidden=True,
+                    stop_immediately_unfit=False, walk_through_hidden_trans=True, post_fix_caching=None,
+                    marking_to_activity_caching=None, is_reduction=False,
+                    thread_maximum_ex_time=TechnicalParameters.MAX_DEF_THR_EX_TIME.value, cleaning_token_flood=False,
+                    s_components=None, consider_activities_not_in_model_in_fitness=False, replay_cases=False,
+                    return_object_names=False, use_prefix_trie=False, progress=None):
+    """
+    Replays a list of variants (or, if requested, every case of the variants separately) on the Petri net
+
+    Parameters
+    -------------
+    variants_cases
+        List of couples (variant, positions of the cases of the variant)
+    log
+        Object permitting to access the cases by position (used only when the cases are replayed separately)
+    replay_cases
+        Replays every case separately (instead of replaying one trace per variant)
+    progress
+        (if provided) progress bar that is updated after every variant/case
+    (the other parameters are the same as apply_log and ApplyTraceTokenReplay)
+
+    Returns
+    -------------
+    results
+        Dictionary associating to the position of every case the outcome of its replay
+    """
+    prefix_trie_replay = None
+    if use_prefix_trie and not is_reduction and not replay_cases:
+        prefix_trie_replay = PrefixTrieReplay(net, initial_marking, final_marking, trans_map, enable_pltr_fitness,
+                                              place_fitness, transition_fitness,
+                                              notexisting_activities_in_model, places_shortest_path_by_hidden,
+                                              consider_remaining_in_fitness, activity_key=activity_key,
+                                              reach_mark_through_hidden=reach_mark_through_hidden,
+                                              stop_immediately_when_unfit=stop_immediately_unfit,
+                                              walk_through_hidden_trans=walk_through_hidden_trans,
+                                              cleaning_token_flood=cleaning_token_flood, s_components=s_components,
+                                              consider_activities_not_in_model_in_fitness=consider_activities_not_in_model_in_fitness)
+
+    threads_results = {}
+
+    for variant, all_cases in variants_cases:
+        if replay_cases:
+            for case_position in all_cases:
+                considered_case = log[case_position]
+                t = ApplyTraceTokenReplay(considered_case, net, initial_marking, final_marking,
+                                          trans_map, enable_pltr_fitness, place_fitness,
+                                          transition_fitness,
+                                          notexisting_activities_in_model,
+                                          places_shortest_path_by_hidden,
+                                          consider_remaining_in_fitness,
+                                          activity_key=activity_key,
+                                          reach_mark_through_hidden=reach_mark_through_hidden,
+                                          stop_immediately_when_unfit=stop_immediately_unfit,
+                                          walk_through_hidden_trans=walk_through_hidden_trans,
+                                          post_fix_caching=post_fix_caching,
+                                          marking_to_activity_caching=marking_to_activity_caching,
+                                          is_reduction=is_reduction,
+                                          thread_maximum_ex_time=thread_maximum_ex_time,
+                                          cleaning_token_flood=cleaning_token_flood,
+                                          s_components=s_components, trace_occurrences=1,
+                                          consider_activities_not_in_model_in_fitness=consider_activities_not_in_model_in_fitness)
+                t.run()
+                threads_results[case_position] = transcribe_result(t, return_object_names=return_object_names)
+                if progress is not None:
+                    progress.update()
+        else:
+            considered_case = variants_util.variant_to_trace(variant, parameters={constants.PARAMETER_CONSTANT_ACTIVITY_KEY: activity_key})
+            t = ApplyTraceTokenReplay(considered_case, net, initial_marking, final_marking,
+                                      trans_map, enable_pltr_fitness, place_fitness,
+                                      transition_fitness,
+                                      notexisting_activities_in_model,
+                                      places_shortest_path_by_hidden,
+                                      consider_remaining_in_fitness,
+                                      activity_key=activity_key,
+                                      reach_mark_through_hidden=reach_mark_through_hidden,
+                                      stop_immediately_when_unfit=stop_immediately_unfit,
+                                      walk_through_hidden_trans=walk_through_hidden_trans,
+                                      post_fix_caching=post_fix_caching,
+                                      marking_to_activity_caching=marking_to_activity_caching,
+                                      is_reduction=is_reduction,
+                                      thread_maximum_ex_time=thread_maximum_ex_time,
+                                      cleaning_token_flood=cleaning_token_flood,
+                                      s_components=s_components, trace_occurrences=len(all_cases),
+                                      consider_activities_not_in_model_in_fitness=consider_activities_not_in_model_in_fitness,
+                                      prefix_trie_replay=prefix_trie_replay)
+            t.run()
+
+            result = transcribe_result(t, return_object_names=return_object_names)
+            for case_position in all_cases:
+                threads_results[case_position] = result
+
+            if progress is not None:
+                progress.update()
+
+    return threads_results
+
+
 def apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=False, consider_remaining_in_fitness=False,
               activity_key="concept:name", reach_mark_through_hidden=True, stop_immediately_unfit=False,
               walk_through_hidden_trans=True, places_shortest_path_by_hidden=None,
               is_reduction=False, thread_maximum_ex_time=TechnicalParameters.MAX_DEF_THR_EX_TIME.value,
               cleaning_token_flood=False, disable_variants=False, return_object_names=False, show_progress_bar=True,
-              consider_activities_not_in_model_in_fitness=False, case_id_key=constants.CASE_CONCEPT_NAME):
+              consider_activities_not_in_model_in_fitness=False, case_id_key=constants.CASE_CONCEPT_NAME,
+              use_prefix_trie=False, multiprocessing=False, cores=None, chunk_size=None, worker_pool=None):
     """
     Apply token-based replay to a log
 
@@ -996,10 +1616,27 @@ def apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=Fals
         Disable variants grouping
     return_object_names
         Decides whether names instead of object pointers shall be returned
+    use_prefix_trie
+        Replays the variants along a prefix trie, so every distinct prefix is replayed only once
+        (not applied when the variants are disabled or in a reduction attempt)
+    multiprocessing
+        Distributes the variants (or the cases, when the variants are disabled) among a pool of worker processes
+    cores
+        Number of worker processes (default: the number of CPUs minus two)
+    chunk_size
+        Number of variants (or cases) sent to a worker in a single task
+    worker_pool
+        (optional) an already started TokenReplayWorkerPool on the same Petri net, which is reused
+        (and not closed) by the method
     """
+    if worker_pool is not None and worker_pool.net is not net:
+        raise Exception("the provided worker pool has been started on a different Petri net!")
+
+    use_worker_pool = worker_pool is not None or multiprocessing
+
     post_fix_cache = PostFixCaching()
     marking_to_activity_cache = MarkingToActivityCaching()
-    if places_shortest_path_by_hidden is None:
+    if places_shortest_path_by_hidden is None and worker_pool is None:
         places_shortest_path_by_hidden = get_places_shortest_path_by_hidden(net,
                                                                             TechnicalParameters.MAX_REC_DEPTH.value)
 
@@ -1009,16 +1646,12 @@ def apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=Fals
     aligned_traces = []
 
     if enable_pltr_fitness:
-        for place in net.places:
-            place_fitness_per_trace[place] = {"underfed_traces": set(), "overfed_traces": set(), "m": 0, "r": 0, "c": 0,
-                                              "p": 0}
-        for transition in net.transitions:
-            if transition.label:
-                transition_fitness_per_trace[transition] = {"underfed_traces": {}, "fit_traces": {}}
+        place_fitness_per_trace = get_empty_place_fitness(net)
+        transition_fitness_per_trace = get_empty_transition_fitness(net)
 
     s_components = []
 
-    if cleaning_token_flood:
+    if cleaning_token_flood and not use_worker_pool:
         s_components = get_s_components_from_petri(net, initial_marking, final_marking)
 
     notexisting_activities_in_model = {}
@@ -1027,13 +1660,14 @@ def apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=Fals
     # transitions are now fired as follows:
     # - (from a previous update on 14/10/2020) it is checked if in the current market any transition having as label the current activity is enabled. If that's true, then the given transition is fired
     # - otherwise, if there are no corresponding transitions enabled in the current marking, the TBR tries to enable with invisibles always the same transition (removing undeterminism)
-    trans_map = {}
-    for t in sorted(list(net.transitions), key=lambda x: x.name):
-        trans_map[t.label] = t
+    trans_map = get_transitions_map(net)
 
     if pandas_utils.check_is_pandas_dataframe(log):
-        traces = [(tuple(x), y) for y, x in log.groupby(case_id_key)[activity_key].agg(list).to_dict().items()]
-        traces = [(traces[i][0], i) for i in range(len(traces))]
+        variant_index = pandas_numpy_variants.get_variant_index(log, parameters={
+            pandas_numpy_variants.Parameters.CASE_ID_KEY: case_id_key,
+            pandas_numpy_variants.Parameters.ACTIVITY_KEY: activity_key})
+        all_variants = variant_index.get_variants()
+        traces = [(all_variants[v], i) for i, v in enumerate(variant_index.case_variant.tolist())]
     else:
         traces = [(tuple(x[activity_key] for x in log[i]), i) for i in range(len(log))]
 
@@ -1048,75 +1682,51 @@ def apply_log(log, net, initial_marking, final_marking, enable_pltr_fitness=Fals
     vc = [(k, v) for k, v in variants.items()]
     vc = list(sorted(vc, key=lambda x: (len(x[1]), x[0]), reverse=True))
 
-    threads_results = {}
+    replay_cases = disable_variants and not pandas_utils.check_is_pandas_dataframe(log)
 
     progress = None
 
     if importlib.util.find_spec("tqdm") and show_progress_bar and len(variants) > 1:
         from tqdm.auto import tqdm
 
-        if disable_variants and not pandas_utils.check_is_pandas_dataframe(log):
+        if replay_cases:
             progress = tqdm(total=len(traces), desc="replaying log with TBR, completed traces :: ")
         else:
             progress = tqdm(total=len(variants), desc="replaying log with TBR, completed traces :: ")
 
-    for i in range(len(vc)):
-        variant = vc[i][0]
-        all_cases = vc[i][1]
-
-        if disable_variants and not pandas_utils.check_is_pandas_dataframe(log):
-            for j in range(len(all_cases)):
-                case_position = all_cases[j]
-                considered_case = log[case_position]
-                t = ApplyTraceTokenReplay(considered_case, net, initial_marking, final_marking,
-                                          trans_map, enable_pltr_fitness, place_fitness_per_trace,
-                                          transition_fitness_per_trace,
-                                          notexisting_activities_in_model,
-                                          places_shortest_path_by_hidden,
-                                          consider_remaining_in_fitness,
-                                          activity_key=activity_key,
-                                          reach_mark_through_hidden=reach_mark_through_hidden,
-                                          stop_immediately_when_unfit=stop_immediately_unfit,
-                                          walk_through_hidden_trans=walk_through_hidden_trans,
-                                          post_fix_caching=post_fix_cache,
-                                          marking_to_activity_caching=marking_to_activity_cache,
-                                          is_reduction=is_reduction,
-                                          thread_maximum_ex_time=thread_maximum_ex_time,
-                                          cleaning_token_flood=cleaning_token_flood,
-                                          s_components=s_components, trace_occurrences=1,
-                                          consider_activities_not_in_model_in_fitness=consider_activities_not_in_model_in_fitness)
-                t.run()
-                threads_results[case_position] = transcribe_result(t, return_object_names=return_object_names)
-                if progress is not None:
-                    progress.update()
+    settings = {"activity_key": activity_key, "reach_mark_through_hidden": reach_mark_through_hidden,
+                "stop_immediately_unfit": stop_immediately_unfit, "walk_through_hidden_trans": walk_through_hidden_trans,
+                "is_reduction": is_reduction, "thread_maximum_ex_time": thread_maximum_ex_time,
+                "cleaning_token_flood": cleaning_token_flood,
+                "consider_activities_not_in_model_in_fitness": consider_activities_not_in_model_in_fitness,
+                "replay_cases": replay_cases, "return_object_names": return_object_names,
+                "use_prefix_trie": use_prefix_trie}
+
+    if use_worker_pool:
+        from pm4py.algo.conformance.tokenreplay.utils.worker_pool import TokenReplayWorkerPool
+        from pm4py.algo.conformance.tokenreplay.utils.worker_pool import Parameters as WorkerPoolParameters
+
+        if worker_pool is not None:
+            threads_results = worker_pool.replay_variants(vc, log, enable_pltr_fitness, consider_remaining_in_fitness,
+                                                          place_fitness_per_trace, transition_fitness_per_trace,
+                                                          notexisting_activities_in_model, settings, progress=progress)
         else:
-            considered_case = variants_util.variant_to_trace(variant, parameters={constants.PARAMETER_CONSTANT_ACTIVITY_KEY: activity_key})
-            t = ApplyTraceTokenReplay(considered_case, net, initial_marking, final_marking,
-                                                     trans_map, enable_pltr_fitness, place_fitness_per_trace,
-                                                     transition_fitness_per_trace,
-                                                     notexisting_activities_in_model,
-                                                     places_shortest_path_by_hidden,
-                                                     consider_remaining_in_fitness,
-                                                     activity_key=activity_key,
-                                                     reach_mark_through_hidden=reach_mark_through_hidden,
-                                                     stop_immediately_when_unfit=stop_immediately_unfit,
-                                                     walk_through_hidden_trans=walk_through_hidden_trans,
-                                                     post_fix_caching=post_fix_cache,
-                                                     marking_to_activity_caching=marking_to_activity_cache,
-                                                     is_reduction=is_reduction,
-                                                     thread_maximum_ex_time=thread_maximum_ex_time,
-                                                     cleaning_token_flood=cleaning_token_flood,
-                                                     s_components=s_components, trace_occurrences=len(vc[i][1]),
-                                                     consider_activities_not_in_model_in_fitness=consider_activities_not_in_model_in_fitness)
-            t.run()
-
-            for j in range(len(all_cases)):
-                case_position = all_cases[j]
-
-                threads_results[case_position] = transcribe_result(t, return_object_names=return_object_names)
-
-            if progress is not None:
-                progress.update()
+            pool_parameters = {WorkerPoolParameters.CORES: cores,
+                               WorkerPoolParameters.CHUNK_SIZE: chunk_size,
+                               WorkerPoolParameters.PLACES_SHORTEST_PATH_BY_HIDDEN: places_shortest_path_by_hidden,
+                               WorkerPoolParameters.CLEANING_TOKEN_FLOOD: cleaning_token_flood}
+            with TokenReplayWorkerPool(net, initial_marking, final_marking,
+                                       parameters={k: v for k, v in pool_parameters.items() if v is not None}) as pool:
+                threads_results = pool.replay_variants(vc, log, enable_pltr_fitness, consider_remaining_in_fitness,
+                                                       place_fitness_per_trace, transition_fitness_per_trace,
+                                                       notexisting_activities_in_model, settings, progress=progress)
+    else:
+        threads_results = replay_variants(vc, log, net, initial_marking, final_marking, trans_map,
+                                          enable_pltr_fitness, place_fitness_per_trace, transition_fitness_per_trace,
+                                          notexisting_activities_in_model, places_shortest_path_by_hidden,
+                                          consider_remaining_in_fitness, post_fix_caching=post_fix_cache,
+                                          marking_to_activity_caching=marking_to_activity_cache,
+                                          s_components=s_components, progress=progress, **settings)
 
     for i in range(len(traces)):
         aligned_traces.append(threads_results[i])
@@ -1147,7 +1757,12 @@ def apply(log: EventLog, net: PetriNet, initial_marking: Marking, final_marking:
     final_marking
         Final marking
     parameters
-        Parameters of the algorithm
+        Parameters of the algorithm, including:
+        - Parameters.MULTIPROCESSING => distributes the replay among a pool of worker processes
+        - Parameters.CORES => number of worker processes
+        - Parameters.CHUNK_SIZE => number of variants (or cases) sent to a worker in a single task
+        - Parameters.WORKER_POOL => (optional) an already started TokenReplayWorkerPool on the same Petri net,
+        which is reused (and not closed) by the method
     """
     if parameters is None:
         parameters = {}
@@ -1173,6 +1788,12 @@ def apply(log: EventLog, net: PetriNet, initial_marking: Marking, final_marking:
 
     show_progress_bar = exec_utils.get_param_value(Parameters.SHOW_PROGRESS_BAR, parameters, constants.SHOW_PROGRESS_BAR)
     case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+    use_prefix_trie = exec_utils.get_param_value(Parameters.USE_PREFIX_TRIE, parameters, False)
+    multiprocessing = exec_utils.get_param_value(Parameters.MULTIPROCESSING, parameters,
+                                                 constants.ENABLE_MULTIPROCESSING_DEFAULT)
+    cores = exec_utils.get_param_value(Parameters.CORES, parameters, None)
+    chunk_size = exec_utils.get_param_value(Parameters.CHUNK_SIZE, parameters, None)
+    worker_pool = exec_utils.get_param_value(Parameters.WORKER_POOL, parameters, None)
 
     if type(log) is not pd.DataFrame:
         log = log_converter.apply(log, variant=log_converter.Variants.TO_EVENT_LOG, parameters=parameters)
@@ -1187,7 +1808,8 @@ def apply(log: EventLog, net: PetriNet, initial_marking: Marking, final_marking:
                      cleaning_token_flood=cleaning_token_flood, disable_variants=disable_variants,
                      return_object_names=return_names, show_progress_bar=show_progress_bar,
                      consider_activities_not_in_model_in_fitness=consider_activities_not_in_model_in_fitness,
-                     case_id_key=case_id_key)
+                     case_id_key=case_id_key, use_prefix_trie=use_prefix_trie, multiprocessing=multiprocessing,
+                     cores=cores, chunk_size=chunk_size, worker_pool=worker_pool)
 
 
 def apply_variants_list(variants_list, net, initial_marking, final_marking, parameters=None):
@@ -20,4 +20,4 @@ Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
 
-from pm4py.algo.discovery.declare import algorithm, variants
+from pm4py.algo.discovery.declare import algorithm, variants, variant_positions
@@ -22,7 +22,7 @@ Contact: info@processintelligence.solutions
 
 from pm4py.util import exec_utils
 from enum import Enum
-from pm4py.algo.discovery.declare.variants import classic
+from pm4py.algo.discovery.declare.variants import classic, vectorized
 from pm4py.objects.log.obj import EventLog
 import pandas as pd
 from typing import Union, Dict, Optional, Any
@@ -30,9 +30,13 @@ from typing import Union, Dict, Optional, Any
 
 class Variants(Enum):
     CLASSIC = classic
+    VECTORIZED = vectorized
 
 
-def apply(log: Union[EventLog, pd.DataFrame], variant=Variants.CLASSIC, parameters: Optional[Dict[Any, Any]] = None) -> Dict[str, Dict[Any, Dict[str, int]]]:
+DEFAULT_VARIANT = Variants.VECTORIZED
+
+
+def apply(log: Union[EventLog, pd.DataFrame], variant=DEFAULT_VARIANT, parameters: Optional[Dict[Any, Any]] = None) -> Dict[str, Dict[Any, Dict[str, int]]]:
     """
     Discovers a DECLARE model from the provided event log
 
@@ -43,6 +47,7 @@ def apply(log: Union[EventLog, pd.DataFrame], variant=Variants.CLASSIC, paramete
     variant
         Variant of the algorithm to be used, including:
         - Variants.CLASSIC
+        - Variants.VECTORIZED (templates evaluated on the integer-coded variants with vectorized operations)
     parameters
         Variant-specific parameters
 
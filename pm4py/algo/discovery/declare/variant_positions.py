@@ -0,0 +1,374 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from typing import Optional, Dict, Any, Union, List, Tuple, Callable
+
+import numpy as np
+import pandas as pd
+
+from pm4py.objects.log.obj import EventLog
+from pm4py.util import exec_utils, constants, xes_constants, pandas_utils
+
+
+class Parameters(Enum):
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    CONSIDERED_ACTIVITIES = "considered_activities"
+    MULTIPROCESSING = "multiprocessing"
+    CORES = "cores"
+    MAX_PAIRS_PER_CHUNK = "max_pairs_per_chunk"
+
+
+# the alternation of two activities is checked on the whole projected sequence (succession),
+# after dropping the occurrences of the second activity before the first activity (response),
+# or after dropping the occurrences before the first occurrence of the second activity that follows another one (precedence)
+STRIP_NONE = 0
+STRIP_RESPONSE = 1
+STRIP_PRECEDENCE = 2
+
+
+def _expand(starts: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Given the groups [starts[i], starts[i] + counts[i]), returns the group and the index of every element
+    """
+    groups = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.cumsum(counts) - counts
+    return groups, starts[groups] + np.arange(int(counts.sum())) - offsets[groups]
+
+
+class VariantPositions(object):
+    """
+    Integer-coded variants of a log, weighted by their number of cases, along with the positions of the activities
+    in every variant.
+
+    The occurrences of the activities are sorted by variant, activity and position; the (variant, activity) couples
+    for which the activity occurs in the variant (entries) store the number of occurrences, and the first
+    and the last position. The same structure is used for the discovery of DECLARE models
+    and for conformance checking against them.
+    """
+
+    def __init__(self, activities: List[Any], variant_offsets: np.ndarray, variant_codes: np.ndarray,
+                 weights: np.ndarray, case_variant: Optional[np.ndarray] = None):
+        """
+        Constructor
+
+        Parameters
+        ---------------
+        activities
+            List of the activities (the activity codes are positions in this list)
+        variant_offsets
+            Array such that the activity codes of the variant v are variant_codes[variant_offsets[v]:variant_offsets[v+1]]
+        variant_codes
+            Concatenation of the activity codes of the variants
+        weights
+            Number of cases of every variant
+        case_variant
+            Array associating to every case (in the order of the log) its variant
+        """
+        self.activities = list(activities)
+        self.activity_codes = {act: i for i, act in enumerate(self.activities)}
+        self.variant_offsets = np.asarray(variant_offsets, dtype=np.int64)
+        self.variant_codes = np.asarray(variant_codes, dtype=np.int64)
+        self.weights = np.asarray(weights, dtype=np.int64)
+        self.case_variant = case_variant
+
+        num_activities = max(1, len(self.activities))
+        num_variants = len(self.weights)
+        lengths = np.diff(self.variant_offsets)
+        self.lengths = lengths
+        event_variant = np.repeat(np.arange(num_variants), lengths)
+        event_position = np.arange(len(self.variant_codes)) - np.repeat(self.variant_offsets[:-1], lengths)
+
+        order = np.lexsort((event_position, self.variant_codes, event_variant))
+        self.occurrence_positions = event_position[order]
+        occurrence_key = event_variant[order] * num_activities + self.variant_codes[order]
+        is_start = np.ones(len(order), dtype=bool)
+        is_start[1:] = occurrence_key[1:] != occurrence_key[:-1]
+
+        self.entry_start = np.flatnonzero(is_start)
+        self.entry_key = occurrence_key[self.entry_start]
+        self.entry_variant = self.entry_key // num_activities
+        self.entry_activity = self.entry_key % num_activities
+        self.entry_count = np.diff(np.append(self.entry_start, len(order)))
+        self.entry_first = self.occurrence_positions[self.entry_start]
+        self.entry_last = self.occurrence_positions[self.entry_start + self.entry_count - 1]
+        self.variant_entries = np.searchsorted(self.entry_variant, np.arange(num_variants + 1))
+
+        self.first_activity = np.full(num_variants, -1, dtype=np.int64)
+        self.first_activity[lengths > 0] = self.variant_codes[self.variant_offsets[:-1][lengths > 0]]
+
+    def __len__(self):
+        return len(self.weights)
+
+    def get_activity_codes(self, activities: List[Any]) -> np.ndarray:
+        """
+        Gets the codes of the provided activities (-1 for the activities which are not in the log)
+        """
+        return np.array([self.activity_codes.get(act, -1) for act in activities], dtype=np.int64)
+
+    def get_entries(self, variants: np.ndarray, activities: np.ndarray) -> np.ndarray:
+        """
+        Gets the entries of the provided (variant, activity) couples (-1 if the activity does not occur in the variant)
+        """
+        num_activities = max(1, len(self.activities))
+        keys = variants * num_activities + activities
+        idx = np.minimum(np.searchsorted(self.entry_key, keys), max(0, len(self.entry_key) - 1))
+        found = (activities >= 0) & (len(self.entry_key) > 0)
+        found[found] = self.entry_key[idx[found]] == keys[found]
+        return np.where(found, idx, -1)
+
+    def get_dense(self, values: np.ndarray, default: int) -> np.ndarray:
+        """
+        Gets a (variants x activities + 1) matrix with the provided value of every entry; the last column
+        (activities which are not in the log) and the activities not occurring in the variant get the default value
+        """
+        ret = np.full((len(self), len(self.activities) + 1), default, dtype=np.int64)
+        ret[self.entry_variant, self.entry_activity] = values
+        return ret
+
+    def get_chunks(self, max_pairs: int) -> List[Tuple[int, int]]:
+        """
+        Splits the variants in contiguous chunks, each one containing at most max_pairs couples of activities
+        occurring in the same variant (a chunk contains at least one variant)
+        """
+        entries = np.diff(self.variant_entries)
+        cumulative = np.cumsum(entries * entries)
+        chunks = []
+        start = 0
+        while start < len(self):
+            base = cumulative[start - 1] if start > 0 else 0
+            end = max(start + 1, int(np.searchsorted(cumulative, base + max_pairs, side="right")))
+            chunks.append((start, end))
+            start = end
+        return chunks if chunks else [(0, 0)]
+
+    def subset(self, start: int, end: int) -> "VariantPositions":
+        """
+        Gets the positions of the variants in the range [start, end)
+        """
+        offsets = self.variant_offsets[start:end + 1]
+        return VariantPositions(self.activities, offsets - offsets[0], self.variant_codes[offsets[0]:offsets[-1]],
+                                self.weights[start:end])
+
+    def get_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gets all the couples of entries (first, second) of different activities occurring in the same variant
+        """
+        entries = np.diff(self.variant_entries)
+        per_entry = entries[self.entry_variant]
+        first, second = _expand(self.variant_entries[self.entry_variant], per_entry)
+        mask = first != second
+        return first[mask], second[mask]
+
+    def check_alternation(self, variants: np.ndarray, activities1: np.ndarray, activities2: np.ndarray,
+                          strip: int = STRIP_NONE, chain: bool = False) -> np.ndarray:
+        """
+        Checks, for every (variant, activity1, activity2) triple, if the sequence of the occurrences of the two
+        (different) activities in the variant is an alternation (activity1 activity2)*, after the stripping
+        of the initial occurrences defined by the strip argument. If chain is True, activity2 should
+        be directly after activity1 in the variant.
+
+        Parameters
+        ---------------
+        variants
+            Variants
+        activities1
+            Codes of the first activities (-1 if the activity is not in the log)
+        activities2
+            Codes of the second activities (-1 if the activity is not in the log)
+        strip
+            STRIP_NONE, STRIP_RESPONSE or STRIP_PRECEDENCE
+        chain
+            Whether the activities of each alternation should be consecutive in the variant
+
+        Returns
+        ---------------
+        is_ok
+            Boolean array
+        """
+        num_segments = len(variants)
+        entries1 = self.get_entries(variants, activities1)
+        entries2 = self.get_entries(variants, activities2)
+        count1 = np.where(entries1 >= 0, self.entry_count[entries1], 0)
+        count2 = np.where(entries2 >= 0, self.entry_count[entries2], 0)
+
+        segments1, occurrences1 = _expand(self.entry_start[np.maximum(entries1, 0)], count1)
+        segments2, occurrences2 = _expand(self.entry_start[np.maximum(entries2, 0)], count2)
+        segments = np.concatenate([segments1, segments2])
+        labels = np.concatenate([np.zeros(len(segments1), dtype=np.int64), np.ones(len(segments2), dtype=np.int64)])
+        positions = np.concatenate([self.occurrence_positions[occurrences1], self.occurrence_positions[occurrences2]])
+        order = np.argsort(segments * (int(positions.max(initial=0)) + 1) + positions, kind="stable")
+        segments, labels, positions = segments[order], labels[order], positions[order]
+
+        segment_length = count1 + count2
+        rank = np.arange(len(segments)) - (np.cumsum(segment_length) - segment_length)[segments]
+
+        if strip == STRIP_RESPONSE:
+            # the initial occurrences of the second activity are dropped
+            stripped = segment_length.copy()
+            is_first = labels == 0
+            np.minimum.at(stripped, segments[is_first], rank[is_first])
+        elif strip == STRIP_PRECEDENCE:
+            # the occurrences are dropped until the second element is an occurrence of the second activity
+            stripped = np.maximum(segment_length - 1, 0)
+            is_second = (labels == 1) & (rank >= 1)
+            np.minimum.at(stripped, segments[is_second], rank[is_second] - 1)
+        else:
+            stripped = np.zeros(num_segments, dtype=np.int64)
+
+        relative = rank - stripped[segments]
+        expected = relative % 2
+        bad = (relative >= 0) & (labels != expected)
+        if chain and len(positions) > 0:
+            previous = np.concatenate([[-2], positions[:-1]])
+            bad |= (relative >= 0) & (expected == 1) & (positions != previous + 1)
+        is_ok = ((segment_length - stripped) % 2 == 0)
+        is_ok[segments[bad]] = False
+        return is_ok
+
+
+def build(log: Union[EventLog, pd.DataFrame], parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> VariantPositions:
+    """
+    Builds the integer-coded variants (with the positions of the activities) of a log.
+    For dataframes, the variant index of the dataframe is reused (the events of every case are taken
+    in the order of the rows).
+
+    Parameters
+    ---------------
+    log
+        Log object (EventLog, Pandas dataframe)
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.ACTIVITY_KEY => the activity
+        - Parameters.CASE_ID_KEY => the case identifier
+        - Parameters.CONSIDERED_ACTIVITIES => if provided, the variants are projected on these activities
+          (which are all coded, even if they do not occur in the log)
+
+    Returns
+    ---------------
+    positions
+        Variant positions
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+    case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+    considered_activities = exec_utils.get_param_value(Parameters.CONSIDERED_ACTIVITIES, parameters, None)
+
+    if pandas_utils.check_is_pandas_dataframe(log):
+        from pm4py.objects.log.util import pandas_numpy_variants
+        index = pandas_numpy_variants.get_variant_index(log, parameters={
+            pandas_numpy_variants.Parameters.ACTIVITY_KEY: activity_key,
+            pandas_numpy_variants.Parameters.CASE_ID_KEY: case_id_key})
+        activities = index.activities
+        variant_offsets = index.variant_offsets
+        variant_codes = index.variant_codes
+        weights = index.counts
+        case_variant = index.case_variant
+    else:
+        activities_dict = {}
+        variants_dict = {}
+        codes = []
+        lengths = []
+        case_variant = []
+        for trace in log:
+            variant = tuple(activities_dict.setdefault(ev[activity_key], len(activities_dict)) for ev in trace)
+            if variant not in variants_dict:
+                variants_dict[variant] = len(variants_dict)
+                codes.extend(variant)
+                lengths.append(len(variant))
+            case_variant.append(variants_dict[variant])
+        activities = list(activities_dict)
+        variant_offsets = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+        variant_codes = np.array(codes, dtype=np.int64)
+        case_variant = np.array(case_variant, dtype=np.int64)
+        weights = np.bincount(case_variant, minlength=len(lengths))
+
+    if considered_activities is not None:
+        considered = sorted(set(considered_activities), key=lambda x: str(x))
+        considered_codes = {act: i for i, act in enumerate(considered)}
+        mapping = np.array([considered_codes.get(act, -1) for act in activities] + [-1], dtype=np.int64)
+        new_codes = mapping[variant_codes] if len(variant_codes) > 0 else np.zeros(0, dtype=np.int64)
+        kept = new_codes >= 0
+        event_variant = np.repeat(np.arange(len(variant_offsets) - 1), np.diff(variant_offsets))
+        new_lengths = np.bincount(event_variant[kept], minlength=len(variant_offsets) - 1)
+        variant_offsets = np.concatenate([[0], np.cumsum(new_lengths)])
+        variant_codes = new_codes[kept]
+        activities = considered
+
+    return VariantPositions(activities, variant_offsets, variant_codes, weights, case_variant=case_variant)
+
+
+def apply_chunks(positions: VariantPositions, function: Callable[..., Any], args: Tuple[Any, ...],
+                 chunks: Optional[List[Tuple[int, int]]] = None,
+                 parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> List[Any]:
+    """
+    Applies a function to the chunks of variants of the positions (with a pool of processes if multiprocessing is
+    enabled, more cores are allowed and there is more than one chunk)
+
+    Parameters
+    ---------------
+    positions
+        Variant positions
+    function
+        Function, accepting as first argument the positions of a chunk of variants, and then the given arguments
+    args
+        Additional arguments of the function
+    chunks
+        Ranges of variants of the chunks (if not provided, the variants are split following
+        Parameters.MAX_PAIRS_PER_CHUNK)
+    parameters
+        Parameters, including:
+        - Parameters.MULTIPROCESSING => evaluates the chunks in a pool of processes
+          (default: constants.ENABLE_MULTIPROCESSING_DEFAULT)
+        - Parameters.CORES => number of processes (default: number of CPUs - 2 when multiprocessing is enabled,
+          1 otherwise)
+        - Parameters.MAX_PAIRS_PER_CHUNK => maximum number of couples of activities occurring in the same variant
+          within a chunk (default: 2^22)
+
+    Returns
+    ---------------
+    results
+        Results of the function on the chunks, in the order of the variants
+    """
+    if parameters is None:
+        parameters = {}
+
+    enable_multiprocessing = exec_utils.get_param_value(Parameters.MULTIPROCESSING, parameters,
+                                                        constants.ENABLE_MULTIPROCESSING_DEFAULT)
+    cores = max(1, exec_utils.get_param_value(Parameters.CORES, parameters,
+                                              multiprocessing.cpu_count() - 2 if enable_multiprocessing else 1))
+    max_pairs = exec_utils.get_param_value(Parameters.MAX_PAIRS_PER_CHUNK, parameters, 1 << 22)
+
+    if chunks is None:
+        chunks = positions.get_chunks(max_pairs)
+    if len(chunks) == 1:
+        return [function(positions, *args)]
+
+    subsets = [positions.subset(start, end) for start, end in chunks]
+    if cores > 1:
+        with ProcessPoolExecutor(max_workers=min(cores, len(subsets))) as executor:
+            return list(executor.map(function, subsets, *[[arg] * len(subsets) for arg in args]))
+    return [function(subset, *args) for subset in subsets]
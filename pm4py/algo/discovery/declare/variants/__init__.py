@@ -20,4 +20,4 @@ Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
 
-from pm4py.algo.discovery.declare.variants import classic
+from pm4py.algo.discovery.declare.variants import classic, vectorized
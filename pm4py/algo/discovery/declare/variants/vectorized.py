@@ -0,0 +1,327 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+from enum import Enum
+from typing import Union, Dict, Optional, Any, Tuple, Collection, List
+
+import numpy as np
+import pandas as pd
+
+from pm4py.algo.discovery.declare import variant_positions
+from pm4py.algo.discovery.declare.templates import *
+from pm4py.objects.log.obj import EventLog
+from pm4py.util import exec_utils, constants, xes_constants
+
+
+class Parameters(Enum):
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    CONSIDERED_ACTIVITIES = "considered_activities"
+    MIN_SUPPORT_RATIO = "min_support_ratio"
+    MIN_CONFIDENCE_RATIO = "min_confidence_ratio"
+    AUTO_SELECTION_MULTIPLIER = "auto_selection_multiplier"
+    ALLOWED_TEMPLATES = "allowed_templates"
+    MULTIPROCESSING = "multiprocessing"
+    CORES = "cores"
+    MAX_PAIRS_PER_CHUNK = "max_pairs_per_chunk"
+
+
+UNARY_TEMPLATES = {EXISTENCE, EXACTLY_ONE, INIT, ABSENCE}
+
+
+def __count_chunk(positions: variant_positions.VariantPositions) -> Dict[str, np.ndarray]:
+    """
+    Computes, on a chunk of variants, the (weighted) number of cases satisfying the conditions from which
+    the support and the confidence of all the rules are obtained
+    """
+    num_activities = len(positions.activities)
+    weights = positions.weights
+    entry_weight = weights[positions.entry_variant]
+
+    ret = {}
+    ret["present"] = np.bincount(positions.entry_activity, weights=entry_weight, minlength=num_activities)
+    ret["exactly_one"] = np.bincount(positions.entry_activity, weights=entry_weight * (positions.entry_count == 1),
+                                     minlength=num_activities)
+    non_empty = positions.first_activity >= 0
+    ret["init"] = np.bincount(positions.first_activity[non_empty], weights=weights[non_empty], minlength=num_activities)
+
+    first, second = positions.get_pairs()
+    pair_code = positions.entry_activity[first] * num_activities + positions.entry_activity[second]
+    pair_weight = entry_weight[first]
+    size = num_activities * num_activities
+
+    def __count(mask):
+        return np.bincount(pair_code[mask], weights=pair_weight[mask], minlength=size).reshape((num_activities, num_activities))
+
+    response = positions.entry_last[first] < positions.entry_last[second]
+    precedence = positions.entry_first[first] < positions.entry_first[second]
+    ret["both"] = __count(np.ones(len(first), dtype=bool))
+    ret["response"] = __count(response)
+    ret["precedence"] = __count(precedence)
+    ret["succession"] = __count(response & precedence)
+
+    # the alternations are possible only between activities having the same number of occurrences;
+    # for single occurrences, they reduce to the order (and the adjacency) of the two occurrences
+    same_count = positions.entry_count[first] == positions.entry_count[second]
+    single = same_count & (positions.entry_count[first] == 1)
+    alternate = single & precedence
+    chain = single & (positions.entry_first[second] == positions.entry_first[first] + 1)
+    candidates = np.flatnonzero(same_count & ~single)
+    variants = positions.entry_variant[first[candidates]]
+    activities1 = positions.entry_activity[first[candidates]]
+    activities2 = positions.entry_activity[second[candidates]]
+    is_alternate = positions.check_alternation(variants, activities1, activities2)
+    alternate[candidates] = is_alternate
+    chain[candidates[is_alternate]] = positions.check_alternation(variants[is_alternate], activities1[is_alternate],
+                                                                  activities2[is_alternate], chain=True)
+    ret["alternate"] = __count(alternate)
+    ret["chain"] = __count(chain)
+
+    return ret
+
+
+def get_supports(positions: variant_positions.VariantPositions, allowed_templates: Optional[Collection[str]] = None,
+                 parameters: Optional[Dict[Any, Any]] = None) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Computes the support (number of cases in which the rule is activated) and the confidence (number of cases
+    in which the rule is satisfied) of the rules of all the allowed templates, for all the activities
+    (unary templates) and for all the couples of different activities (binary templates).
+    The values are the ones of the classic variant, computed on the variants with vectorized operations.
+
+    Parameters
+    ---------------
+    positions
+        Variant positions
+    allowed_templates
+        Allowed templates
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.MULTIPROCESSING => evaluates the chunks of variants in a pool of processes
+        - Parameters.CORES => number of processes evaluating the chunks of variants
+        - Parameters.MAX_PAIRS_PER_CHUNK => maximum number of couples of activities occurring in the same variant
+          within a chunk
+
+    Returns
+    ---------------
+    supports
+        Dictionary associating to every template a couple (support, confidence) of arrays, having one element
+        per activity (unary templates) or a matrix (binary templates) whose cell (i, j) is the rule
+        between the i-th and the j-th activity (the diagonal is meaningless)
+    """
+    if parameters is None:
+        parameters = {}
+
+    if allowed_templates is None:
+        allowed_templates = {EXISTENCE, EXACTLY_ONE, INIT, RESPONDED_EXISTENCE, RESPONSE, PRECEDENCE, SUCCESSION,
+                             ALTRESPONSE, ALTPRECEDENCE, ALTSUCCESSION, CHAINRESPONSE, CHAINPRECEDENCE, CHAINSUCCESSION,
+                             ABSENCE, COEXISTENCE}
+    allowed_templates = set(allowed_templates)
+
+    chunks_params = {variant_positions.Parameters.MULTIPROCESSING: exec_utils.get_param_value(Parameters.MULTIPROCESSING, parameters, None),
+                     variant_positions.Parameters.CORES: exec_utils.get_param_value(Parameters.CORES, parameters, None),
+                     variant_positions.Parameters.MAX_PAIRS_PER_CHUNK: exec_utils.get_param_value(Parameters.MAX_PAIRS_PER_CHUNK, parameters, 1 << 22)}
+    chunks_params = {k: v for k, v in chunks_params.items() if v is not None}
+    counts = None
+    for chunk_counts in variant_positions.apply_chunks(positions, __count_chunk, (), parameters=chunks_params):
+        if counts is None:
+            counts = chunk_counts
+        else:
+            for k in counts:
+                counts[k] = counts[k] + chunk_counts[k]
+    counts = {k: np.rint(v).astype(np.int64) for k, v in counts.items()}
+
+    total = np.full(len(positions.activities), int(positions.weights.sum()), dtype=np.int64)
+    present = counts["present"]
+    present_row = np.broadcast_to(present[:, None], counts["both"].shape)
+    present_column = np.broadcast_to(present[None, :], counts["both"].shape)
+    coexistence_support = present_row + present_column - counts["both"]
+
+    ret = {}
+    if EXISTENCE in allowed_templates:
+        ret[EXISTENCE] = (total, present)
+    if EXACTLY_ONE in allowed_templates:
+        ret[EXACTLY_ONE] = (present, counts["exactly_one"])
+    if INIT in allowed_templates:
+        ret[INIT] = (total, counts["init"])
+    if RESPONDED_EXISTENCE in allowed_templates:
+        ret[RESPONDED_EXISTENCE] = (present_row, counts["both"])
+    if RESPONSE in allowed_templates:
+        ret[RESPONSE] = (present_row, counts["response"])
+    if PRECEDENCE in allowed_templates:
+        ret[PRECEDENCE] = (counts["both"], counts["precedence"])
+    if ALTRESPONSE in allowed_templates:
+        ret[ALTRESPONSE] = (present_row, counts["alternate"])
+    if CHAINRESPONSE in allowed_templates:
+        ret[CHAINRESPONSE] = (present_row, counts["chain"])
+    if ALTPRECEDENCE in allowed_templates:
+        ret[ALTPRECEDENCE] = (counts["both"], counts["alternate"])
+    if CHAINPRECEDENCE in allowed_templates:
+        ret[CHAINPRECEDENCE] = (counts["both"], counts["chain"])
+    if ABSENCE in allowed_templates and EXISTENCE in allowed_templates:
+        ret[ABSENCE] = (total, total - present)
+    if SUCCESSION in allowed_templates and RESPONSE in allowed_templates and PRECEDENCE in allowed_templates:
+        ret[SUCCESSION] = (present_row, counts["succession"])
+    if ALTSUCCESSION in allowed_templates and ALTRESPONSE in allowed_templates and ALTPRECEDENCE in allowed_templates:
+        ret[ALTSUCCESSION] = (present_row, counts["alternate"])
+    if CHAINSUCCESSION in allowed_templates and CHAINRESPONSE in allowed_templates and CHAINPRECEDENCE in allowed_templates:
+        ret[CHAINSUCCESSION] = (present_row, counts["chain"])
+    if COEXISTENCE in allowed_templates and RESPONDED_EXISTENCE in allowed_templates:
+        ret[COEXISTENCE] = (coexistence_support, counts["both"])
+        if NONCOEXISTENCE in allowed_templates:
+            ret[NONCOEXISTENCE] = (coexistence_support, coexistence_support - counts["both"])
+    if NONSUCCESSION in allowed_templates and SUCCESSION in ret:
+        ret[NONSUCCESSION] = (present_row, present_row - counts["succession"])
+    if NONCHAINSUCCESSION in allowed_templates and CHAINSUCCESSION in ret:
+        ret[NONCHAINSUCCESSION] = (present_row, present_row - counts["chain"])
+
+    return ret
+
+
+def get_rules_from_supports(supports: Dict[str, Tuple[np.ndarray, np.ndarray]], activities: List[Any], num_cases: int,
+                            parameters: Optional[Dict[Any, Any]] = None) -> Dict[str, Dict[Any, Dict[str, int]]]:
+    """
+    Selects the rules having enough support and confidence (as in the classic variant: if no threshold is
+    provided, they are set to a share of the ones of the rule maximizing the product of the ratios)
+
+    Parameters
+    ---------------
+    supports
+        Supports and confidences of the rules (see get_supports)
+    activities
+        Activities
+    num_cases
+        Number of cases of the log
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.MIN_SUPPORT_RATIO
+        - Parameters.MIN_CONFIDENCE_RATIO
+        - Parameters.AUTO_SELECTION_MULTIPLIER
+
+    Returns
+    ---------------
+    declare_model
+        DECLARE model (as Python dictionary), where each template is associated with its own rules
+    """
+    if parameters is None:
+        parameters = {}
+
+    min_support_ratio = exec_utils.get_param_value(Parameters.MIN_SUPPORT_RATIO, parameters, None)
+    min_confidence_ratio = exec_utils.get_param_value(Parameters.MIN_CONFIDENCE_RATIO, parameters, None)
+
+    def __cells(template, values):
+        if template in UNARY_TEMPLATES:
+            return [(i,) for i in np.flatnonzero(values)]
+        rows, columns = np.nonzero(values)
+        return [(i, j) for i, j in zip(rows.tolist(), columns.tolist()) if i != j]
+
+    def __col_name(template, cell):
+        return (template,) + tuple(activities[i] for i in cell)
+
+    if num_cases == 0:
+        return {}
+
+    if min_support_ratio is None and min_confidence_ratio is None:
+        # auto determine the minimum support and confidence ratio by identifying the values for the best feature
+        auto_selection_multiplier = exec_utils.get_param_value(Parameters.AUTO_SELECTION_MULTIPLIER, parameters, 0.8)
+        best = None
+        for template, (supp, conf) in supports.items():
+            supp = np.asarray(supp, dtype=np.float64)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                prod = (supp / float(num_cases)) * (np.asarray(conf, dtype=np.float64) / supp)
+            valid = supp > 0
+            if template not in UNARY_TEMPLATES:
+                valid = valid & ~np.eye(len(activities), dtype=bool)
+            if not valid.any():
+                continue
+            max_prod = prod[valid].max()
+            candidates = max(__col_name(template, cell) for cell in __cells(template, valid & (prod == max_prod)))
+            if best is None or (max_prod, candidates) > best[:2]:
+                best = (max_prod, candidates, template, supports[template])
+        if best is None:
+            return {}
+        cell = tuple(activities.index(x) for x in best[1][1:])
+        supp = int(best[3][0][cell])
+        conf = int(best[3][1][cell])
+        min_support_ratio = float(supp) / float(num_cases) * auto_selection_multiplier
+        min_confidence_ratio = float(conf) / float(supp) * auto_selection_multiplier
+
+    min_support_ratio = 0.0 if min_support_ratio is None else min_support_ratio
+    min_confidence_ratio = 0.0 if min_confidence_ratio is None else min_confidence_ratio
+
+    rules = {}
+    for template, (supp, conf) in supports.items():
+        supp = np.asarray(supp)
+        conf = np.asarray(conf)
+        selected = (supp > num_cases * min_support_ratio) & (conf > supp * min_confidence_ratio)
+        for cell in __cells(template, selected):
+            key = activities[cell[0]] if len(cell) == 1 else (activities[cell[0]], activities[cell[1]])
+            if template not in rules:
+                rules[template] = {}
+            rules[template][key] = {"support": int(supp[cell]), "confidence": int(conf[cell])}
+
+    return rules
+
+
+def apply(log: Union[EventLog, pd.DataFrame], parameters: Optional[Dict[Any, Any]] = None) -> Dict[
+    str, Dict[Any, Dict[str, int]]]:
+    """
+    Discovers a DECLARE model from the provided event log, evaluating the templates on the integer-coded variants
+    (weighted by their number of cases) with vectorized operations over all the couples of activities.
+    The model is the same of the classic variant.
+
+    Parameters
+    ---------------
+    log
+        Log object (EventLog, Pandas table)
+    parameters
+        Possible parameters of the algorithm, including:
+        - Parameters.ACTIVITY_KEY
+        - Parameters.CASE_ID_KEY
+        - Parameters.CONSIDERED_ACTIVITIES
+        - Parameters.MIN_SUPPORT_RATIO
+        - Parameters.MIN_CONFIDENCE_RATIO
+        - Parameters.AUTO_SELECTION_MULTIPLIER
+        - Parameters.ALLOWED_TEMPLATES: collection of templates to consider (see the classic variant)
+        - Parameters.MULTIPROCESSING => evaluates the chunks of variants in a pool of processes
+          (default: constants.ENABLE_MULTIPROCESSING_DEFAULT)
+        - Parameters.CORES => number of processes evaluating the chunks of variants (default: number of CPUs - 2 when
+          multiprocessing is enabled, 1 otherwise)
+        - Parameters.MAX_PAIRS_PER_CHUNK => maximum number of couples of activities occurring in the same variant
+          within a chunk (default: 2^22)
+
+    Returns
+    -------------
+    declare_model
+        DECLARE model (as Python dictionary), where each template is associated with its own rules
+    """
+    if parameters is None:
+        parameters = {}
+
+    allowed_templates = exec_utils.get_param_value(Parameters.ALLOWED_TEMPLATES, parameters, None)
+
+    positions = variant_positions.build(log, parameters={
+        variant_positions.Parameters.ACTIVITY_KEY: exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY),
+        variant_positions.Parameters.CASE_ID_KEY: exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME),
+        variant_positions.Parameters.CONSIDERED_ACTIVITIES: exec_utils.get_param_value(Parameters.CONSIDERED_ACTIVITIES, parameters, None)})
+
+    supports = get_supports(positions, allowed_templates=allowed_templates, parameters=parameters)
+
+    return get_rules_from_supports(supports, positions.activities, int(positions.weights.sum()), parameters=parameters)
@@ -19,4 +19,4 @@ visit <https://www.gnu.org/licenses/>.
 Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
-from pm4py.algo.discovery.dfg.adapters.pandas import df_statistics, freq_triples
+from pm4py.algo.discovery.dfg.adapters.pandas import df_statistics, freq_triples, df_numpy_kernel
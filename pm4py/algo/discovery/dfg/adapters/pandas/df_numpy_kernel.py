@@ -0,0 +1,296 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+import numpy as np
+import pandas as pd
+
+from pm4py.util import constants
+from pm4py.util.business_hours import BusinessHoursEngine
+
+SUPPORTED_MEASURES = {"frequency", "performance", "both"}
+SUPPORTED_AGGREGATIONS = {"mean", "median", "min", "max", "sum", "std", "all", "raw_values"}
+
+# above this number of possible activity couples, the frequency is computed by sorting instead of np.bincount
+MAX_BINCOUNT_DOMAIN = 1 << 24
+
+
+def is_supported(df, measure="frequency", activity_key="concept:name", case_id_glue="case:concept:name",
+                 start_timestamp_key="start_timestamp", timestamp_key="time:timestamp", perf_aggregation_key="mean",
+                 sort_caseid_required=True, sort_timestamp_along_case_id=True, window=1, target_activity_key=None):
+    """
+    Checks if the options provided to the computation of the DFG are supported by the vectorized kernel
+
+    Parameters
+    --------------
+    df
+        Dataframe
+    (the other parameters are the same as df_statistics.get_dfg_graph)
+
+    Returns
+    --------------
+    boolean
+        Boolean value (True if the vectorized kernel can be used)
+    """
+    if target_activity_key is None:
+        target_activity_key = activity_key
+
+    if not isinstance(df, pd.DataFrame):
+        return False
+    if measure not in SUPPORTED_MEASURES:
+        return False
+    if measure != "frequency" and perf_aggregation_key not in SUPPORTED_AGGREGATIONS:
+        return False
+    if not isinstance(window, (int, np.integer)) or window < 1:
+        return False
+    if case_id_glue not in df.columns or activity_key not in df.columns or target_activity_key not in df.columns:
+        return False
+
+    if measure != "frequency" or (sort_caseid_required and sort_timestamp_along_case_id):
+        for col in {start_timestamp_key, timestamp_key}:
+            if col not in df.columns or not pd.api.types.is_datetime64_any_dtype(df[col]):
+                return False
+            if df[col].isna().any():
+                return False
+
+    return True
+
+
+def _timestamp_array(series):
+    """
+    Gets the (timezone-naive) numpy datetime64 array of a timestamp column
+    """
+    return np.asarray(series.values)
+
+
+def _encode(series, sort=True):
+    """
+    Integer-codes a column of the dataframe (missing values get the code -1)
+    """
+    codes, uniques = pd.factorize(series, sort=sort)
+    return np.asarray(codes, dtype=np.int64), uniques
+
+
+def _group_sorted(keys):
+    """
+    Groups an array of non-negative integer keys by sorting it
+
+    Returns
+    --------------
+    perm
+        Stable permutation sorting the keys
+    unique_keys
+        Distinct keys (sorted)
+    starts
+        Start position of every group in the sorted array
+    counts
+        Size of every group
+    """
+    perm = np.argsort(keys, kind="stable")
+    sorted_keys = keys[perm]
+    if len(sorted_keys) > 0:
+        starts = np.concatenate(([0], np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1))
+    else:
+        starts = np.zeros(0, dtype=np.int64)
+    counts = np.diff(np.append(starts, len(sorted_keys)))
+    return perm, sorted_keys[starts], starts, counts
+
+
+def _aggregate(values, pairs, aggregation):
+    """
+    Aggregates the values of the performance on the given couple indexes (sort-reduce over the pair index)
+
+    Returns
+    --------------
+    unique_pairs
+        Distinct couple indexes
+    aggregated
+        List containing, for each distinct couple, the aggregated value
+    """
+    perm, unique_pairs, starts, counts = _group_sorted(pairs)
+    if len(unique_pairs) == 0:
+        return unique_pairs, []
+
+    sorted_values = values[perm]
+    result = {}
+
+    if aggregation in ("sum", "mean", "std", "all"):
+        result["sum"] = np.add.reduceat(sorted_values, starts)
+        result["mean"] = result["sum"] / counts
+    if aggregation in ("min", "all"):
+        result["min"] = np.minimum.reduceat(sorted_values, starts)
+    if aggregation in ("max", "all"):
+        result["max"] = np.maximum.reduceat(sorted_values, starts)
+    if aggregation in ("std", "all"):
+        deviations = sorted_values - np.repeat(result["mean"], counts)
+        sq_sum = np.add.reduceat(deviations * deviations, starts)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result["std"] = np.where(counts > 1, np.sqrt(sq_sum / np.maximum(counts - 1, 1)), np.nan)
+    if aggregation in ("median", "all"):
+        values_in_group = values[np.lexsort((values, pairs))]
+        result["median"] = (values_in_group[starts + (counts - 1) // 2] + values_in_group[starts + counts // 2]) / 2.0
+
+    if aggregation == "raw_values":
+        return unique_pairs, [x.tolist() for x in np.split(sorted_values, starts[1:])]
+    if aggregation == "all":
+        return unique_pairs, [{"mean": a, "median": b, "max": c, "min": d, "sum": e, "stdev": f} for a, b, c, d, e, f in
+                              zip(result["mean"].tolist(), result["median"].tolist(), result["max"].tolist(),
+                                  result["min"].tolist(), result["sum"].tolist(), result["std"].tolist())]
+    return unique_pairs, result[aggregation].tolist()
+
+
+def get_dfg_graph(df, measure="frequency", activity_key="concept:name", case_id_glue="case:concept:name",
+                  start_timestamp_key="start_timestamp", timestamp_key="time:timestamp", perf_aggregation_key="mean",
+                  sort_caseid_required=True, sort_timestamp_along_case_id=True, keep_once_per_case=False, window=1,
+                  target_activity_key=None, st_eq_ct=True, business_hours=False, business_hours_slot=None,
+                  workcalendar=constants.DEFAULT_BUSINESS_HOURS_WORKCALENDAR):
+    """
+    Computes the DFG of a Pandas dataframe on integer-coded columns.
+    The case and the activity columns are category-coded once, and the directly-follows couples are computed
+    on NumPy arrays (without shifting and concatenating the dataframe).
+
+    Parameters
+    -----------
+    df
+        Dataframe
+    measure
+        Measure to use (frequency/performance/both)
+    activity_key
+        Activity key to use in the grouping
+    case_id_glue
+        Case ID identifier
+    start_timestamp_key
+        Start timestamp key (the column should exist in the dataframe)
+    timestamp_key
+        Timestamp key
+    perf_aggregation_key
+        Performance aggregation key (mean, median, min, max, sum, std, all, raw_values)
+    sort_caseid_required
+        Specify if a sort on the Case ID is required
+    sort_timestamp_along_case_id
+        Specifying if sorting by timestamp along the CaseID is required
+    keep_once_per_case
+        In the counts, keep only one occurrence of the path per case (the first)
+    window
+        Window of the DFG (default 1)
+    target_activity_key
+        Activity key for the target event of the couple (default: the activity key)
+    st_eq_ct
+        Boolean value telling if the start timestamp is equal to the complete timestamp
+    business_hours
+        Enables the computation of the performance in business hours
+    business_hours_slot
+        Work schedule of the company (see pm4py.util.business_hours)
+    workcalendar
+        Work calendar (it permits querying if a given day is a working day)
+
+    Returns
+    -----------
+    dfg
+        DFG in the chosen measure (may be only the frequency, only the performance, or both)
+    """
+    if target_activity_key is None:
+        target_activity_key = activity_key
+
+    case_codes, _ = _encode(df[case_id_glue])
+    source_codes, source_labels = _encode(df[activity_key])
+    if target_activity_key == activity_key:
+        target_codes, target_labels = source_codes, source_labels
+    else:
+        target_codes, target_labels = _encode(df[target_activity_key])
+
+    needs_timestamps = measure != "frequency"
+    start_timestamps = None
+    timestamps = None
+    if needs_timestamps or (sort_caseid_required and sort_timestamp_along_case_id):
+        timestamps = _timestamp_array(df[timestamp_key])
+        start_timestamps = timestamps if start_timestamp_key == timestamp_key else _timestamp_array(df[start_timestamp_key])
+
+    if measure != "frequency" and business_hours:
+        # cumulative working seconds of every timestamp, so the business hours between two events are a difference
+        engine = BusinessHoursEngine(business_hours_slot, workcalendar)
+        working_seconds, start_working_seconds = engine.get_working_seconds(df[timestamp_key], df[start_timestamp_key])
+
+    if sort_caseid_required:
+        if sort_timestamp_along_case_id:
+            order = np.lexsort((timestamps.view(np.int64), start_timestamps.view(np.int64), case_codes))
+        else:
+            order = np.argsort(case_codes, kind="stable")
+        case_codes = case_codes[order]
+        source_codes = source_codes[order]
+        target_codes = target_codes[order]
+        if needs_timestamps:
+            timestamps = timestamps[order]
+            start_timestamps = start_timestamps[order]
+            if business_hours:
+                working_seconds = working_seconds[order]
+                start_working_seconds = start_working_seconds[order]
+
+    # couples of events at distance 'window' belonging to the same case
+    valid = (case_codes[:-window] == case_codes[window:]) & (case_codes[:-window] >= 0) & (
+            source_codes[:-window] >= 0) & (target_codes[window:] >= 0)
+    idx = np.flatnonzero(valid)
+
+    num_targets = max(len(target_labels), 1)
+    pairs = source_codes[idx] * num_targets + target_codes[idx + window]
+
+    if keep_once_per_case:
+        num_pairs = max(len(source_labels), 1) * num_targets
+        _, first_occ = np.unique(case_codes[idx] * num_pairs + pairs, return_index=True)
+        first_occ.sort()
+        idx = idx[first_occ]
+        pairs = pairs[first_occ]
+
+    def decode(pair):
+        return (source_labels[pair // num_targets], target_labels[pair % num_targets])
+
+    dfg_frequency = {}
+    dfg_performance = {}
+
+    if measure == "frequency" or measure == "both":
+        domain = len(source_labels) * len(target_labels)
+        if domain <= MAX_BINCOUNT_DOMAIN:
+            counts = np.bincount(pairs, minlength=domain)
+            unique_pairs = np.flatnonzero(counts)
+            counts = counts[unique_pairs]
+        else:
+            unique_pairs, counts = np.unique(pairs, return_counts=True)
+        dfg_frequency = {decode(p): c for p, c in zip(unique_pairs.tolist(), counts.tolist())}
+
+    if measure == "performance" or measure == "both":
+        if business_hours:
+            flow_times = np.maximum(start_working_seconds[idx + window] - working_seconds[idx], 0.0)
+        else:
+            source_timestamps = timestamps[idx]
+            target_timestamps = start_timestamps[idx + window]
+            if not st_eq_ct:
+                # in the arc performance calculation, make sure to consider positive or null values
+                target_timestamps = np.maximum(target_timestamps, source_timestamps)
+            flow_times = (target_timestamps - source_timestamps) / np.timedelta64(1, "s")
+        unique_pairs, aggregated = _aggregate(flow_times, pairs, perf_aggregation_key)
+        dfg_performance = {decode(p): v for p, v in zip(unique_pairs.tolist(), aggregated)}
+
+    if measure == "frequency":
+        return dfg_frequency
+
+    if measure == "performance":
+        return dfg_performance
+
+    return [dfg_frequency, dfg_performance]
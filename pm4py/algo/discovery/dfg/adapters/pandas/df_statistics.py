@@ -20,7 +20,8 @@ Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
 from pm4py.util import xes_constants, pandas_utils, constants
-from pm4py.util.business_hours import soj_time_business_hours_diff
+from pm4py.util.business_hours import soj_time_business_hours_diff_vectorized
+from pm4py.algo.discovery.dfg.adapters.pandas import df_numpy_kernel
 
 
 def get_dfg_graph(df, measure="frequency", activity_key="concept:name", case_id_glue="case:concept:name",
@@ -78,6 +79,22 @@ def get_dfg_graph(df, measure="frequency", activity_key="concept:name", case_id_
             df[start_timestamp_key] = df[timestamp_key]
         st_eq_ct = True
 
+    # when possible, compute the DFG on integer-coded NumPy arrays instead of shifting and concatenating the dataframe
+    if constants.ENABLE_VECTORIZED_DFG_KERNEL and df_numpy_kernel.is_supported(df, measure=measure, activity_key=activity_key,
+                                                                              case_id_glue=case_id_glue, start_timestamp_key=start_timestamp_key,
+                                                                              timestamp_key=timestamp_key, perf_aggregation_key=perf_aggregation_key,
+                                                                              sort_caseid_required=sort_caseid_required,
+                                                                              sort_timestamp_along_case_id=sort_timestamp_along_case_id,
+                                                                              window=window, target_activity_key=target_activity_key):
+        return df_numpy_kernel.get_dfg_graph(df, measure=measure, activity_key=activity_key, case_id_glue=case_id_glue,
+                                             start_timestamp_key=start_timestamp_key, timestamp_key=timestamp_key,
+                                             perf_aggregation_key=perf_aggregation_key, sort_caseid_required=sort_caseid_required,
+                                             sort_timestamp_along_case_id=sort_timestamp_along_case_id,
+                                             keep_once_per_case=keep_once_per_case, window=window,
+                                             target_activity_key=target_activity_key, st_eq_ct=st_eq_ct,
+                                             business_hours=business_hours, business_hours_slot=business_hours_slot,
+                                             workcalendar=workcalendar)
+
     # to increase the speed of the approaches reduce dataframe to case, activity (and possibly complete timestamp)
     # columns
     if reduce_columns:
@@ -128,8 +145,7 @@ def get_dfg_graph(df, measure="frequency", activity_key="concept:name", case_id_
         if business_hours:
             if business_hours_slot is None:
                 business_hours_slot = constants.DEFAULT_BUSINESS_HOUR_SLOTS
-            df_successive_rows[constants.DEFAULT_FLOW_TIME] = df_successive_rows.apply(
-            lambda x: soj_time_business_hours_diff(x[timestamp_key], x[start_timestamp_key + '_2'], business_hours_slot, workcalendar), axis=1)
+            df_successive_rows[constants.DEFAULT_FLOW_TIME] = soj_time_business_hours_diff_vectorized(df_successive_rows[timestamp_key], df_successive_rows[start_timestamp_key + '_2'], business_hours_slot, workcalendar)
         else:
             difference = df_successive_rows[start_timestamp_key + '_2'] - df_successive_rows[timestamp_key]
             df_successive_rows[constants.DEFAULT_FLOW_TIME] = pandas_utils.get_total_seconds(difference)
@@ -248,8 +264,7 @@ def get_partial_order_dataframe(df, start_timestamp_key=None, timestamp_key="tim
     if business_hours:
         if business_hours_slot is None:
             business_hours_slot = constants.DEFAULT_BUSINESS_HOUR_SLOTS
-        df[constants.DEFAULT_FLOW_TIME] = df.apply(
-            lambda x: soj_time_business_hours_diff(x[timestamp_key], x[start_timestamp_key + '_2'], business_hours_slot, workcalendar), axis=1)
+        df[constants.DEFAULT_FLOW_TIME] = soj_time_business_hours_diff_vectorized(df[timestamp_key], df[start_timestamp_key + '_2'], business_hours_slot, workcalendar)
     else:
         df[constants.DEFAULT_FLOW_TIME] = pandas_utils.get_total_seconds(df[start_timestamp_key + "_2"] - df[timestamp_key])
 
@@ -19,6 +19,7 @@ visit <https://www.gnu.org/licenses/>.
 Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
+from collections import Counter
 from enum import Enum
 from typing import Optional, Dict, Any, Union
 
@@ -33,6 +34,7 @@ from pm4py.algo.discovery.inductive.variants.imd import IMD
 from pm4py.algo.discovery.inductive.variants.instances import IMInstance
 from pm4py.objects.dfg.obj import DFG
 from pm4py.objects.log.obj import EventLog
+from pm4py.objects.log.util import pandas_numpy_variants
 from pm4py.objects.process_tree.obj import ProcessTree
 from pm4py.objects.process_tree.utils import generic as pt_util
 from pm4py.objects.process_tree.utils.generic import tree_sort
@@ -72,9 +74,17 @@ def apply(obj: Union[EventLog, pd.DataFrame, DFG, UVCL], parameters: Optional[Di
         idfg = InductiveDFG(dfg=obj, skip=False)
         process_tree = imd.apply(IMDataStructureDFG(idfg), parameters)
     else:
+        uvcl = None
         if type(obj) in [UVCL]:
             uvcl = obj
-        else:
+        elif type(obj) is pd.DataFrame and tk in obj.columns and pd.api.types.is_datetime64_any_dtype(obj[tk]) and not \
+                obj[tk].isna().any():
+            # if the events of every case are already sorted by timestamp, the cached variant index is used
+            variant_index = pandas_numpy_variants.get_variant_index(obj, parameters={
+                pandas_numpy_variants.Parameters.CASE_ID_KEY: cidk, pandas_numpy_variants.Parameters.ACTIVITY_KEY: ack})
+            if variant_index.is_sorted_along_cases(obj[tk].values):
+                uvcl = Counter(variant_index.to_variants_dict())
+        if uvcl is None:
             uvcl = comut.get_variants(comut.project_univariate(obj, key=ack, df_glue=cidk, df_sorting_criterion_key=tk))
 
         if variant is Variants.IM:
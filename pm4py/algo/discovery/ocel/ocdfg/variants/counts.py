@@ -0,0 +1,309 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+from enum import Enum
+from typing import Optional, Dict, Any, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pm4py.objects.ocel import constants as ocel_constants
+from pm4py.objects.ocel.obj import OCEL
+from pm4py.util import exec_utils, constants, pandas_utils
+
+
+class Parameters(Enum):
+    EVENT_ID = ocel_constants.PARAM_EVENT_ID
+    OBJECT_ID = ocel_constants.PARAM_OBJECT_ID
+    EVENT_ACTIVITY = ocel_constants.PARAM_EVENT_ACTIVITY
+    EVENT_TIMESTAMP = ocel_constants.PARAM_EVENT_TIMESTAMP
+    OBJECT_TYPE = ocel_constants.PARAM_OBJECT_TYPE
+    COMPUTE_EDGES_PERFORMANCE = "compute_edges_performance"
+    MATERIALIZE_SETS = "materialize_sets"
+    BUSINESS_HOURS = "business_hours"
+    BUSINESS_HOUR_SLOTS = "business_hour_slots"
+    WORKCALENDAR = "workcalendar"
+
+
+def _group_distinct(keys: List[np.ndarray], values: List[np.ndarray]) -> Tuple[List[np.ndarray], np.ndarray, np.ndarray]:
+    """
+    Sorts the rows (integer codes) by keys and values, and finds the distinct rows
+
+    Returns
+    ----------------
+    distinct
+        Columns (keys and values) of the distinct rows, sorted by keys and values
+    group_starts
+        Indexes (in the distinct rows) where a new combination of the keys starts
+    group_counts
+        Number of distinct values for every combination of the keys
+    """
+    columns = keys + values
+    if len(columns[0]) == 0:
+        return [c[:0] for c in columns], np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    order = np.lexsort(columns[::-1])
+    columns = [c[order] for c in columns]
+
+    is_new = np.zeros(len(order), dtype=bool)
+    is_new[0] = True
+    for c in columns:
+        is_new[1:] |= c[1:] != c[:-1]
+    columns = [c[is_new] for c in columns]
+
+    is_new_group = np.zeros(len(columns[0]), dtype=bool)
+    is_new_group[0] = True
+    for c in columns[:len(keys)]:
+        is_new_group[1:] |= c[1:] != c[:-1]
+    group_starts = np.nonzero(is_new_group)[0]
+    group_counts = np.diff(np.append(group_starts, len(columns[0])))
+
+    return columns, group_starts, group_counts
+
+
+def _to_nested_dict(keys: List[np.ndarray], labels: List[np.ndarray], values: List[Any]) -> Dict[Any, Any]:
+    """
+    Builds a (possibly nested) dictionary from the codes of the keys and the corresponding labels.
+    The last two key columns (the activity couple of an edge) are merged in a tuple when three columns are provided.
+    """
+    ret = {}
+    decoded = [lab[k].tolist() for k, lab in zip(keys, labels)]
+    for i in range(len(values)):
+        if len(decoded) == 1:
+            ret[decoded[0][i]] = values[i]
+        elif len(decoded) == 2:
+            ret.setdefault(decoded[0][i], {})[decoded[1][i]] = values[i]
+        else:
+            ret.setdefault(decoded[0][i], {})[(decoded[1][i], decoded[2][i])] = values[i]
+    return ret
+
+
+def _activity_metrics(keys: List[np.ndarray], labels: List[np.ndarray], ev: np.ndarray, obj: np.ndarray,
+                      ev_labels: np.ndarray, obj_labels: np.ndarray, materialize: bool) -> Dict[str, Dict[Any, Any]]:
+    """
+    Computes the events / unique objects / total objects metrics of the activities on the given relations
+    """
+    ret = {}
+    distinct_ev, starts_ev, counts_ev = _group_distinct(keys, [ev])
+    distinct_obj, starts_obj, counts_obj = _group_distinct(keys, [obj])
+    distinct_tot, starts_tot, counts_tot = _group_distinct(keys, [np.arange(len(ev))])
+
+    group_keys = [c[starts_ev] for c in distinct_ev[:len(keys)]]
+    if materialize:
+        ev_sets = [set(x) for x in np.split(ev_labels[distinct_ev[-1]], starts_ev[1:])] if len(starts_ev) else []
+        obj_sets = [set(x) for x in np.split(obj_labels[distinct_obj[-1]], starts_obj[1:])] if len(starts_obj) else []
+        tot_lists = []
+        if len(starts_tot):
+            for x in np.split(distinct_tot[-1], starts_tot[1:]):
+                x = np.sort(x)
+                tot_lists.append(list(zip(ev_labels[ev[x]].tolist(), obj_labels[obj[x]].tolist())))
+        ret["events"] = _to_nested_dict(group_keys, labels, ev_sets)
+        ret["unique_objects"] = _to_nested_dict(group_keys, labels, obj_sets)
+        ret["total_objects"] = _to_nested_dict(group_keys, labels, tot_lists)
+    else:
+        ret["events"] = _to_nested_dict(group_keys, labels, counts_ev.tolist())
+        ret["unique_objects"] = _to_nested_dict(group_keys, labels, counts_obj.tolist())
+        ret["total_objects"] = _to_nested_dict(group_keys, labels, counts_tot.tolist())
+    return ret
+
+
+def _edges_performance(group_keys: List[np.ndarray], labels: List[np.ndarray], starts: np.ndarray,
+                       source: np.ndarray, target: np.ndarray, timestamps: pd.Series,
+                       parameters: Dict[Any, Any]) -> Dict[str, Dict[Tuple[str, str], np.ndarray]]:
+    """
+    Computes the sorted array of the times (in seconds) between the source and the target events
+    of the occurrences of every edge
+    """
+    business_hours = exec_utils.get_param_value(Parameters.BUSINESS_HOURS, parameters, False)
+
+    if business_hours:
+        from pm4py.util.business_hours import soj_time_business_hours_diff_vectorized
+
+        business_hours_slots = exec_utils.get_param_value(Parameters.BUSINESS_HOUR_SLOTS, parameters,
+                                                          constants.DEFAULT_BUSINESS_HOUR_SLOTS)
+        workcalendar = exec_utils.get_param_value(Parameters.WORKCALENDAR, parameters,
+                                                  constants.DEFAULT_BUSINESS_HOURS_WORKCALENDAR)
+        diffs = np.asarray(soj_time_business_hours_diff_vectorized(timestamps.iloc[source], timestamps.iloc[target],
+                                                                   business_hours_slots, work_calendar=workcalendar),
+                           dtype=np.float64)
+    else:
+        seconds = (timestamps - timestamps.min()).dt.total_seconds().to_numpy()
+        diffs = seconds[target] - seconds[source]
+
+    group = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(source))))
+    order = np.lexsort((diffs, group))
+    performance = np.split(diffs[order], starts[1:]) if len(starts) else []
+
+    return _to_nested_dict(group_keys, labels, performance)
+
+
+def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None) -> Dict[str, Any]:
+    """
+    Discovers an OC-DFG model from an object-centric event log, computing all the metrics as counts.
+
+    Differently from the classic variant, the sets of events, objects, couples of events and
+    (event, event, object) triples behind every metric are not materialized: the relations are integer-coded and
+    sorted, and every metric is obtained as the number of distinct rows of a group of the sorted table.
+    The performance of the edges is returned as sorted NumPy arrays.
+    The result has the same structure of the classic variant, where the sets are replaced by their size
+    (the sets are built only when Parameters.MATERIALIZE_SETS is enabled).
+
+    Reference paper:
+    Berti, Alessandro, and Wil van der Aalst. "Extracting multiple viewpoint models from relational databases." Data-Driven Process Discovery and Analysis. Springer, Cham, 2018. 24-51.
+
+    Parameters
+    -----------------
+    ocel
+        Object-centric event log
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.EVENT_ID => the event identifier
+        - Parameters.OBJECT_ID => the object identifier
+        - Parameters.EVENT_ACTIVITY => the attribute to be used as activity
+        - Parameters.EVENT_TIMESTAMP => the timestamp
+        - Parameters.OBJECT_TYPE => the attribute to be used as object type
+        - Parameters.COMPUTE_EDGES_PERFORMANCE => (boolean) enables/disables the computation of the performance on the edges
+        - Parameters.MATERIALIZE_SETS => (boolean) returns the sets of the classic variant instead of their size
+        (default: False)
+        - Parameters.BUSINESS_HOURS => enables/disables the business hours in the performance of the edges
+        - Parameters.BUSINESS_HOUR_SLOTS => work schedule of the company (see edge_metrics.performance_calculation_ocel_aggregation)
+        - Parameters.WORKCALENDAR => work calendar of the business hours (object providing is_working_day)
+
+    Returns
+    -----------------
+    ocdfg
+        Object-centric directly-follows graph, expressed as a dictionary containing the same properties
+        of the classic variant (activities, object_types, edges, activities_indep, activities_ot, start_activities,
+        end_activities, edges_performance), where every metric is the number of:
+        - events: the distinct events
+        - unique_objects: the distinct objects
+        - total_objects: the (event, object) relations, or the distinct (source event, target event, object)
+        triples for the edges
+        - event_couples: the distinct couples of (source event, target event) for the edges
+    """
+    if parameters is None:
+        parameters = {}
+
+    event_id = exec_utils.get_param_value(Parameters.EVENT_ID, parameters, ocel.event_id_column)
+    object_id = exec_utils.get_param_value(Parameters.OBJECT_ID, parameters, ocel.object_id_column)
+    event_activity = exec_utils.get_param_value(Parameters.EVENT_ACTIVITY, parameters, ocel.event_activity)
+    timestamp_key = exec_utils.get_param_value(Parameters.EVENT_TIMESTAMP, parameters, ocel.event_timestamp)
+    object_type = exec_utils.get_param_value(Parameters.OBJECT_TYPE, parameters, ocel.object_type_column)
+    compute_edges_performance = exec_utils.get_param_value(Parameters.COMPUTE_EDGES_PERFORMANCE, parameters, True)
+    materialize = exec_utils.get_param_value(Parameters.MATERIALIZE_SETS, parameters, False)
+
+    relations = ocel.relations
+    ev, ev_labels = pd.factorize(relations[event_id])
+    obj, obj_labels = pd.factorize(relations[object_id])
+    act, act_labels = pd.factorize(relations[event_activity])
+    ot, ot_labels = pd.factorize(relations[object_type])
+    ev_labels = np.asarray(ev_labels, dtype=object)
+    obj_labels = np.asarray(obj_labels, dtype=object)
+    act_labels = np.asarray(act_labels, dtype=object)
+    ot_labels = np.asarray(ot_labels, dtype=object)
+
+    ret = {}
+    ret["activities"] = set(pandas_utils.format_unique(ocel.events[event_activity].unique()))
+    ret["object_types"] = set(pandas_utils.format_unique(ocel.objects[object_type].unique()))
+
+    # activities (regardless of the object type, and per object type)
+    mask = act >= 0
+    ret["activities_indep"] = _activity_metrics([act[mask]], [act_labels], ev[mask], obj[mask], ev_labels,
+                                                obj_labels, materialize)
+    mask = mask & (ot >= 0)
+    ret["activities_ot"] = _activity_metrics([ot[mask], act[mask]], [ot_labels, act_labels], ev[mask], obj[mask],
+                                             ev_labels, obj_labels, materialize)
+
+    # start / end activities: the first / last relation of every object of every object type
+    ot_obj = ot.astype(np.int64) * (len(obj_labels) + 1) + obj
+    for key, rows in (("start_activities", np.unique(ot_obj, return_index=True)[1]),
+                      ("end_activities", len(ot_obj) - 1 - np.unique(ot_obj[::-1], return_index=True)[1])):
+        rows = np.sort(rows)
+        rows = rows[(act[rows] >= 0) & (ot[rows] >= 0)]
+        ret[key] = _activity_metrics([ot[rows], act[rows]], [ot_labels, act_labels], ev[rows], obj[rows],
+                                     ev_labels, obj_labels, materialize)
+
+    # edges: the events of every object are sorted as in the events table,
+    # and the couples of consecutive events are the occurrences of the edges
+    events = ocel.events
+    events_codes, events_ids = pd.factorize(events[event_id])
+    first_rows = np.unique(events_codes, return_index=True)[1]
+    events_act, events_act_labels = pd.factorize(events[event_activity].to_numpy()[first_rows])
+    events_act_labels = np.asarray(events_act_labels, dtype=object)
+    timestamps = events[timestamp_key].iloc[first_rows].reset_index(drop=True)
+
+    objects = ocel.objects.drop_duplicates(subset=[object_id])
+    edge_ot, edge_ot_labels = pd.factorize(objects[object_type])
+    edge_ot_labels = np.asarray(edge_ot_labels, dtype=object)
+    rel_obj_ot = pd.Index(objects[object_id]).get_indexer(obj_labels)
+    rel_obj_ot = np.where(rel_obj_ot >= 0, edge_ot[rel_obj_ot], -1)[obj]
+    rel_event = pd.Index(events_ids).get_indexer(ev_labels)[ev]
+
+    mask = (rel_event >= 0) & (rel_obj_ot >= 0)
+    e_event = rel_event[mask]
+    e_obj = obj[mask]
+    e_ot = rel_obj_ot[mask]
+    order = np.lexsort((e_event, e_obj))
+    e_event, e_obj, e_ot = e_event[order], e_obj[order], e_ot[order]
+    consecutive = e_obj[1:] == e_obj[:-1]
+    source = e_event[:-1][consecutive]
+    target = e_event[1:][consecutive]
+    e_obj = e_obj[1:][consecutive]
+    e_ot = e_ot[1:][consecutive]
+    keys = [e_ot, events_act[source], events_act[target]]
+    labels = [edge_ot_labels, events_act_labels, events_act_labels]
+
+    couples, starts_couples, counts_couples = _group_distinct(keys, [source, target])
+    uniq, starts_uniq, counts_uniq = _group_distinct(keys, [e_obj])
+    triples, starts_triples, counts_triples = _group_distinct(keys, [source, target, e_obj])
+    group_keys = [c[starts_couples] for c in couples[:3]]
+
+    events_ids = np.asarray(events_ids, dtype=object)
+    ret["edges"] = {}
+    if materialize:
+        ret["edges"]["event_couples"] = _to_nested_dict(group_keys, labels, [
+            set(zip(events_ids[x].tolist(), events_ids[y].tolist())) for x, y in
+            zip(np.split(couples[3], starts_couples[1:]), np.split(couples[4], starts_couples[1:]))] if len(
+            starts_couples) else [])
+        ret["edges"]["unique_objects"] = _to_nested_dict(group_keys, labels, [
+            set(obj_labels[x].tolist()) for x in np.split(uniq[3], starts_uniq[1:])] if len(starts_uniq) else [])
+        ret["edges"]["total_objects"] = _to_nested_dict(group_keys, labels, [
+            set(zip(events_ids[x].tolist(), events_ids[y].tolist(), obj_labels[z].tolist())) for x, y, z in
+            zip(np.split(triples[3], starts_triples[1:]), np.split(triples[4], starts_triples[1:]),
+                np.split(triples[5], starts_triples[1:]))] if len(starts_triples) else [])
+    else:
+        ret["edges"]["event_couples"] = _to_nested_dict(group_keys, labels, counts_couples.tolist())
+        ret["edges"]["unique_objects"] = _to_nested_dict(group_keys, labels, counts_uniq.tolist())
+        ret["edges"]["total_objects"] = _to_nested_dict(group_keys, labels, counts_triples.tolist())
+
+    ret["edges_performance"] = {}
+    ret["edges_performance"]["event_couples"] = {}
+    ret["edges_performance"]["total_objects"] = {}
+
+    if compute_edges_performance:
+        ret["edges_performance"]["event_couples"] = _edges_performance(group_keys, labels, starts_couples,
+                                                                       couples[3], couples[4], timestamps,
+                                                                       parameters)
+        ret["edges_performance"]["total_objects"] = _edges_performance(group_keys, labels, starts_triples,
+                                                                       triples[3], triples[4], timestamps,
+                                                                       parameters)
+
+    return ret
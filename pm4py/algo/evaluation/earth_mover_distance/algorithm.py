@@ -19,7 +19,7 @@ visit <https://www.gnu.org/licenses/>.
 Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
-from pm4py.algo.evaluation.earth_mover_distance.variants import pyemd
+from pm4py.algo.evaluation.earth_mover_distance.variants import pyemd, transport
 from enum import Enum
 from pm4py.util import exec_utils
 from typing import Optional, Dict, Any, List
@@ -27,12 +27,13 @@ from typing import Optional, Dict, Any, List
 
 class Variants(Enum):
     PYEMD = pyemd
+    TRANSPORT = transport
 
 
-DEFAULT_VARIANT = Variants.PYEMD
+DEFAULT_VARIANT = Variants.TRANSPORT
 
 
-def apply(lang1: Dict[List[str], float], lang2: Dict[List[str], float], variant=Variants.PYEMD, parameters: Optional[Dict[Any, Any]] = None) -> float:
+def apply(lang1: Dict[List[str], float], lang2: Dict[List[str], float], variant=DEFAULT_VARIANT, parameters: Optional[Dict[Any, Any]] = None) -> float:
     """
     Gets the EMD language between the two languages
 
@@ -48,7 +49,9 @@ def apply(lang1: Dict[List[str], float], lang2: Dict[List[str], float], variant=
         Parameters
     variants
         Variants of the algorithm, including:
-            - Variants.PYEMD: pyemd based distance
+            - Variants.PYEMD: pyemd based distance (dense linear program)
+            - Variants.TRANSPORT: sparse transport problem (exact, or approximated by Sinkhorn iterations), with
+              a vectorized distance matrix
 
     Returns
     -------------
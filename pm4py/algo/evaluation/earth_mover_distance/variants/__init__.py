@@ -19,4 +19,4 @@ visit <https://www.gnu.org/licenses/>.
 Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
-from pm4py.algo.evaluation.earth_mover_distance.variants import pyemd
+from pm4py.algo.evaluation.earth_mover_distance.variants import pyemd, transport
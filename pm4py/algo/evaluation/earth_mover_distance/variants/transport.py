@@ -0,0 +1,477 @@
+'''
+    PM4Py â€“ A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschrÃ¤nkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from typing import Optional, Dict, Any, Union, List, Tuple
+
+import numpy as np
+
+from pm4py.algo.evaluation.earth_mover_distance.variants import pyemd
+from pm4py.util import exec_utils, constants
+
+
+class Parameters(Enum):
+    STRING_DISTANCE = "string_distance"
+    SOLVER = "solver"
+    MASS_THRESHOLD = "mass_threshold"
+    MAX_DISTANCE = "max_distance"
+    SINKHORN_REGULARIZATION = "sinkhorn_regularization"
+    SINKHORN_MAX_ITERATIONS = "sinkhorn_max_iterations"
+    SINKHORN_TOLERANCE = "sinkhorn_tolerance"
+    MULTIPROCESSING = "multiprocessing"
+    CORES = "cores"
+
+
+class Solvers(Enum):
+    EXACT = "exact"
+    SINKHORN = "sinkhorn"
+
+
+# size of the blocks (traces of the first language x traces of the second language) of the vectorized edit distance
+ROWS_PER_BLOCK = 64
+COLUMNS_PER_BLOCK = 512
+# cheapest edges per row/column of the distance matrix that are part of the first restricted transport problem
+CANDIDATE_EDGES = 8
+# below this (relative) regularization, the Gibbs kernel of the Sinkhorn iterations underflows
+MIN_SINKHORN_REGULARIZATION = 2e-3
+
+
+def truncate_language(language: Dict[Tuple[str, ...], float], mass_threshold: float) -> Tuple[Dict[Tuple[str, ...], float], float]:
+    """
+    Keeps the most probable traces of a stochastic language, until the given share of its probability mass is covered.
+    The kept traces are rescaled to the original total mass.
+
+    Parameters
+    --------------
+    language
+        Stochastic language
+    mass_threshold
+        Share of the probability mass to keep (1.0: the language is kept entirely)
+
+    Returns
+    --------------
+    truncated_language
+        Truncated stochastic language
+    dropped_mass
+        Probability mass of the traces which have been dropped
+    """
+    items = sorted(((tuple(x), float(y)) for x, y in language.items() if y > 0), key=lambda x: (-x[1], x[0]))
+    total = sum(x[1] for x in items)
+    if mass_threshold >= 1.0 or not items:
+        return dict(items), 0.0
+
+    cumulative = np.cumsum([x[1] for x in items])
+    num_kept = min(len(items), int(np.searchsorted(cumulative, mass_threshold * total * (1.0 - 1e-12))) + 1)
+    kept_mass = float(cumulative[num_kept - 1])
+    return {x: y * total / kept_mass for x, y in items[:num_kept]}, total - kept_mass
+
+
+def _encode_traces(traces: List[Tuple[str, ...]], activities: Dict[str, int], padding: int) -> Tuple[np.ndarray, np.ndarray]:
+    lengths = np.array([len(x) for x in traces], dtype=np.int64)
+    encoded = np.full((len(traces), max(1, int(lengths.max(initial=0)))), padding, dtype=np.int32)
+    for i, trace in enumerate(traces):
+        encoded[i, :len(trace)] = [activities[x] for x in trace]
+    return encoded, lengths
+
+
+def _myers_block(x: np.ndarray, lx: np.ndarray, y: np.ndarray, ly: np.ndarray, num_symbols: int) -> np.ndarray:
+    """
+    Edit distances between each row of x and each row of y (padded integer-coded traces), using the bit-parallel
+    algorithm of Myers in the block-based formulation of Hyyro: the vertical deltas of a column of the dynamic
+    programming table are stored as the bits of 64 bits words, and each event of the traces of y updates the words
+    of all the pairs at once (the horizontal delta at the bottom of a word is carried to the next word)
+    """
+    one = np.uint64(1)
+    num_words = max(1, (int(lx.max(initial=0)) + 63) // 64)
+    peq = np.zeros((num_words, len(lx), num_symbols + 1), dtype=np.uint64)
+    rows, positions = np.nonzero(np.arange(x.shape[1]) < lx[:, None])
+    np.bitwise_or.at(peq, (positions // 64, rows, x[rows, positions]), np.left_shift(one, (positions % 64).astype(np.uint64)))
+    y = np.where(y < 0, num_symbols, y)
+    last = np.maximum(lx, 1) - 1
+    last_word = (last // 64)[:, None]
+    last_bit = np.left_shift(one, (last % 64).astype(np.uint64))[:, None]
+    top_bit = np.left_shift(one, np.uint64(63))
+
+    pv = np.full((num_words, len(lx), len(ly)), np.iinfo(np.uint64).max, dtype=np.uint64)
+    mv = np.zeros_like(pv)
+    score = np.broadcast_to(lx[:, None], pv.shape[1:]).astype(np.int32)
+    for j in range(int(ly.max(initial=0))):
+        symbols = y[:, j]
+        active = (j < ly)[None, :]
+        # the first row of the table is 0, 1, 2, ..., hence the horizontal delta entering the first word is +1
+        h_positive = np.ones(pv.shape[1:], dtype=np.uint64)
+        h_negative = np.zeros(pv.shape[1:], dtype=np.uint64)
+        for w in range(num_words):
+            eq = peq[w][:, symbols]
+            xv = eq | mv[w]
+            eq |= h_negative
+            xh = (((eq & pv[w]) + pv[w]) ^ pv[w]) | eq
+            ph = mv[w] | ~(xh | pv[w])
+            mh = pv[w] & xh
+            is_last = active & (last_word == w)
+            score += (is_last & ((ph & last_bit) != 0)).astype(np.int32) - (is_last & ((mh & last_bit) != 0)).astype(np.int32)
+            next_positive = (ph & top_bit) >> np.uint64(63)
+            next_negative = (mh & top_bit) >> np.uint64(63)
+            ph = (ph << one) | h_positive
+            mh = (mh << one) | h_negative
+            pv[w] = mh | ~(xv | ph)
+            mv[w] = ph & xv
+            h_positive, h_negative = next_positive, next_negative
+    score[lx == 0] = ly
+    return score
+
+
+def _levenshtein_rows(x: np.ndarray, lx: np.ndarray, y: np.ndarray, ly: np.ndarray, num_symbols: int) -> np.ndarray:
+    ret = np.empty((len(lx), len(ly)), dtype=np.int32)
+    for j in range(0, len(ly), COLUMNS_PER_BLOCK):
+        yj, lyj = y[j:j + COLUMNS_PER_BLOCK], ly[j:j + COLUMNS_PER_BLOCK]
+        ret[:, j:j + COLUMNS_PER_BLOCK] = _myers_block(x, lx, yj[:, :max(1, int(lyj.max(initial=0)))], lyj, num_symbols)
+    return ret
+
+
+def normalized_levenshtein_matrix(traces1: List[Tuple[str, ...]], traces2: List[Tuple[str, ...]], parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> np.ndarray:
+    """
+    Computes the matrix of the normalized Levenshtein distances (edit distance divided by the length of the longest
+    trace) between the traces of two lists. The edit distances are computed on integer-coded traces in vectorized
+    bit-parallel blocks, which can be distributed on a pool of processes.
+
+    Parameters
+    --------------
+    traces1
+        First list of traces
+    traces2
+        Second list of traces
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.MULTIPROCESSING => computes the blocks of the matrix in a pool of processes
+          (default: constants.ENABLE_MULTIPROCESSING_DEFAULT)
+        - Parameters.CORES => number of processes computing the blocks of the matrix (default: number of CPUs - 2 when
+          multiprocessing is enabled, 1 otherwise)
+
+    Returns
+    --------------
+    distance_matrix
+        Matrix (len(traces1) x len(traces2)) of the normalized distances
+    """
+    if parameters is None:
+        parameters = {}
+
+    enable_multiprocessing = exec_utils.get_param_value(Parameters.MULTIPROCESSING, parameters,
+                                                        constants.ENABLE_MULTIPROCESSING_DEFAULT)
+    cores = max(1, exec_utils.get_param_value(Parameters.CORES, parameters,
+                                              multiprocessing.cpu_count() - 2 if enable_multiprocessing else 1))
+
+    activities = {}
+    for trace in traces1 + traces2:
+        for act in trace:
+            if act not in activities:
+                activities[act] = len(activities)
+
+    x, lx = _encode_traces(traces1, activities, -1)
+    y, ly = _encode_traces(traces2, activities, -2)
+    # sort the traces by length so that each block is padded to a similar length
+    order_x = np.argsort(lx, kind="stable")
+    order_y = np.argsort(ly, kind="stable")
+    x, lx, y, ly = x[order_x], lx[order_x], y[order_y], ly[order_y]
+
+    blocks = [(x[i:i + ROWS_PER_BLOCK, :max(1, int(lx[i:i + ROWS_PER_BLOCK].max(initial=0)))], lx[i:i + ROWS_PER_BLOCK])
+              for i in range(0, len(lx), ROWS_PER_BLOCK)]
+    if cores > 1 and len(blocks) > 1:
+        with ProcessPoolExecutor(max_workers=min(cores, len(blocks))) as executor:
+            rows = list(executor.map(_levenshtein_rows, [b[0] for b in blocks], [b[1] for b in blocks],
+                                     [y] * len(blocks), [ly] * len(blocks), [len(activities)] * len(blocks)))
+    else:
+        rows = [_levenshtein_rows(b[0], b[1], y, ly, len(activities)) for b in blocks]
+
+    distances = np.vstack(rows) if rows else np.zeros((0, len(ly)), dtype=np.int32)
+    lengths = np.maximum(lx[:, None], ly[None, :])
+    sorted_matrix = np.divide(distances, lengths, out=np.zeros(distances.shape), where=lengths > 0)
+
+    ret = np.empty_like(sorted_matrix)
+    ret[np.ix_(order_x, order_y)] = sorted_matrix
+    return ret
+
+
+def _northwest_corner(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    rows, columns = [], []
+    ra, rb = a.copy(), b.copy()
+    i = j = 0
+    while i < len(a) and j < len(b):
+        rows.append(i)
+        columns.append(j)
+        if ra[i] < rb[j]:
+            rb[j] -= ra[i]
+            i += 1
+        else:
+            ra[i] -= rb[j]
+            j += 1
+    return np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64)
+
+
+def _cheapest_edges(matrix: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    n, m = matrix.shape
+    k = min(k, m)
+    columns = np.argpartition(matrix, k - 1, axis=1)[:, :k] if k < m else np.broadcast_to(np.arange(m), (n, m))
+    return np.repeat(np.arange(n), k), columns.ravel()
+
+
+def solve_exact(a: np.ndarray, b: np.ndarray, distance_matrix: np.ndarray) -> float:
+    """
+    Solves the transport problem exactly by column generation. The LP is first solved on a sparse set of edges
+    (a northwest corner solution, which makes it feasible, and the cheapest edges of each row and column).
+    Then, the edges having a negative reduced cost with respect to the dual solution are added, until
+    the dual solution is feasible for the full problem (hence the restricted solution is optimal).
+
+    Parameters
+    --------------
+    a
+        First histogram
+    b
+        Second histogram (having the same total mass)
+    distance_matrix
+        Distances between the points of the two histograms
+
+    Returns
+    --------------
+    emd
+        Earth Mover's Distance
+    """
+    from scipy.optimize import linprog
+    from scipy.sparse import csr_matrix
+
+    n, m = distance_matrix.shape
+    tolerance = 1e-9 * max(1.0, float(distance_matrix.max(initial=0.0)))
+
+    rows0, columns0 = _northwest_corner(a, b)
+    rows1, columns1 = _cheapest_edges(distance_matrix, CANDIDATE_EDGES)
+    columns2, rows2 = _cheapest_edges(distance_matrix.T, CANDIDATE_EDGES)
+    edges = np.unique(np.concatenate([rows0, rows1, rows2]) * m + np.concatenate([columns0, columns1, columns2]))
+
+    while True:
+        rows, columns = edges // m, edges % m
+        num_edges = len(edges)
+        constraints = csr_matrix((np.ones(2 * num_edges), (np.concatenate([rows, n + columns]), np.tile(np.arange(num_edges), 2))),
+                                 shape=(n + m, num_edges))
+        res = linprog(distance_matrix[rows, columns], A_eq=constraints, b_eq=np.concatenate([a, b]), bounds=(0, None),
+                      method="highs")
+        if res.status != 0:
+            raise ValueError(f"Linear programming failed. Status: {res.status}, Message: {res.message}")
+
+        duals = res.eqlin.marginals
+        reduced_costs = distance_matrix - duals[:n, None] - duals[None, n:]
+        violated = reduced_costs < -tolerance
+        if not violated.any():
+            return float(res.fun)
+
+        new_rows, new_columns = _cheapest_edges(np.where(violated, reduced_costs, np.inf), CANDIDATE_EDGES)
+        is_violated = violated[new_rows, new_columns]
+        new_edges = np.setdiff1d(new_rows[is_violated] * m + new_columns[is_violated], edges)
+        if len(new_edges) == 0:
+            # the violations are numerical noise on edges which are already in the problem
+            return float(res.fun)
+        edges = np.union1d(edges, new_edges)
+
+
+def solve_sinkhorn(a: np.ndarray, b: np.ndarray, distance_matrix: np.ndarray, regularization: float = 0.01,
+                   max_iterations: int = 10000, tolerance: float = 1e-4) -> Tuple[float, float, float]:
+    """
+    Approximates the transport problem with entropic regularization (Sinkhorn iterations). The plan of the last
+    iteration is rounded to a feasible transport plan, whose cost is returned along with an upper and a lower bound
+    on the Earth Mover's Distance. The upper bound is the cost of the feasible plan, the lower bound is the value
+    of the dual solution obtained by c-transforming the Sinkhorn potentials.
+
+    Parameters
+    --------------
+    a
+        First histogram
+    b
+        Second histogram (having the same total mass)
+    distance_matrix
+        Distances between the points of the two histograms
+    regularization
+        Entropic regularization, relative to the maximum distance
+    max_iterations
+        Maximum number of Sinkhorn iterations
+    tolerance
+        The iterations stop when the (L1) error on the marginals is below this value
+
+    Returns
+    --------------
+    emd
+        Approximated Earth Mover's Distance
+    lower_bound
+        Lower bound on the Earth Mover's Distance
+    upper_bound
+        Upper bound on the Earth Mover's Distance
+    """
+    if regularization < MIN_SINKHORN_REGULARIZATION:
+        raise Exception("the Sinkhorn regularization should be at least " + str(MIN_SINKHORN_REGULARIZATION))
+
+    total = float(a.sum())
+    max_distance = float(distance_matrix.max(initial=0.0))
+    if total <= 0 or max_distance <= 0:
+        return 0.0, 0.0, 0.0
+    a = a / total
+    b = b / total
+
+    epsilon = regularization * max_distance
+    kernel = np.exp(-distance_matrix / epsilon)
+    u = np.ones(len(a))
+    v = np.ones(len(b))
+    for it in range(max_iterations):
+        u = a / (kernel @ v)
+        v = b / (kernel.T @ u)
+        if it % 10 == 0 and np.abs(u * (kernel @ v) - a).sum() < tolerance:
+            break
+
+    # lower bound: c-transforms of the dual potentials give a feasible dual solution
+    f = epsilon * np.log(u)
+    g = np.min(distance_matrix - f[:, None], axis=0)
+    f = np.min(distance_matrix - g[None, :], axis=1)
+    lower_bound = float(a @ f + b @ g)
+
+    # upper bound: rounding of the plan diag(u) K diag(v) to the transport polytope
+    u = u * np.minimum(a / (u * (kernel @ v)), 1.0)
+    v = v * np.minimum(b / (v * (kernel.T @ u)), 1.0)
+    error_a = a - u * (kernel @ v)
+    error_b = b - v * (kernel.T @ u)
+    upper_bound = float(u @ ((kernel * distance_matrix) @ v))
+    if error_a.sum() > 0:
+        upper_bound += float(error_a @ distance_matrix @ error_b) / float(error_a.sum())
+
+    lower_bound = min(max(lower_bound, 0.0), upper_bound)
+    return upper_bound * total, lower_bound * total, upper_bound * total
+
+
+def apply_with_bounds(lang1: Dict[List[str], float],
+                      lang2: Dict[List[str], float],
+                      parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Tuple[float, float, float]:
+    """
+    Computes the Earth Mover's Distance between two stochastic languages, along with a lower and an upper bound
+    on the distance between the full languages (the bounds account for the approximation of the Sinkhorn solver
+    and for the truncation of the languages).
+
+    Parameters
+    --------------
+    lang1
+        First stochastic language
+    lang2
+        Second stochastic language (having the same total mass)
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.STRING_DISTANCE => distance function between two traces encoded as strings (default: the
+          normalized Levenshtein distance, computed in a vectorized way on the integer-coded traces)
+        - Parameters.SOLVER => Solvers.EXACT (column generation on the sparse transport problem, default)
+          or Solvers.SINKHORN (entropic-regularized approximation)
+        - Parameters.MASS_THRESHOLD => share of the probability mass of each language that is kept (default: 1.0);
+          the least probable traces are dropped
+        - Parameters.MAX_DISTANCE => maximum distance between two traces, used to bound the truncation error
+          (default: 1.0, which is the case of the normalized Levenshtein distance)
+        - Parameters.SINKHORN_REGULARIZATION => entropic regularization, relative to the maximum distance (default: 0.01)
+        - Parameters.SINKHORN_MAX_ITERATIONS => maximum number of Sinkhorn iterations (default: 10000)
+        - Parameters.SINKHORN_TOLERANCE => tolerance on the marginals of the Sinkhorn iterations (default: 1e-4)
+        - Parameters.MULTIPROCESSING => computes the distance matrix in a pool of processes
+          (default: constants.ENABLE_MULTIPROCESSING_DEFAULT)
+        - Parameters.CORES => number of processes computing the distance matrix (default: number of CPUs - 2 when
+          multiprocessing is enabled, 1 otherwise)
+
+    Returns
+    --------------
+    emd
+        Earth Mover's Distance (between the truncated languages)
+    lower_bound
+        Lower bound on the Earth Mover's Distance between the full languages
+    upper_bound
+        Upper bound on the Earth Mover's Distance between the full languages
+    """
+    if parameters is None:
+        parameters = {}
+
+    distance_function = exec_utils.get_param_value(Parameters.STRING_DISTANCE, parameters, None)
+    solver = exec_utils.get_param_value(Parameters.SOLVER, parameters, Solvers.EXACT)
+    mass_threshold = exec_utils.get_param_value(Parameters.MASS_THRESHOLD, parameters, 1.0)
+    max_distance = exec_utils.get_param_value(Parameters.MAX_DISTANCE, parameters, 1.0)
+    regularization = exec_utils.get_param_value(Parameters.SINKHORN_REGULARIZATION, parameters, 0.01)
+    max_iterations = exec_utils.get_param_value(Parameters.SINKHORN_MAX_ITERATIONS, parameters, 10000)
+    tolerance = exec_utils.get_param_value(Parameters.SINKHORN_TOLERANCE, parameters, 1e-4)
+    solver = Solvers(solver)
+
+    lang1, dropped1 = truncate_language(lang1, mass_threshold)
+    lang2, dropped2 = truncate_language(lang2, mass_threshold)
+    traces1 = list(lang1)
+    traces2 = list(lang2)
+    first_histogram = np.array([lang1[x] for x in traces1], dtype=np.float64)
+    second_histogram = np.array([lang2[x] for x in traces2], dtype=np.float64)
+
+    sum1 = float(first_histogram.sum())
+    sum2 = float(second_histogram.sum())
+    if not np.isclose(sum1, sum2):
+        raise ValueError("Histograms must sum to the same total for EMD calculation.")
+    if not traces1 or not traces2:
+        return 0.0, 0.0, 0.0
+    second_histogram *= sum1 / sum2
+
+    if distance_function is None:
+        distance_matrix = normalized_levenshtein_matrix(traces1, traces2, parameters=parameters)
+    else:
+        acts_corresp = pyemd.get_act_correspondence(sorted(set(y for x in traces1 + traces2 for y in x)))
+        enc1 = ["".join(acts_corresp[y] for y in x) for x in traces1]
+        enc2 = ["".join(acts_corresp[y] for y in x) for x in traces2]
+        distance_matrix = np.array([[float(distance_function(x, y)) for y in enc2] for x in enc1]).reshape(len(enc1), len(enc2))
+
+    if solver == Solvers.SINKHORN:
+        emd, lower_bound, upper_bound = solve_sinkhorn(first_histogram, second_histogram, distance_matrix,
+                                                       regularization=regularization, max_iterations=max_iterations,
+                                                       tolerance=tolerance)
+    else:
+        emd = lower_bound = upper_bound = solve_exact(first_histogram, second_histogram, distance_matrix)
+
+    # moving the dropped mass costs at most max_distance per unit of mass
+    lower_bound = max(0.0, lower_bound - (dropped1 + dropped2) * max_distance)
+    upper_bound = upper_bound + max(dropped1, dropped2) * max_distance
+
+    return emd, lower_bound, upper_bound
+
+
+def apply(lang1: Dict[List[str], float],
+          lang2: Dict[List[str], float],
+          parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> float:
+    """
+    Computes the Earth Mover's Distance between two stochastic languages, solving the transport problem
+    on a sparse formulation (or with Sinkhorn iterations) and computing the distance matrix in a vectorized way.
+
+    Parameters
+    --------------
+    lang1
+        First stochastic language
+    lang2
+        Second stochastic language
+    parameters
+        Parameters of the algorithm (see apply_with_bounds)
+
+    Returns
+    --------------
+    emd
+        Earth Mover's Distance
+    """
+    return apply_with_bounds(lang1, lang2, parameters=parameters)[0]
@@ -26,9 +26,13 @@ from pm4py.objects.petri_net.utils.petri_utils import construct_trace_net
 from pm4py.objects.petri_net.utils.synchronous_product import construct
 from pm4py.statistics.start_activities.log.get import get_start_activities
 from pm4py.objects.petri_net.utils.align_utils import get_visible_transitions_eventually_enabled_by_marking
-from pm4py.util import exec_utils
+from pm4py.objects.petri_net.utils.compiled_net import CompiledPetriNet
+from pm4py.objects.trie.obj import Trie
+from pm4py.util import exec_utils, pandas_utils
 from pm4py.util import xes_constants
 import importlib.util
+import heapq
+from collections import Counter
 from enum import Enum
 from pm4py.util import constants
 from typing import Optional, Dict, Any, Union
@@ -46,6 +50,7 @@ class Parameters(Enum):
     SHOW_PROGRESS_BAR = "show_progress_bar"
     MULTIPROCESSING = "multiprocessing"
     CORES = "cores"
+    USE_PREFIX_TREE = "use_prefix_tree"
 
 
 def apply(log: Union[EventLog, EventStream, pd.DataFrame], net: PetriNet, marking: Marking, final_marking: Marking, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> float:
@@ -65,6 +70,10 @@ def apply(log: Union[EventLog, EventStream, pd.DataFrame], net: PetriNet, markin
     parameters
         Parameters of the algorithm, including:
             Parameters.ACTIVITY_KEY -> Activity key
+            Parameters.USE_PREFIX_TREE -> aligns all the prefixes of the log in a single search on the prefix tree
+            of the log (default: True), instead of aligning every prefix separately
+            Parameters.MULTIPROCESSING -> aligns the prefixes in a pool of processes (only when the prefix tree
+            is not used)
     """
 
     if parameters is None:
@@ -74,6 +83,7 @@ def apply(log: Union[EventLog, EventStream, pd.DataFrame], net: PetriNet, markin
 
     activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, log_lib.util.xes.DEFAULT_NAME_KEY)
     case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+    use_prefix_tree = exec_utils.get_param_value(Parameters.USE_PREFIX_TREE, parameters, True)
 
     # default value for precision, when no activated transitions (not even by looking at the initial marking) are found
     precision = 1.0
@@ -87,12 +97,21 @@ def apply(log: Union[EventLog, EventStream, pd.DataFrame], net: PetriNet, markin
     if type(log) is not pd.DataFrame:
         log = log_converter.apply(log, variant=log_converter.Variants.TO_EVENT_LOG, parameters=parameters)
 
-    prefixes, prefix_count = precision_utils.get_log_prefixes(log, activity_key=activity_key, case_id_key=case_id_key)
-    prefixes_keys = list(prefixes.keys())
-    fake_log = precision_utils.form_fake_log(prefixes_keys, activity_key=activity_key)
+    if use_prefix_tree:
+        prefixes, prefix_count, all_markings = align_prefix_tree_stop_markings(log, net, marking, final_marking,
+                                                                               parameters=parameters)
+        prefixes_keys = list(prefixes.keys())
+    else:
+        prefixes, prefix_count = precision_utils.get_log_prefixes(log, activity_key=activity_key,
+                                                                  case_id_key=case_id_key)
+        prefixes_keys = list(prefixes.keys())
+        fake_log = precision_utils.form_fake_log(prefixes_keys, activity_key=activity_key)
+
+        align_stop_marking = align_fake_log_stop_marking(fake_log, net, marking, final_marking, parameters=parameters)
+        all_markings = transform_markings_from_sync_to_original_net(align_stop_marking, net, parameters=parameters)
 
-    align_stop_marking = align_fake_log_stop_marking(fake_log, net, marking, final_marking, parameters=parameters)
-    all_markings = transform_markings_from_sync_to_original_net(align_stop_marking, net, parameters=parameters)
+    # visible transitions eventually enabled by the markings (computed once per marking)
+    enabled_visible = {}
 
     for i in range(len(prefixes)):
         markings = all_markings[i]
@@ -103,9 +122,12 @@ def apply(log: Union[EventLog, EventStream, pd.DataFrame], net: PetriNet, markin
             for m in markings:
                 # add to the set of activated transitions in the model the activated transitions
                 # for each prefix
-                activated_transitions_labels = activated_transitions_labels.union(
-                    x.label for x in utils.get_visible_transitions_eventually_enabled_by_marking(net, m) if
-                    x.label is not None)
+                marking_key = frozenset(m.items())
+                if marking_key not in enabled_visible:
+                    enabled_visible[marking_key] = set(
+                        x.label for x in utils.get_visible_transitions_eventually_enabled_by_marking(net, m) if
+                        x.label is not None)
+                activated_transitions_labels = activated_transitions_labels.union(enabled_visible[marking_key])
             escaping_edges = activated_transitions_labels.difference(log_transitions)
 
             sum_at += len(activated_transitions_labels) * prefix_count[prefixes_keys[i]]
@@ -144,6 +166,178 @@ def apply(log: Union[EventLog, EventStream, pd.DataFrame], net: PetriNet, markin
     return precision
 
 
+def align_prefix_tree_stop_markings(log, net, marking, final_marking, parameters=None):
+    """
+    Aligns all the prefixes of the log in a single search, on the product between the prefix tree of the log
+    and the Petri net, getting for every prefix the markings in which its optimal alignments stop.
+
+    As in the alignment of every prefix on its own synchronous product, only synchronous moves (cost 0)
+    and moves on invisible transitions (cost 1) are allowed. A state of the search is a node of the prefix tree
+    along with a marking of the Petri net: the shortest distance of a state is the same as in the search of the
+    prefix of the node, so the markings of the optimal alignments of a prefix are the ones of the states of its
+    node at minimum distance. The search stops expanding a state when no prefix in the subtree of its node
+    can still be improved.
+
+    Parameters
+    -------------
+    log
+        Event log / Pandas dataframe
+    net
+        Petri net
+    marking
+        Initial marking
+    final_marking
+        Final marking
+    parameters
+        Parameters of the algorithm
+
+    Returns
+    -------------
+    prefixes
+        Dictionary associating to every prefix (tuple of activities) the set of activities following it in the log
+    prefix_count
+        Number of occurrences of every prefix
+    markings
+        For every prefix (in the same order as prefixes), the list of markings of the original net
+        in which its optimal alignments stop (None if the prefix cannot be aligned)
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+    case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+    show_progress_bar = exec_utils.get_param_value(Parameters.SHOW_PROGRESS_BAR, parameters, constants.SHOW_PROGRESS_BAR)
+
+    if pandas_utils.check_is_pandas_dataframe(log):
+        traces = [tuple(x) for x in log.groupby(case_id_key)[activity_key].agg(list).to_dict().values()]
+    else:
+        traces = [tuple(x[activity_key] for x in trace) for trace in log]
+
+    # prefix tree of the log (the nodes are identified by their position in the list)
+    nodes = [Trie()]
+    children = [{}]
+    prefix_count = [0]
+    for trace, count in Counter(traces).items():
+        node = 0
+        for i, activity in enumerate(trace):
+            # the prefix of the current node is followed by the activity
+            prefix_count[node] += count
+            if activity not in children[node]:
+                nodes.append(Trie(label=activity, parent=nodes[node], depth=nodes[node].depth + 1))
+                nodes[node].children.append(nodes[-1])
+                children[node][activity] = len(nodes) - 1
+                children.append({})
+                prefix_count.append(0)
+            node = children[node][activity]
+        nodes[node].final = True
+
+    # the empty prefix is not aligned
+    needed = [i > 0 and prefix_count[i] > 0 for i in range(len(nodes))]
+    parents = [None] * len(nodes)
+    for i in range(len(nodes)):
+        for j in children[i].values():
+            parents[j] = i
+
+    compiled = CompiledPetriNet(net)
+    transitions_per_label = {}
+    invisible_transitions = []
+    for tid, t in enumerate(compiled.transitions):
+        if t.label is None:
+            # invisible transitions without input places are never enabled in the synchronous product
+            if compiled.pre[tid]:
+                invisible_transitions.append(tid)
+        else:
+            transitions_per_label.setdefault(t.label, []).append(tid)
+
+    inf = float("inf")
+    distance = [None] * len(nodes)
+    stop_markings = [None] * len(nodes)
+
+    def get_limit(i):
+        own = -inf
+        if needed[i]:
+            own = distance[i] if distance[i] is not None else inf
+        return max([own] + [limit[j] for j in children[i].values()])
+
+    # for every node, the maximum distance at which a state can still contribute to a prefix of its subtree
+    # (the children are inserted after their parent, so they are computed first)
+    limit = [-inf] * len(nodes)
+    for i in range(len(nodes) - 1, -1, -1):
+        limit[i] = get_limit(i)
+
+    progress = None
+    if importlib.util.find_spec("tqdm") and show_progress_bar and sum(needed) > 1:
+        from tqdm.auto import tqdm
+        progress = tqdm(total=sum(needed), desc="computing precision with alignments, completed prefixes :: ")
+
+    ini = compiled.encode_marking(marking)
+    open_set = [(0, 0, 0, ini)]
+    queued = 1
+    closed = set()
+    while open_set:
+        g, _, node, m = heapq.heappop(open_set)
+        if g > limit[0]:
+            break
+        if (node, m) in closed:
+            continue
+        closed.add((node, m))
+
+        if needed[node]:
+            if distance[node] is None:
+                distance[node] = g
+                stop_markings[node] = [m]
+                # updates the limits of the node and its ancestors
+                current = node
+                while current is not None:
+                    limit[current] = get_limit(current)
+                    current = parents[current]
+                if progress is not None:
+                    progress.update()
+            elif g == distance[node]:
+                stop_markings[node].append(m)
+
+        if g > limit[node]:
+            continue
+
+        for tid in invisible_transitions:
+            if compiled.is_enabled(tid, m):
+                new_state = (node, compiled.fire(tid, m))
+                if new_state not in closed and g + 1 <= limit[node]:
+                    heapq.heappush(open_set, (g + 1, queued, new_state[0], new_state[1]))
+                    queued += 1
+        for activity, child in children[node].items():
+            if g <= limit[child]:
+                for tid in transitions_per_label.get(activity, []):
+                    if compiled.is_enabled(tid, m):
+                        new_state = (child, compiled.fire(tid, m))
+                        if new_state not in closed:
+                            heapq.heappush(open_set, (g, queued, new_state[0], new_state[1]))
+                            queued += 1
+
+    # gracefully close progress bar
+    if progress is not None:
+        progress.close()
+    del progress
+
+    prefixes = {}
+    counts = Counter()
+    markings = []
+    for i in range(len(nodes)):
+        if needed[i]:
+            activities = []
+            current = i
+            while current != 0:
+                activities.append(nodes[current].label)
+                current = parents[current]
+            prefix = tuple(reversed(activities))
+            prefixes[prefix] = set(children[i])
+            counts[prefix] = prefix_count[i]
+            markings.append([compiled.decode_marking(x) for x in stop_markings[i]] if stop_markings[i] is not None
+                            else None)
+
+    return prefixes, counts, markings
+
+
 def transform_markings_from_sync_to_original_net(markings0, net, parameters=None):
     """
     Transform the markings of the sync net (in which alignment stops) into markings of the original net
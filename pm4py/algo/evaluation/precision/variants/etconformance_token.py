@@ -26,9 +26,13 @@ from pm4py.objects import log as log_lib
 from pm4py.algo.evaluation.precision import utils as precision_utils
 from pm4py.statistics.start_activities.log.get import get_start_activities
 from pm4py.objects.petri_net.utils.align_utils import get_visible_transitions_eventually_enabled_by_marking
-from pm4py.util import exec_utils
+from pm4py.objects.petri_net.utils.petri_utils import get_places_shortest_path_by_hidden, get_s_components_from_petri
+from pm4py.util import xes_constants
+from pm4py.util import exec_utils, variants_util, pandas_utils
 from enum import Enum
 from pm4py.util import constants
+from collections import Counter
+import importlib.util
 from typing import Optional, Dict, Any, Union
 from pm4py.objects.log.obj import EventLog
 from pm4py.objects.petri_net.obj import PetriNet, Marking
@@ -44,6 +48,7 @@ class Parameters(Enum):
     SHOW_PROGRESS_BAR = "show_progress_bar"
     MULTIPROCESSING = "multiprocessing"
     CORES = "cores"
+    USE_PREFIX_TREE = "use_prefix_tree"
 
 """
 Implementation of the approach described in paper
@@ -81,6 +86,8 @@ def apply(log: EventLog, net: PetriNet, marking: Marking, final_marking: Marking
     parameters
         Parameters of the algorithm, including:
             Parameters.ACTIVITY_KEY -> Activity key
+            Parameters.USE_PREFIX_TREE -> replays the prefixes incrementally along the prefix tree of the log
+            (default: True; applies only to the default token-based replay variant)
     """
 
     if parameters is None:
@@ -92,6 +99,7 @@ def apply(log: EventLog, net: PetriNet, marking: Marking, final_marking: Marking
     activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, log_lib.util.xes.DEFAULT_NAME_KEY)
     case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
     show_progress_bar = exec_utils.get_param_value(Parameters.SHOW_PROGRESS_BAR, parameters, constants.SHOW_PROGRESS_BAR)
+    use_prefix_tree = exec_utils.get_param_value(Parameters.USE_PREFIX_TREE, parameters, True)
 
     # default value for precision, when no activated transitions (not even by looking at the initial marking) are found
     precision = 1.0
@@ -111,12 +119,13 @@ def apply(log: EventLog, net: PetriNet, marking: Marking, final_marking: Marking
     if type(log) is not pd.DataFrame:
         log = log_converter.apply(log, variant=log_converter.Variants.TO_EVENT_LOG, parameters=parameters)
 
-    prefixes, prefix_count = precision_utils.get_log_prefixes(log, activity_key=activity_key, case_id_key=case_id_key)
-    prefixes_keys = list(prefixes.keys())
-    fake_log = precision_utils.form_fake_log(prefixes_keys, activity_key=activity_key)
-
-    aligned_traces = executor.apply(fake_log, net, marking, final_marking, variant=token_replay_variant,
-                                        parameters=parameters_tr)
+    if use_prefix_tree and exec_utils.get_variant(token_replay_variant) is token_replay:
+        sum_at, sum_ee = __apply_prefix_tree(log, net, marking, final_marking, activity_key=activity_key,
+                                             case_id_key=case_id_key, cleaning_token_flood=cleaning_token_flood,
+                                             show_progress_bar=show_progress_bar)
+    else:
+        sum_at, sum_ee = __apply_fake_log(log, net, marking, final_marking, token_replay_variant, parameters_tr,
+                                          activity_key=activity_key, case_id_key=case_id_key)
 
     # fix: also the empty prefix should be counted!
     start_activities = set(get_start_activities(log, parameters=parameters))
@@ -130,6 +139,35 @@ def apply(log: EventLog, net: PetriNet, marking: Marking, final_marking: Marking
         sum_ee += log[case_id_key].nunique() * len(diff)
     # end fix
 
+    if sum_at > 0:
+        precision = 1 - float(sum_ee) / float(sum_at)
+
+    return precision
+
+
+def __apply_fake_log(log, net, marking, final_marking, token_replay_variant, parameters_tr,
+                     activity_key=xes_constants.DEFAULT_NAME_KEY, case_id_key=constants.CASE_CONCEPT_NAME):
+    """
+    Computes the activated transitions and the escaping edges of the prefixes of the log,
+    replaying a fake log containing every prefix as a separate trace
+
+    Returns
+    ----------
+    sum_at
+        Activated transitions (weighted by the number of occurrences of the prefix)
+    sum_ee
+        Escaping edges (weighted by the number of occurrences of the prefix)
+    """
+    sum_at = 0
+    sum_ee = 0
+
+    prefixes, prefix_count = precision_utils.get_log_prefixes(log, activity_key=activity_key, case_id_key=case_id_key)
+    prefixes_keys = list(prefixes.keys())
+    fake_log = precision_utils.form_fake_log(prefixes_keys, activity_key=activity_key)
+
+    aligned_traces = executor.apply(fake_log, net, marking, final_marking, variant=token_replay_variant,
+                                    parameters=parameters_tr)
+
     for i in range(len(aligned_traces)):
         if aligned_traces[i]["trace_is_fit"]:
             log_transitions = set(prefixes[prefixes_keys[i]])
@@ -139,7 +177,75 @@ def apply(log: EventLog, net: PetriNet, marking: Marking, final_marking: Marking
             escaping_edges = activated_transitions_labels.difference(log_transitions)
             sum_ee += len(escaping_edges) * prefix_count[prefixes_keys[i]]
 
-    if sum_at > 0:
-        precision = 1 - float(sum_ee) / float(sum_at)
+    return sum_at, sum_ee
 
-    return precision
+
+def __apply_prefix_tree(log, net, marking, final_marking, activity_key=xes_constants.DEFAULT_NAME_KEY,
+                        case_id_key=constants.CASE_CONCEPT_NAME, cleaning_token_flood=False, show_progress_bar=True):
+    """
+    Computes the activated transitions and the escaping edges of the prefixes of the log,
+    walking the prefix tree of the log once: every transition is fired incrementally from the marking
+    reached by the parent prefix, and the visible transitions enabled at every node are computed once per marking
+
+    Returns
+    ----------
+    sum_at
+        Activated transitions (weighted by the number of occurrences of the prefix)
+    sum_ee
+        Escaping edges (weighted by the number of occurrences of the prefix)
+    """
+    sum_at = 0
+    sum_ee = 0
+
+    if pandas_utils.check_is_pandas_dataframe(log):
+        traces = [tuple(x) for x in log.groupby(case_id_key)[activity_key].agg(list).to_dict().values()]
+    else:
+        traces = [tuple(x[activity_key] for x in trace) for trace in log]
+    variants = Counter(traces)
+
+    # same settings as the replay of the fake log (stop at the first missing token, do not reach the final marking)
+    prefix_replay = token_replay.PrefixTrieReplay(net, marking, final_marking, token_replay.get_transitions_map(net),
+                                                  False, {}, {}, {},
+                                                  get_places_shortest_path_by_hidden(
+                                                      net, token_replay.TechnicalParameters.MAX_REC_DEPTH.value),
+                                                  False, activity_key=activity_key, reach_mark_through_hidden=False,
+                                                  stop_immediately_when_unfit=True, walk_through_hidden_trans=True,
+                                                  cleaning_token_flood=cleaning_token_flood,
+                                                  s_components=get_s_components_from_petri(net, marking, final_marking)
+                                                  if cleaning_token_flood else [])
+
+    progress = None
+    if importlib.util.find_spec("tqdm") and show_progress_bar and len(variants) > 1:
+        from tqdm.auto import tqdm
+        progress = tqdm(total=len(variants), desc="computing precision with token-based replay, completed variants :: ")
+
+    # for every prefix (node of the tree) the activities following it in the log, and its number of occurrences
+    prefix_state = {}
+    prefix_next = {}
+    prefix_count = Counter()
+    for variant, count in variants.items():
+        trace = variants_util.variant_to_trace(variant, parameters={constants.PARAMETER_CONSTANT_ACTIVITY_KEY: activity_key})
+        # the entire trace is not a prefix
+        for i, (node, missing, reached_marking) in enumerate(prefix_replay.replay_prefixes(trace[:-1])):
+            if node not in prefix_state:
+                prefix_state[node] = (missing, reached_marking)
+                prefix_next[node] = set()
+            prefix_next[node].add(variant[i + 1])
+            prefix_count[node] += count
+        if progress is not None:
+            progress.update()
+
+    for node, (missing, reached_marking) in prefix_state.items():
+        if missing == 0:
+            activated_transitions_labels = set(x.label for x in prefix_replay.get_enabled_visible_transitions(reached_marking)
+                                               if x.label is not None)
+            sum_at += len(activated_transitions_labels) * prefix_count[node]
+            escaping_edges = activated_transitions_labels.difference(prefix_next[node])
+            sum_ee += len(escaping_edges) * prefix_count[node]
+
+    # gracefully close progress bar
+    if progress is not None:
+        progress.close()
+    del progress
+
+    return sum_at, sum_ee
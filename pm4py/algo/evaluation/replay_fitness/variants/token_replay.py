@@ -109,12 +109,15 @@ def apply(log: EventLog, petri_net: PetriNet, initial_marking: Marking, final_ma
     cleaning_token_flood = exec_utils.get_param_value(Parameters.CLEANING_TOKEN_FLOOD, parameters, False)
     show_progress_bar = exec_utils.get_param_value(Parameters.SHOW_PROGRESS_BAR, parameters, constants.SHOW_PROGRESS_BAR)
     case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+    multiprocessing = exec_utils.get_param_value(Parameters.MULTIPROCESSING, parameters,
+                                                 constants.ENABLE_MULTIPROCESSING_DEFAULT)
 
     parameters_tr = {token_replay.Parameters.ACTIVITY_KEY: activity_key,
                      token_replay.Parameters.CONSIDER_REMAINING_IN_FITNESS: True,
                      token_replay.Parameters.CLEANING_TOKEN_FLOOD: cleaning_token_flood,
                      token_replay.Parameters.SHOW_PROGRESS_BAR: show_progress_bar,
-                     token_replay.Parameters.CASE_ID_KEY: case_id_key}
+                     token_replay.Parameters.CASE_ID_KEY: case_id_key,
+                     token_replay.Parameters.MULTIPROCESSING: multiprocessing}
 
     aligned_traces = executor.apply(log, petri_net, initial_marking, final_marking, variant=token_replay_variant,
                                     parameters=parameters_tr)
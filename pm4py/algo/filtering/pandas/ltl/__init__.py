@@ -20,3 +20,4 @@ Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
 from pm4py.algo.filtering.pandas.ltl import ltl_checker
+from pm4py.algo.filtering.pandas.ltl import case_scan
@@ -0,0 +1,409 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+from enum import Enum
+from typing import Optional, Dict, Any, Union, List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pm4py.util import exec_utils
+from pm4py.util.constants import CASE_CONCEPT_NAME
+from pm4py.util.constants import PARAMETER_CONSTANT_ATTRIBUTE_KEY, PARAMETER_CONSTANT_CASEID_KEY, \
+    PARAMETER_CONSTANT_RESOURCE_KEY, PARAMETER_CONSTANT_TIMESTAMP_KEY
+from pm4py.util.xes_constants import DEFAULT_NAME_KEY, DEFAULT_RESOURCE_KEY, DEFAULT_TIMESTAMP_KEY
+
+
+class Parameters(Enum):
+    CASE_ID_KEY = PARAMETER_CONSTANT_CASEID_KEY
+    ATTRIBUTE_KEY = PARAMETER_CONSTANT_ATTRIBUTE_KEY
+    TIMESTAMP_KEY = PARAMETER_CONSTANT_TIMESTAMP_KEY
+    RESOURCE_KEY = PARAMETER_CONSTANT_RESOURCE_KEY
+    ENABLE_TIMESTAMP = "enable_timestamp"
+    TIMESTAMP_DIFF_BOUNDARIES = "timestamp_diff_boundaries"
+
+
+# maximum number of couples of events that are materialized at once when checking timestamp constraints
+# on cases whose timestamps are not sorted
+MAX_PAIRS = 1 << 22
+
+# bound (in nanoseconds) to which the timestamp boundaries are clipped, to avoid overflows in the int64 arithmetic
+MAX_NS = 1 << 62
+
+
+def _codes(series: pd.Series) -> Tuple[np.ndarray, Dict[Any, int]]:
+    codes, uniques = pd.factorize(series)
+    return codes.astype(np.int64, copy=False), {v: i for i, v in enumerate(uniques.tolist())}
+
+
+def _to_ns(seconds: float, rounding) -> int:
+    return int(rounding(min(max(seconds * 1e9, -MAX_NS), MAX_NS)))
+
+
+class CaseScan(object):
+    """
+    Case-segmented view of a dataframe, on which the LTL patterns are checked by linear scans.
+
+    The events are stably sorted by case (keeping the order of the dataframe inside each case), and the case
+    identifiers, the attribute values, the timestamps (as nanoseconds) and the resources are integer-coded in
+    NumPy arrays. Events with a missing case identifier are not assigned to any case.
+    Every check returns a boolean mask over the cases (see case_ids).
+    """
+
+    def __init__(self, df: pd.DataFrame, case_id_key: str = CASE_CONCEPT_NAME, attribute_key: str = DEFAULT_NAME_KEY,
+                 timestamp_key: Optional[str] = None, resource_key: Optional[str] = None):
+        row_case, case_ids = pd.factorize(df[case_id_key])
+        self.row_case = row_case.astype(np.int64, copy=False)
+        self.case_ids = np.asarray(case_ids, dtype=object)
+        self.num_cases = len(self.case_ids)
+
+        rows = np.flatnonzero(self.row_case >= 0)
+        self.order = rows[np.argsort(self.row_case[rows], kind="stable")]
+        self.case = self.row_case[self.order]
+
+        attr, self.attr_index = _codes(df[attribute_key])
+        self.attr = attr[self.order]
+
+        self.timestamp = None
+        self.timestamp_valid = None
+        self._timestamps_sorted = None
+        if timestamp_key is not None:
+            timestamps = df[timestamp_key]
+            if getattr(timestamps.dtype, "tz", None) is not None:
+                timestamps = timestamps.dt.tz_convert(None)
+            self.timestamp_valid = ~timestamps.isna().to_numpy()[self.order]
+            self.timestamp = timestamps.to_numpy().astype("datetime64[ns]").view(np.int64)[self.order]
+
+        self.resource = None
+        self.num_resources = 0
+        if resource_key is not None:
+            resource, resource_index = _codes(df[resource_key])
+            self.resource = resource[self.order]
+            self.num_resources = len(resource_index)
+
+    def empty_mask(self) -> np.ndarray:
+        return np.zeros(self.num_cases, dtype=bool)
+
+    def get_case_ids(self, case_mask: np.ndarray) -> Set[Any]:
+        """
+        Gets the identifiers of the cases selected by the mask
+        """
+        return set(self.case_ids[case_mask].tolist())
+
+    def get_rows_mask(self, case_mask: np.ndarray, positive: bool = True) -> np.ndarray:
+        """
+        Gets the mask over the rows of the dataframe belonging to the cases selected by the mask
+        (positive=True), or to the other cases (positive=False)
+        """
+        rows_mask = np.zeros(len(self.row_case), dtype=bool)
+        rows_mask[self.order] = case_mask[self.case]
+        if not positive:
+            rows_mask = ~rows_mask
+        return rows_mask
+
+    def occurrences(self, value: Any, require_timestamp: bool = False) -> np.ndarray:
+        """
+        Gets the (sorted) positions, in the case-sorted arrays, of the events having the given attribute value
+        """
+        if value not in self.attr_index:
+            return np.zeros(0, dtype=np.int64)
+        selected = self.attr == self.attr_index[value]
+        if require_timestamp:
+            selected &= self.timestamp_valid
+        return np.flatnonzero(selected)
+
+    def timestamps_sorted(self) -> bool:
+        """
+        Checks if the (defined) timestamps are non-decreasing inside every case
+        """
+        if self._timestamps_sorted is None:
+            valid = np.flatnonzero(self.timestamp_valid)
+            same_case = self.case[valid[1:]] == self.case[valid[:-1]]
+            self._timestamps_sorted = bool(np.all(self.timestamp[valid[1:]][same_case] >= self.timestamp[valid[:-1]][same_case]))
+        return self._timestamps_sorted
+
+    def eventually_follows(self, attribute_values: List[Any], timestamp_diff_boundaries: Optional[List[Tuple[float, float]]] = None,
+                           enable_timestamp: bool = False) -> np.ndarray:
+        """
+        Gets the cases in which attribute_values[0] is eventually followed by attribute_values[1] ... eventually followed by
+        attribute_values[n-1].
+
+        Parameters
+        ---------------
+        attribute_values
+            Attribute values
+        timestamp_diff_boundaries
+            (Optional) for every step i, the minimum and maximum difference (in seconds) between the timestamps of the
+            events matching attribute_values[i+1] and attribute_values[i]
+        enable_timestamp
+            Considers only the events with a defined timestamp (requires the timestamp column)
+
+        Returns
+        ---------------
+        case_mask
+            Boolean mask over the cases
+        """
+        case_mask = self.empty_mask()
+        occurrences = [self.occurrences(v, require_timestamp=enable_timestamp) for v in attribute_values]
+
+        if not (enable_timestamp and timestamp_diff_boundaries):
+            # without timestamp constraints, the earliest completion of each prefix of the pattern is enough
+            reached = occurrences[0]
+            reached = reached[np.r_[True, self.case[reached[1:]] != self.case[reached[:-1]]]] if len(reached) else reached
+            for candidates in occurrences[1:]:
+                k = np.searchsorted(candidates, reached, side="right")
+                found = k < len(candidates)
+                reached, k = reached[found], k[found]
+                reached = candidates[k[self.case[candidates[k]] == self.case[reached]]]
+        else:
+            # every event completing the prefix of the pattern is kept, since the timestamp constraint of the next
+            # step depends on it
+            reached = occurrences[0]
+            for i in range(1, len(occurrences)):
+                if not len(reached):
+                    break
+                lo = _to_ns(timestamp_diff_boundaries[i - 1][0], np.ceil)
+                hi = _to_ns(timestamp_diff_boundaries[i - 1][1], np.floor)
+                if self.timestamps_sorted():
+                    reached = self.__reach_sorted(reached, occurrences[i], lo, hi)
+                else:
+                    reached = self.__reach_pairs(reached, occurrences[i], lo, hi)
+
+        case_mask[self.case[reached]] = True
+        return case_mask
+
+    def __reach_sorted(self, previous: np.ndarray, candidates: np.ndarray, lo: int, hi: int) -> np.ndarray:
+        # the timestamps are sorted inside the cases, hence the previous events of each case whose timestamp lies in
+        # [t - hi, t - lo] form a contiguous range, found by binary search on the (case, timestamp rank) key
+        t_prev = self.timestamp[previous]
+        t_cand = self.timestamp[candidates]
+        uniques, inverse = np.unique(np.concatenate([t_prev, t_cand - hi, t_cand - lo]), return_inverse=True)
+        base = len(uniques) + 1
+        n0, n1 = len(previous), len(candidates)
+        key_prev = self.case[previous] * base + inverse[:n0]
+        key_cand = self.case[candidates] * base
+        start = np.searchsorted(key_prev, key_cand + inverse[n0:n0 + n1], side="left")
+        end = np.minimum(np.searchsorted(key_prev, key_cand + inverse[n0 + n1:], side="right"),
+                         np.searchsorted(previous, candidates, side="left"))
+        return candidates[start < end]
+
+    def __reach_pairs(self, previous: np.ndarray, candidates: np.ndarray, lo: int, hi: int) -> np.ndarray:
+        # compares each candidate with all the previous events of the same case preceding it, materializing at most
+        # MAX_PAIRS couples at once
+        start = np.searchsorted(self.case[previous], self.case[candidates], side="left")
+        end = np.searchsorted(previous, candidates, side="left")
+        counts = end - start
+        cum_counts = np.cumsum(counts)
+        reached = np.zeros(len(candidates), dtype=bool)
+        i = 0
+        while i < len(candidates):
+            j = max(int(np.searchsorted(cum_counts, cum_counts[i] - counts[i] + MAX_PAIRS, side="right")), i + 1)
+            chunk_counts = counts[i:j]
+            owner = np.repeat(np.arange(i, j), chunk_counts)
+            offsets = np.arange(len(owner)) - np.repeat(np.cumsum(chunk_counts) - chunk_counts, chunk_counts)
+            diff = self.timestamp[candidates[owner]] - self.timestamp[previous[start[owner] + offsets]]
+            reached[owner[(diff >= lo) & (diff <= hi)]] = True
+            i = j
+        return candidates[reached]
+
+    def directly_follows(self, attribute_values: List[Any]) -> np.ndarray:
+        """
+        Gets the cases in which attribute_values[0] is directly followed by attribute_values[1] ... directly followed by
+        attribute_values[n-1]
+        """
+        case_mask = self.empty_mask()
+        k = len(attribute_values)
+        n = len(self.case) - k + 1
+        if n <= 0 or any(v not in self.attr_index for v in attribute_values):
+            return case_mask
+        matches = self.case[:n] == self.case[k - 1:]
+        for i, v in enumerate(attribute_values):
+            matches &= self.attr[i:n + i] == self.attr_index[v]
+        case_mask[self.case[:n][matches]] = True
+        return case_mask
+
+    def case_resources(self, value: Any) -> np.ndarray:
+        """
+        Gets the sorted unique (case, resource) couples, encoded as case * num_resources + resource, of the events
+        having the given attribute value and a defined resource
+        """
+        if value not in self.attr_index:
+            return np.zeros(0, dtype=np.int64)
+        selected = (self.attr == self.attr_index[value]) & (self.resource >= 0)
+        return np.unique(self.case[selected] * self.num_resources + self.resource[selected])
+
+    def four_eyes(self, A: Any, B: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gets the cases in which both A and B are done by some resource, and the cases in which the sets of resources
+        doing A and B intersect
+        """
+        pairs_a = self.case_resources(A)
+        pairs_b = self.case_resources(B)
+        both = self.empty_mask()
+        has_b = self.empty_mask()
+        both[pairs_a // max(self.num_resources, 1)] = True
+        has_b[pairs_b // max(self.num_resources, 1)] = True
+        both &= has_b
+        shared = self.empty_mask()
+        shared[np.intersect1d(pairs_a, pairs_b, assume_unique=True) // max(self.num_resources, 1)] = True
+        return both, shared
+
+    def different_persons(self, A: Any) -> np.ndarray:
+        """
+        Gets the cases in which A is done by more than one resource
+        """
+        pairs = self.case_resources(A)
+        return np.bincount(pairs // max(self.num_resources, 1), minlength=self.num_cases) > 1
+
+
+def eventually_follows_cases(df: pd.DataFrame, attribute_values: List[Any], parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Set[Any]:
+    """
+    Gets the identifiers of the cases in which attribute_values[0] is eventually followed by attribute_values[1] ...
+    eventually followed by attribute_values[n-1]
+
+    Parameters
+    ---------------
+    df
+        Dataframe
+    attribute_values
+        Attribute values
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.CASE_ID_KEY => the case identifier
+        - Parameters.ATTRIBUTE_KEY => the attribute
+        - Parameters.TIMESTAMP_KEY => the timestamp
+        - Parameters.TIMESTAMP_DIFF_BOUNDARIES => minimum and maximum difference (in seconds) between the timestamps
+        of consecutive steps
+        - Parameters.ENABLE_TIMESTAMP => considers only the events with a defined timestamp
+
+    Returns
+    ---------------
+    cases
+        Set of case identifiers
+    """
+    if parameters is None:
+        parameters = {}
+
+    case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, CASE_CONCEPT_NAME)
+    attribute_key = exec_utils.get_param_value(Parameters.ATTRIBUTE_KEY, parameters, DEFAULT_NAME_KEY)
+    timestamp_key = exec_utils.get_param_value(Parameters.TIMESTAMP_KEY, parameters, DEFAULT_TIMESTAMP_KEY)
+    timestamp_diff_boundaries = exec_utils.get_param_value(Parameters.TIMESTAMP_DIFF_BOUNDARIES, parameters, [])
+    enable_timestamp = exec_utils.get_param_value(Parameters.ENABLE_TIMESTAMP, parameters, len(timestamp_diff_boundaries) > 0)
+
+    scan = CaseScan(df, case_id_key, attribute_key, timestamp_key=timestamp_key if enable_timestamp else None)
+    return scan.get_case_ids(scan.eventually_follows(attribute_values, timestamp_diff_boundaries, enable_timestamp))
+
+
+def directly_follows_cases(df: pd.DataFrame, attribute_values: List[Any], parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Set[Any]:
+    """
+    Gets the identifiers of the cases in which attribute_values[0] is directly followed by attribute_values[1] ...
+    directly followed by attribute_values[n-1]
+
+    Parameters
+    ---------------
+    df
+        Dataframe
+    attribute_values
+        Attribute values
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.CASE_ID_KEY => the case identifier
+        - Parameters.ATTRIBUTE_KEY => the attribute
+
+    Returns
+    ---------------
+    cases
+        Set of case identifiers
+    """
+    if parameters is None:
+        parameters = {}
+
+    case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, CASE_CONCEPT_NAME)
+    attribute_key = exec_utils.get_param_value(Parameters.ATTRIBUTE_KEY, parameters, DEFAULT_NAME_KEY)
+
+    scan = CaseScan(df, case_id_key, attribute_key)
+    return scan.get_case_ids(scan.directly_follows(attribute_values))
+
+
+def four_eyes_violation_cases(df: pd.DataFrame, A: Any, B: Any, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Set[Any]:
+    """
+    Gets the identifiers of the cases in which some resource does both A and B
+
+    Parameters
+    ---------------
+    df
+        Dataframe
+    A
+        A attribute value
+    B
+        B attribute value
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.CASE_ID_KEY => the case identifier
+        - Parameters.ATTRIBUTE_KEY => the attribute
+        - Parameters.RESOURCE_KEY => the resource
+
+    Returns
+    ---------------
+    cases
+        Set of case identifiers
+    """
+    if parameters is None:
+        parameters = {}
+
+    case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, CASE_CONCEPT_NAME)
+    attribute_key = exec_utils.get_param_value(Parameters.ATTRIBUTE_KEY, parameters, DEFAULT_NAME_KEY)
+    resource_key = exec_utils.get_param_value(Parameters.RESOURCE_KEY, parameters, DEFAULT_RESOURCE_KEY)
+
+    scan = CaseScan(df, case_id_key, attribute_key, resource_key=resource_key)
+    return scan.get_case_ids(scan.four_eyes(A, B)[1])
+
+
+def different_persons_cases(df: pd.DataFrame, A: Any, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Set[Any]:
+    """
+    Gets the identifiers of the cases in which A is done by different resources
+
+    Parameters
+    ---------------
+    df
+        Dataframe
+    A
+        A attribute value
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.CASE_ID_KEY => the case identifier
+        - Parameters.ATTRIBUTE_KEY => the attribute
+        - Parameters.RESOURCE_KEY => the resource
+
+    Returns
+    ---------------
+    cases
+        Set of case identifiers
+    """
+    if parameters is None:
+        parameters = {}
+
+    case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, CASE_CONCEPT_NAME)
+    attribute_key = exec_utils.get_param_value(Parameters.ATTRIBUTE_KEY, parameters, DEFAULT_NAME_KEY)
+    resource_key = exec_utils.get_param_value(Parameters.RESOURCE_KEY, parameters, DEFAULT_RESOURCE_KEY)
+
+    scan = CaseScan(df, case_id_key, attribute_key, resource_key=resource_key)
+    return scan.get_case_ids(scan.different_persons(A))
@@ -21,7 +21,8 @@ Contact: info@processintelligence.solutions
 '''
 from enum import Enum
 
-from pm4py.util import exec_utils, pandas_utils, constants
+from pm4py.util import exec_utils
+from pm4py.algo.filtering.pandas.ltl import case_scan
 from pm4py.util.constants import CASE_CONCEPT_NAME
 from pm4py.util.constants import PARAMETER_CONSTANT_ATTRIBUTE_KEY, PARAMETER_CONSTANT_CASEID_KEY, \
     PARAMETER_CONSTANT_RESOURCE_KEY, PARAMETER_CONSTANT_TIMESTAMP_KEY
@@ -56,6 +57,8 @@ def eventually_follows(df0: pd.DataFrame, attribute_values: List[str], parameter
         Dataframe
     attribute_values
         A list of attribute_values attribute_values[n] follows attribute_values[n-1] follows ... follows attribute_values[0]
+        (the check is a linear scan over the case-sorted events, see case_scan.CaseScan, hence patterns of any length
+        and repeated attribute values are supported with bounded memory)
 
     parameters
         Parameters of the algorithm, including the attribute key and the positive parameter:
@@ -78,41 +81,9 @@ def eventually_follows(df0: pd.DataFrame, attribute_values: List[str], parameter
     timestamp_diff_boundaries = exec_utils.get_param_value(Parameters.TIMESTAMP_DIFF_BOUNDARIES, parameters, [])
     enable_timestamp = exec_utils.get_param_value(Parameters.ENABLE_TIMESTAMP, parameters, len(timestamp_diff_boundaries) > 0)
 
-    colset = [case_id_glue, attribute_key]
-    if enable_timestamp:
-        colset.append(timestamp_key)
-
-    df = df0.copy()
-    df = df[colset]
-    df = pandas_utils.insert_index(df)
-
-    df_a = [df[df[attribute_key] == attribute_value].copy() for attribute_value in attribute_values]
-
-    df_join = df_a[0].merge(df_a[1], on=case_id_glue, suffixes=('_0', "_1")).dropna()
-    df_join[constants.DEFAULT_INDEX_KEY] = df_join[constants.DEFAULT_INDEX_KEY + "_0"]
-    df_join["@@diffindex0"] = df_join[constants.DEFAULT_INDEX_KEY + "_1"] - df_join[constants.DEFAULT_INDEX_KEY + "_0"]
-    df_join = df_join[df_join["@@diffindex0"] > 0]
-
-    for i in range(2, len(df_a)):
-        df_join = df_join.merge(df_a[i], on=case_id_glue, suffixes=('', "_%d" % i)).dropna()
-        df_join["@@diffindex%d" % (i - 1)] = df_join[constants.DEFAULT_INDEX_KEY + "_%d" % i] - df_join[
-            constants.DEFAULT_INDEX_KEY + "_%d" % (i - 1)]
-        df_join = df_join[df_join["@@diffindex%d" % (i - 1)] > 0]
-
-    if enable_timestamp:
-        for i in range(1, len(df_a)):
-            df_join["@@difftimestamp%d" % (i - 1)] = pandas_utils.get_total_seconds(df_join[timestamp_key + "_%d" % i] - df_join[timestamp_key + '_%d' % (i-1)])
-
-            if timestamp_diff_boundaries:
-                df_join = df_join[df_join["@@difftimestamp%d" % (i-1)] >= timestamp_diff_boundaries[i-1][0]]
-                df_join = df_join[df_join["@@difftimestamp%d" % (i-1)] <= timestamp_diff_boundaries[i-1][1]]
-
-    i1 = df.set_index(case_id_glue).index
-    i2 = df_join.set_index(case_id_glue).index
-    if positive:
-        ret = df0[i1.isin(i2)]
-    else:
-        ret = df0[~i1.isin(i2)]
+    scan = case_scan.CaseScan(df0, case_id_glue, attribute_key, timestamp_key=timestamp_key if enable_timestamp else None)
+    satisfied = scan.eventually_follows(attribute_values, timestamp_diff_boundaries, enable_timestamp)
+    ret = df0[scan.get_rows_mask(satisfied, positive)]
 
     ret.attrs = copy(df0.attrs) if hasattr(df0, 'attrs') else {}
     return ret
@@ -150,30 +121,8 @@ def A_next_B_next_C(df0: pd.DataFrame, A: str, B: str, C: str, parameters: Optio
     attribute_key = exec_utils.get_param_value(Parameters.ATTRIBUTE_KEY, parameters, DEFAULT_NAME_KEY)
     positive = exec_utils.get_param_value(Parameters.POSITIVE, parameters, True)
 
-    df = df0.copy()
-    df = df[[case_id_glue, attribute_key]]
-    df = pandas_utils.insert_index(df)
-    df_A = df[df[attribute_key] == A].copy()
-    df_B = df[df[attribute_key] == B].copy()
-    df_C = df[df[attribute_key] == C].copy()
-    df_B["@@conceptname"] = df_B[case_id_glue]
-    df_B = df_B.groupby(case_id_glue).last().set_index("@@conceptname")
-    df_C["@@conceptname"] = df_C[case_id_glue]
-    df_C = df_C.groupby(case_id_glue).last().set_index("@@conceptname")
-
-    df_join = df_A.join(df_B, on=case_id_glue, rsuffix="_2").dropna().join(df_C, on=case_id_glue, rsuffix="_3").dropna()
-    df_join["@@diffindex"] = df_join[constants.DEFAULT_INDEX_KEY + "_2"] - df_join[constants.DEFAULT_INDEX_KEY]
-    df_join["@@diffindex2"] = df_join[constants.DEFAULT_INDEX_KEY + "_3"] - df_join[constants.DEFAULT_INDEX_KEY + "_2"]
-    df_join = df_join[df_join["@@diffindex"] == 1]
-    df_join = df_join[df_join["@@diffindex2"] == 1]
-
-    i1 = df.set_index(case_id_glue).index
-    i2 = df_join.set_index(case_id_glue).index
-
-    if positive:
-        ret = df0[i1.isin(i2)]
-    else:
-        ret = df0[~i1.isin(i2)]
+    scan = case_scan.CaseScan(df0, case_id_glue, attribute_key)
+    ret = df0[scan.get_rows_mask(scan.directly_follows([A, B, C]), positive)]
 
     ret.attrs = copy(df0.attrs) if hasattr(df0, 'attrs') else {}
     return ret
@@ -211,26 +160,9 @@ def four_eyes_principle(df0: pd.DataFrame, A: str, B: str, parameters: Optional[
     resource_key = exec_utils.get_param_value(Parameters.RESOURCE_KEY, parameters, DEFAULT_RESOURCE_KEY)
     positive = exec_utils.get_param_value(Parameters.POSITIVE, parameters, True)
 
-    df = df0.copy()
-    df = df[[case_id_glue, attribute_key, resource_key]]
-
-    df_A = df[df[attribute_key] == A].copy()
-    df_B = df[df[attribute_key] == B].copy()
-    df_B["@@conceptname"] = df_B[case_id_glue]
-    df_B = df_B.groupby(case_id_glue).last().set_index("@@conceptname")
-
-    df_join = df_A.join(df_B, on=case_id_glue, rsuffix="_2").dropna()
-    df_join_pos = df_join[df_join[resource_key] == df_join[resource_key + "_2"]]
-    df_join_neg = df_join[df_join[resource_key] != df_join[resource_key + "_2"]]
-
-    i1 = df.set_index(case_id_glue).index
-    i2 = df_join_pos.set_index(case_id_glue).index
-    i3 = df_join_neg.set_index(case_id_glue).index
-
-    if positive:
-        ret = df0[i1.isin(i3) & ~i1.isin(i2)]
-    else:
-        ret = df0[i1.isin(i2)]
+    scan = case_scan.CaseScan(df0, case_id_glue, attribute_key, resource_key=resource_key)
+    both, shared = scan.four_eyes(A, B)
+    ret = df0[scan.get_rows_mask(both & ~shared if positive else shared)]
 
     ret.attrs = copy(df0.attrs) if hasattr(df0, 'attrs') else {}
     return ret
@@ -264,24 +196,8 @@ def attr_value_different_persons(df0: pd.DataFrame, A: str, parameters: Optional
     resource_key = exec_utils.get_param_value(Parameters.RESOURCE_KEY, parameters, DEFAULT_RESOURCE_KEY)
     positive = exec_utils.get_param_value(Parameters.POSITIVE, parameters, True)
 
-    df = df0.copy()
-    df = df[[case_id_glue, attribute_key, resource_key]]
-
-    df_A = df[df[attribute_key] == A].copy()
-    df_B = df[df[attribute_key] == A].copy()
-    df_B["@@conceptname"] = df_B[case_id_glue]
-    df_B = df_B.groupby(case_id_glue).last().set_index("@@conceptname")
-
-    df_join = df_A.join(df_B, on=case_id_glue, rsuffix="_2").dropna()
-    df_join_neg = df_join[df_join[resource_key] != df_join[resource_key + "_2"]]
-
-    i1 = df.set_index(case_id_glue).index
-    i2 = df_join_neg.set_index(case_id_glue).index
-
-    if positive:
-        ret = df0[i1.isin(i2)]
-    else:
-        ret = df0[~i1.isin(i2)]
+    scan = case_scan.CaseScan(df0, case_id_glue, attribute_key, resource_key=resource_key)
+    ret = df0[scan.get_rows_mask(scan.different_persons(A), positive)]
 
     ret.attrs = copy(df0.attrs) if hasattr(df0, 'attrs') else {}
     return ret
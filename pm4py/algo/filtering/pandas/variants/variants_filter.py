@@ -22,6 +22,8 @@ Contact: info@processintelligence.solutions
 from pm4py.util.constants import CASE_CONCEPT_NAME
 from pm4py.statistics.traces.generic.pandas.case_statistics import get_variants_df
 from pm4py.statistics.variants.pandas import get as variants_get
+from pm4py.objects.log.util import pandas_numpy_variants
+from pm4py.util.xes_constants import DEFAULT_NAME_KEY
 from pm4py.util.constants import PARAMETER_CONSTANT_CASEID_KEY, PARAMETER_CONSTANT_ACTIVITY_KEY
 from enum import Enum
 from pm4py.util import exec_utils
@@ -46,7 +48,8 @@ def apply(df: pd.DataFrame, admitted_variants: List[List[str]], parameters: Opti
     df
         Dataframe
     admitted_variants
-        List of admitted variants (to include/exclude)
+        List of admitted variants (to include/exclude), expressed as tuples of activities
+        or as identifiers of the variants in the variant index of the dataframe
     parameters
         Parameters of the algorithm, including:
             Parameters.CASE_ID_KEY -> Column that contains the Case ID
@@ -64,16 +67,21 @@ def apply(df: pd.DataFrame, admitted_variants: List[List[str]], parameters: Opti
         parameters = {}
 
     case_id_glue = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, CASE_CONCEPT_NAME)
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, DEFAULT_NAME_KEY)
     positive = exec_utils.get_param_value(Parameters.POSITIVE, parameters, True)
-    variants_df = parameters["variants_df"] if "variants_df" in parameters else get_variants_df(df,
-                                                                                                parameters=parameters)
-    variants_df = variants_df[variants_df["variant"].isin(admitted_variants)]
-    i1 = df.set_index(case_id_glue).index
-    i2 = variants_df.index
+    if "variants_df" in parameters:
+        variants_df = parameters["variants_df"]
+        variants_df = variants_df[variants_df["variant"].isin(admitted_variants)]
+        mask = df.set_index(case_id_glue).index.isin(variants_df.index)
+    else:
+        variant_index = pandas_numpy_variants.get_variant_index(df, parameters={
+            pandas_numpy_variants.Parameters.CASE_ID_KEY: case_id_glue,
+            pandas_numpy_variants.Parameters.ACTIVITY_KEY: activity_key})
+        mask = variant_index.get_rows_mask(admitted_variants)
     if positive:
-        ret = df[i1.isin(i2)]
+        ret = df[mask]
     else:
-        ret = df[~i1.isin(i2)]
+        ret = df[~mask]
 
     ret.attrs = copy(df.attrs) if hasattr(df, 'attrs') else {}
     return ret
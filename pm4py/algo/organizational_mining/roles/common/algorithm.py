@@ -20,6 +20,7 @@ Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
 from collections import Counter
+import heapq
 import numpy as np
 from pm4py.util import exec_utils
 from enum import Enum
@@ -32,6 +33,7 @@ class Parameters(Enum):
     ROLES_THRESHOLD_PARAMETER = "roles_threshold_parameter"
     RESOURCE_KEY = constants.PARAMETER_CONSTANT_RESOURCE_KEY
     ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    SPARSE_CANDIDATES = "sparse_candidates"
 
 
 def get_sum_from_dictio_values(dictio, parameters=None):
@@ -253,6 +255,221 @@ def aggregate_roles_algorithm(roles, parameters=None):
     return roles
 
 
+class RolesMatrix(object):
+    """
+    Roles x resources matrix (CSR) of the number of occurrences of the resources in the roles,
+    supporting the addition of the rows of the aggregated roles without copying the matrix
+    """
+
+    def __init__(self, num_resources: int):
+        self.num_resources = num_resources
+        self.indptr = [0]
+        self.indices = np.zeros(1024, dtype=np.int64)
+        self.counts = np.zeros(1024, dtype=np.float64)
+        self.probs = np.zeros(1024, dtype=np.float64)
+
+    def add_row(self, indices: np.ndarray, counts: np.ndarray) -> int:
+        """
+        Adds a role (resources indices and number of occurrences) and returns its identifier
+        """
+        start = self.indptr[-1]
+        end = start + len(indices)
+        if end > len(self.indices):
+            size = max(end, 2 * len(self.indices))
+            self.indices = np.resize(self.indices, size)
+            self.counts = np.resize(self.counts, size)
+            self.probs = np.resize(self.probs, size)
+        self.indices[start:end] = indices
+        self.counts[start:end] = counts
+        self.probs[start:end] = counts / np.sum(counts)
+        self.indptr.append(end)
+        return len(self.indptr) - 2
+
+    def row(self, i: int):
+        """
+        Gets the resources indices, the number of occurrences and the normalized occurrences of a role
+        """
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.counts[start:end], self.probs[start:end]
+
+    def similarities(self, i: int, others: np.ndarray) -> np.ndarray:
+        """
+        Computes (vectorized) the similarity between a role and a collection of other roles,
+        i.e., the ratio between the intersection and the union of the normalized multisets of resources
+        (see find_role_similarity)
+        """
+        indices, _, probs = self.row(i)
+        dense = np.zeros(self.num_resources)
+        dense[indices] = probs
+
+        starts = np.asarray(self.indptr, dtype=np.int64)[others]
+        lengths = np.asarray(self.indptr, dtype=np.int64)[others + 1] - starts
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(np.sum(lengths))
+        rows = np.repeat(np.arange(len(others)), lengths)
+
+        values = self.probs[positions]
+        other_values = dense[self.indices[positions]]
+        num = np.bincount(rows, weights=np.minimum(values, other_values), minlength=len(others))
+        den = np.bincount(rows, weights=np.maximum(values, other_values), minlength=len(others))
+        den += np.sum(probs) - np.bincount(rows, weights=other_values, minlength=len(others))
+
+        return num / den
+
+
+def aggregate_roles_heap(roles, parameters=None):
+    """
+    Algorithm to aggregate similar roles (same output as aggregate_roles_algorithm).
+
+    Instead of recomputing the similarity between every couple of roles at every iteration, the similarities
+    exceeding the threshold are kept in a priority queue. After the aggregation of two roles, only the similarities
+    between the aggregated role and the remaining roles are computed and inserted in the queue, while the couples
+    involving the two aggregated roles are discarded lazily. The similarities are first estimated (vectorized on
+    a roles x resources matrix), and the couples of roles close to or above the threshold are then compared
+    with find_role_similarity, in the same order of aggregate_roles_iteration, so that the comparisons with the
+    threshold and the ties are resolved on the same floating point values.
+
+    With the sparse candidates option, the couples of roles are compared only if they share a resource
+    in the prefix of their normalized multisets (according to a global order of the resources, rarest first)
+    leaving out less than the minimum intersection required by the threshold (prefix filtering).
+    This does not change the result, since the couples which are not compared cannot exceed the threshold.
+
+    Parameters
+    --------------
+    roles
+        Roles
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.ROLES_THRESHOLD_PARAMETER => the similarity threshold to aggregate two roles
+        - Parameters.SPARSE_CANDIDATES => enables the prefix filtering of the couples of roles (default: True)
+
+    Returns
+    --------------
+    agg_roles
+        (Aggregated) roles
+    """
+    if parameters is None:
+        parameters = {}
+
+    threshold = exec_utils.get_param_value(Parameters.ROLES_THRESHOLD_PARAMETER, parameters, 0.65)
+    sparse_candidates = exec_utils.get_param_value(Parameters.SPARSE_CANDIDATES, parameters, True)
+
+    if len(roles) < 2:
+        return roles
+
+    # similarity = I / (2 - I), where I is the intersection of two normalized multisets of resources
+    min_intersection = 2.0 * threshold / (1.0 + threshold) - 1e-9
+    sparse_candidates = sparse_candidates and threshold >= 0
+
+    resources = {}
+    for role in roles:
+        for res in role[1]:
+            if res not in resources:
+                resources[res] = len(resources)
+
+    matrix = RolesMatrix(len(resources))
+    for role in roles:
+        matrix.add_row(np.array([resources[res] for res in role[1]], dtype=np.int64),
+                       np.array(list(role[1].values()), dtype=np.float64))
+
+    num_roles = len(roles)
+    activities = [role[0] for role in roles]
+    originators = [role[1] for role in roles]
+    strings = [constants.DEFAULT_VARIANT_SEP.join(x) for x in activities]
+    alive = [True] * num_roles
+
+    # global order of the resources (rarest first) for the prefix filtering
+    rank = np.argsort(np.argsort(np.bincount(matrix.indices[:matrix.indptr[-1]], minlength=len(resources)),
+                                 kind="stable"), kind="stable")
+    prefix_index = {}
+
+    def add_prefix(i):
+        indices, _, probs = matrix.row(i)
+        order = np.argsort(rank[indices])
+        suffix_mass = np.cumsum(probs[order][::-1])[::-1]
+        for res in indices[order][suffix_mass > min_intersection]:
+            prefix_index.setdefault(res, []).append(i)
+
+    def candidates(i, only_following):
+        if sparse_candidates:
+            indices = matrix.row(i)[0]
+            ret = set()
+            for res in indices:
+                if res in prefix_index:
+                    ret.update(prefix_index[res])
+            ret = [j for j in ret if alive[j] and j != i and (j > i or not only_following)]
+        else:
+            ret = [j for j in range(i + 1 if only_following else 0, len(alive)) if alive[j] and j != i]
+        return np.array(sorted(ret), dtype=np.int64)
+
+    heap = []
+    initial_sims = []
+
+    def exact_similarity(i, j):
+        # same operations (and rounding) of find_role_similarity, where the first role is the one preceding in the
+        # list of roles of aggregate_roles_iteration
+        return find_role_similarity([[activities[i], originators[i]], [activities[j], originators[j]]], 0, 1,
+                                    parameters=parameters)
+
+    def push_similarities(i, others, initial=False):
+        if len(others) == 0:
+            return
+        # the vectorized similarities (which can differ from the exact ones in the last bits) only select
+        # the couples of roles to compare
+        sim = matrix.similarities(i, others)
+        for j in others[sim > threshold - 1e-9].tolist():
+            # after the first iteration, the roles are sorted by their activities
+            a, b = (i, j) if strings[i] < strings[j] else (j, i)
+            s = exact_similarity(a, b)
+            if s > threshold:
+                heapq.heappush(heap, (-s, strings[a], strings[b], a, b))
+            if initial:
+                # in the first iteration, the roles are in the provided order
+                s = s if a == i else exact_similarity(i, j)
+                if s > threshold:
+                    initial_sims.append((-s, strings[i], strings[j], i, j))
+
+    if sparse_candidates:
+        for i in range(num_roles):
+            add_prefix(i)
+    for i in range(num_roles):
+        push_similarities(i, candidates(i, True), initial=True)
+
+    if not initial_sims:
+        return roles
+
+    entry = min(initial_sims)
+    while entry is not None:
+        i, j = entry[3], entry[4]
+        alive[i] = False
+        alive[j] = False
+
+        indices_i, counts_i, _ = matrix.row(i)
+        indices_j, counts_j, _ = matrix.row(j)
+        indices = np.union1d(indices_i, indices_j)
+        counts = np.zeros(len(indices))
+        counts[np.searchsorted(indices, indices_i)] += counts_i
+        counts[np.searchsorted(indices, indices_j)] += counts_j
+
+        k = matrix.add_row(indices, counts)
+        activities.append(sorted(list(set(activities[i]).union(set(activities[j])))))
+        originators.append(Counter(originators[i] + originators[j]))
+        strings.append(constants.DEFAULT_VARIANT_SEP.join(activities[k]))
+        alive.append(True)
+
+        if sparse_candidates:
+            add_prefix(k)
+        push_similarities(k, candidates(k, False))
+
+        entry = None
+        while heap and entry is None:
+            entry = heapq.heappop(heap)
+            if not (alive[entry[3]] and alive[entry[4]]):
+                entry = None
+
+    roles = [[activities[i], originators[i]] for i in range(len(alive)) if alive[i]]
+    return sorted(roles, key=lambda x: constants.DEFAULT_VARIANT_SEP.join(x[0]))
+
+
 def get_initial_roles(res_act_couples, parameters=None):
     """
     Get the initial list of roles (each activity is a stand-alone role)
@@ -290,7 +507,7 @@ def get_initial_roles(res_act_couples, parameters=None):
 
     roles = sorted(roles, key=lambda x: (len(x[0]), len(x[1]), constants.DEFAULT_VARIANT_SEP.join(sorted(x[0]))), reverse=True)
 
-    roles = aggregate_roles_algorithm(roles, parameters=parameters)
+    roles = aggregate_roles_heap(roles, parameters=parameters)
 
     roles = sorted(roles, key=lambda x: (len(x[0]), len(x[1]), constants.DEFAULT_VARIANT_SEP.join(sorted(x[0]))), reverse=True)
 
@@ -33,6 +33,7 @@ from pm4py.objects.org.roles.obj import Role
 
 class Parameters(Enum):
     ROLES_THRESHOLD_PARAMETER = "roles_threshold_parameter"
+    SPARSE_CANDIDATES = "sparse_candidates"
     RESOURCE_KEY = constants.PARAMETER_CONSTANT_RESOURCE_KEY
     ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
 
@@ -19,4 +19,4 @@ visit <https://www.gnu.org/licenses/>.
 Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
-from pm4py.algo.organizational_mining.sna import algorithm, util, variants
+from pm4py.algo.organizational_mining.sna import algorithm, util, variants, common
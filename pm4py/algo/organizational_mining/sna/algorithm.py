@@ -30,7 +30,7 @@ import numpy as np
 from enum import Enum
 from pm4py.util import constants
 
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, Tuple, List
 from pm4py.objects.log.obj import EventLog
 import pandas as pd
 from pm4py.objects.org.sna.obj import SNA
@@ -53,7 +53,7 @@ class Variants(Enum):
     JOINTACTIVITIES_PANDAS = pd_jointactivities
 
 
-def apply(log: Union[EventLog, pd.DataFrame], parameters: Optional[Dict[Union[str, Parameters], Any]] = None, variant=Variants.HANDOVER_LOG) -> SNA:
+def apply(log: Union[EventLog, pd.DataFrame], parameters: Optional[Dict[Union[str, Parameters], Any]] = None, variant=Variants.HANDOVER_LOG) -> Union[SNA, Tuple[Any, List[Any]]]:
     """
     Calculates a SNA metric
 
@@ -76,8 +76,9 @@ def apply(log: Union[EventLog, pd.DataFrame], parameters: Optional[Dict[Union[st
 
     Returns
     -----------
-    tuple
-        Tuple containing the metric matrix and the resources list
+    sna
+        SNA object, or (log variants with Parameters.RETURN_SPARSE) tuple containing the sparse metric matrix
+        and the resources list
     """
     if parameters is None:
         parameters = {}
@@ -88,6 +89,13 @@ def apply(log: Union[EventLog, pd.DataFrame], parameters: Optional[Dict[Union[st
                    Variants.SUBCONTRACTING_LOG]:
         log = log_conversion.apply(log, variant=log_conversion.Variants.TO_EVENT_LOG, parameters=parameters)
     sna = exec_utils.get_variant(variant).apply(log, parameters=parameters)
+    if not isinstance(sna, SNA):
+        # sparse matrix and list of resources (Parameters.RETURN_SPARSE of the log variants)
+        matrix, resources = sna
+        abs_max = np.max(np.abs(matrix.data)) if matrix.nnz > 0 else 0
+        if enable_metric_normalization and abs_max > 0:
+            matrix = matrix / abs_max
+        return matrix, resources
     abs_max = np.max(np.abs(list(sna.connections.values())))
     if enable_metric_normalization and abs_max > 0:
         for key in sna.connections:
@@ -0,0 +1,434 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from typing import Optional, Dict, Any, Union, List, Tuple, Collection
+
+import numpy as np
+
+from pm4py.objects.log.obj import EventLog
+from pm4py.objects.org.sna.obj import SNA
+from pm4py.util import exec_utils, constants, xes_constants
+
+
+class Parameters(Enum):
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    RESOURCE_KEY = constants.PARAMETER_CONSTANT_RESOURCE_KEY
+    BETA = "beta"
+    N = "n"
+    MULTIPROCESSING = "multiprocessing"
+    CORES = "cores"
+    CHUNK_SIZE = "chunk_size"
+    RETURN_SPARSE = "return_sparse"
+
+
+HANDOVER = "handover"
+SUBCONTRACTING = "subcontracting"
+WORKING_TOGETHER = "working_together"
+JOINT_ACTIVITIES = "joint_activities"
+
+DIRECTED = {HANDOVER: True, SUBCONTRACTING: True, WORKING_TOGETHER: False, JOINT_ACTIVITIES: False}
+
+DEFAULT_CHUNK_SIZE = 2 ** 22
+
+
+class ResourceSequences(object):
+    """
+    Integer-coded resources (and, optionally, activities) of the events of a log, sorted by case.
+    The events of the i-th case are at the positions [case_offsets[i], case_offsets[i + 1])
+    """
+
+    def __init__(self, resources: List[Any], resource_codes: np.ndarray, case_offsets: np.ndarray,
+                 activities: Optional[List[Any]] = None, activity_codes: Optional[np.ndarray] = None):
+        self.resources = resources
+        self.resource_codes = resource_codes
+        self.case_offsets = case_offsets
+        self.activities = activities
+        self.activity_codes = activity_codes
+
+    def __len__(self) -> int:
+        return len(self.case_offsets) - 1
+
+    def get_chunks(self, chunk_size: int) -> List[Tuple[int, int]]:
+        """
+        Splits the cases in ranges containing (unless a single case is longer) at most chunk_size events
+        """
+        targets = np.arange(chunk_size, self.case_offsets[-1], chunk_size)
+        boundaries = np.searchsorted(self.case_offsets, targets, side="right") - 1
+        boundaries = np.unique(np.concatenate([[0], boundaries, [len(self)]]))
+        if len(boundaries) == 1:
+            return [(0, 0)]
+        return [(int(boundaries[i]), int(boundaries[i + 1])) for i in range(len(boundaries) - 1)]
+
+    def subset(self, start: int, end: int) -> "ResourceSequences":
+        """
+        Returns the sequences of the cases in the range [start, end)
+        """
+        first, last = self.case_offsets[start], self.case_offsets[end]
+        return ResourceSequences(self.resources, self.resource_codes[first:last],
+                                 self.case_offsets[start:end + 1] - first, activities=self.activities,
+                                 activity_codes=self.activity_codes[first:last] if self.activity_codes is not None
+                                 else None)
+
+
+def encode_log(log: EventLog, include_activities: bool = False,
+               parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> ResourceSequences:
+    """
+    Encodes the resources of the events of an event log as integers (following the sorted list of resources)
+
+    Parameters
+    ---------------
+    log
+        Event log
+    include_activities
+        Encodes also the activities of the events (needed by the joint activities metric)
+    parameters
+        Parameters, including:
+        - Parameters.RESOURCE_KEY => the attribute to use as resource
+        - Parameters.ACTIVITY_KEY => the attribute to use as activity
+
+    Returns
+    ---------------
+    sequences
+        Integer-coded resource sequences
+    """
+    if parameters is None:
+        parameters = {}
+
+    resource_key = exec_utils.get_param_value(Parameters.RESOURCE_KEY, parameters, xes_constants.DEFAULT_RESOURCE_KEY)
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+
+    lengths = np.fromiter((len(trace) for trace in log), dtype=np.int64, count=len(log))
+    case_offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+
+    resources, resource_codes = _encode([event[resource_key] for trace in log for event in trace])
+    activities, activity_codes = None, None
+    if include_activities:
+        activities, activity_codes = _encode([event[activity_key] for trace in log for event in trace])
+
+    return ResourceSequences(resources, resource_codes, case_offsets, activities=activities,
+                             activity_codes=activity_codes)
+
+
+def _encode(values: List[Any]) -> Tuple[List[Any], np.ndarray]:
+    """
+    Internal method
+    """
+    if not values:
+        return [], np.zeros(0, dtype=np.int64)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    vocabulary, codes = np.unique(array, return_inverse=True)
+    return vocabulary.tolist(), codes.reshape(-1).astype(np.int64)
+
+
+def _followers(sequences: ResourceSequences) -> np.ndarray:
+    """
+    Number of events following each event in its case
+    """
+    lengths = np.diff(sequences.case_offsets)
+    return np.repeat(sequences.case_offsets[1:], lengths) - np.arange(len(sequences.resource_codes)) - 1
+
+
+def _matrix(rows: np.ndarray, cols: np.ndarray, data: np.ndarray, shape: Tuple[int, int]):
+    """
+    Internal method
+    """
+    from scipy.sparse import coo_matrix
+    return coo_matrix((data, (rows, cols)), shape=shape).tocsr()
+
+
+def _handover_chunk(sequences: ResourceSequences, beta: float, chunk_size: int):
+    """
+    Sums, for each couple of resources, beta^(distance - 1) over the couples of events of the same case
+    performed by the two resources (considering only the directly-following events when beta is 0)
+    """
+    codes = sequences.resource_codes
+    shape = (len(sequences.resources), len(sequences.resources))
+    followers = _followers(sequences)
+
+    matrix = _matrix(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0), shape)
+    rows, cols, data = [], [], []
+    buffered = 0
+    idx = np.arange(len(codes))
+    distance = 1
+    while True:
+        idx = idx[followers[idx] >= distance]
+        if len(idx) == 0:
+            break
+        rows.append(codes[idx])
+        cols.append(codes[idx + distance])
+        data.append(np.full(len(idx), beta ** (distance - 1), dtype=np.float64))
+        buffered += len(idx)
+        if buffered >= chunk_size:
+            matrix = matrix + _matrix(np.concatenate(rows), np.concatenate(cols), np.concatenate(data), shape)
+            rows, cols, data = [], [], []
+            buffered = 0
+        if beta == 0:
+            break
+        distance += 1
+
+    if rows:
+        matrix = matrix + _matrix(np.concatenate(rows), np.concatenate(cols), np.concatenate(data), shape)
+
+    return matrix
+
+
+def _subcontracting_chunk(sequences: ResourceSequences, n: int):
+    """
+    Returns, for each resource, the first event (if any) starting a subcontracting pattern
+    (the same resource performs the event n positions later in the case)
+    """
+    codes = sequences.resource_codes
+    starts = np.nonzero(_followers(sequences) >= n)[0]
+    starts = starts[codes[starts] == codes[starts + n]]
+    first_codes, first_idx = np.unique(codes[starts], return_index=True)
+    return first_codes, starts[first_idx]
+
+
+def _working_together_chunk(sequences: ResourceSequences):
+    """
+    Counts, for each couple of different resources, the cases in which both resources are involved
+    """
+    n_resources = len(sequences.resources)
+    case_idx = np.repeat(np.arange(len(sequences)), np.diff(sequences.case_offsets))
+    incidence = _matrix(case_idx, sequences.resource_codes, np.ones(len(case_idx)), (len(sequences), n_resources))
+    incidence.data[:] = 1.0
+    matrix = (incidence.T @ incidence).tocoo()
+    mask = matrix.row != matrix.col
+    return _matrix(matrix.row[mask], matrix.col[mask], matrix.data[mask], (n_resources, n_resources))
+
+
+def _joint_activities_chunk(sequences: ResourceSequences):
+    """
+    Counts the events of every activity performed by every resource
+    """
+    return _matrix(sequences.resource_codes, sequences.activity_codes, np.ones(len(sequences.resource_codes)),
+                   (len(sequences.resources), len(sequences.activities)))
+
+
+def _chunk_metrics(sequences: ResourceSequences, metrics: Collection[str], beta: float, n: int,
+                   chunk_size: int) -> Dict[str, Any]:
+    """
+    Computes the partial results of the given metrics on a chunk of cases
+    """
+    results = {}
+    if HANDOVER in metrics:
+        results[HANDOVER] = _handover_chunk(sequences, beta, chunk_size)
+    if SUBCONTRACTING in metrics:
+        results[SUBCONTRACTING] = _subcontracting_chunk(sequences, n)
+    if WORKING_TOGETHER in metrics:
+        results[WORKING_TOGETHER] = _working_together_chunk(sequences)
+    if JOINT_ACTIVITIES in metrics:
+        results[JOINT_ACTIVITIES] = _joint_activities_chunk(sequences)
+    return results
+
+
+def _variant_multiplicity(sequences: ResourceSequences, cases: np.ndarray) -> np.ndarray:
+    """
+    Returns, for each of the given cases, the number of cases having the same sequence of resources
+    """
+    lengths = np.diff(sequences.case_offsets)
+    multiplicity = np.zeros(len(cases), dtype=np.float64)
+    for length in np.unique(lengths[cases]):
+        same = np.nonzero(lengths == length)[0]
+        rows = sequences.resource_codes[sequences.case_offsets[same][:, None] + np.arange(length)]
+        _, inverse, counts = np.unique(rows, axis=0, return_inverse=True, return_counts=True)
+        mask = lengths[cases] == length
+        multiplicity[mask] = counts[inverse.reshape(-1)[np.searchsorted(same, cases[mask])]]
+    return multiplicity
+
+
+def _subcontracting(sequences: ResourceSequences, chunks: List[Tuple[int, int]], partials: List[Any], n: int):
+    """
+    Aggregates the subcontracting metric. As in the original definition over the variants, only the first
+    occurrence of a pattern for every resource (in the order of the cases) is considered, weighted by
+    the number of cases sharing its sequence of resources
+    """
+    codes = sequences.resource_codes
+    n_resources = len(sequences.resources)
+    first_codes = np.concatenate([partial[0] for partial in partials])
+    positions = np.concatenate([partial[1] + sequences.case_offsets[start]
+                                for (start, end), partial in zip(chunks, partials)]).astype(np.int64)
+    first_codes, first_idx = np.unique(first_codes, return_index=True)
+    positions = positions[first_idx]
+
+    cases = np.searchsorted(sequences.case_offsets, positions, side="right") - 1
+    weights = _variant_multiplicity(sequences, cases)
+
+    rows = np.tile(first_codes, max(n - 1, 0))
+    cols = np.concatenate([codes[positions + k] for k in range(1, n)] + [np.zeros(0, dtype=np.int64)])
+    data = np.tile(weights, max(n - 1, 0))
+
+    return _matrix(rows, cols, data / len(sequences), (n_resources, n_resources))
+
+
+def _joint_activities(counts):
+    """
+    Computes the Pearson correlation between the activity profiles of every couple of different resources
+    """
+    import warnings
+
+    counts = counts.toarray()
+    centered = counts - counts.mean(axis=1, keepdims=True)
+    norms = np.sqrt((centered ** 2).sum(axis=1))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        correlation = np.clip((centered @ centered.T) / np.outer(norms, norms), -1.0, 1.0)
+
+    rows, cols = np.nonzero(~np.eye(len(correlation), dtype=bool))
+    return _matrix(rows, cols, correlation[rows, cols], correlation.shape)
+
+
+def compute(sequences: ResourceSequences, metrics: Collection[str],
+            parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Dict[str, Any]:
+    """
+    Computes the given SNA metrics on integer-coded resource sequences, visiting the chunks of cases once
+    (with a pool of processes if multiprocessing is enabled, more cores are allowed and there is more than one chunk)
+
+    Parameters
+    ---------------
+    sequences
+        Integer-coded resource sequences
+    metrics
+        Metrics to compute (HANDOVER, SUBCONTRACTING, WORKING_TOGETHER, JOINT_ACTIVITIES)
+    parameters
+        Parameters, including:
+        - Parameters.BETA => beta value of the handover metric (default: 0)
+        - Parameters.N => n value of the subcontracting metric (default: 2)
+        - Parameters.MULTIPROCESSING => computes the chunks of cases in a pool of processes
+          (default: constants.ENABLE_MULTIPROCESSING_DEFAULT)
+        - Parameters.CORES => number of processes (default: number of CPUs - 2 when multiprocessing is enabled,
+          1 otherwise)
+        - Parameters.CHUNK_SIZE => maximum number of events in a chunk of cases, and of couples of events
+          buffered before their aggregation in the handover metric (default: 2^22)
+
+    Returns
+    ---------------
+    matrices
+        Dictionary associating to each metric a (sparse) resource x resource matrix
+    """
+    if parameters is None:
+        parameters = {}
+
+    beta = exec_utils.get_param_value(Parameters.BETA, parameters, 0)
+    n = exec_utils.get_param_value(Parameters.N, parameters, 2)
+    enable_multiprocessing = exec_utils.get_param_value(Parameters.MULTIPROCESSING, parameters,
+                                                        constants.ENABLE_MULTIPROCESSING_DEFAULT)
+    cores = max(1, exec_utils.get_param_value(Parameters.CORES, parameters,
+                                              multiprocessing.cpu_count() - 2 if enable_multiprocessing else 1))
+    chunk_size = exec_utils.get_param_value(Parameters.CHUNK_SIZE, parameters, DEFAULT_CHUNK_SIZE)
+
+    metrics = list(metrics)
+    chunks = sequences.get_chunks(chunk_size)
+    subsets = [sequences.subset(start, end) for start, end in chunks] if len(chunks) > 1 else [sequences]
+    args = (metrics, beta, n, chunk_size)
+    if cores > 1 and len(subsets) > 1:
+        with ProcessPoolExecutor(max_workers=min(cores, len(subsets))) as executor:
+            partials = list(executor.map(_chunk_metrics, subsets, *[[arg] * len(subsets) for arg in args]))
+    else:
+        partials = [_chunk_metrics(subset, *args) for subset in subsets]
+
+    matrices = {}
+    for metric in metrics:
+        if metric == SUBCONTRACTING:
+            matrices[metric] = _subcontracting(sequences, chunks, [partial[metric] for partial in partials], n)
+            continue
+        matrix = partials[0][metric]
+        for partial in partials[1:]:
+            matrix = matrix + partial[metric]
+        if metric == HANDOVER:
+            total = matrix.sum()
+            matrices[metric] = matrix / total if total > 0 else matrix
+        elif metric == WORKING_TOGETHER:
+            matrices[metric] = matrix / len(sequences) if len(sequences) > 0 else matrix
+        elif metric == JOINT_ACTIVITIES:
+            matrices[metric] = _joint_activities(matrix)
+    return matrices
+
+
+def to_sna(matrix, resources: List[Any], metric: str) -> SNA:
+    """
+    Transforms a resource x resource matrix into a SNA object
+
+    Parameters
+    ---------------
+    matrix
+        (Sparse) resource x resource matrix
+    resources
+        Resources corresponding to the rows/columns of the matrix
+    metric
+        Metric expressed by the matrix
+
+    Returns
+    ---------------
+    sna
+        SNA object
+    """
+    matrix = matrix.tocoo()
+    connections = {(resources[i], resources[j]): v for i, j, v in
+                   zip(matrix.row.tolist(), matrix.col.tolist(), matrix.data.tolist())}
+    return SNA(connections, DIRECTED[metric])
+
+
+def apply(log: EventLog, metric: str, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Union[
+        SNA, Tuple[Any, List[Any]]]:
+    """
+    Computes a SNA metric on an event log, through its integer-coded resource sequences
+
+    Parameters
+    ---------------
+    log
+        Event log
+    metric
+        Metric to compute (HANDOVER, SUBCONTRACTING, WORKING_TOGETHER, JOINT_ACTIVITIES)
+    parameters
+        Parameters, including:
+        - Parameters.RESOURCE_KEY => the attribute to use as resource
+        - Parameters.ACTIVITY_KEY => the attribute to use as activity
+        - Parameters.BETA => beta value of the handover metric (default: 0)
+        - Parameters.N => n value of the subcontracting metric (default: 2)
+        - Parameters.MULTIPROCESSING => computes the chunks of cases in a pool of processes
+          (default: constants.ENABLE_MULTIPROCESSING_DEFAULT)
+        - Parameters.CORES => number of processes (default: number of CPUs - 2 when multiprocessing is enabled,
+          1 otherwise)
+        - Parameters.CHUNK_SIZE => maximum number of events in a chunk of cases (default: 2^22)
+        - Parameters.RETURN_SPARSE => returns the sparse matrix along with the list of resources,
+          instead of the SNA object (default: False)
+
+    Returns
+    ---------------
+    sna
+        SNA object, or tuple containing the sparse resource x resource matrix and the list of resources
+    """
+    if parameters is None:
+        parameters = {}
+
+    return_sparse = exec_utils.get_param_value(Parameters.RETURN_SPARSE, parameters, False)
+
+    sequences = encode_log(log, include_activities=metric == JOINT_ACTIVITIES, parameters=parameters)
+    matrix = compute(sequences, [metric], parameters=parameters)[metric]
+
+    if return_sparse:
+        return matrix, sequences.resources
+    return to_sna(matrix, sequences.resources, metric)
@@ -19,15 +19,11 @@ visit <https://www.gnu.org/licenses/>.
 Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
-import numpy
-
-from pm4py.statistics.variants.log import get as variants_filter
-from pm4py.util import xes_constants as xes
 from enum import Enum
-from pm4py.util import constants, exec_utils
-from pm4py.util import variants_util
+from pm4py.util import constants
+from pm4py.algo.organizational_mining.sna.common import kernel
 
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, Tuple, List
 from pm4py.objects.log.obj import EventLog
 from pm4py.objects.org.sna.obj import SNA
 
@@ -36,12 +32,16 @@ class Parameters(Enum):
     ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
     RESOURCE_KEY = constants.PARAMETER_CONSTANT_RESOURCE_KEY
     BETA = "beta"
+    MULTIPROCESSING = "multiprocessing"
+    CORES = "cores"
+    CHUNK_SIZE = "chunk_size"
+    RETURN_SPARSE = "return_sparse"
 
 
 BETA = Parameters.BETA
 
 
-def apply(log: EventLog, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> SNA:
+def apply(log: EventLog, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Union[SNA, Tuple[Any, List[Any]]]:
     """
     Calculates the HW metric
 
@@ -52,54 +52,16 @@ def apply(log: EventLog, parameters: Optional[Dict[Union[str, Parameters], Any]]
     parameters
         Possible parameters of the algorithm:
             Parameters.BETA -> beta value as described in the Wil SNA paper
+            Parameters.MULTIPROCESSING -> computes the chunks of cases in a pool of processes
+            (default: constants.ENABLE_MULTIPROCESSING_DEFAULT)
+            Parameters.CORES -> number of processes computing the chunks of cases (default: number of CPUs - 2 when
+            multiprocessing is enabled, 1 otherwise)
+            Parameters.CHUNK_SIZE -> maximum number of events in a chunk of cases (default: 2^22)
+            Parameters.RETURN_SPARSE -> returns the sparse matrix along with the resources list (default: False)
 
     Returns
     -----------
-    tuple
-        Tuple containing the metric matrix and the resources list. Moreover, last boolean indicates that the metric is
-        directed.
+    sna
+        SNA object (the metric is directed), or tuple containing the sparse metric matrix and the resources list
     """
-    if parameters is None:
-        parameters = {}
-
-    resource_key = exec_utils.get_param_value(Parameters.RESOURCE_KEY, parameters, xes.DEFAULT_RESOURCE_KEY)
-    beta = exec_utils.get_param_value(Parameters.BETA, parameters, 0)
-
-    parameters_variants = {variants_filter.Parameters.ACTIVITY_KEY: resource_key,
-                           variants_filter.Parameters.ATTRIBUTE_KEY: resource_key}
-    variants_occ = {x: len(y) for x, y in variants_filter.get_variants(log, parameters=parameters_variants).items()}
-    variants_resources = list(variants_occ.keys())
-    resources = [variants_util.get_activities_from_variant(y) for y in variants_resources]
-
-    flat_list = sorted(list(set([item for sublist in resources for item in sublist])))
-
-    metric_matrix = numpy.zeros((len(flat_list), len(flat_list)))
-
-    sum_i_to_j = {}
-    dividend = 0
-
-    for idx, rv in enumerate(resources):
-        rvj = variants_resources[idx]
-        for i in range(len(rv) - 1):
-            res_i = flat_list.index(rv[i])
-            if not res_i in sum_i_to_j:
-                sum_i_to_j[res_i] = {}
-            for j in range(i + 1, len(rv)):
-                res_j = flat_list.index(rv[j])
-                if not res_j in sum_i_to_j[res_i]:
-                    sum_i_to_j[res_i][res_j] = 0
-                if beta == 0:
-                    sum_i_to_j[res_i][res_j] += variants_occ[rvj]
-                    dividend += variants_occ[rvj]
-                    break
-                else:
-                    sum_i_to_j[res_i][res_j] += variants_occ[rvj] * (beta ** (j - i - 1))
-                    dividend += variants_occ[rvj] * (beta ** (j - i - 1))
-
-    connections = {}
-    for key1 in sum_i_to_j:
-        for key2 in sum_i_to_j[key1]:
-            connections[(flat_list[key1], flat_list[key2])] = sum_i_to_j[key1][key2] / dividend
-
-    return SNA(connections, True)
-
+    return kernel.apply(log, kernel.HANDOVER, parameters=parameters)
@@ -19,17 +19,11 @@ visit <https://www.gnu.org/licenses/>.
 Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
-from collections import Counter
-
-import numpy as np
-
-from pm4py.objects.conversion.log import converter as log_converter
-from pm4py.util import xes_constants as xes
-from pm4py.util import exec_utils
 from enum import Enum
 from pm4py.util import constants
+from pm4py.algo.organizational_mining.sna.common import kernel
 
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, Tuple, List
 from pm4py.objects.log.obj import EventLog
 from pm4py.objects.org.sna.obj import SNA
 
@@ -38,9 +32,13 @@ class Parameters(Enum):
     ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
     RESOURCE_KEY = constants.PARAMETER_CONSTANT_RESOURCE_KEY
     METRIC_NORMALIZATION = "metric_normalization"
+    MULTIPROCESSING = "multiprocessing"
+    CORES = "cores"
+    CHUNK_SIZE = "chunk_size"
+    RETURN_SPARSE = "return_sparse"
 
 
-def apply(log: EventLog, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> SNA:
+def apply(log: EventLog, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Union[SNA, Tuple[Any, List[Any]]]:
     """
     Calculates the Joint Activities / Similar Task metric
 
@@ -49,39 +47,17 @@ def apply(log: EventLog, parameters: Optional[Dict[Union[str, Parameters], Any]]
     log
         Log
     parameters
-        Possible parameters of the algorithm
+        Possible parameters of the algorithm:
+            Parameters.MULTIPROCESSING -> computes the chunks of cases in a pool of processes
+            (default: constants.ENABLE_MULTIPROCESSING_DEFAULT)
+            Parameters.CORES -> number of processes computing the chunks of cases (default: number of CPUs - 2 when
+            multiprocessing is enabled, 1 otherwise)
+            Parameters.CHUNK_SIZE -> maximum number of events in a chunk of cases (default: 2^22)
+            Parameters.RETURN_SPARSE -> returns the sparse matrix along with the resources list (default: False)
 
     Returns
     -----------
-    tuple
-        Tuple containing the metric matrix and the resources list. Moreover, last boolean indicates that the metric is
-        directed.
+    sna
+        SNA object (the metric is not directed), or tuple containing the sparse metric matrix and the resources list
     """
-    from scipy.stats import pearsonr
-
-    if parameters is None:
-        parameters = {}
-
-    resource_key = exec_utils.get_param_value(Parameters.RESOURCE_KEY, parameters, xes.DEFAULT_RESOURCE_KEY)
-    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes.DEFAULT_NAME_KEY)
-    stream = log_converter.apply(log, variant=log_converter.TO_EVENT_STREAM, parameters={"deepcopy": False, "include_case_attributes": False})
-    activities = Counter(event[activity_key] for event in stream)
-    resources = Counter(event[resource_key] for event in stream)
-    activity_resource_couples = Counter((event[resource_key], event[activity_key]) for event in stream)
-    activities_keys = sorted(list(activities.keys()))
-    resources_keys = sorted(list(resources.keys()))
-    rsc_act_matrix = np.zeros((len(resources_keys), len(activities_keys)))
-    for arc in activity_resource_couples.keys():
-        i = resources_keys.index(arc[0])
-        j = activities_keys.index(arc[1])
-        rsc_act_matrix[i, j] += activity_resource_couples[arc]
-    connections = {}
-    for i in range(rsc_act_matrix.shape[0]):
-        vect_i = rsc_act_matrix[i, :]
-        for j in range(rsc_act_matrix.shape[0]):
-            if not i == j:
-                vect_j = rsc_act_matrix[j, :]
-                r, p = pearsonr(vect_i, vect_j)
-                connections[(resources_keys[i], resources_keys[j])] = r
-
-    return SNA(connections, False)
+    return kernel.apply(log, kernel.JOINT_ACTIVITIES, parameters=parameters)
@@ -20,3 +20,4 @@ Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
 from pm4py.algo.simulation.montecarlo.variants import petri_semaph_fifo
+from pm4py.algo.simulation.montecarlo.variants import petri_discrete_event
@@ -0,0 +1,621 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+import datetime
+import heapq
+import logging
+import multiprocessing
+import random
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+from enum import Enum
+from typing import Optional, Dict, Any, Union, Tuple, List
+
+import numpy as np
+
+from pm4py.algo.simulation.montecarlo.utils import replay
+from pm4py.objects.log.obj import EventLog, Trace, Event
+from pm4py.objects.petri_net.obj import PetriNet, Marking
+from pm4py.objects.petri_net.semantics import enabled_transitions, weak_execute
+from pm4py.objects.stochastic_petri import utils as stochastic_utils
+from pm4py.statistics.traces.generic.log import case_arrival
+from pm4py.util import exec_utils, xes_constants, constants
+from pm4py.util.dt_parsing.variants import strpfromiso
+
+
+class Parameters(Enum):
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_TIMESTAMP_KEY
+    TOKEN_REPLAY_VARIANT = "token_replay_variant"
+    PARAM_NUM_SIMULATIONS = "num_simulations"
+    PARAM_FORCE_DISTRIBUTION = "force_distribution"
+    PARAM_ENABLE_DIAGNOSTICS = "enable_diagnostics"
+    PARAM_DIAGN_INTERVAL = "diagn_interval"
+    PARAM_CASE_ARRIVAL_RATIO = "case_arrival_ratio"
+    PARAM_PROVIDED_SMAP = "provided_stochastic_map"
+    PARAM_MAP_RESOURCES_PER_PLACE = "map_resources_per_place"
+    PARAM_DEFAULT_NUM_RESOURCES_PER_PLACE = "default_num_resources_per_place"
+    PARAM_SMALL_SCALE_FACTOR = "small_scale_factor"
+    PARAM_MAX_THREAD_EXECUTION_TIME = "max_thread_exec_time"
+    PARAM_RANDOM_SEED = "random_seed"
+    PARAM_NUM_REPLICATIONS = "num_replications"
+    PARAM_CORES = "cores"
+
+
+class Outputs(Enum):
+    OUTPUT_PLACES_INTERVAL_TREES = "places_interval_trees"
+    OUTPUT_TRANSITIONS_INTERVAL_TREES = "transitions_interval_trees"
+    OUTPUT_CASES_EX_TIME = "cases_ex_time"
+    OUTPUT_MEDIAN_CASES_EX_TIME = "median_cases_ex_time"
+    OUTPUT_CASE_ARRIVAL_RATIO = "input_case_arrival_ratio"
+    OUTPUT_TOTAL_CASES_TIME = "total_cases_time"
+
+
+# kinds of the events of the simulation heap
+ARRIVAL, RESUME, COMPLETE, TIMEOUT = 0, 1, 2, 3
+
+
+class SimulatedCase(object):
+    def __init__(self, id, start_time, deadline):
+        """
+        State of a simulated case
+
+        Parameters
+        -------------
+        id
+            Identifier
+        start_time
+            Arrival time of the case
+        deadline
+            Time after which the case is terminated for timeout
+        """
+        self.id = id
+        self.start_time = start_time
+        self.deadline = deadline
+        self.trace = Trace()
+        self.marking = None
+        # units of the resources of the places currently held by the case
+        self.units = Counter()
+        # places whose resources should be acquired before proceeding
+        self.pending = []
+        # times in which the tokens of the case entered the places
+        self.entry_times = {}
+        self.transition = None
+        self.decision_time = None
+        self.duration = None
+        # time since which the case waits in the queue of a place (None if the case is not waiting)
+        self.waiting_since = None
+        self.active = True
+        self.terminated_correctly = False
+
+
+class DiscreteEventSimulation(object):
+    def __init__(self, net, im, fm, smap, case_arrival_ratio, resources_per_places, default_num_resources_per_places,
+                 max_case_time, enable_diagnostics, diagn_interval):
+        """
+        Discrete-event simulation of an accepting Petri net over virtual time.
+
+        Each place has a given number of resources: a token in the place holds one of them. Before firing a transition,
+        a case acquires (in order) one resource of every output place, waiting in the FIFO queue of the place when none is
+        available; as soon as all of them are acquired, the resources of the input places are released.
+        When the waiting cases form a cycle (each one waits for a resource held by another one), the deadlock is broken
+        by lending one more resource of its place to the case that waits since the longest time; the lent resource is
+        withdrawn at the next release of the place.
+        The events (arrivals of cases, resumptions after waiting, completions of the firings, timeouts) are processed in
+        order of time from a heap, hence the simulation is deterministic given the seed of the random generators.
+
+        Parameters
+        -------------
+        net
+            Accepting Petri net
+        im
+            Initial marking
+        fm
+            Final marking
+        smap
+            Stochastic map
+        case_arrival_ratio
+            Time between the arrival of two consecutive cases
+        resources_per_places
+            Number of resources of the specified places
+        default_num_resources_per_places
+            Number of resources of the other places
+        max_case_time
+            Maximum (virtual) execution time of a case
+        enable_diagnostics
+            Enable the logging of diagnostics about the current execution
+        diagn_interval
+            Interval of (virtual) time in which the diagnostics are printed
+        """
+        from intervaltree import IntervalTree
+
+        self.net = net
+        self.im = im
+        self.fm = fm
+        self.smap = smap
+        self.case_arrival_ratio = case_arrival_ratio
+        self.max_case_time = max_case_time
+        self.enable_diagnostics = enable_diagnostics
+        self.diagn_interval = diagn_interval
+        self.available = {place: resources_per_places[place] if place in resources_per_places else
+                          default_num_resources_per_places for place in net.places}
+        self.queues = {place: deque() for place in net.places}
+        # cases holding some resource of the places, and resources lent to break deadlocks
+        self.holders = {place: set() for place in net.places}
+        self.lent = Counter()
+        self.places_interval_trees = {place: IntervalTree() for place in net.places}
+        self.transitions_interval_trees = {trans: IntervalTree() for trans in net.transitions}
+        # the sets of the Petri net are iterated in order of name, to not depend on the memory addresses of the objects
+        self.transitions_order = {trans: i for i, trans in
+                                  enumerate(sorted(net.transitions, key=lambda x: (str(x.label), str(x.name))))}
+        self.input_places = {trans: sorted((arc.source for arc in trans.in_arcs), key=lambda x: str(x.name))
+                             for trans in net.transitions}
+        self.output_places = {trans: sorted((arc.target for arc in trans.out_arcs), key=lambda x: str(x.name))
+                              for trans in net.transitions}
+        self.heap = []
+        self.counter = 0
+        self.logger = logging.getLogger(__name__)
+
+    def schedule(self, time, kind, case):
+        # the counter breaks the ties in order of scheduling
+        heapq.heappush(self.heap, (time, self.counter, kind, case))
+        self.counter += 1
+
+    def acquire(self, case, time):
+        """
+        Acquires the pending resources of the case, returning False if the case is queued on some place
+        """
+        while case.pending:
+            place = case.pending[0]
+            if self.available[place] > 0 and self.first_waiting(place) is None:
+                self.available[place] -= 1
+                case.units[place] += 1
+                self.holders[place].add(case)
+                case.pending.pop(0)
+            else:
+                self.queues[place].append(case)
+                case.waiting_since = time
+                self.break_deadlock(case, time)
+                return False
+        return True
+
+    def grant(self, case, place, time):
+        """
+        Hands a resource of the place to the case waiting for it, resuming the case
+        """
+        case.units[place] += 1
+        self.holders[place].add(case)
+        case.pending.pop(0)
+        case.waiting_since = None
+        self.schedule(time, RESUME, case)
+
+    def break_deadlock(self, case, time):
+        """
+        Checks whether the waiting case is part of a deadlock, and in that case lends resources to the deadlocked cases
+        that wait since the longest time, until no deadlock is left
+        """
+        # waiting cases reachable from the case, following the holders of the resources they wait for
+        # (and the first case of the queues, which waits for the same holders)
+        reachable = set()
+        stack = [case]
+        while stack:
+            current = stack.pop()
+            if current in reachable:
+                continue
+            reachable.add(current)
+            place = current.pending[0]
+            for holder in self.holders[place]:
+                if holder.waiting_since is None:
+                    # a holder not waiting will eventually release its resources
+                    return
+                stack.append(holder)
+            stack.append(self.first_waiting(place))
+        deadlocked = reachable
+        while True:
+            # a case is deadlocked if all the holders of the resource it waits for are deadlocked
+            removed = True
+            while removed:
+                removed = False
+                for current in list(deadlocked):
+                    if not self.holders[current.pending[0]] <= deadlocked:
+                        deadlocked.remove(current)
+                        removed = True
+            if not deadlocked:
+                return
+            # only the first case of a queue can receive a resource, to keep the FIFO order
+            heads = [current for current in deadlocked if self.first_waiting(current.pending[0]) is current]
+            victim = min(heads, key=lambda x: (x.waiting_since, x.id))
+            place = victim.pending[0]
+            if self.enable_diagnostics:
+                self.logger.info(str(time) + " broken deadlock of " + str(len(deadlocked)) + " cases lending a resource"
+                                 " of " + str(place) + " to case ID " + str(victim.id))
+            self.queues[place].popleft()
+            self.lent[place] += 1
+            self.grant(victim, place, time)
+            deadlocked.remove(victim)
+
+    def first_waiting(self, place):
+        """
+        Returns the first active case waiting for a resource of the place
+        """
+        queue = self.queues[place]
+        while queue and not queue[0].active:
+            queue.popleft()
+        return queue[0] if queue else None
+
+    def release(self, case, place, time):
+        """
+        Releases a resource of the place held by the case, handing it to the first case waiting for it
+        """
+        if case.units[place] <= 0:
+            return
+        case.units[place] -= 1
+        if case.units[place] == 0:
+            self.holders[place].discard(case)
+        if self.lent[place] > 0:
+            # the resource lent to break a deadlock is withdrawn, which may leave the waiting cases in a deadlock again
+            self.lent[place] -= 1
+            waiting = self.first_waiting(place)
+            if waiting is not None:
+                self.break_deadlock(waiting, time)
+            return
+        waiting = self.first_waiting(place)
+        if waiting is not None:
+            self.queues[place].popleft()
+            self.grant(waiting, place, time)
+            return
+        self.available[place] += 1
+
+    def proceed(self, case, time):
+        """
+        Continues the case after all its pending resources have been acquired
+        """
+        from intervaltree import Interval
+
+        if case.marking is None:
+            case.marking = copy(self.im)
+            for place in self.im:
+                case.entry_times[place] = [time] * self.im[place]
+            self.decide(case, time)
+        else:
+            waiting_time = time - case.decision_time
+            if waiting_time > 0:
+                self.transitions_interval_trees[case.transition].add(Interval(case.decision_time, time))
+            # as in the FIFO variant, the resources of the input places are released once the output places are acquired
+            for place in self.input_places[case.transition]:
+                self.release(case, place, time)
+            # the sampled time includes the waiting time
+            self.schedule(max(case.decision_time + case.duration, time), COMPLETE, case)
+
+    def decide(self, case, time):
+        """
+        Picks the next transition to fire, or terminates the case
+        """
+        if self.fm <= case.marking:
+            self.terminate(case, time, True)
+            return
+        et = sorted(enabled_transitions(self.net, case.marking), key=self.transitions_order.get)
+        if not et:
+            self.terminate(case, time, False)
+            return
+        ct = stochastic_utils.pick_transition(et, self.smap)
+        duration = -1
+        while duration < 0:
+            duration = self.smap[ct].get_value() if ct in self.smap else 0.0
+        case.transition = ct
+        case.decision_time = time
+        case.duration = duration
+        case.pending = list(self.output_places[ct])
+        if self.acquire(case, time):
+            self.proceed(case, time)
+
+    def complete(self, case, time):
+        """
+        Completes the firing of the current transition of the case
+        """
+        from intervaltree import Interval
+
+        ct = case.transition
+        case.marking = weak_execute(ct, case.marking)
+        if ct.label is not None:
+            case.trace.append(Event({xes_constants.DEFAULT_NAME_KEY: ct.label,
+                                     xes_constants.DEFAULT_TIMESTAMP_KEY: strpfromiso.fix_naivety(
+                                         datetime.datetime.fromtimestamp(time))}))
+        for place in self.input_places[ct]:
+            entry_times = case.entry_times.get(place)
+            if entry_times:
+                entry_time = entry_times.pop(0)
+                if time - entry_time > 0:
+                    self.places_interval_trees[place].add(Interval(entry_time, time))
+        for place in self.output_places[ct]:
+            case.entry_times.setdefault(place, []).append(time)
+        self.decide(case, time)
+
+    def terminate(self, case, time, terminated_correctly):
+        """
+        Terminates the case, releasing the resources it holds
+        """
+        case.active = False
+        case.waiting_since = None
+        case.terminated_correctly = terminated_correctly
+        for place in list(case.units):
+            while case.units[place] > 0:
+                self.release(case, place, time)
+        if self.enable_diagnostics:
+            self.logger.info(str(time) + " terminated " + ("successfully" if terminated_correctly else "unsuccessfully")
+                             + " case ID " + str(case.id))
+
+    def log_diagnostics(self, time):
+        blocked = {place: len(self.queues[place]) for place in self.net.places if self.available[place] == 0}
+        if blocked:
+            self.logger.info(str(time) + " diagnostics: blocked places by resources (waiting cases): " + str(blocked))
+
+    def run(self, no_simulations, start_time):
+        """
+        Simulates the given number of cases
+
+        Parameters
+        -------------
+        no_simulations
+            Number of cases
+        start_time
+            Arrival time of the first case
+
+        Returns
+        -------------
+        cases
+            Simulated cases, in order of arrival
+        """
+        cases = []
+        for i in range(no_simulations):
+            case = SimulatedCase(i, start_time + i * self.case_arrival_ratio,
+                                 start_time + i * self.case_arrival_ratio + self.max_case_time)
+            cases.append(case)
+            self.schedule(case.start_time, ARRIVAL, case)
+            self.schedule(case.deadline, TIMEOUT, case)
+
+        next_diagnostics = start_time + self.diagn_interval
+        while self.heap:
+            time, _, kind, case = heapq.heappop(self.heap)
+            if self.enable_diagnostics and time >= next_diagnostics:
+                self.log_diagnostics(time)
+                next_diagnostics = time + self.diagn_interval
+            if not case.active:
+                continue
+            if kind == ARRIVAL:
+                case.pending = [place for place in self.im for _ in range(self.im[place])]
+                if self.acquire(case, time):
+                    self.proceed(case, time)
+            elif kind == RESUME:
+                if self.acquire(case, time):
+                    self.proceed(case, time)
+            elif kind == COMPLETE:
+                self.complete(case, time)
+            elif kind == TIMEOUT:
+                self.terminate(case, time, False)
+
+        return cases
+
+
+def _set_seed(seed):
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed % (2 ** 32))
+
+
+def _simulate(net, im, fm, smap, case_arrival_ratio, seed, settings):
+    """
+    Runs a simulation, returning the simulated log and the result of the simulation
+    """
+    from statistics import median
+
+    _set_seed(seed)
+
+    simulation = DiscreteEventSimulation(net, im, fm, smap, case_arrival_ratio, settings["resources_per_places"],
+                                         settings["default_num_resources_per_places"], settings["max_case_time"],
+                                         settings["enable_diagnostics"], settings["diagn_interval"])
+    # the start timestamp is set to 1000000 instead of 0 to avoid problems with 32 bit machines
+    cases = simulation.run(settings["no_simulations"], 1000000)
+    cases = [case for case in cases if case.terminated_correctly]
+
+    timestamp_key = xes_constants.DEFAULT_TIMESTAMP_KEY
+    cases_ex_time = [case.trace[-1][timestamp_key].timestamp() - case.trace[0][timestamp_key].timestamp()
+                     if case.trace else 0 for case in cases]
+    log = EventLog([case.trace for case in cases])
+    timestamps = [ev[timestamp_key].timestamp() for trace in log for ev in trace]
+
+    transitions_interval_trees = {t.name: y for t, y in simulation.transitions_interval_trees.items()}
+
+    return log, {Outputs.OUTPUT_PLACES_INTERVAL_TREES.value: simulation.places_interval_trees,
+                 Outputs.OUTPUT_TRANSITIONS_INTERVAL_TREES.value: transitions_interval_trees,
+                 Outputs.OUTPUT_CASES_EX_TIME.value: cases_ex_time,
+                 Outputs.OUTPUT_MEDIAN_CASES_EX_TIME.value: median(cases_ex_time) if cases_ex_time else 0,
+                 Outputs.OUTPUT_CASE_ARRIVAL_RATIO.value: case_arrival_ratio,
+                 Outputs.OUTPUT_TOTAL_CASES_TIME.value: max(timestamps) - timestamps[0] if timestamps else 0}
+
+
+def _simulate_replication(net, im, fm, smap, case_arrival_ratio, seed, settings):
+    # the places are not shared with the parent process: the interval trees are keyed by the name of the place
+    log, result = _simulate(net, im, fm, smap, case_arrival_ratio, seed, settings)
+    result[Outputs.OUTPUT_PLACES_INTERVAL_TREES.value] = {p.name: y for p, y in
+                                                          result[Outputs.OUTPUT_PLACES_INTERVAL_TREES.value].items()}
+    return log, result
+
+
+def __prepare(log, net, im, fm, parameters):
+    enable_diagnostics = exec_utils.get_param_value(Parameters.PARAM_ENABLE_DIAGNOSTICS, parameters, True)
+    force_distribution = exec_utils.get_param_value(Parameters.PARAM_FORCE_DISTRIBUTION, parameters, None)
+    case_arrival_ratio = exec_utils.get_param_value(Parameters.PARAM_CASE_ARRIVAL_RATIO, parameters, None)
+    smap = exec_utils.get_param_value(Parameters.PARAM_PROVIDED_SMAP, parameters, None)
+    resources_per_places = exec_utils.get_param_value(Parameters.PARAM_MAP_RESOURCES_PER_PLACE, parameters, None)
+    small_scale_factor = exec_utils.get_param_value(Parameters.PARAM_SMALL_SCALE_FACTOR, parameters, 864000)
+    max_thread_exec_time = exec_utils.get_param_value(Parameters.PARAM_MAX_THREAD_EXECUTION_TIME, parameters, 60.0)
+
+    logging.basicConfig()
+    logger = logging.getLogger(__name__)
+    logger.setLevel(logging.DEBUG)
+
+    if case_arrival_ratio is None:
+        case_arrival_ratio = case_arrival.get_case_arrival_avg(log, parameters=parameters)
+
+    # when the user does not specify any map from transitions to random variables,
+    # a replay operation is performed
+    if smap is None:
+        if enable_diagnostics:
+            logger.info(str(datetime.datetime.now()) + " started the replay operation.")
+        if force_distribution is not None:
+            smap = replay.get_map_from_log_and_net(log, net, im, fm, force_distribution=force_distribution,
+                                                   parameters=parameters)
+        else:
+            smap = replay.get_map_from_log_and_net(log, net, im, fm, parameters=parameters)
+        if enable_diagnostics:
+            logger.info(str(datetime.datetime.now()) + " ended the replay operation.")
+
+    # the wall-clock parameters of the thread-based variant are mapped to virtual time through the scale factor
+    settings = {"no_simulations": exec_utils.get_param_value(Parameters.PARAM_NUM_SIMULATIONS, parameters, 100),
+                "resources_per_places": resources_per_places if resources_per_places is not None else {},
+                "default_num_resources_per_places": exec_utils.get_param_value(
+                    Parameters.PARAM_DEFAULT_NUM_RESOURCES_PER_PLACE, parameters, 1),
+                "max_case_time": max_thread_exec_time * small_scale_factor,
+                "enable_diagnostics": enable_diagnostics,
+                "diagn_interval": exec_utils.get_param_value(Parameters.PARAM_DIAGN_INTERVAL, parameters,
+                                                             32.0) * small_scale_factor}
+
+    return smap, case_arrival_ratio, settings
+
+
+def apply(log: EventLog, net: PetriNet, im: Marking, fm: Marking, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Tuple[EventLog, Dict[str, Any]]:
+    """
+    Performs a Monte Carlo simulation of an accepting Petri net without duplicate transitions and where the preset is always
+    distinct from the postset (discrete-event variant; the cases are simulated over virtual time, with the same resource
+    semantics of the FIFO variant, deterministically given the random seed; the deadlocks between the cases waiting for
+    the resources are broken by lending a resource to the case waiting since the longest time)
+
+    Parameters
+    -------------
+    log
+        Event log
+    net
+        Accepting Petri net without duplicate transitions and where the preset is always distinct from the postset
+    im
+        Initial marking
+    fm
+        Final marking
+    parameters
+        Parameters of the algorithm:
+            PARAM_NUM_SIMULATIONS => (default: 100)
+            PARAM_FORCE_DISTRIBUTION => Force a particular stochastic distribution (e.g. normal) when the stochastic map
+            is discovered from the log (default: None; no distribution is forced)
+            PARAM_ENABLE_DIAGNOSTICS => Enable the printing of diagnostics (default: True)
+            PARAM_DIAGN_INTERVAL => Interval of time in which diagnostics of the simulation are printed (default: 32,
+            scaled to virtual time by PARAM_SMALL_SCALE_FACTOR)
+            PARAM_CASE_ARRIVAL_RATIO => Case arrival of new cases (default: None; inferred from the log)
+            PARAM_PROVIDED_SMAP => Stochastic map that is used in the simulation (default: None; inferred from the log)
+            PARAM_MAP_RESOURCES_PER_PLACE => Specification of the number of resources available per place
+            (default: None; each place gets the default number of resources)
+            PARAM_DEFAULT_NUM_RESOURCES_PER_PLACE => Default number of resources per place when not specified
+            (default: 1; each place gets 1 resource and has to wait for the resource to finish)
+            PARAM_SMALL_SCALE_FACTOR => Scale factor between the time of the thread-based simulation and the virtual
+            time (default: 864000.0, 10gg)
+            PARAM_MAX_THREAD_EXECUTION_TIME => Maximum execution time per case, scaled to virtual time by
+            PARAM_SMALL_SCALE_FACTOR (default: 60.0)
+            PARAM_RANDOM_SEED => Seed of the random generators (default: None; the current state is used)
+
+    Returns
+    ------------
+    simulated_log
+        Simulated event log
+    simulation_result
+        Result of the simulation:
+            Outputs.OUTPUT_PLACES_INTERVAL_TREES => inteval trees that associate to each place the times in which it was occupied.
+            Outputs.OUTPUT_TRANSITIONS_INTERVAL_TREES => interval trees that associate to each transition the intervals of time
+            in which it could not fire because some token was in the output.
+            Outputs.OUTPUT_CASES_EX_TIME => Throughput time of the cases included in the simulated log
+            Outputs.OUTPUT_MEDIAN_CASES_EX_TIME => Median of the throughput times
+            Outputs.OUTPUT_CASE_ARRIVAL_RATIO => Case arrival ratio that was specified in the simulation
+            Outputs.OUTPUT_TOTAL_CASES_TIME => Total time occupied by cases of the simulated log
+    """
+    if parameters is None:
+        parameters = {}
+
+    seed = exec_utils.get_param_value(Parameters.PARAM_RANDOM_SEED, parameters, None)
+
+    # the seed is set before the discovery of the stochastic map, since the replay may draw random values
+    _set_seed(seed)
+    smap, case_arrival_ratio, settings = __prepare(log, net, im, fm, parameters)
+
+    return _simulate(net, im, fm, smap, case_arrival_ratio, seed, settings)
+
+
+def apply_replications(log: EventLog, net: PetriNet, im: Marking, fm: Marking, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> List[Tuple[EventLog, Dict[str, Any]]]:
+    """
+    Performs independent replications of the discrete-event Monte Carlo simulation, sharing the stochastic map.
+    The replication i uses the seed PARAM_RANDOM_SEED + i, hence the results do not depend on the number of processes.
+
+    Parameters
+    -------------
+    log
+        Event log
+    net
+        Accepting Petri net without duplicate transitions and where the preset is always distinct from the postset
+    im
+        Initial marking
+    fm
+        Final marking
+    parameters
+        Parameters of the algorithm (see apply), including:
+            PARAM_NUM_REPLICATIONS => Number of replications (default: 10)
+            PARAM_RANDOM_SEED => Seed of the first replication (default: None; a random seed is drawn)
+            PARAM_CORES => Number of processes running the replications (default: number of CPUs - 2; with a single
+            process, the replications run in the current process)
+
+    Returns
+    ------------
+    replications
+        List of (simulated_log, simulation_result) couples, one per replication
+    """
+    if parameters is None:
+        parameters = {}
+
+    num_replications = exec_utils.get_param_value(Parameters.PARAM_NUM_REPLICATIONS, parameters, 10)
+    seed = exec_utils.get_param_value(Parameters.PARAM_RANDOM_SEED, parameters, None)
+    cores = min(num_replications, max(1, exec_utils.get_param_value(Parameters.PARAM_CORES, parameters,
+                                                                    multiprocessing.cpu_count() - 2)))
+
+    _set_seed(seed)
+    smap, case_arrival_ratio, settings = __prepare(log, net, im, fm, parameters)
+    if seed is None:
+        seed = int(np.random.randint(0, 2 ** 31))
+
+    if cores == 1:
+        return [_simulate(net, im, fm, smap, case_arrival_ratio, seed + i, settings) for i in range(num_replications)]
+
+    with ProcessPoolExecutor(max_workers=cores) as executor:
+        futures = [executor.submit(_simulate_replication, net, im, fm, smap, case_arrival_ratio, seed + i, settings)
+                   for i in range(num_replications)]
+        replications = [future.result() for future in futures]
+
+    places = {place.name: place for place in net.places}
+    for log, result in replications:
+        result[Outputs.OUTPUT_PLACES_INTERVAL_TREES.value] = {places[name]: y for name, y in
+                                                              result[Outputs.OUTPUT_PLACES_INTERVAL_TREES.value].items()}
+    return replications
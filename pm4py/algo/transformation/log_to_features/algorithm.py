@@ -26,13 +26,14 @@ import pandas as pd
 
 from pm4py.objects.log.obj import EventLog, EventStream
 from pm4py.util import exec_utils
-from pm4py.algo.transformation.log_to_features.variants import event_based, trace_based, temporal
+from pm4py.algo.transformation.log_to_features.variants import event_based, trace_based, temporal, trace_based_sparse
 
 
 class Variants(Enum):
     EVENT_BASED = event_based
     TRACE_BASED = trace_based
     TEMPORAL = temporal
+    TRACE_BASED_SPARSE = trace_based_sparse
 
 
 def apply(log: Union[EventLog, pd.DataFrame, EventStream], variant: Any = Variants.TRACE_BASED,
@@ -51,6 +52,8 @@ def apply(log: Union[EventLog, pd.DataFrame, EventStream], variant: Any = Varian
         - Variants.TRACE_BASED => extracts for each trace a single numerical vector containing the features
             of the trace
         - Variants.TEMPORAL => extracts temporal features from the traditional event log
+        - Variants.TRACE_BASED_SPARSE => extracts the features of Variants.TRACE_BASED as a sparse (CSR) matrix,
+            computing them on the integer-coded columns of the dataframe (in chunks of cases)
 
     Returns
     ---------------
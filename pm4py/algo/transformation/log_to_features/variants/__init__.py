@@ -19,4 +19,4 @@ visit <https://www.gnu.org/licenses/>.
 Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
-from pm4py.algo.transformation.log_to_features.variants import event_based, trace_based
+from pm4py.algo.transformation.log_to_features.variants import event_based, trace_based, trace_based_sparse
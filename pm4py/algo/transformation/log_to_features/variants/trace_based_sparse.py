@@ -0,0 +1,460 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+from enum import Enum
+from typing import Optional, Dict, Any, Union, Tuple, List
+
+import numpy as np
+import pandas as pd
+
+from pm4py.algo.transformation.log_to_features.variants.trace_based import get_numeric_trace_attribute_rep, \
+    get_numeric_event_attribute_rep
+from pm4py.objects.conversion.log import converter
+from pm4py.objects.log.obj import EventLog
+from pm4py.objects.log.util import dataframe_utils
+from pm4py.util import constants, exec_utils, pandas_utils
+from pm4py.util import xes_constants
+
+
+class Parameters(Enum):
+    STR_TRACE_ATTRIBUTES = "str_tr_attr"
+    STR_EVENT_ATTRIBUTES = "str_ev_attr"
+    NUM_TRACE_ATTRIBUTES = "num_tr_attr"
+    NUM_EVENT_ATTRIBUTES = "num_ev_attr"
+    STR_EVSUCC_ATTRIBUTES = "str_evsucc_attr"
+    FEATURE_NAMES = "feature_names"
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_TIMESTAMP_KEY
+    CASE_ATTRIBUTE_PREFIX = constants.CASE_ATTRIBUTE_PREFIX
+    CHUNK_SIZE = "chunk_size"
+
+
+class _CaseSortedLog(object):
+    def __init__(self, df: pd.DataFrame, case_id_key: str, sort_cases: bool = False):
+        """
+        Events of a dataframe stably sorted by case (the cases are numbered in order of first appearance, as in the
+        conversion to an event log, or in order of case identifier if sort_cases is set, as in the features
+        dataframe)
+        """
+        row_case, self.case_ids = pd.factorize(df[case_id_key], sort=sort_cases)
+        self.num_cases = len(self.case_ids)
+        rows = np.flatnonzero(row_case >= 0)
+        self.order = rows[np.argsort(row_case[rows], kind="stable")]
+        self.case = row_case[self.order].astype(np.int64, copy=False)
+        self.case_start = np.searchsorted(self.case, np.arange(self.num_cases + 1), side="left")
+        self.df = df
+
+    def codes(self, col: str) -> Tuple[np.ndarray, List[Any]]:
+        # integer codes of the (case-sorted) values of the column; -1 for missing values
+        codes, uniques = pd.factorize(self.df[col])
+        return codes.astype(np.int64, copy=False)[self.order], list(uniques)
+
+    def first_rows(self) -> np.ndarray:
+        return self.case_start[:-1]
+
+
+def _vocabulary(prefix: str, uniques: List[Any], undefined: bool) -> Tuple[List[str], List[str]]:
+    # representation of every code, and the sorted representations that are features
+    reps = [prefix + "@" + str(v) for v in uniques]
+    features = set(reps)
+    if undefined:
+        features.add(prefix + "@UNDEFINED")
+    return reps, sorted(features)
+
+
+def _unique(keys: np.ndarray) -> np.ndarray:
+    keys = np.sort(keys)
+    return keys[np.r_[True, keys[1:] != keys[:-1]]] if len(keys) else keys
+
+
+def _column_of(reps: List[str], dictionary: Dict[str, int]) -> np.ndarray:
+    return np.array([dictionary.get(r, -1) for r in reps], dtype=np.int64)
+
+
+class _Feature(object):
+    """
+    Family of features computed from a single attribute. compute(lo, hi) returns the (row, column, value) entries
+    for the cases in the range [lo, hi)
+    """
+    names = []
+
+    def bind(self, dictionary: Dict[str, int]):
+        pass
+
+    def compute(self, lo: int, hi: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        raise NotImplementedError()
+
+
+class _OneHotTrace(_Feature):
+    def __init__(self, log: _CaseSortedLog, attribute: str, column: str):
+        self.log = log
+        codes, uniques = log.codes(column)
+        self.first = codes[log.first_rows()]
+        self.prefix = "trace:" + str(attribute)
+        self.reps, self.names = _vocabulary(self.prefix, uniques, bool(np.any(self.first < 0)))
+
+    def bind(self, dictionary):
+        self.columns = _column_of(self.reps, dictionary)
+        self.undefined = dictionary.get(self.prefix + "@UNDEFINED", -1)
+
+    def compute(self, lo, hi):
+        first = self.first[lo:hi]
+        cols = np.where(first >= 0, self.columns[np.maximum(first, 0)] if len(self.columns) else -1, self.undefined)
+        rows = np.arange(lo, hi)
+        keep = cols >= 0
+        return rows[keep], cols[keep], np.ones(int(np.count_nonzero(keep)))
+
+
+class _OneHotEvent(_Feature):
+    def __init__(self, log: _CaseSortedLog, attribute: str):
+        self.log = log
+        self.codes, uniques = log.codes(attribute)
+        self.num_values = max(len(uniques), 1)
+        present = np.zeros(log.num_cases, dtype=bool)
+        present[log.case[self.codes >= 0]] = True
+        self.present = present
+        self.prefix = "event:" + str(attribute)
+        self.reps, self.names = _vocabulary(self.prefix, uniques, not bool(np.all(present)))
+
+    def bind(self, dictionary):
+        self.columns = _column_of(self.reps, dictionary)
+        self.undefined = dictionary.get(self.prefix + "@UNDEFINED", -1)
+
+    def compute(self, lo, hi):
+        start, end = self.log.case_start[lo], self.log.case_start[hi]
+        codes = self.codes[start:end]
+        case = self.log.case[start:end]
+        keys = _unique(case[codes >= 0] * self.num_values + codes[codes >= 0])
+        rows = keys // self.num_values
+        cols = self.columns[keys % self.num_values]
+        absent = lo + np.flatnonzero(~self.present[lo:hi])
+        rows = np.concatenate([rows, absent])
+        cols = np.concatenate([cols, np.full(len(absent), self.undefined, dtype=np.int64)])
+        keep = cols >= 0
+        return rows[keep], cols[keep], np.ones(int(np.count_nonzero(keep)))
+
+
+class _Succession(_Feature):
+    def __init__(self, log: _CaseSortedLog, attribute: str):
+        self.log = log
+        codes, self.uniques = log.codes(attribute)
+        num_values = max(len(self.uniques), 1)
+        valid = (log.case[1:] == log.case[:-1]) & (codes[1:] >= 0) & (codes[:-1] >= 0)
+        self.pair_case = log.case[:-1][valid]
+        pairs, self.pair_codes = np.unique(codes[:-1][valid] * num_values + codes[1:][valid], return_inverse=True)
+        self.pair_codes = self.pair_codes.astype(np.int64, copy=False).reshape(-1)
+        self.num_pairs = max(len(pairs), 1)
+        self.pair_start = np.searchsorted(self.pair_case, np.arange(log.num_cases + 1), side="left")
+        present = np.zeros(log.num_cases, dtype=bool)
+        present[self.pair_case] = True
+        self.present = present
+        self.prefix = "succession:" + str(attribute)
+        self.reps = [self.prefix + "@" + str(self.uniques[p // num_values]) + "#" + str(self.uniques[p % num_values])
+                     for p in pairs.tolist()]
+        names = set(self.reps)
+        if not bool(np.all(present)):
+            names.add(self.prefix + "@UNDEFINED")
+        self.names = sorted(names)
+
+    def bind(self, dictionary):
+        self.columns = _column_of(self.reps, dictionary)
+        self.undefined = dictionary.get(self.prefix + "@UNDEFINED", -1)
+
+    def compute(self, lo, hi):
+        start, end = self.pair_start[lo], self.pair_start[hi]
+        keys = _unique(self.pair_case[start:end] * self.num_pairs + self.pair_codes[start:end])
+        rows = keys // self.num_pairs
+        cols = self.columns[keys % self.num_pairs]
+        absent = lo + np.flatnonzero(~self.present[lo:hi])
+        rows = np.concatenate([rows, absent])
+        cols = np.concatenate([cols, np.full(len(absent), self.undefined, dtype=np.int64)])
+        keep = cols >= 0
+        return rows[keep], cols[keep], np.ones(int(np.count_nonzero(keep)))
+
+
+class _NumericTrace(_Feature):
+    def __init__(self, log: _CaseSortedLog, attribute: str, column: str):
+        self.values = pd.to_numeric(log.df[column].to_numpy()[log.order][log.first_rows()]).astype(np.float64)
+        if np.any(np.isnan(self.values)):
+            raise Exception("at least a trace without trace attribute: " + attribute)
+        self.names = [get_numeric_trace_attribute_rep(attribute)]
+
+    def bind(self, dictionary):
+        self.column = dictionary.get(self.names[0], -1)
+
+    def compute(self, lo, hi):
+        if self.column < 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        return np.arange(lo, hi), np.full(hi - lo, self.column, dtype=np.int64), self.values[lo:hi]
+
+
+class _NumericEvent(_Feature):
+    def __init__(self, log: _CaseSortedLog, attribute: str):
+        values = pd.to_numeric(log.df[attribute].to_numpy()[log.order]).astype(np.float64)
+        valid = np.flatnonzero(~np.isnan(values))
+        # last defined value of every case
+        last = valid[np.r_[log.case[valid][1:] != log.case[valid][:-1], True]] if len(valid) else valid
+        if len(last) < log.num_cases:
+            raise Exception("at least a trace without any event with event attribute: " + attribute)
+        self.values = values[last]
+        self.names = [get_numeric_event_attribute_rep(attribute)]
+
+    def bind(self, dictionary):
+        self.column = dictionary.get(self.names[0], -1)
+
+    def compute(self, lo, hi):
+        if self.column < 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        return np.arange(lo, hi), np.full(hi - lo, self.column, dtype=np.int64), self.values[lo:hi]
+
+
+class _OneHotColumn(_Feature):
+    def __init__(self, log: _CaseSortedLog, column: str):
+        # as in dataframe_utils.select_string_column, a column for every value (and when two values get the same
+        # name, the column of the last one is kept)
+        self.log = log
+        self.codes, uniques = log.codes(column)
+        self.num_values = max(len(uniques), 1)
+        self.reps = [column + "_" + str(v).encode('ascii', errors='ignore').decode('ascii').replace(" ", "")
+                     for v in uniques]
+        owner = {rep: code for code, rep in enumerate(self.reps)}
+        self.owned = np.array([owner[rep] == code for code, rep in enumerate(self.reps)], dtype=bool)
+        self.names = list(owner)
+
+    def bind(self, dictionary):
+        self.columns = np.where(self.owned, _column_of(self.reps, dictionary), -1)
+
+    def compute(self, lo, hi):
+        start, end = self.log.case_start[lo], self.log.case_start[hi]
+        codes = self.codes[start:end]
+        case = self.log.case[start:end]
+        keys = _unique(case[codes >= 0] * self.num_values + codes[codes >= 0])
+        rows = keys // self.num_values
+        cols = self.columns[keys % self.num_values] if len(self.columns) else np.zeros(0, dtype=np.int64)
+        keep = cols >= 0
+        return rows[keep], cols[keep], np.ones(int(np.count_nonzero(keep)))
+
+
+class _LastValueColumn(_Feature):
+    def __init__(self, log: _CaseSortedLog, column: str):
+        # as in dataframe_utils.select_number_column, the last defined value of the case (NaN when missing)
+        values = pd.to_numeric(log.df[column].to_numpy()[log.order]).astype(np.float64)
+        valid = np.flatnonzero(~np.isnan(values))
+        last = valid[np.r_[log.case[valid][1:] != log.case[valid][:-1], True]] if len(valid) else valid
+        self.values = np.full(log.num_cases, np.nan)
+        self.values[log.case[last]] = values[last]
+        self.names = [column]
+
+    def bind(self, dictionary):
+        self.column = dictionary.get(self.names[0], -1)
+
+    def compute(self, lo, hi):
+        if self.column < 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        # the zeros are left unstored, the missing values are stored as NaN
+        rows = lo + np.flatnonzero(self.values[lo:hi] != 0)
+        return rows, np.full(len(rows), self.column, dtype=np.int64), self.values[rows]
+
+
+def _assemble(log: _CaseSortedLog, features: List[_Feature], feature_names: Optional[List[str]], chunk_size: int,
+              dtype=np.float64) -> Tuple[Any, List[str]]:
+    from scipy import sparse
+
+    if feature_names is None:
+        feature_names = [name for feature in features for name in feature.names]
+    dictionary = {name: index for index, name in enumerate(feature_names)}
+    for feature in features:
+        feature.bind(dictionary)
+
+    chunks = []
+    for lo in range(0, log.num_cases, max(1, chunk_size)):
+        hi = min(lo + max(1, chunk_size), log.num_cases)
+        entries = [feature.compute(lo, hi) for feature in features]
+        rows = np.concatenate([e[0] for e in entries] + [np.zeros(0, dtype=np.int64)]) - lo
+        cols = np.concatenate([e[1] for e in entries] + [np.zeros(0, dtype=np.int64)])
+        vals = np.concatenate([e[2] for e in entries] + [np.zeros(0)]).astype(dtype)
+        chunks.append(sparse.csr_matrix((vals, (rows, cols)), shape=(hi - lo, len(feature_names)), dtype=dtype))
+
+    if not chunks:
+        return sparse.csr_matrix((0, len(feature_names)), dtype=dtype), feature_names
+
+    return sparse.vstack(chunks, format="csr"), feature_names
+
+
+def get_representation(df: pd.DataFrame, str_tr_attr: List[str], str_ev_attr: List[str], num_tr_attr: List[str],
+                       num_ev_attr: List[str], str_evsucc_attr: Optional[List[str]] = None,
+                       feature_names: Optional[List[str]] = None, case_id_key: str = constants.CASE_CONCEPT_NAME,
+                       case_attribute_prefix: str = constants.CASE_ATTRIBUTE_PREFIX,
+                       chunk_size: int = 100000) -> Tuple[Any, List[str]]:
+    """
+    Gets the same representation of trace_based.get_representation, computed on the integer-coded columns of a
+    dataframe (a missing value is treated as an attribute which is not present in the event).
+
+    Parameters
+    -------------
+    df
+        Dataframe
+    str_tr_attr
+        List of string trace attributes to consider in data vector creation
+    str_ev_attr
+        List of string event attributes to consider in data vector creation
+    num_tr_attr
+        List of numeric trace attributes to consider in data vector creation
+    num_ev_attr
+        List of numeric event attributes to consider in data vector creation
+    str_evsucc_attr
+        List of attributes succession of values to consider in data vector creation
+    feature_names
+        (If provided) Feature to use in the representation of the log
+    case_id_key
+        Case identifier
+    case_attribute_prefix
+        Prefix of the columns of the trace attributes
+    chunk_size
+        Number of cases that are processed at once
+
+    Returns
+    -------------
+    data
+        Sparse (CSR) matrix having a row for every case (in order of first appearance) and a column for every feature
+    feature_names
+        Names of the features, in order
+    """
+    log = _CaseSortedLog(df, case_id_key)
+
+    features = [_OneHotTrace(log, a, case_attribute_prefix + a) for a in str_tr_attr]
+    features += [_OneHotEvent(log, a) for a in str_ev_attr]
+    features += [_NumericTrace(log, a, case_attribute_prefix + a) for a in num_tr_attr]
+    features += [_NumericEvent(log, a) for a in num_ev_attr]
+    if str_evsucc_attr:
+        features += [_Succession(log, a) for a in str_evsucc_attr]
+
+    return _assemble(log, features, feature_names, chunk_size)
+
+
+def get_dataframe_representation(df: pd.DataFrame, list_columns: List[str], feature_names: Optional[List[str]] = None,
+                                 case_id_key: str = constants.CASE_CONCEPT_NAME,
+                                 chunk_size: int = 100000) -> Tuple[Any, List[str]]:
+    """
+    Gets the same features of dataframe_utils.get_features_df (one-hot encoding of the string columns, last value of
+    the numeric columns), computed on the integer-coded columns of the dataframe
+
+    Parameters
+    -------------
+    df
+        Dataframe
+    list_columns
+        List of columns to consider in the feature extraction
+    feature_names
+        (If provided) Feature to use in the representation of the dataframe
+    case_id_key
+        Case identifier
+    chunk_size
+        Number of cases that are processed at once
+
+    Returns
+    -------------
+    data
+        Sparse (CSR) matrix having a row for every case (in order of case identifier) and a column for every feature
+    feature_names
+        Names of the features, in order
+    """
+    log = _CaseSortedLog(df, case_id_key, sort_cases=True)
+
+    features = []
+    for col in list_columns:
+        if "obj" in str(df[col].dtype) or "str" in str(df[col].dtype):
+            features.append(_OneHotColumn(log, col))
+        elif "float" in str(df[col].dtype) or "int" in str(df[col].dtype):
+            features.append(_LastValueColumn(log, col))
+
+    return _assemble(log, features, feature_names, chunk_size, dtype=np.float32)
+
+
+def apply(log: Union[EventLog, pd.DataFrame], parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Tuple[Any, List[str]]:
+    """
+    Extract the features from an event log (a vector for each trace) as a sparse matrix, using the integer-coded
+    columns of the dataframe (the features are the ones of the trace_based variant: for a dataframe, the ones of
+    dataframe_utils.get_features_df, and for an event log, the ones of its get_representation)
+
+    Parameters
+    -----------------
+    log
+        Log or dataframe
+    parameters
+        Parameters of the algorithm, including:
+        - STR_TRACE_ATTRIBUTES => string trace attributes to consider in the features extraction
+        - STR_EVENT_ATTRIBUTES => string event attributes to consider in the features extraction
+        - NUM_TRACE_ATTRIBUTES => numeric trace attributes to consider in the features extraction
+        - NUM_EVENT_ATTRIBUTES => numeric event attributes to consider in the features extraction
+        - STR_EVSUCC_ATTRIBUTES => succession of event attributes to consider in the features extraction
+        (if none of the previous is provided, the columns are selected automatically for a dataframe, and the
+        activity and the succession of activities are considered for an event log)
+        - FEATURE_NAMES => features to consider (in the given order)
+        - CHUNK_SIZE => number of cases that are processed at once (default: 100000)
+
+    Returns
+    -------------
+    data
+        Sparse (CSR) matrix having a row for every case and a column for every feature
+    feature_names
+        Names of the features, in order
+    """
+    if parameters is None:
+        parameters = {}
+
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+    case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+    case_attribute_prefix = exec_utils.get_param_value(Parameters.CASE_ATTRIBUTE_PREFIX, parameters, constants.CASE_ATTRIBUTE_PREFIX)
+    str_tr_attr = exec_utils.get_param_value(Parameters.STR_TRACE_ATTRIBUTES, parameters, None)
+    num_tr_attr = exec_utils.get_param_value(Parameters.NUM_TRACE_ATTRIBUTES, parameters, None)
+    str_ev_attr = exec_utils.get_param_value(Parameters.STR_EVENT_ATTRIBUTES, parameters, None)
+    num_ev_attr = exec_utils.get_param_value(Parameters.NUM_EVENT_ATTRIBUTES, parameters, None)
+    str_evsucc_attr = exec_utils.get_param_value(Parameters.STR_EVSUCC_ATTRIBUTES, parameters, None)
+    feature_names = exec_utils.get_param_value(Parameters.FEATURE_NAMES, parameters, None)
+    chunk_size = exec_utils.get_param_value(Parameters.CHUNK_SIZE, parameters, 100000)
+
+    if pandas_utils.check_is_pandas_dataframe(log):
+        # as in the trace_based variant, the successions are not considered on dataframes
+        if str_tr_attr or num_tr_attr or str_ev_attr or num_ev_attr:
+            str_tr_attr = str_tr_attr or []
+            num_tr_attr = num_tr_attr or []
+            columns = list(set([case_attribute_prefix + x for x in str_tr_attr]).union(set([case_attribute_prefix + x for x in num_tr_attr])).union(
+                set(str_ev_attr or [])).union(set(num_ev_attr or [])))
+        else:
+            timestamp_key = exec_utils.get_param_value(Parameters.TIMESTAMP_KEY, parameters, xes_constants.DEFAULT_TIMESTAMP_KEY)
+            columns = set(dataframe_utils.automatic_feature_selection_df(log, parameters=parameters).columns)
+            columns.discard(case_id_key)
+            columns.discard(timestamp_key)
+            columns = list(columns)
+        return get_dataframe_representation(log, columns, feature_names=feature_names, case_id_key=case_id_key,
+                                            chunk_size=chunk_size)
+
+    if str_tr_attr is None and num_tr_attr is None and str_ev_attr is None and num_ev_attr is None and str_evsucc_attr is None:
+        str_ev_attr = [activity_key]
+        str_evsucc_attr = [activity_key]
+
+    log = converter.apply(log, variant=converter.Variants.TO_DATA_FRAME, parameters=parameters)
+
+    return get_representation(log, str_tr_attr or [], str_ev_attr or [], num_tr_attr or [], num_ev_attr or [],
+                              str_evsucc_attr=str_evsucc_attr, feature_names=feature_names, case_id_key=case_id_key,
+                              case_attribute_prefix=case_attribute_prefix, chunk_size=chunk_size)
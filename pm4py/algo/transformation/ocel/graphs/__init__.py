@@ -19,4 +19,4 @@ visit <https://www.gnu.org/licenses/>.
 Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
-from pm4py.algo.transformation.ocel.graphs import object_descendants_graph, object_interaction_graph, object_cobirth_graph, object_codeath_graph, object_inheritance_graph
+from pm4py.algo.transformation.ocel.graphs import object_incidence, object_descendants_graph, object_interaction_graph, object_cobirth_graph, object_codeath_graph, object_inheritance_graph
@@ -19,6 +19,7 @@ visit <https://www.gnu.org/licenses/>.
 Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
+from pm4py.algo.transformation.ocel.graphs import object_incidence
 from pm4py.objects.ocel.obj import OCEL
 from typing import Optional, Dict, Any, Set, Tuple
 
@@ -47,23 +48,6 @@ def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None) -> Set[Tuple[
     if parameters is None:
         parameters = {}
 
-    graph = set()
+    incidence = object_incidence.apply(ocel)
 
-    ordered_events = ocel.events[ocel.event_id_column].to_numpy()
-    ev_rel_obj = ocel.relations.groupby(ocel.event_id_column)[ocel.object_id_column].agg(list).to_dict()
-    set_objects = set()
-
-    for ev in ordered_events:
-        rel_obj = ev_rel_obj[ev]
-        rel_obj_seen = {x for x in rel_obj if x in set_objects}
-        rel_obj_unseen = {x for x in rel_obj if x not in rel_obj_seen}
-
-        for o1 in rel_obj_unseen:
-            for o2 in rel_obj_unseen:
-                if o1 < o2:
-                    graph.add((o1, o2))
-
-        for obj in rel_obj_unseen:
-            set_objects.add(obj)
-
-    return graph
+    return incidence.to_set(incidence.cobirth_edges())
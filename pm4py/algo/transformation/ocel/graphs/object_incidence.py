@@ -0,0 +1,189 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+from typing import List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pm4py.objects.ocel.obj import OCEL
+
+
+class ObjectIncidence(object):
+    """
+    Sparse event x object incidence matrix of an OCEL, on integer-coded identifiers.
+
+    The rows follow the order of the events in the events table of the OCEL (the same order used by the
+    object graphs to decide which objects are seen for the first/last time), while the objects are coded in
+    sorted order of their identifiers, so an edge (i, j) with i < j corresponds to an edge (o1, o2) with o1 < o2.
+    The object graphs are computed as products of sparse matrices, and returned as arrays of edges.
+    """
+
+    def __init__(self, ocel: OCEL):
+        from scipy import sparse
+
+        relations = ocel.relations[[ocel.event_id_column, ocel.object_id_column]]
+        event_ids = pd.Index(ocel.events[ocel.event_id_column])
+        event_codes = event_ids.get_indexer(relations[ocel.event_id_column])
+        object_codes, self.object_ids = pd.factorize(relations[ocel.object_id_column], sort=True)
+        # relations of events not contained in the events table are ignored
+        mask = (event_codes >= 0) & (object_codes >= 0)
+        event_codes = event_codes[mask]
+        object_codes = np.asarray(object_codes[mask], dtype=np.int64)
+
+        self.num_events = len(event_ids)
+        self.num_objects = len(self.object_ids)
+
+        incidence = sparse.csc_matrix((np.ones(len(event_codes), dtype=np.int32), (event_codes, object_codes)),
+                                      shape=(self.num_events, self.num_objects))
+        # duplicated relations count once
+        incidence.data[:] = 1
+        self.incidence = incidence
+
+        # first and last event of the lifecycle of every object
+        nnz_per_object = np.diff(incidence.indptr)
+        incidence.sort_indices()
+        has_events = nnz_per_object > 0
+        self.first_event = np.full(self.num_objects, -1, dtype=np.int64)
+        self.last_event = np.full(self.num_objects, -1, dtype=np.int64)
+        self.first_event[has_events] = incidence.indices[incidence.indptr[:-1][has_events]]
+        self.last_event[has_events] = incidence.indices[incidence.indptr[1:][has_events] - 1]
+
+    def _lifecycle_matrix(self, event_per_object):
+        """
+        Event x object matrix with an entry for every object at the given event (e.g., first/last of the lifecycle)
+        """
+        from scipy import sparse
+
+        objects = np.flatnonzero(event_per_object >= 0)
+        return sparse.csr_matrix((np.ones(len(objects), dtype=np.int32), (event_per_object[objects], objects)),
+                                 shape=(self.num_events, self.num_objects))
+
+    def _edges(self, matrix, upper_triangular=False, remove_diagonal=False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gets the edges (couples of object codes) corresponding to the non-zero entries of an object x object matrix
+        """
+        matrix = matrix.tocsr()
+        matrix.sum_duplicates()
+        # sorted by (row, column)
+        matrix.sort_indices()
+        rows = np.repeat(np.arange(matrix.shape[0], dtype=np.int64), np.diff(matrix.indptr))
+        cols = matrix.indices.astype(np.int64)
+        keep = matrix.data != 0
+        if upper_triangular:
+            keep &= rows < cols
+        elif remove_diagonal:
+            keep &= rows != cols
+        return rows[keep], cols[keep]
+
+    def interaction_edges(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Edges of the object interaction graph (couples of objects related to a common event)
+        """
+        return self._edges(self.incidence.T.tocsr() @ self.incidence.tocsr(), upper_triangular=True)
+
+    def descendants_edges(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Edges of the object descendants graph (from the objects already seen to the objects appearing for the
+        first time in a common event)
+        """
+        first = self._lifecycle_matrix(self.first_event)
+        seen = self.incidence.tocsr() - first
+        return self._edges(seen.T @ first)
+
+    def cobirth_edges(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Edges of the object cobirth graph (couples of objects appearing for the first time in the same event)
+        """
+        first = self._lifecycle_matrix(self.first_event)
+        return self._edges(first.T @ first, upper_triangular=True)
+
+    def codeath_edges(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Edges of the object codeath graph (couples of objects appearing for the last time in the same event)
+        """
+        last = self._lifecycle_matrix(self.last_event)
+        return self._edges(last.T @ last, upper_triangular=True)
+
+    def inheritance_edges(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Edges of the object inheritance graph (from an object ending its lifecycle to an object starting it
+        in the same event, excluding the couples connected in both directions)
+        """
+        inheritance = self._lifecycle_matrix(self.last_event).T @ self._lifecycle_matrix(self.first_event)
+        inheritance.setdiag(0)
+        inheritance.eliminate_zeros()
+        inheritance.data[:] = 1
+        inheritance = inheritance - inheritance.multiply(inheritance.T)
+        return self._edges(inheritance, remove_diagonal=True)
+
+    def to_object_ids(self, edges: Tuple[np.ndarray, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Decodes the edges from object codes to object identifiers
+        """
+        object_ids = np.asarray(self.object_ids, dtype=object)
+        return object_ids[edges[0]], object_ids[edges[1]]
+
+    def to_set(self, edges: Tuple[np.ndarray, np.ndarray]) -> Set[Tuple[str, str]]:
+        """
+        Materializes the edges as a set of couples of object identifiers
+        """
+        sources, targets = self.to_object_ids(edges)
+        return set(zip(sources.tolist(), targets.tolist()))
+
+    def interaction_connected_components(self) -> List[Set[str]]:
+        """
+        Connected components of the object interaction graph (the objects without any interaction are excluded)
+        """
+        from scipy import sparse
+        from scipy.sparse.csgraph import connected_components
+
+        rows, cols = self.interaction_edges()
+        adjacency = sparse.csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)),
+                                      shape=(self.num_objects, self.num_objects))
+        num_components, labels = connected_components(adjacency, directed=False)
+        connected = np.zeros(self.num_objects, dtype=bool)
+        connected[rows] = True
+        connected[cols] = True
+
+        object_ids = np.asarray(self.object_ids, dtype=object)
+        components = {}
+        for obj, label in zip(object_ids[connected].tolist(), labels[connected].tolist()):
+            components.setdefault(label, set()).add(obj)
+        return list(components.values())
+
+
+def apply(ocel: OCEL) -> ObjectIncidence:
+    """
+    Builds the sparse event x object incidence matrix of an OCEL,
+    which is used to compute the object graphs
+
+    Parameters
+    -----------------
+    ocel
+        Object-centric event log
+
+    Returns
+    -----------------
+    incidence
+        Object incidence
+    """
+    return ObjectIncidence(ocel)
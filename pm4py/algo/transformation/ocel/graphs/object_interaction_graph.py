@@ -19,6 +19,7 @@ visit <https://www.gnu.org/licenses/>.
 Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
+from pm4py.algo.transformation.ocel.graphs import object_incidence
 from pm4py.objects.ocel.obj import OCEL
 from typing import Optional, Dict, Any, Set, Tuple
 
@@ -43,15 +44,6 @@ def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None) -> Set[Tuple[
     if parameters is None:
         parameters = {}
 
-    graph = set()
+    incidence = object_incidence.apply(ocel)
 
-    ev_rel_obj = ocel.relations.groupby(ocel.event_id_column)[ocel.object_id_column].agg(list).to_dict()
-
-    for ev in ev_rel_obj:
-        rel_obj = ev_rel_obj[ev]
-        for o1 in rel_obj:
-            for o2 in rel_obj:
-                if o1 < o2:
-                    graph.add((o1, o2))
-
-    return graph
+    return incidence.to_set(incidence.interaction_edges())
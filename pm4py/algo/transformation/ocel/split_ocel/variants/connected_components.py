@@ -21,7 +21,7 @@ Contact: info@processintelligence.solutions
 '''
 from pm4py.objects.ocel.obj import OCEL
 from typing import Optional, Dict, Any
-from pm4py.algo.transformation.ocel.graphs import object_interaction_graph
+from pm4py.algo.transformation.ocel.graphs import object_incidence, object_interaction_graph
 from pm4py.util import exec_utils, pandas_utils, nx_utils
 from enum import Enum
 import sys
@@ -60,27 +60,12 @@ def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
     max_value_centrality = exec_utils.get_param_value(Parameters.MAX_VALUE_CENTRALITY, parameters, sys.maxsize)
     enable_prints = exec_utils.get_param_value(Parameters.ENABLE_PRINTS, parameters, False)
 
-    g0 = object_interaction_graph.apply(ocel, parameters=parameters)
-    g = nx_utils.Graph()
-
-    for edge in g0:
-        g.add_edge(edge[0], edge[1])
-
-    removed_nodes = set()
-
-    if centrality_measure is not None:
-        degree_centrality = centrality_measure(g)
-        if enable_prints:
-            print(sorted([(x, y) for x, y in degree_centrality.items()], key=lambda x: (x[1], x[0]), reverse=True))
-
-        for n in degree_centrality:
-            if degree_centrality[n] > max_value_centrality:
-                if enable_prints:
-                    print("removing", n)
-                removed_nodes.add(n)
-                g.remove_node(n)
-
-    conn_comp = list(nx_utils.connected_components(g))
+    if centrality_measure is None:
+        # the connected components are computed directly on the sparse incidence matrix of the OCEL
+        conn_comp = object_incidence.apply(ocel).interaction_connected_components()
+    else:
+        conn_comp = __connected_components_removing_central_nodes(ocel, centrality_measure, max_value_centrality,
+                                                                 enable_prints, parameters=parameters)
 
     ret = []
 
@@ -94,3 +79,28 @@ def apply(ocel: OCEL, parameters: Optional[Dict[Any, Any]] = None):
         ret.append(subocel)
 
     return ret
+
+
+def __connected_components_removing_central_nodes(ocel, centrality_measure, max_value_centrality, enable_prints,
+                                                  parameters=None):
+    """
+    Computes the connected components of the object interaction graph,
+    after removing the nodes with a centrality greater than the provided maximum value
+    """
+    g0 = object_interaction_graph.apply(ocel, parameters=parameters)
+    g = nx_utils.Graph()
+
+    for edge in g0:
+        g.add_edge(edge[0], edge[1])
+
+    degree_centrality = centrality_measure(g)
+    if enable_prints:
+        print(sorted([(x, y) for x, y in degree_centrality.items()], key=lambda x: (x[1], x[0]), reverse=True))
+
+    for n in degree_centrality:
+        if degree_centrality[n] > max_value_centrality:
+            if enable_prints:
+                print("removing", n)
+            g.remove_node(n)
+
+    return list(nx_utils.connected_components(g))
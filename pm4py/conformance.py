@@ -44,6 +44,7 @@ def conformance_diagnostics_token_based_replay(
     timestamp_key: str = "time:timestamp",
     case_id_key: str = "case:concept:name",
     return_diagnostics_dataframe: bool = constants.DEFAULT_RETURN_DIAGNOSTICS_DATAFRAME,
+    multi_processing: bool = constants.ENABLE_MULTIPROCESSING_DEFAULT,
     opt_parameters: Optional[Dict[Any, Any]] = None
 ) -> List[Dict[str, Any]]:
     """
@@ -75,6 +76,7 @@ def conformance_diagnostics_token_based_replay(
     :param timestamp_key: Attribute to be used for the timestamp (default is "time:timestamp").
     :param case_id_key: Attribute to be used as the case identifier (default is "case:concept:name").
     :param return_diagnostics_dataframe: If possible, returns a dataframe with the diagnostics instead of the usual output (default is `constants.DEFAULT_RETURN_DIAGNOSTICS_DATAFRAME`).
+    :param multi_processing: Boolean to enable multiprocessing, distributing the variants among a pool of worker processes (default is `constants.ENABLE_MULTIPROCESSING_DEFAULT`).
     :param opt_parameters: Optional parameters for the token-based replay, including:
         * **reach_mark_through_hidden**: Boolean to decide if the final marking should be reached through hidden transitions.
         * **stop_immediately_unfit**: Boolean to decide if the replay should stop immediately when non-conformance is detected.
@@ -131,6 +133,8 @@ def conformance_diagnostics_token_based_replay(
         case_id_key=case_id_key
     )
 
+    properties["multiprocessing"] = multi_processing
+
     if opt_parameters is None:
         opt_parameters = {}
 
@@ -330,7 +334,8 @@ def fitness_token_based_replay(
     final_marking: Marking,
     activity_key: str = "concept:name",
     timestamp_key: str = "time:timestamp",
-    case_id_key: str = "case:concept:name"
+    case_id_key: str = "case:concept:name",
+    multi_processing: bool = constants.ENABLE_MULTIPROCESSING_DEFAULT
 ) -> Dict[str, float]:
     """
     Calculate the fitness using token-based replay.
@@ -359,6 +364,7 @@ def fitness_token_based_replay(
     :param activity_key: Attribute to be used for the activity (default is "concept:name").
     :param timestamp_key: Attribute to be used for the timestamp (default is "time:timestamp").
     :param case_id_key: Attribute to be used as the case identifier (default is "case:concept:name").
+    :param multi_processing: Boolean to enable multiprocessing, distributing the variants among a pool of worker processes (default is `constants.ENABLE_MULTIPROCESSING_DEFAULT`).
     :return: A dictionary containing fitness metrics.
     :rtype: ``Dict[str, float]``
 
@@ -399,6 +405,7 @@ def fitness_token_based_replay(
         timestamp_key=timestamp_key,
         case_id_key=case_id_key
     )
+    properties["multiprocessing"] = multi_processing
 
     from pm4py.algo.evaluation.replay_fitness import algorithm as replay_fitness
     result = replay_fitness.apply(
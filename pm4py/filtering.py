@@ -285,7 +285,7 @@ def filter_variants(
     Filters a log based on a specified set of variants.
 
     :param log: Event log or Pandas DataFrame.
-    :param variants: Collection of variants to filter. A variant should be specified as a list of tuples of activity names, e.g., [('a', 'b', 'c')].
+    :param variants: Collection of variants to filter. A variant should be specified as a list of tuples of activity names, e.g., [('a', 'b', 'c')]. For dataframes, a variant can also be specified by its identifier in the variant index of the dataframe (see ``pm4py.objects.log.util.pandas_numpy_variants.get_variant_index``).
     :param retain: Boolean indicating whether to retain (if True) or remove (if False) traces conforming to the specified variants.
     :param activity_key: Attribute to be used for the activity.
     :param timestamp_key: Attribute to be used for the timestamp.
@@ -402,20 +402,12 @@ def filter_eventually_follows_relation(
 
     parameters = get_properties(log, activity_key=activity_key, timestamp_key=timestamp_key, case_id_key=case_id_key)
     if check_is_pandas_dataframe(log):
-        from pm4py.algo.filtering.pandas.ltl import ltl_checker
-        parameters[ltl_checker.Parameters.POSITIVE] = retain
-        if retain:
-            cases = set()
-        else:
-            cases = set(log[case_id_key].to_numpy().tolist())
+        from pm4py.algo.filtering.pandas.ltl import case_scan
+        scan = case_scan.CaseScan(log, case_id_key, activity_key)
+        satisfied = scan.empty_mask()
         for path in relations:
-            filt_log = ltl_checker.eventually_follows(log, path, parameters=parameters)
-            this_traces = set(filt_log[case_id_key].to_numpy().tolist())
-            if retain:
-                cases = cases.union(this_traces)
-            else:
-                cases = cases.intersection(this_traces)
-        return log[log[case_id_key].isin(cases)]
+            satisfied |= scan.eventually_follows(path)
+        return log[scan.get_rows_mask(satisfied, retain)]
     else:
         from pm4py.algo.filtering.log.ltl import ltl_checker
         parameters[ltl_checker.Parameters.POSITIVE] = retain
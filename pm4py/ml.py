@@ -32,6 +32,7 @@ from pm4py.utils import __event_log_deprecation_warning
 import random
 from pm4py.util.pandas_utils import check_is_pandas_dataframe, check_pandas_dataframe_columns
 from pm4py.utils import get_properties, constants, pandas_utils
+from pm4py.util import xes_constants
 
 
 def split_train_test(
@@ -203,6 +204,7 @@ def extract_features_dataframe(
     case_id_key: Optional[str] = None,
     resource_key: str = "org:resource",
     include_case_id: bool = False,
+    sparse: bool = False,
     **kwargs
 ) -> pd.DataFrame:
     """
@@ -223,6 +225,8 @@ def extract_features_dataframe(
     :param case_id_key: (Optional) Attribute to be used as the case identifier. If not provided, the default is used.
     :param resource_key: Attribute to be used as the resource identifier.
     :param include_case_id: Whether to include the case identifier column in the features table.
+    :param sparse: If True, the features are computed on the integer-coded columns of the dataframe and returned as a
+                   dataframe with sparse columns (the columns and the values are the same of the default extraction).
     :param **kwargs: Additional keyword arguments to pass to the feature extraction algorithm.
     :return: A Pandas DataFrame containing the extracted features for each case.
     :rtype: ``pd.DataFrame``
@@ -268,6 +272,24 @@ def extract_features_dataframe(
             timestamp_key=timestamp_key
         )
 
+    if sparse:
+        data, feature_names = log_to_features.apply(log, variant=log_to_features.Variants.TRACE_BASED_SPARSE,
+                                                    parameters=parameters)
+        data = pd.DataFrame.sparse.from_spmatrix(data, columns=feature_names)
+        # the unstored entries are zeros, while the stored NaN are missing values (the default fill value of the
+        # float columns is NaN)
+        features_df = pandas_utils.instantiate_dataframe(
+            {col: pd.arrays.SparseArray(data[col].array.sp_values, sparse_index=data[col].array.sp_index, fill_value=0.0)
+             for col in feature_names}, columns=feature_names, index=data.index)
+        if include_case_id:
+            if check_is_pandas_dataframe(log):
+                case_id_key = parameters.get(constants.PARAMETER_CONSTANT_CASEID_KEY, constants.CASE_CONCEPT_NAME)
+                features_df.insert(0, case_id_key, sorted(pandas_utils.format_unique(log[case_id_key].dropna().unique())))
+            else:
+                case_id_key = parameters.get(constants.PARAMETER_CONSTANT_CASEID_KEY, xes_constants.DEFAULT_TRACEID_KEY)
+                features_df.insert(0, "@@case_id_column", [trace.attributes[case_id_key] for trace in log])
+        return features_df
+
     data, feature_names = log_to_features.apply(log, parameters=parameters)
 
     return pandas_utils.instantiate_dataframe(data, columns=feature_names)
@@ -0,0 +1,281 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or 
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+import gzip
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from io import BytesIO
+from typing import Optional, Dict, Any, Union, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pm4py.objects.log.importer.xes.variants import chunk_regex
+from pm4py.objects.log.obj import EventLog
+from pm4py.util import constants, exec_utils, pandas_utils
+
+
+class Parameters(Enum):
+    ENCODING = "encoding"
+    RETURN_LEGACY_LOG_OBJECT = "return_legacy_log_object"
+    CORES = "cores"
+    CHUNK_SIZE = "chunk_size"
+    CASE_ATTRIBUTE_PREFIX = "case_attribute_prefix"
+
+
+TRACE_START = b"<trace"
+TRACE_END = b"</trace>"
+
+# default number of bytes of a chunk of traces parsed by a worker
+DEFAULT_CHUNK_SIZE = 2 ** 24
+
+
+def _parse_traces(content: bytes, encoding: str) -> EventLog:
+    """
+    Parses a sequence of <trace> elements with the rules of the chunk_regex importer
+    """
+    return chunk_regex.import_log_from_file_object(BytesIO(b"<log>" + content + b"</log>"), encoding)
+
+
+def _parse_header(content: bytes, encoding: str) -> EventLog:
+    """
+    Parses the part of the XES preceding the traces (log attributes, extensions, globals, classifiers)
+    """
+    return chunk_regex.import_log_from_file_object(BytesIO(content), encoding)
+
+
+def _to_columns(log: EventLog, case_attribute_prefix: str) -> Tuple[int, Dict[str, list]]:
+    """
+    Transforms the traces of a log into columns (one row per event, with the attributes of the case prefixed),
+    in the order of first appearance of the attributes. Missing values are NaN.
+    """
+    columns = {}
+    num_rows = 0
+    for trace in log:
+        case_attributes = [(case_attribute_prefix + k, v) for k, v in trace.attributes.items()]
+        for event in trace:
+            for attributes in (event.items(), case_attributes):
+                for k, v in attributes:
+                    col = columns.get(k)
+                    if col is None:
+                        col = []
+                        columns[k] = col
+                    if len(col) < num_rows:
+                        col.extend([np.nan] * (num_rows - len(col)))
+                    col.append(v)
+            num_rows += 1
+    for col in columns.values():
+        if len(col) < num_rows:
+            col.extend([np.nan] * (num_rows - len(col)))
+    return num_rows, columns
+
+
+def _parse_chunk(content: bytes, encoding: str, return_legacy_log_object: bool, case_attribute_prefix: str):
+    log = _parse_traces(content, encoding)
+    if return_legacy_log_object:
+        return log
+    return _to_columns(log, case_attribute_prefix)
+
+
+def _parse_file_range(filename: str, start: int, end: int, encoding: str, return_legacy_log_object: bool,
+                      case_attribute_prefix: str):
+    """
+    Parses (inside a worker) the traces contained in a byte range of an uncompressed XES file
+    """
+    with open(filename, "rb") as f:
+        f.seek(start)
+        content = f.read(end - start)
+    return _parse_chunk(content, encoding, return_legacy_log_object, case_attribute_prefix)
+
+
+def _split_ranges(mm, start: int, end: int, num_chunks: int) -> List[Tuple[int, int]]:
+    """
+    Splits the byte range [start, end) of the (memory-mapped) file in about num_chunks ranges,
+    each one beginning at a <trace> element
+    """
+    boundaries = [start]
+    chunk_size = max(1, (end - start) // max(1, num_chunks))
+    target = start + chunk_size
+    while target < end:
+        pos = mm.find(TRACE_START, target, end)
+        if pos < 0:
+            break
+        if pos > boundaries[-1]:
+            boundaries.append(pos)
+        target = pos + chunk_size
+    boundaries.append(end)
+    return [(boundaries[i], boundaries[i + 1]) for i in range(len(boundaries) - 1)]
+
+
+def _merge(header: EventLog, results: list, return_legacy_log_object: bool) -> Union[EventLog, pd.DataFrame]:
+    """
+    Merges the results of the chunks (in order)
+    """
+    if return_legacy_log_object:
+        log = header
+        for chunk_log in results:
+            for trace in chunk_log:
+                log.append(trace)
+        return log
+
+    column_order = {}
+    for _, columns in results:
+        for col in columns:
+            if col not in column_order:
+                column_order[col] = len(column_order)
+    merged = {}
+    for col in column_order:
+        values = []
+        for num_rows, columns in results:
+            values.extend(columns[col] if col in columns else [np.nan] * num_rows)
+        merged[col] = values
+    return pandas_utils.instantiate_dataframe(merged)
+
+
+def import_log(filename: str, parameters: Optional[Dict[Any, Any]] = None) -> Union[EventLog, pd.DataFrame]:
+    """
+    Imports a XES log, parsing in parallel (in a pool of processes) chunks of the file cut at the <trace> boundaries.
+    The attributes are typed with the same rules of the chunk_regex importer.
+
+    Uncompressed files are memory-mapped to find the boundaries, and every worker reads its own byte range.
+    Compressed (.gz) files are decompressed in a streaming fashion, and the decompressed chunks are dispatched
+    to the workers while the decompression proceeds.
+
+    Parameters
+    -----------
+    filename
+        XES file to parse
+    parameters
+        Parameters of the algorithm, including:
+            Parameters.ENCODING -> Regulates the encoding of the log (default: utf-8)
+            Parameters.RETURN_LEGACY_LOG_OBJECT -> Returns an EventLog object instead of a Pandas dataframe (default: True)
+            Parameters.CORES -> Number of processes used for the parsing
+            Parameters.CHUNK_SIZE -> Number of bytes of every chunk of traces (default: 16 MB)
+            Parameters.CASE_ATTRIBUTE_PREFIX -> Prefix of the case attributes in the dataframe (default: case:)
+
+    Returns
+    -----------
+    log
+        Event log / Pandas dataframe
+    """
+    if parameters is None:
+        parameters = {}
+
+    encoding = exec_utils.get_param_value(Parameters.ENCODING, parameters, constants.DEFAULT_ENCODING)
+    return_legacy_log_object = exec_utils.get_param_value(Parameters.RETURN_LEGACY_LOG_OBJECT, parameters, True)
+    cores = max(1, exec_utils.get_param_value(Parameters.CORES, parameters, multiprocessing.cpu_count()))
+    chunk_size = max(1, exec_utils.get_param_value(Parameters.CHUNK_SIZE, parameters, DEFAULT_CHUNK_SIZE))
+    case_attribute_prefix = exec_utils.get_param_value(Parameters.CASE_ATTRIBUTE_PREFIX, parameters,
+                                                       constants.CASE_ATTRIBUTE_PREFIX)
+
+    if filename.endswith(".gz"):
+        header, results = __import_compressed(filename, encoding, return_legacy_log_object, case_attribute_prefix,
+                                              cores, chunk_size)
+    else:
+        header, results = __import_uncompressed(filename, encoding, return_legacy_log_object,
+                                                case_attribute_prefix, cores, chunk_size)
+
+    return _merge(header, results, return_legacy_log_object)
+
+
+def __import_uncompressed(filename, encoding, return_legacy_log_object, case_attribute_prefix, cores, chunk_size):
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return EventLog(), []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            body_start = mm.find(TRACE_START)
+            if body_start < 0:
+                return _parse_header(mm[:], encoding), []
+            body_end = mm.rfind(TRACE_END) + len(TRACE_END)
+            header = _parse_header(mm[:body_start], encoding)
+            num_chunks = max(1, (body_end - body_start) // chunk_size)
+            ranges = _split_ranges(mm, body_start, body_end, num_chunks)
+            if len(ranges) == 1:
+                return header, [_parse_chunk(mm[body_start:body_end], encoding, return_legacy_log_object,
+                                             case_attribute_prefix)]
+
+    with ProcessPoolExecutor(max_workers=min(cores, len(ranges))) as executor:
+        futures = [executor.submit(_parse_file_range, filename, start, end, encoding, return_legacy_log_object,
+                                   case_attribute_prefix) for start, end in ranges]
+        return header, [future.result() for future in futures]
+
+
+def __import_compressed(filename, encoding, return_legacy_log_object, case_attribute_prefix, cores, chunk_size):
+    header = None
+    buffer = b""
+    futures = []
+    executor = None
+
+    try:
+        with gzip.open(filename, mode="rb") as f:
+            while True:
+                block = f.read(chunk_size)
+                buffer += block
+                if header is None:
+                    body_start = buffer.find(TRACE_START)
+                    if body_start < 0:
+                        if block:
+                            continue
+                        # log without traces
+                        return _parse_header(buffer, encoding), []
+                    header = _parse_header(buffer[:body_start], encoding)
+                    buffer = buffer[body_start:]
+                cut = buffer.rfind(TRACE_END)
+                if cut >= 0 and (len(buffer) >= chunk_size or not block):
+                    cut += len(TRACE_END)
+                    if executor is None:
+                        executor = ProcessPoolExecutor(max_workers=cores)
+                    futures.append(executor.submit(_parse_chunk, buffer[:cut], encoding, return_legacy_log_object,
+                                                   case_attribute_prefix))
+                    buffer = buffer[cut:]
+                if not block:
+                    break
+        return header, [future.result() for future in futures]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def apply(filename: str, parameters: Optional[Dict[Any, Any]] = None) -> Union[EventLog, pd.DataFrame]:
+    return import_log(filename, parameters)
+
+
+def import_from_string(log_string, parameters=None):
+    """
+    Deserialize a text/binary string representing a XES log
+    (the parsing is performed by the chunk_regex importer)
+
+    Parameters
+    -----------
+    log_string
+        String that contains the XES
+    parameters
+        Parameters of the algorithm
+
+    Returns
+    -----------
+    log
+        Trace log object
+    """
+    return chunk_regex.import_from_string(log_string, parameters=parameters)
@@ -21,10 +21,12 @@ Contact: info@processintelligence.solutions
 '''
 import pandas as pd
 from enum import Enum
-from pm4py.util import constants, xes_constants, pandas_utils, exec_utils
+from pm4py.util import constants, xes_constants, exec_utils
 import numpy as np
+import weakref
+import hashlib
 from collections import Counter
-from typing import Tuple, Dict, Collection
+from typing import Tuple, Dict, Collection, List, Any, Optional
 import importlib.util
 
 
@@ -35,9 +37,383 @@ class Parameters(Enum):
     INDEX_KEY = "index_key"
 
 
+class VariantIndex(object):
+    """
+    Integer-coded index of the variants of a dataframe.
+
+    The cases are numbered following the sorted case identifiers, the variants following
+    their first occurrence among the cases, and the activities following their first occurrence in the dataframe.
+    """
+
+    def __init__(self, case_ids, row_case, case_variant, activities, variant_offsets, variant_codes, counts):
+        """
+        Constructor
+
+        Parameters
+        ---------------
+        case_ids
+            Array containing the (sorted) case identifiers
+        row_case
+            Array associating to every row of the dataframe the number of its case (-1 if the case is missing)
+        case_variant
+            Array associating to every case the identifier of its variant
+        activities
+            List of the activities (the activity codes are positions in this list)
+        variant_offsets
+            Array such that the activity codes of the variant v are variant_codes[variant_offsets[v]:variant_offsets[v+1]]
+        variant_codes
+            Concatenation of the activity codes of the variants
+        counts
+            Array associating to every variant its number of cases
+        """
+        self.case_ids = case_ids
+        self.row_case = row_case
+        self.case_variant = case_variant
+        self.activities = activities
+        self.variant_offsets = variant_offsets
+        self.variant_codes = variant_codes
+        self.counts = counts
+        self._variants = None
+        self._variant_ids = None
+        self._case_order = None
+
+    def __len__(self):
+        return len(self.counts)
+
+    def get_variant_codes(self, variant_id: int) -> np.ndarray:
+        """
+        Gets the activity codes of a variant
+        """
+        return self.variant_codes[self.variant_offsets[variant_id]:self.variant_offsets[variant_id + 1]]
+
+    def get_variants(self) -> List[Tuple[Any, ...]]:
+        """
+        Gets the list of variants (as tuples of activities), in the order of their identifiers
+        """
+        if self._variants is None:
+            activities = self.activities
+            codes = self.variant_codes.tolist()
+            offsets = self.variant_offsets.tolist()
+            self._variants = [tuple(activities[c] for c in codes[offsets[i]:offsets[i + 1]]) for i in
+                              range(len(offsets) - 1)]
+        return self._variants
+
+    def get_variant(self, variant_id: int) -> Tuple[Any, ...]:
+        """
+        Gets a variant (as tuple of activities) from its identifier
+        """
+        return self.get_variants()[variant_id]
+
+    def get_variant_ids(self, variants: Collection[Any]) -> np.ndarray:
+        """
+        Gets the identifiers of the provided variants. Every variant can be expressed as a tuple (or list)
+        of activities or directly as variant identifier. Variants not contained in the dataframe are ignored.
+        """
+        if self._variant_ids is None:
+            self._variant_ids = {v: i for i, v in enumerate(self.get_variants())}
+        ret = []
+        for v in variants:
+            if isinstance(v, (int, np.integer)):
+                if 0 <= v < len(self.counts):
+                    ret.append(int(v))
+            elif isinstance(v, (tuple, list)):
+                v = self._variant_ids.get(tuple(v))
+                if v is not None:
+                    ret.append(v)
+        return np.array(ret, dtype=np.int64)
+
+    def get_rows_mask(self, variants: Collection[Any]) -> np.ndarray:
+        """
+        Gets the boolean mask of the rows of the dataframe belonging to cases of the provided variants
+        (expressed as tuples of activities or as variant identifiers)
+        """
+        cases_mask = np.isin(self.case_variant, self.get_variant_ids(variants))
+        return (self.row_case >= 0) & cases_mask[self.row_case]
+
+    def to_variants_dict(self) -> Dict[Tuple[Any, ...], int]:
+        """
+        Gets the dictionary associating to every variant (as tuple of activities) its number of cases
+        """
+        return dict(zip(self.get_variants(), self.counts.tolist()))
+
+    def to_case_variant_dict(self) -> Dict[Any, Tuple[Any, ...]]:
+        """
+        Gets the dictionary associating to every case identifier its variant (as tuple of activities)
+        """
+        variants = self.get_variants()
+        return {c: variants[v] for c, v in zip(self.case_ids.tolist(), self.case_variant.tolist())}
+
+    def is_sorted_along_cases(self, values: np.ndarray) -> bool:
+        """
+        Checks if the provided values (one for every row of the dataframe) are non-decreasing
+        along the rows of every case (also when the rows of different cases are interleaved)
+        """
+        if self._case_order is None:
+            # rows of the dataframe (stably) sorted by case
+            rows = np.flatnonzero(self.row_case >= 0)
+            self._case_order = rows[np.argsort(self.row_case[rows], kind="stable")]
+        cases = self.row_case[self._case_order]
+        values = values[self._case_order]
+        return not np.any((cases[1:] == cases[:-1]) & (values[1:] < values[:-1]))
+
+    def get_cases_per_variant(self) -> List[np.ndarray]:
+        """
+        Gets, for every variant, the (sorted) numbers of its cases
+        """
+        order = np.argsort(self.case_variant, kind="stable")
+        return np.split(order, np.cumsum(self.counts)[:-1])
+
+
+# variant indexes of the dataframes currently alive: id of the dataframe ->
+# (weak reference, columns, token of the columns, fingerprint, index)
+_VARIANT_INDEXES = {}
+
+
+def _is_copy_on_write() -> bool:
+    """
+    Checks if the copy-on-write mode of Pandas is enabled (always the case from Pandas 3)
+    """
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    try:
+        return pd.get_option("mode.copy_on_write") is True
+    except Exception:
+        return False
+
+
+def _get_columns_token(columns: Tuple[pd.Series, ...]) -> Optional[Tuple[Any, ...]]:
+    """
+    Gets a token identifying the memory of the values of the provided columns (None if copy-on-write is disabled).
+
+    With copy-on-write, while the columns are referenced by the registry, a modification of the values
+    (e.g., with .loc or with an inplace method) copies them in new memory, hence changing the token.
+    """
+    if not _is_copy_on_write():
+        return None
+    token = []
+    for column in columns:
+        values = column.array
+        if type(values) is pd.arrays.NumpyExtensionArray:
+            # the wrapper of a numpy array is created at every access, hence the memory of the array is considered
+            values = np.asarray(values)
+            token.append((len(values), values.__array_interface__["data"][0], values.strides))
+        else:
+            token.append((len(values), id(values)))
+    return tuple(token)
+
+
+def _factorize(dataframe: pd.DataFrame, case_id_key: str, activity_key: str) -> Tuple[Any, ...]:
+    """
+    Integer-codes the case identifiers (following their sorted values) and the activities (following their first
+    occurrence) of the dataframe
+    """
+    row_case, case_ids = pd.factorize(dataframe[case_id_key], sort=True)
+    act_codes, activities = pd.factorize(dataframe[activity_key], use_na_sentinel=False)
+    return np.asarray(row_case, dtype=np.int64), case_ids, np.asarray(act_codes, dtype=np.int64), activities
+
+
+def _get_fingerprint(dataframe: pd.DataFrame, case_id_key: str, activity_key: str,
+                     factorized: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """
+    Gets a fingerprint of the contents of the case identifier and activity columns, computed by hashing their codes
+    and their distinct values (hence changing also when the values are modified in place)
+    """
+    row_case, case_ids, act_codes, activities = factorized
+    digest = hashlib.blake2b(digest_size=16)
+    for codes, uniques in [(row_case, case_ids), (act_codes, activities)]:
+        digest.update(np.ascontiguousarray(codes).tobytes())
+        digest.update(pd.util.hash_pandas_object(pd.Series(np.asarray(uniques, dtype=object)),
+                                                 index=False).to_numpy().tobytes())
+    return len(dataframe), case_id_key, activity_key, str(dataframe[case_id_key].dtype), str(
+        dataframe[activity_key].dtype), digest.digest()
+
+
+# bases of the polynomial hashes of the sequences of activity codes (computed modulo 2^64)
+HASH_BASES = (1000003, 2305843009213693951)
+
+
+def _hash_sequences(codes: np.ndarray, positions: np.ndarray, starts: np.ndarray, base: int) -> np.ndarray:
+    """
+    Computes, for every case, the polynomial hash (modulo 2^64) of its sequence of activity codes
+    """
+    if len(codes) == 0:
+        return np.zeros(len(starts), dtype=np.uint64)
+    powers = np.full(int(positions.max()) + 1, base, dtype=np.uint64)
+    powers[0] = 1
+    with np.errstate(over="ignore"):
+        powers = np.cumprod(powers, dtype=np.uint64)
+        terms = (codes.astype(np.uint64) + np.uint64(1)) * powers[positions]
+    return np.add.reduceat(terms, starts)
+
+
+def _index_from_case_keys(case_ids, row_case, activities, sorted_codes, starts, lengths, case_key) -> VariantIndex:
+    """
+    Builds the variant index from a matrix associating to every case a key (row) identifying its variant
+    """
+    # number the variants following their first occurrence among the cases
+    _, first_case, inverse = np.unique(case_key, axis=0, return_index=True, return_inverse=True)
+    first_order = np.argsort(first_case)
+    rank = np.empty(len(first_case), dtype=np.int64)
+    rank[first_order] = np.arange(len(first_case))
+    case_variant = rank[inverse.reshape(-1)]
+    counts = np.bincount(case_variant, minlength=len(first_case))
+
+    representatives = first_case[first_order]
+    variant_lengths = lengths[representatives]
+    variant_offsets = np.concatenate(([0], np.cumsum(variant_lengths))).astype(np.int64)
+    variant_codes = sorted_codes[np.repeat(starts[representatives] - variant_offsets[:-1], variant_lengths) + np.arange(
+        variant_offsets[-1])]
+
+    return VariantIndex(case_ids, row_case, case_variant, activities, variant_offsets, variant_codes, counts)
+
+
+def build_variant_index(dataframe: pd.DataFrame, case_id_key: str = constants.CASE_CONCEPT_NAME,
+                        activity_key: str = xes_constants.DEFAULT_NAME_KEY) -> VariantIndex:
+    """
+    Builds the variant index of a dataframe (the events of every case are taken in the order of the rows).
+
+    The cases and the activities are integer-coded once; then, the sequences of activity codes of the cases
+    are hashed in a single pass, and the outcome is verified against the representative of every variant.
+
+    Parameters
+    ---------------
+    dataframe
+        Dataframe
+    case_id_key
+        Case identifier
+    activity_key
+        Activity
+
+    Returns
+    ---------------
+    variant_index
+        Variant index
+    """
+    return _build_from_codes(*_factorize(dataframe, case_id_key, activity_key))
+
+
+def _build_from_codes(row_case: np.ndarray, case_ids: Any, act_codes: np.ndarray, activities: Any) -> VariantIndex:
+    """
+    Builds the variant index from the integer-coded case identifiers and activities of the dataframe
+    """
+    activities = list(activities.tolist() if hasattr(activities, "tolist") else activities)
+    case_ids = np.asarray(case_ids)
+
+    sorted_cases = row_case[row_case >= 0]
+    sorted_codes = act_codes[row_case >= 0]
+    if len(sorted_cases) > 1 and np.any(sorted_cases[1:] < sorted_cases[:-1]):
+        order = np.argsort(sorted_cases, kind="stable")
+        sorted_cases = sorted_cases[order]
+        sorted_codes = sorted_codes[order]
+
+    num_cases = len(case_ids)
+    lengths = np.bincount(sorted_cases, minlength=num_cases)
+    starts = (np.cumsum(lengths) - lengths).astype(np.int64)
+
+    positions = np.arange(len(sorted_codes), dtype=np.int64) - np.repeat(starts, lengths)
+
+    # every case is keyed by its length and two polynomial hashes of its activity codes (computed in one pass)
+    case_key = np.stack([lengths.astype(np.uint64)] + [_hash_sequences(sorted_codes, positions, starts, base) for base in
+                                                       HASH_BASES], axis=1)
+    variant_index = _index_from_case_keys(case_ids, row_case, activities, sorted_codes, starts, lengths, case_key)
+
+    # the hashes are verified: every case should have the same activity codes of the representative of its variant
+    expected = variant_index.variant_codes[
+        np.repeat(variant_index.variant_offsets[variant_index.case_variant], lengths) + positions]
+    if not np.array_equal(expected, sorted_codes):
+        # collision of the hashes: the distinct sequences are found by deduplicating the rows of a matrix,
+        # within every group of cases having the same length
+        exact_key = np.zeros(num_cases, dtype=np.int64)
+        by_length = np.argsort(lengths, kind="stable")
+        group_starts = np.flatnonzero(np.diff(lengths[by_length], prepend=-1))
+        offset = 0
+        for cases_group in np.split(by_length, group_starts[1:]):
+            matrix = sorted_codes[starts[cases_group][:, None] + np.arange(lengths[cases_group[0]])]
+            _, inverse = np.unique(matrix, axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            exact_key[cases_group] = offset + inverse
+            offset += int(inverse.max()) + 1
+        variant_index = _index_from_case_keys(case_ids, row_case, activities, sorted_codes, starts, lengths,
+                                              exact_key[:, None])
+
+    return variant_index
+
+
+def get_variant_index(dataframe: pd.DataFrame, parameters: Optional[Dict[Any, Any]] = None) -> VariantIndex:
+    """
+    Gets the variant index of a dataframe. The index is kept (for the lifetime of the dataframe) in a registry,
+    along with a reference to the case identifier and activity columns, and a fingerprint of their contents.
+
+    With copy-on-write (Pandas >= 3), an in-place modification of the values of the two columns moves them to new
+    memory, hence the cached index is returned in constant time when the columns still occupy the same memory.
+    Otherwise, the two columns are integer-coded and hashed, and the index is rebuilt (from the same codes)
+    only when the fingerprint changes, hence also after in-place modifications of the values.
+
+    Parameters
+    ---------------
+    dataframe
+        Dataframe
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.CASE_ID_KEY => the case identifier
+        - Parameters.ACTIVITY_KEY => the activity
+
+    Returns
+    ---------------
+    variant_index
+        Variant index
+    """
+    if parameters is None:
+        parameters = {}
+
+    case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+
+    key = (id(dataframe), case_id_key, activity_key)
+    columns = (dataframe[case_id_key], dataframe[activity_key])
+    token = _get_columns_token(columns)
+
+    entry = _VARIANT_INDEXES.get(key)
+    if entry is not None and entry[0]() is not dataframe:
+        entry = None
+    if entry is not None and token is not None and entry[2] == token:
+        return entry[4]
+
+    factorized = _factorize(dataframe, case_id_key, activity_key)
+    fingerprint = _get_fingerprint(dataframe, case_id_key, activity_key, factorized)
+
+    if entry is not None and entry[3] == fingerprint:
+        variant_index = entry[4]
+    else:
+        variant_index = _build_from_codes(*factorized)
+
+    def __remove(ref, key=key):
+        current = _VARIANT_INDEXES.get(key)
+        if current is not None and current[0] is ref:
+            del _VARIANT_INDEXES[key]
+
+    _VARIANT_INDEXES[key] = (weakref.ref(dataframe, __remove), columns, token, fingerprint, variant_index)
+
+    return variant_index
+
+
+def invalidate_variant_index(dataframe: pd.DataFrame):
+    """
+    Removes the cached variant indexes of a dataframe
+
+    Parameters
+    ---------------
+    dataframe
+        Dataframe
+    """
+    for key in [k for k in _VARIANT_INDEXES if k[0] == id(dataframe)]:
+        del _VARIANT_INDEXES[key]
+
+
 def apply(dataframe: pd.DataFrame, parameters=None) -> Tuple[Dict[Collection[str], int], Dict[str, Collection[str]]]:
     """
-    Efficient method returning the variants from a Pandas dataframe (through Numpy)
+    Efficient method returning the variants from a Pandas dataframe (through Numpy).
+    The variants are read from the variant index of the dataframe (see get_variant_index), which is computed once.
 
     Minimum viable example:
 
@@ -58,8 +434,6 @@ def apply(dataframe: pd.DataFrame, parameters=None) -> Tuple[Dict[Collection[str
         Parameters of the algorithm, including:
         - Parameters.CASE_ID_KEY => the case identifier
         - Parameters.ACTIVITY_KEY => the activity
-        - Parameters.TIMESTAMP_KEY => the timestamp
-        - Parameters.INDEX_KEY => the index
 
     Returns
     ------------------
@@ -73,13 +447,6 @@ def apply(dataframe: pd.DataFrame, parameters=None) -> Tuple[Dict[Collection[str
 
     case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
     activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
-    timestamp_key = exec_utils.get_param_value(Parameters.TIMESTAMP_KEY, parameters, xes_constants.DEFAULT_TIMESTAMP_KEY)
-    index_key = exec_utils.get_param_value(Parameters.INDEX_KEY, parameters, constants.DEFAULT_INDEX_KEY)
-
-    if not (hasattr(dataframe, "attrs") and dataframe.attrs):
-        # dataframe has not been initialized through format_dataframe
-        dataframe = pandas_utils.insert_index(dataframe, index_key)
-        dataframe.sort_values([case_id_key, timestamp_key, index_key])
 
     case_variant = dict()
 
@@ -88,18 +455,10 @@ def apply(dataframe: pd.DataFrame, parameters=None) -> Tuple[Dict[Collection[str
         case_variant = {x: tuple(y) for x, y in case_variant.items()}
         variants_counter = Counter(case_variant.values())
     else:
-        variants_counter = Counter()
-        cases = dataframe[case_id_key].to_numpy()
-        activities = dataframe[activity_key].to_numpy()
-
-        c_unq, c_ind, c_counts = np.unique(cases, return_index=True, return_counts=True)
-
-        for i in range(len(c_ind)):
-            si = c_ind[i]
-            ei = si + c_counts[i]
-            acts = tuple(activities[si:ei])
-            variants_counter[acts] += 1
-            case_variant[c_unq[i]] = acts
+        variant_index = get_variant_index(dataframe, parameters={Parameters.CASE_ID_KEY: case_id_key,
+                                                                  Parameters.ACTIVITY_KEY: activity_key})
+        variants_counter = variant_index.to_variants_dict()
+        case_variant = variant_index.to_case_variant_dict()
 
     # return as Python dictionary
     variants_dict = {x: y for x, y in variants_counter.items()}
@@ -20,7 +20,7 @@ Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
 from pm4py.objects.ocel import constants
 from pm4py.objects.ocel.obj import OCEL
@@ -57,6 +57,65 @@ def apply(file_path: str, parameters: Optional[Dict[Any, Any]] = None):
     validation = exec_utils.get_param_value(Parameters.VALIDATION, parameters, True)
     except_if_invalid = exec_utils.get_param_value(Parameters.EXCEPT_IF_INVALID, parameters, False)
 
+    if validation:
+        satisfied, unsatisfied = ocel20_rel_validation.apply(file_path)
+        if unsatisfied:
+            if pm4_constants.SHOW_INTERNAL_WARNINGS:
+                warnings.warn("There are unsatisfied OCEL 2.0 constraints in the given relational database: "+str(unsatisfied))
+
+            if except_if_invalid:
+                raise Exception("OCEL 2.0 validation failed.")
+
+    conn = sqlite3.connect(file_path)
+    ocel = import_from_connection(conn, parameters=parameters)
+    conn.close()
+
+    return ocel
+
+
+def __where(restrictions: List[Tuple[str, Optional[Tuple[str, List[Any]]]]]) -> Tuple[str, List[Any]]:
+    """
+    Builds a WHERE clause restricting every column to the identifiers returned by the corresponding
+    selection query (a column without a selection query is not restricted).
+    The rows are returned in the order of the table, regardless of the indexes used to select them.
+    """
+    clauses = []
+    params = []
+    for column, selection in restrictions:
+        if selection is not None:
+            clauses.append(column + " IN (" + selection[0] + ")")
+            params.extend(selection[1])
+    if not clauses:
+        return "", []
+    return " WHERE " + " AND ".join(clauses) + " ORDER BY rowid", params
+
+
+def import_from_connection(conn, events_selection: Optional[Tuple[str, List[Any]]] = None,
+                           objects_selection: Optional[Tuple[str, List[Any]]] = None,
+                           parameters: Optional[Dict[Any, Any]] = None) -> OCEL:
+    """
+    Imports an OCEL 2.0 from an open connection to a relational database.
+    Only the events and the objects returned by the provided selection queries are read.
+
+    Parameters
+    ----------------
+    conn
+        Connection to the database
+    events_selection
+        (Optional) couple (query, query parameters) returning the identifiers of the events to read
+    objects_selection
+        (Optional) couple (query, query parameters) returning the identifiers of the objects to read
+    parameters
+        Parameters of the importer
+
+    Returns
+    ----------------
+    ocel
+        Object-centric event log
+    """
+    if parameters is None:
+        parameters = {}
+
     event_id = exec_utils.get_param_value(Parameters.EVENT_ID, parameters, constants.DEFAULT_EVENT_ID)
     event_activity = exec_utils.get_param_value(Parameters.EVENT_ACTIVITY, parameters, constants.DEFAULT_EVENT_ACTIVITY)
     event_timestamp = exec_utils.get_param_value(Parameters.EVENT_TIMESTAMP, parameters,
@@ -68,19 +127,11 @@ def apply(file_path: str, parameters: Optional[Dict[Any, Any]] = None):
     changed_field = exec_utils.get_param_value(Parameters.CHANGED_FIELD, parameters, constants.DEFAULT_CHNGD_FIELD)
     cumcount_field = exec_utils.get_param_value(Parameters.CUMCOUNT, parameters, "@@cumcount")
 
-    if validation:
-        satisfied, unsatisfied = ocel20_rel_validation.apply(file_path)
-        if unsatisfied:
-            if pm4_constants.SHOW_INTERNAL_WARNINGS:
-                warnings.warn("There are unsatisfied OCEL 2.0 constraints in the given relational database: "+str(unsatisfied))
+    events_where, events_params = __where([("ocel_id", events_selection)])
+    objects_where, objects_params = __where([("ocel_id", objects_selection)])
 
-            if except_if_invalid:
-                raise Exception("OCEL 2.0 validation failed.")
-
-    conn = sqlite3.connect(file_path)
-
-    EVENTS = pd.read_sql("SELECT * FROM event", conn)
-    OBJECTS = pd.read_sql("SELECT * FROM object", conn)
+    EVENTS = pd.read_sql("SELECT * FROM event" + events_where, conn, params=events_params)
+    OBJECTS = pd.read_sql("SELECT * FROM object" + objects_where, conn, params=objects_params)
 
     etypes = sorted(pandas_utils.format_unique(EVENTS["ocel_type"].unique()))
     otypes = sorted(pandas_utils.format_unique(OBJECTS["ocel_type"].unique()))
@@ -103,16 +154,22 @@ def apply(file_path: str, parameters: Optional[Dict[Any, Any]] = None):
 
     for act in etypes:
         act_red = events_type_map[act]
-        df = pd.read_sql("SELECT * FROM event_"+act_red, conn)
+        df = pd.read_sql("SELECT * FROM event_"+act_red+events_where, conn, params=events_params)
         df = df.rename(columns={"ocel_id": event_id, "ocel_time": event_timestamp})
         event_types_coll.append(df)
 
     for ot in otypes:
         ot_red = objects_type_map[ot]
-        df = pd.read_sql("SELECT * FROM object_"+ot_red, conn)
+        df = pd.read_sql("SELECT * FROM object_"+ot_red+objects_where, conn, params=objects_params)
         df = df.rename(columns={"ocel_id": object_id, "ocel_time": event_timestamp})
         object_types_coll.append(df)
 
+    if not event_types_coll:
+        # the selection does not contain any event
+        event_types_coll.append(pd.DataFrame(columns=[event_id, event_timestamp]))
+    if not object_types_coll:
+        object_types_coll.append(pd.DataFrame(columns=[object_id, event_timestamp]))
+
     event_types_coll = pandas_utils.concat(event_types_coll)
     event_types_coll[event_activity] = event_types_coll[event_id].map(events_id_type)
     event_types_coll = dataframe_utils.convert_timestamp_columns_in_df(event_types_coll, timest_format=pm4_constants.DEFAULT_TIMESTAMP_PARSE_FORMAT, timest_columns=[event_timestamp])
@@ -140,19 +197,19 @@ def apply(file_path: str, parameters: Optional[Dict[Any, Any]] = None):
     del objects[event_timestamp]
     del objects[cumcount_field]
 
-    E2O = pd.read_sql("SELECT * FROM event_object", conn)
+    e2o_where, e2o_params = __where([("ocel_event_id", events_selection), ("ocel_object_id", objects_selection)])
+    E2O = pd.read_sql("SELECT * FROM event_object" + e2o_where, conn, params=e2o_params)
     E2O = E2O.rename(columns={"ocel_event_id": event_id, "ocel_object_id": object_id, "ocel_qualifier": qualifier_field})
     E2O[event_activity] = E2O[event_id].map(events_id_type)
     E2O[event_timestamp] = E2O[event_id].map(events_timestamp)
     E2O[object_type] = E2O[object_id].map(objects_id_type)
 
-    O2O = pd.read_sql("SELECT * FROM object_object", conn)
+    o2o_where, o2o_params = __where([("ocel_source_id", objects_selection), ("ocel_target_id", objects_selection)])
+    O2O = pd.read_sql("SELECT * FROM object_object" + o2o_where, conn, params=o2o_params)
     O2O = O2O.rename(columns={"ocel_source_id": object_id, "ocel_target_id": object_id+"_2", "ocel_qualifier": qualifier_field})
     if len(O2O) == 0:
         O2O = None
 
-    conn.close()
-
     event_types_coll[internal_index] = event_types_coll.index
     E2O[internal_index] = E2O.index
 
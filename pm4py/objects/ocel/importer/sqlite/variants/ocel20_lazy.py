@@ -0,0 +1,328 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+import random
+from datetime import timezone
+from enum import Enum
+from itertools import count
+from typing import Optional, Dict, Any, List, Tuple, Collection
+
+from pm4py.objects.ocel import constants
+from pm4py.objects.ocel.obj import OCEL
+from pm4py.objects.ocel.importer.sqlite.variants import ocel20
+from pm4py.algo.filtering.common.timestamp.timestamp_common import get_dt_from_string
+from pm4py.util import exec_utils
+
+
+class Parameters(Enum):
+    EVENT_ID = constants.PARAM_EVENT_ID
+    EVENT_ACTIVITY = constants.PARAM_EVENT_ACTIVITY
+    CREATE_INDEXES = "create_indexes"
+
+
+_SAMPLE_COUNTER = count()
+
+
+def _restrict(table: str, selection: Tuple[str, List[Any]], query: str, params: List[Any]) -> Tuple[str, List[Any]]:
+    """
+    Restricts a selection of identifiers of the given table to the identifiers returned by a query
+    """
+    return "SELECT ocel_id FROM " + table + " WHERE ocel_id IN (" + selection[0] + ") AND ocel_id IN (" + query + ")", \
+        list(selection[1]) + list(params)
+
+
+def _placeholders(values: Collection[Any]) -> str:
+    return ", ".join("?" for _ in values)
+
+
+class LazyOCEL(object):
+    """
+    View on an OCEL 2.0 stored in a SQLite database.
+
+    The filters are not applied in memory: every filter returns a new view, whose selection of events and objects
+    is expressed as SQL subqueries on the (indexed) columns of the database, and the filtering is propagated between
+    events and objects through the event_object table as done by the in-memory filters.
+    The pandas OCEL is built only when to_ocel() is called, reading just the selected events, objects and relations.
+    """
+
+    def __init__(self, conn, events_selection: Tuple[str, List[Any]], objects_selection: Tuple[str, List[Any]],
+                 parameters: Optional[Dict[Any, Any]] = None):
+        if parameters is None:
+            parameters = {}
+
+        self.conn = conn
+        self.events_selection = events_selection
+        self.objects_selection = objects_selection
+        self.parameters = parameters
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Closes the connection to the database (shared by all the views derived from the same database)
+        """
+        self.conn.close()
+
+    def __derive(self, events_selection: Tuple[str, List[Any]],
+                 objects_selection: Tuple[str, List[Any]]) -> "LazyOCEL":
+        return LazyOCEL(self.conn, events_selection, objects_selection, parameters=self.parameters)
+
+    def __with_events(self, query: str, params: List[Any]) -> "LazyOCEL":
+        """
+        Restricts the events to the ones returned by the query, and keeps only the objects related to them
+        """
+        events = _restrict("event", self.events_selection, query, params)
+        objects = _restrict("object", self.objects_selection,
+                            "SELECT ocel_object_id FROM event_object WHERE ocel_event_id IN (" + events[0] + ")",
+                            events[1])
+        return self.__derive(events, objects)
+
+    def __with_objects(self, query: str, params: List[Any]) -> "LazyOCEL":
+        """
+        Restricts the objects to the ones returned by the query, and keeps only the events related to them
+        """
+        objects = _restrict("object", self.objects_selection, query, params)
+        events = _restrict("event", self.events_selection,
+                           "SELECT ocel_event_id FROM event_object WHERE ocel_object_id IN (" + objects[0] + ")",
+                           objects[1])
+        return self.__derive(events, objects)
+
+    def __event_tables(self) -> List[str]:
+        return ["event_" + x[0] for x in self.conn.execute("SELECT ocel_type_map FROM event_map_type").fetchall()]
+
+    def filter_object_types(self, obj_types: Collection[str], positive: bool = True) -> "LazyOCEL":
+        """
+        Keeps (or removes) the objects of the given object types, and the events related to the remaining objects
+        (same semantics as pm4py.filter_ocel_object_types)
+
+        Parameters
+        ---------------
+        obj_types
+            Object types
+        positive
+            Boolean indicating whether to keep (True) or remove (False) the specified object types
+
+        Returns
+        ---------------
+        lazy_ocel
+            Filtered view
+        """
+        obj_types = list(obj_types)
+        operator = " IN " if positive else " NOT IN "
+        return self.__with_objects("SELECT ocel_id FROM object WHERE ocel_type" + operator + "(" +
+                                   _placeholders(obj_types) + ")", obj_types)
+
+    def filter_events_timestamp(self, min_timest, max_timest) -> "LazyOCEL":
+        """
+        Keeps the events in the provided timestamp range, and the objects related to them
+        (same semantics as pm4py.filter_ocel_events_timestamp)
+
+        Parameters
+        ---------------
+        min_timest
+            Left extreme of the allowed timestamp interval (datetime, or string in the format: YYYY-mm-dd HH:MM:SS)
+        max_timest
+            Right extreme of the allowed timestamp interval (datetime, or string in the format: YYYY-mm-dd HH:MM:SS)
+
+        Returns
+        ---------------
+        lazy_ocel
+            Filtered view
+        """
+        extremes = []
+        for timest in [min_timest, max_timest]:
+            timest = get_dt_from_string(timest)
+            if timest.tzinfo is not None:
+                timest = timest.astimezone(timezone.utc).replace(tzinfo=None)
+            extremes.append(timest.strftime("%Y-%m-%d %H:%M:%S.%f"))
+
+        tables = self.__event_tables()
+        query = " UNION ALL ".join(
+            "SELECT ocel_id FROM " + t + " WHERE julianday(ocel_time) BETWEEN julianday(?) AND julianday(?)"
+            for t in tables)
+        if not tables:
+            query = "SELECT ocel_id FROM event WHERE 0"
+        return self.__with_events(query, extremes * len(tables))
+
+    def filter_event_attribute(self, attribute_key: str, attribute_values: Collection[Any],
+                               positive: bool = True) -> "LazyOCEL":
+        """
+        Keeps (or removes) the events having one of the provided values for the given attribute, and the objects
+        related to the remaining events (same semantics as pm4py.filter_ocel_event_attribute)
+
+        Parameters
+        ---------------
+        attribute_key
+            Attribute at the event level (the activity, the event identifier, or an attribute stored
+            in the tables of the event types)
+        attribute_values
+            Collection of attribute values to keep or remove
+        positive
+            Determines whether the values should be kept (True) or removed (False)
+
+        Returns
+        ---------------
+        lazy_ocel
+            Filtered view
+        """
+        event_id = exec_utils.get_param_value(Parameters.EVENT_ID, self.parameters, constants.DEFAULT_EVENT_ID)
+        event_activity = exec_utils.get_param_value(Parameters.EVENT_ACTIVITY, self.parameters,
+                                                    constants.DEFAULT_EVENT_ACTIVITY)
+
+        values = list(attribute_values)
+        placeholders = _placeholders(values)
+
+        if attribute_key == event_activity:
+            query = "SELECT ocel_id FROM event WHERE ocel_type IN (" + placeholders + ")"
+            params = values
+        elif attribute_key == event_id:
+            query = "SELECT ocel_id FROM event WHERE ocel_id IN (" + placeholders + ")"
+            params = values
+        else:
+            tables = [t for t in self.__event_tables() if attribute_key in
+                      [x[1] for x in self.conn.execute("PRAGMA table_info(" + t + ")").fetchall()]]
+            query = " UNION ALL ".join(
+                "SELECT ocel_id FROM " + t + " WHERE \"" + attribute_key + "\" IN (" + placeholders + ")"
+                for t in tables)
+            params = values * len(tables)
+            if not tables:
+                query = "SELECT ocel_id FROM event WHERE 0"
+
+        if not positive:
+            query = "SELECT ocel_id FROM event WHERE ocel_id NOT IN (" + query + ")"
+
+        return self.__with_events(query, params)
+
+    def sample_objects(self, num_objects: int) -> "LazyOCEL":
+        """
+        Random samples the objects of the view, and keeps only the events related to at least one of them
+        (same semantics as pm4py.sample_ocel_objects).
+        The sampled identifiers are stored in a temporary table of the connection.
+
+        Parameters
+        ---------------
+        num_objects
+            Number of objects to retain
+
+        Returns
+        ---------------
+        lazy_ocel
+            Sampled view
+        """
+        objects = _restrict("object", self.objects_selection,
+                            "SELECT ocel_object_id FROM event_object WHERE ocel_event_id IN (" +
+                            self.events_selection[0] + ")", self.events_selection[1])
+        objects = [x[0] for x in self.conn.execute(objects[0], objects[1]).fetchall()]
+        random.shuffle(objects)
+        objects = objects[:num_objects]
+
+        table = "temp.pm4py_sample_" + str(next(_SAMPLE_COUNTER))
+        self.conn.execute("CREATE TABLE " + table + " (ocel_id TEXT PRIMARY KEY)")
+        self.conn.executemany("INSERT INTO " + table + " VALUES (?)", [(x,) for x in objects])
+
+        return self.__with_objects("SELECT ocel_id FROM " + table, [])
+
+    def to_ocel(self) -> OCEL:
+        """
+        Materializes the selected slice of the database as an object-centric event log
+
+        Returns
+        ---------------
+        ocel
+            Object-centric event log
+        """
+        return ocel20.import_from_connection(self.conn, events_selection=self.events_selection,
+                                             objects_selection=self.objects_selection, parameters=self.parameters)
+
+
+def create_indexes(conn):
+    """
+    Creates (if missing) the indexes supporting the selections of the lazy view, i.e., on the object identifier of
+    the event_object table, on the type of the events and of the objects, on the identifiers of the object type
+    tables, and on the timestamps of the event type tables.
+    Read-only databases are left untouched.
+
+    Parameters
+    ---------------
+    conn
+        Connection to the SQLite database
+    """
+    import sqlite3
+
+    indexes = [("event_object", "ocel_object_id"), ("object_object", "ocel_target_id"), ("event", "ocel_type"),
+               ("object", "ocel_type")]
+    indexes += [("event_" + x[0], "julianday(ocel_time)") for x in
+                conn.execute("SELECT ocel_type_map FROM event_map_type").fetchall()]
+    indexes += [("object_" + x[0], "ocel_id") for x in
+                conn.execute("SELECT ocel_type_map FROM object_map_type").fetchall()]
+
+    try:
+        for table, column in indexes:
+            name = "pm4py_idx_" + table + "_" + column.replace("(", "_").replace(")", "")
+            conn.execute("CREATE INDEX IF NOT EXISTS " + name + " ON " + table + " (" + column + ")")
+        conn.commit()
+    except sqlite3.OperationalError:
+        conn.rollback()
+
+
+def apply(file_path: str, parameters: Optional[Dict[Any, Any]] = None) -> LazyOCEL:
+    """
+    Opens a lazy view on an OCEL 2.0 stored in a SQLite database.
+    Filters (object types, timestamp range, event attributes, object sampling) are pushed down to the database,
+    and only the resulting slice is read when the view is materialized.
+
+    Parameters
+    ---------------
+    file_path
+        Path to the SQLite database
+    parameters
+        Parameters of the importer, including:
+        - Parameters.CREATE_INDEXES => creates the indexes supporting the selections, if missing (default: True)
+        - the parameters of the OCEL 2.0 SQLite importer, which are used when the view is materialized
+
+    Returns
+    ---------------
+    lazy_ocel
+        Lazy view on the object-centric event log
+
+    Example
+    ---------------
+    with ocel20_lazy.apply("log.sqlite") as lazy_ocel:
+        ocel = lazy_ocel.filter_object_types(["order"]).filter_events_timestamp("2020-01-01 00:00:00",
+            "2020-02-01 00:00:00").to_ocel()
+    """
+    if parameters is None:
+        parameters = {}
+
+    import sqlite3
+
+    create = exec_utils.get_param_value(Parameters.CREATE_INDEXES, parameters, True)
+
+    conn = sqlite3.connect(file_path)
+    if create:
+        create_indexes(conn)
+
+    return LazyOCEL(conn, ("SELECT ocel_id FROM event", []), ("SELECT ocel_id FROM object", []),
+                    parameters=parameters)
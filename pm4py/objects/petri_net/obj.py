@@ -28,7 +28,8 @@ class Marking(Counter):
     pass
 
     def __hash__(self):
-        return frozenset(self).__hash__() # credits egrocha
+        # markings differing only in the number of tokens should not collide
+        return frozenset(self.items()).__hash__()
 
     def __eq__(self, other):
         if not self.keys() == other.keys():
@@ -251,7 +251,8 @@ def __trust_solution(x):
 
 def __compute_exact_heuristic_new_version(sync_net, a_matrix, h_cvx, g_matrix, cost_vec, incidence_matrix,
                                           marking, fin_vec, variant, use_cvxopt=False, strict=True):
-    m_vec = incidence_matrix.encode_marking(marking)
+    # (the marking may also be already encoded as a tuple of token counts, e.g., by a compiled Petri net)
+    m_vec = marking if isinstance(marking, tuple) else incidence_matrix.encode_marking(marking)
     b_term = [i - j for i, j in zip(fin_vec, m_vec)]
     b_term = np.matrix([x * 1.0 for x in b_term]).transpose()
 
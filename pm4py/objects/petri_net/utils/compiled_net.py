@@ -0,0 +1,263 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from pm4py.objects.petri_net.obj import PetriNet, Marking
+from pm4py.objects.petri_net.semantics import ClassicSemantics
+
+CompiledMarking = Tuple[int, ...]
+
+
+class CompiledPetriNet(object):
+    """
+    Array-backed representation of a Petri net, for the hot loops of the model-based algorithms.
+
+    Places and transitions are identified by integers, the presets/postsets of the transitions are stored
+    as tuples of (place id, weight), and the markings are immutable tuples of token counts (indexed by the place id),
+    which are hashed on their content. Every place keeps the transitions consuming from it, so the set of
+    enabled transitions can be maintained incrementally after a firing.
+    """
+
+    def __init__(self, net: PetriNet, place_order: Optional[List[PetriNet.Place]] = None,
+                 transition_order: Optional[List[PetriNet.Transition]] = None):
+        """
+        Compiles a Petri net
+
+        Parameters
+        ---------------
+        net
+            Petri net
+        place_order
+            (optional) ordering of the places (default: sorted by name, as in the incidence matrix)
+        transition_order
+            (optional) ordering of the transitions (default: sorted by name, as in the incidence matrix)
+        """
+        if place_order is None:
+            place_order = sorted(net.places, key=lambda x: (str(x.name), id(x)))
+        if transition_order is None:
+            transition_order = sorted(net.transitions, key=lambda x: (str(x.name), id(x)))
+
+        self.net = net
+        self.places = list(place_order)
+        self.transitions = list(transition_order)
+        self.place_index = {p: i for i, p in enumerate(self.places)}
+        self.transition_index = {t: i for i, t in enumerate(self.transitions)}
+
+        pre = []
+        post = []
+        delta = []
+        for t in self.transitions:
+            t_pre = {}
+            t_post = {}
+            for a in t.in_arcs:
+                pid = self.place_index[a.source]
+                t_pre[pid] = t_pre.get(pid, 0) + a.weight
+            for a in t.out_arcs:
+                pid = self.place_index[a.target]
+                t_post[pid] = t_post.get(pid, 0) + a.weight
+            t_delta = {pid: t_post.get(pid, 0) - t_pre.get(pid, 0) for pid in set(t_pre) | set(t_post)}
+            pre.append(tuple(sorted(t_pre.items())))
+            post.append(tuple(sorted(t_post.items())))
+            delta.append(tuple(sorted((pid, d) for pid, d in t_delta.items() if d != 0)))
+        self.pre = pre
+        self.post = post
+        self.delta = delta
+
+        consumers = [[] for _ in self.places]
+        for tid, t_pre in enumerate(pre):
+            for pid, _ in t_pre:
+                consumers[pid].append(tid)
+        self.consumers = [tuple(c) for c in consumers]
+        self.empty_preset = tuple(tid for tid, t_pre in enumerate(pre) if not t_pre)
+        # transitions whose enabling may change after the firing of a transition
+        self.affected = [tuple(sorted(set(tid2 for pid, _ in t_delta for tid2 in self.consumers[pid]))) for t_delta
+                         in delta]
+
+        self.__pre_matrix = None
+        self.__post_matrix = None
+
+    def __get_pre_matrix(self) -> np.ndarray:
+        if self.__pre_matrix is None:
+            self.__pre_matrix = self.__to_matrix(self.pre)
+        return self.__pre_matrix
+
+    def __get_post_matrix(self) -> np.ndarray:
+        if self.__post_matrix is None:
+            self.__post_matrix = self.__to_matrix(self.post)
+        return self.__post_matrix
+
+    def __to_matrix(self, arcs) -> np.ndarray:
+        matrix = np.zeros((len(self.transitions), len(self.places)), dtype=np.int64)
+        for tid, t_arcs in enumerate(arcs):
+            for pid, weight in t_arcs:
+                matrix[tid, pid] = weight
+        return matrix
+
+    def encode_marking(self, marking: Marking) -> CompiledMarking:
+        """
+        Encodes a marking of the Petri net as a tuple of token counts
+        """
+        m = [0] * len(self.places)
+        for p, count in marking.items():
+            m[self.place_index[p]] = count
+        return tuple(m)
+
+    def decode_marking(self, m: CompiledMarking) -> Marking:
+        """
+        Decodes a tuple of token counts into a marking of the Petri net
+        """
+        marking = Marking()
+        for pid, count in enumerate(m):
+            if count > 0:
+                marking[self.places[pid]] = count
+        return marking
+
+    def is_enabled(self, tid: int, m: CompiledMarking) -> bool:
+        """
+        Checks if the transition with the given id is enabled in the given marking
+        """
+        for pid, weight in self.pre[tid]:
+            if m[pid] < weight:
+                return False
+        return True
+
+    def fire(self, tid: int, m: CompiledMarking) -> CompiledMarking:
+        """
+        Fires the transition with the given id (without checking if it is enabled)
+        """
+        m = list(m)
+        for pid, d in self.delta[tid]:
+            m[pid] += d
+        return tuple(m)
+
+    def enabled_transitions(self, m: CompiledMarking) -> Set[int]:
+        """
+        Gets the ids of the transitions enabled in the given marking
+        (only the transitions consuming from a marked place are checked)
+        """
+        enabled = set(self.empty_preset)
+        for pid, count in enumerate(m):
+            if count > 0:
+                for tid in self.consumers[pid]:
+                    if tid not in enabled and self.is_enabled(tid, m):
+                        enabled.add(tid)
+        return enabled
+
+    def update_enabled(self, enabled: Set[int], tid: int, m: CompiledMarking) -> Set[int]:
+        """
+        Gets the enabled transitions of the marking reached by firing a transition,
+        re-checking only the transitions consuming from the places changed by the firing
+
+        Parameters
+        ---------------
+        enabled
+            Ids of the transitions enabled before the firing
+        tid
+            Id of the fired transition
+        m
+            Marking reached by the firing
+
+        Returns
+        ---------------
+        enabled
+            Ids of the transitions enabled in the reached marking
+        """
+        affected = self.affected[tid]
+        new_enabled = set(enabled)
+        for tid2 in affected:
+            if self.is_enabled(tid2, m):
+                new_enabled.add(tid2)
+            else:
+                new_enabled.discard(tid2)
+        return new_enabled
+
+    pre_matrix = property(__get_pre_matrix)
+    post_matrix = property(__get_post_matrix)
+
+
+class CompiledSemantics(ClassicSemantics):
+    """
+    Semantics of the Petri nets computing the enabled transitions from the compiled representation of the net
+    (only the transitions consuming from the marked places are checked).
+    Algorithms accepting a semantics parameter (e.g., playout, reachability graph) can opt into it by receiving
+    an instance of this class; the reachability graph explores directly the compiled markings.
+    """
+
+    def __init__(self):
+        self._compiled: Dict[int, CompiledPetriNet] = {}
+
+    def compile(self, pn: PetriNet) -> CompiledPetriNet:
+        """
+        Gets the compiled representation of a Petri net (compiled once, and then cached)
+        """
+        compiled = self._compiled.get(id(pn))
+        if compiled is None or compiled.net is not pn or len(compiled.places) != len(pn.places) or len(
+                compiled.transitions) != len(pn.transitions):
+            compiled = CompiledPetriNet(pn)
+            self._compiled[id(pn)] = compiled
+        return compiled
+
+    def enabled_transitions(self, pn, m, **kwargs):
+        """
+        Returns a set of enabled transitions in a Petri net and given marking
+
+        Parameters
+        ----------
+        :param pn: Petri net
+        :param m: marking of the pn
+
+        Returns
+        -------
+        :return: set of enabled transitions
+        """
+        compiled = self.compile(pn)
+        candidates = set(compiled.empty_preset)
+        for p, count in m.items():
+            if count > 0 and p in compiled.place_index:
+                candidates.update(compiled.consumers[compiled.place_index[p]])
+        enabled = set()
+        for tid in candidates:
+            for pid, weight in compiled.pre[tid]:
+                if m[compiled.places[pid]] < weight:
+                    break
+            else:
+                enabled.add(compiled.transitions[tid])
+        return enabled
+
+
+def compile_net(net: PetriNet) -> CompiledPetriNet:
+    """
+    Compiles a Petri net into its array-backed representation
+
+    Parameters
+    ---------------
+    net
+        Petri net
+
+    Returns
+    ---------------
+    compiled_net
+        Compiled Petri net
+    """
+    return CompiledPetriNet(net)
@@ -24,6 +24,7 @@ import re
 from pm4py.objects import petri_net
 from pm4py.objects.transition_system.obj import TransitionSystem
 from pm4py.objects.petri_net.utils import align_utils
+from pm4py.objects.petri_net.utils.compiled_net import CompiledSemantics
 from pm4py.objects.transition_system import obj as ts
 from pm4py.objects.transition_system import utils
 from pm4py.util import exec_utils
@@ -75,6 +76,10 @@ def marking_flow_petri(net, im, return_eventually_enabled=False, parameters=None
 
     start_time = time.time()
 
+    if isinstance(semantics, CompiledSemantics):
+        return __marking_flow_compiled(net, im, semantics.compile(net), start_time, max_exec_time,
+                                       return_eventually_enabled=return_eventually_enabled)
+
     incoming_transitions = {im: set()}
     outgoing_transitions = {}
     eventually_enabled = {}
@@ -101,6 +106,64 @@ def marking_flow_petri(net, im, return_eventually_enabled=False, parameters=None
     return incoming_transitions, outgoing_transitions, eventually_enabled
 
 
+def __marking_flow_compiled(net, im, compiled, start_time, max_exec_time, return_eventually_enabled=False):
+    """
+    Construct the marking flow of a Petri net, exploring the markings of its compiled representation
+    (the enabled transitions of a reached marking are derived incrementally from the ones of the previous marking)
+
+    Parameters
+    -----------------
+    net
+        Petri net
+    im
+        Initial marking
+    compiled
+        Compiled Petri net
+    start_time
+        Start time of the exploration
+    max_exec_time
+        Maximum execution time
+    return_eventually_enabled
+        Return the eventually enabled (visible) transitions
+    """
+    ini = compiled.encode_marking(im)
+    incoming = {ini: set()}
+    outgoing = {}
+    pending_enabled = {ini: compiled.enabled_transitions(ini)}
+
+    active = [ini]
+    while active:
+        if (time.time() - start_time) >= max_exec_time:
+            # interrupt the execution
+            break
+        m = active.pop()
+        enabled = pending_enabled.pop(m)
+        outgoing[m] = {}
+        for tid in enabled:
+            nm = compiled.fire(tid, m)
+            outgoing[m][tid] = nm
+            if nm not in incoming:
+                incoming[nm] = set()
+                active.append(nm)
+                pending_enabled[nm] = compiled.update_enabled(enabled, tid, nm)
+            incoming[nm].add(tid)
+
+    markings = {m: compiled.decode_marking(m) for m in incoming}
+    markings[ini] = im
+    transitions = compiled.transitions
+
+    incoming_transitions = {markings[m]: set(transitions[tid] for tid in incoming[m]) for m in incoming}
+    outgoing_transitions = {markings[m]: {transitions[tid]: markings[nm] for tid, nm in outgoing[m].items()} for m in
+                            outgoing}
+    eventually_enabled = {}
+    if return_eventually_enabled:
+        for m in outgoing:
+            eventually_enabled[markings[m]] = align_utils.get_visible_transitions_eventually_enabled_by_marking(
+                net, markings[m])
+
+    return incoming_transitions, outgoing_transitions, eventually_enabled
+
+
 def construct_reachability_graph_from_flow(incoming_transitions, outgoing_transitions,
                                            use_trans_name=False, parameters=None):
     """
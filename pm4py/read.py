@@ -45,6 +45,7 @@ def read_xes(
     variant: Optional[str] = None,
     return_legacy_log_object: bool = constants.DEFAULT_READ_XES_LEGACY_OBJECT,
     encoding: str = constants.DEFAULT_ENCODING,
+    use_cache: bool = constants.ENABLE_READ_CACHE,
     **kwargs
 ) -> Union[DataFrame, EventLog]:
     """
@@ -57,9 +58,11 @@ def read_xes(
         - "line_by_line" – text-based line-by-line importer,
         - "chunk_regex" – chunk-of-bytes importer (default),
         - "iterparse20" – XES 2.0 importer,
-        - "rustxes" – Rust-based importer.
+        - "rustxes" – Rust-based importer,
+        - "chunk_parallel" – chunk-of-bytes importer parsing the traces in a pool of processes.
     :param return_legacy_log_object: Boolean indicating whether to return a legacy `EventLog` object (default: `False`).
     :param encoding: Encoding to be used (default: `utf-8`).
+    :param use_cache: Boolean indicating whether to store the parsed dataframe in (and read it from) the on-disk columnar cache (see `pm4py.util.read_cache`). Applies only when a dataframe is returned (default: `False`, or the value of the `PM4PY_ENABLE_READ_CACHE` environment variable).
     :param **kwargs: Additional parameters to pass to the importer.
     :rtype: `pandas.DataFrame` or `pm4py.objects.log.obj.EventLog`
 
@@ -92,19 +95,28 @@ def read_xes(
         v = xes_importer.Variants.CHUNK_REGEX
     elif variant == "rustxes":
         v = xes_importer.Variants.RUSTXES
+    elif variant == "chunk_parallel":
+        v = xes_importer.Variants.CHUNK_PARALLEL
 
     from copy import copy
     parameters = copy(kwargs)
     parameters["encoding"] = encoding
     parameters["return_legacy_log_object"] = return_legacy_log_object
 
-    log = xes_importer.apply(file_path, variant=v, parameters=parameters)
+    def __read():
+        log = xes_importer.apply(file_path, variant=v, parameters=parameters)
 
-    if type(log) is EventLog and not return_legacy_log_object:
-        from pm4py.objects.conversion.log import converter as log_converter
-        log = log_converter.apply(log, variant=log_converter.Variants.TO_DATA_FRAME)
+        if type(log) is EventLog and not return_legacy_log_object:
+            from pm4py.objects.conversion.log import converter as log_converter
+            log = log_converter.apply(log, variant=log_converter.Variants.TO_DATA_FRAME)
 
-    return log
+        return log
+
+    if use_cache and not return_legacy_log_object:
+        from pm4py.util import read_cache
+        return read_cache.cached_read(file_path, "xes_" + v.name, __read, reader_parameters=parameters)
+
+    return __read()
 
 
 def read_pnml(
@@ -365,7 +377,8 @@ def read_ocel_sqlite(file_path: str, encoding: str = constants.DEFAULT_ENCODING)
 def read_ocel2(
     file_path: str,
     variant_str: Optional[str] = None,
-    encoding: str = constants.DEFAULT_ENCODING
+    encoding: str = constants.DEFAULT_ENCODING,
+    use_cache: bool = constants.ENABLE_READ_CACHE
 ) -> OCEL:
     """
     Reads an OCEL 2.0 event log.
@@ -373,6 +386,7 @@ def read_ocel2(
     :param file_path: Path to the OCEL 2.0 event log file.
     :param variant_str: [Optional] Specification of the importer variant to be used.
     :param encoding: Encoding to be used (default: `utf-8`).
+    :param use_cache: Boolean indicating whether to store the parsed OCEL in (and read it from) the on-disk columnar cache (see `pm4py.util.read_cache`) (default: `False`, or the value of the `PM4PY_ENABLE_READ_CACHE` environment variable).
     :rtype: `OCEL`
 
     Supported file formats based on extension:
@@ -389,6 +403,13 @@ def read_ocel2(
     if not os.path.exists(file_path):
         raise Exception("File does not exist")
 
+    if use_cache:
+        from pm4py.util import read_cache
+        return read_cache.cached_read(file_path, "ocel2",
+                                      lambda: read_ocel2(file_path, variant_str=variant_str, encoding=encoding,
+                                                         use_cache=False),
+                                      reader_parameters={"variant_str": variant_str, "encoding": encoding})
+
     if file_path.lower().endswith("sqlite"):
         return read_ocel2_sqlite(file_path, variant_str=variant_str, encoding=encoding)
     elif file_path.lower().endswith("xml") or file_path.lower().endswith("xmlocel"):
@@ -22,9 +22,11 @@ Contact: info@processintelligence.solutions
 from enum import Enum
 
 from pm4py.algo.discovery.dfg.adapters.pandas.df_statistics import get_partial_order_dataframe
-from pm4py.util import exec_utils, constants, xes_constants
-from typing import Optional, Dict, Any, Union, Tuple
+from pm4py.util import exec_utils, constants, xes_constants, pandas_utils
+from typing import Optional, Dict, Any, Union, Tuple, List
+import numpy as np
 import pandas as pd
+import warnings
 
 
 class Parameters(Enum):
@@ -33,12 +35,193 @@ class Parameters(Enum):
     TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_TIMESTAMP_KEY
     START_TIMESTAMP_KEY = constants.PARAMETER_CONSTANT_START_TIMESTAMP_KEY
     KEEP_FIRST_FOLLOWING = "keep_first_following"
+    AGGREGATION_MEASURE = "aggregationMeasure"
+    CHUNK_SIZE = "chunk_size"
+
+
+# maximum number of cells (events x activities) of the prefix matrices computed at once
+DEFAULT_CHUNK_SIZE = 2 ** 22
+
+
+def __prepare(dataframe: pd.DataFrame, parameters: Dict[Union[str, Parameters], Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[Any]]:
+    """
+    Sorts the events of the dataframe as in the partial order dataframe, and integer-codes cases and activities.
+
+    Returns
+    --------------
+    case_starts
+        Position (in the sorted events) where every case starts
+    case_codes
+        Case of every sorted event
+    act
+        Code of the activity of every sorted event (-1 if the activity is missing)
+    start
+        Start timestamp of every sorted event (in seconds from the start of the case)
+    complete
+        Complete timestamp of every sorted event (in seconds from the start of the case)
+    labels
+        Activities (corresponding to the codes)
+    """
+    activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters, xes_constants.DEFAULT_NAME_KEY)
+    case_id_glue = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters, constants.CASE_CONCEPT_NAME)
+    timestamp_key = exec_utils.get_param_value(Parameters.TIMESTAMP_KEY, parameters,
+                                               xes_constants.DEFAULT_TIMESTAMP_KEY)
+    start_timestamp_key = exec_utils.get_param_value(Parameters.START_TIMESTAMP_KEY, parameters,
+                                                     xes_constants.DEFAULT_START_TIMESTAMP_KEY)
+    # as in the partial order dataframe, the complete timestamp is used when the start timestamp is missing
+    if start_timestamp_key is None:
+        start_timestamp_key = xes_constants.DEFAULT_START_TIMESTAMP_KEY
+    if start_timestamp_key not in dataframe:
+        start_timestamp_key = timestamp_key
+
+    columns = list({case_id_glue, activity_key, start_timestamp_key, timestamp_key})
+    if constants.DEFAULT_INDEX_KEY in dataframe.columns:
+        # the events are ordered by the index of the dataframe, as done in the partial order dataframe
+        df = dataframe[columns + [constants.DEFAULT_INDEX_KEY]].sort_values([case_id_glue, constants.DEFAULT_INDEX_KEY])
+    else:
+        df = dataframe[columns].sort_values([case_id_glue, start_timestamp_key, timestamp_key])
+
+    case_codes = pd.factorize(df[case_id_glue])[0]
+    act, labels = pd.factorize(df[activity_key])
+
+    reference = min(df[start_timestamp_key].min(), df[timestamp_key].min())
+    start = pandas_utils.get_total_seconds(df[start_timestamp_key] - reference).to_numpy(dtype=np.float64)
+    complete = pandas_utils.get_total_seconds(df[timestamp_key] - reference).to_numpy(dtype=np.float64)
+
+    is_case_start = np.ones(len(case_codes), dtype=bool)
+    is_case_start[1:] = case_codes[1:] != case_codes[:-1]
+    case_starts = np.nonzero(is_case_start)[0]
+
+    # express the timestamps relative to the start of the case, to keep the squared differences accurate
+    case_reference = np.minimum.reduceat(start, case_starts) if len(case_starts) else start[:0]
+    case_reference = np.repeat(case_reference, np.diff(np.append(case_starts, len(case_codes))))
+
+    return case_starts, case_codes, act, start - case_reference, complete - case_reference, list(labels)
+
+
+def __aggregate(dataframe: pd.DataFrame, parameters: Dict[Union[str, Parameters], Any], performance: bool) -> Tuple[List[Any], Dict[str, np.ndarray]]:
+    """
+    Computes, for every couple of activities (a, b), the number of couples of events (e1, e2) of the same case
+    such that e1 (having activity a) precedes e2 (having activity b) and e1 completes before e2 starts.
+    Optionally, the sum, the sum of squares, the minimum and the maximum of the times between
+    the completion of e1 and the start of e2 are computed.
+
+    The couples of events are not expanded: for every event e2, the number of events of every activity
+    preceding it in the case is read from a prefix sum (per case) of the occurrences of the activities, and the
+    timestamp aggregations are read from prefix sums / maximums / minimums of the complete timestamps.
+    Only the events starting before the completion of a previous event of the case (overlapping events) are
+    computed explicitly on the previous events of the case.
+    """
+    chunk_size = exec_utils.get_param_value(Parameters.CHUNK_SIZE, parameters, DEFAULT_CHUNK_SIZE)
+
+    case_starts, case_codes, act, start, complete, labels = __prepare(dataframe, parameters)
+    num_act = len(labels)
+    num_events = len(act)
+    valid = act >= 0
+    case_ends = np.append(case_starts[1:], num_events)
+
+    ret = {"count": np.zeros((num_act, num_act), dtype=np.int64)}
+    if performance:
+        ret["sum"] = np.zeros((num_act, num_act))
+        ret["sum_squares"] = np.zeros((num_act, num_act))
+        ret["min"] = np.full((num_act, num_act), np.inf)
+        ret["max"] = np.full((num_act, num_act), -np.inf)
+
+    chunk_events = max(1, chunk_size // max(1, num_act))
+    c = 0
+    while c < len(case_starts):
+        # a chunk contains entire cases, up to the given number of cells (or a single case)
+        c2 = c + 1
+        while c2 < len(case_starts) and case_ends[c2] - case_starts[c] <= chunk_events:
+            c2 += 1
+        s, e = case_starts[c], case_ends[c2 - 1]
+        __aggregate_chunk(ret, act[s:e], valid[s:e], start[s:e], complete[s:e], case_codes[s:e], num_act,
+                          performance)
+        c = c2
+
+    return labels, ret
+
+
+def __aggregate_chunk(ret: Dict[str, np.ndarray], act: np.ndarray, valid: np.ndarray, start: np.ndarray,
+                      complete: np.ndarray, case_codes: np.ndarray, num_act: int, performance: bool):
+    """
+    Adds the aggregations of a chunk of entire cases to the overall aggregations
+    """
+    n = len(act)
+    onehot = np.zeros((n, num_act))
+    onehot[np.nonzero(valid)[0], act[valid]] = 1.0
+
+    is_case_start = np.ones(n, dtype=bool)
+    is_case_start[1:] = case_codes[1:] != case_codes[:-1]
+    case_start = np.maximum.accumulate(np.where(is_case_start, np.arange(n), 0))
+
+    def exclusive_prefix_sum(x):
+        cumulative = np.vstack([np.zeros((1, num_act)), np.cumsum(x, axis=0)])
+        return cumulative[:-1] - cumulative[case_start]
+
+    counts = exclusive_prefix_sum(onehot)
+    if performance:
+        sums = exclusive_prefix_sum(onehot * complete[:, None])
+        sums_squares = exclusive_prefix_sum(onehot * (complete ** 2)[:, None])
+        masked = pd.DataFrame(np.where(onehot > 0, complete[:, None], np.nan))
+        grouped = masked.groupby(case_codes)
+        # the cumulative maximum / minimum of the previous events (carried over the events of other activities)
+        maxs = grouped.cummax().groupby(case_codes).ffill().groupby(case_codes).shift(1)
+        mins = grouped.cummin().groupby(case_codes).ffill().groupby(case_codes).shift(1)
+        maxs = maxs.to_numpy(dtype=np.float64, copy=True)
+        mins = mins.to_numpy(dtype=np.float64, copy=True)
+
+    # events starting before the completion of a previous event of the same case
+    previous_complete = pd.Series(np.where(valid, complete, -np.inf)).groupby(case_codes).cummax()
+    previous_complete = previous_complete.groupby(case_codes).shift(1).fillna(-np.inf).to_numpy()
+    for j in np.nonzero(valid & (start < previous_complete))[0]:
+        previous = np.arange(case_start[j], j)
+        previous = previous[valid[previous] & (complete[previous] <= start[j])]
+        counts[j] = np.bincount(act[previous], minlength=num_act)
+        if performance:
+            sums[j] = np.bincount(act[previous], weights=complete[previous], minlength=num_act)
+            sums_squares[j] = np.bincount(act[previous], weights=complete[previous] ** 2, minlength=num_act)
+            maxs[j] = np.nan
+            mins[j] = np.nan
+            np.fmax.at(maxs[j], act[previous], complete[previous])
+            np.fmin.at(mins[j], act[previous], complete[previous])
+
+    ret["count"] += np.rint(counts.T @ onehot).astype(np.int64)
+    if performance:
+        ret["sum"] += (counts * start[:, None] - sums).T @ onehot
+        ret["sum_squares"] += (counts * (start ** 2)[:, None] - 2 * sums * start[:, None] + sums_squares).T @ onehot
+        for b in np.unique(act[valid]):
+            rows = act == b
+            with warnings.catch_warnings():
+                # couples of activities without occurrences in the rows lead to all-NaN slices
+                warnings.simplefilter("ignore", category=RuntimeWarning)
+                ret["min"][:, b] = np.fmin(ret["min"][:, b], np.nanmin(start[rows, None] - maxs[rows], axis=0))
+                ret["max"][:, b] = np.fmax(ret["max"][:, b], np.nanmax(start[rows, None] - mins[rows], axis=0))
 
 
 def apply(dataframe: pd.DataFrame, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Dict[Tuple[str, str], int]:
-    if parameters is None:
-        parameters = {}
+    """
+    Computes the eventually-follows graph of a dataframe, i.e., the number of couples of events (e1, e2) of the same
+    case such that e1 precedes e2 (and e1 completes before e2 starts), for every couple of activities.
 
+    Parameters
+    --------------
+    dataframe
+        Dataframe
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.ACTIVITY_KEY => the activity
+        - Parameters.CASE_ID_KEY => the case identifier
+        - Parameters.TIMESTAMP_KEY => the (complete) timestamp
+        - Parameters.START_TIMESTAMP_KEY => the start timestamp
+        - Parameters.KEEP_FIRST_FOLLOWING => counts only the first event following every event
+        - Parameters.CHUNK_SIZE => maximum number of cells (events x activities) processed at once
+
+    Returns
+    --------------
+    efg
+        Eventually-follows graph
+    """
     if parameters is None:
         parameters = {}
 
@@ -49,15 +232,67 @@ def apply(dataframe: pd.DataFrame, parameters: Optional[Dict[Union[str, Paramete
     start_timestamp_key = exec_utils.get_param_value(Parameters.START_TIMESTAMP_KEY, parameters, None)
     keep_first_following = exec_utils.get_param_value(Parameters.KEEP_FIRST_FOLLOWING, parameters, False)
 
-    partial_order_dataframe = get_partial_order_dataframe(dataframe, start_timestamp_key=start_timestamp_key,
-                                                          timestamp_key=timestamp_key, case_id_glue=case_id_glue,
-                                                          activity_key=activity_key,
-                                                          keep_first_following=keep_first_following)
+    if keep_first_following:
+        partial_order_dataframe = get_partial_order_dataframe(dataframe, start_timestamp_key=start_timestamp_key,
+                                                              timestamp_key=timestamp_key, case_id_glue=case_id_glue,
+                                                              activity_key=activity_key,
+                                                              keep_first_following=keep_first_following)
+
+        ret_dict = partial_order_dataframe.groupby([activity_key, activity_key + '_2']).size().to_dict()
+
+        # assure to avoid problems with np.float64, by using the Python float type
+        for el in ret_dict:
+            ret_dict[el] = int(ret_dict[el])
+
+        return ret_dict
+
+    labels, aggregations = __aggregate(dataframe, parameters, False)
+    count = aggregations["count"]
+
+    return {(labels[a], labels[b]): int(count[a, b]) for a, b in zip(*np.nonzero(count))}
+
+
+def apply_performance(dataframe: pd.DataFrame, parameters: Optional[Dict[Union[str, Parameters], Any]] = None) -> Dict[Tuple[str, str], Any]:
+    """
+    Computes the performance of the eventually-follows graph of a dataframe, aggregating (for every couple of
+    activities) the times between the completion of the first event and the start of the second event
+    of the couples of events of the eventually-follows relation, without expanding such couples.
+
+    Parameters
+    --------------
+    dataframe
+        Dataframe
+    parameters
+        Parameters of the algorithm, including:
+        - Parameters.ACTIVITY_KEY => the activity
+        - Parameters.CASE_ID_KEY => the case identifier
+        - Parameters.TIMESTAMP_KEY => the (complete) timestamp
+        - Parameters.START_TIMESTAMP_KEY => the start timestamp
+        - Parameters.AGGREGATION_MEASURE => the aggregation (mean, min, max, sum, stdev, or all to get all of them)
+        - Parameters.CHUNK_SIZE => maximum number of cells (events x activities) processed at once
+
+    Returns
+    --------------
+    efg_performance
+        Performance (in seconds) of the eventually-follows graph
+    """
+    if parameters is None:
+        parameters = {}
+
+    aggregation_measure = exec_utils.get_param_value(Parameters.AGGREGATION_MEASURE, parameters, "mean")
 
-    ret_dict = partial_order_dataframe.groupby([activity_key, activity_key + '_2']).size().to_dict()
+    labels, aggregations = __aggregate(dataframe, parameters, True)
+    count = aggregations["count"]
 
-    # assure to avoid problems with np.float64, by using the Python float type
-    for el in ret_dict:
-        ret_dict[el] = int(ret_dict[el])
+    ret = {}
+    for a, b in zip(*np.nonzero(count)):
+        n = int(count[a, b])
+        total = float(aggregations["sum"][a, b])
+        stdev = float("nan")
+        if n > 1:
+            stdev = float(np.sqrt(max(0.0, (aggregations["sum_squares"][a, b] - total * total / n) / (n - 1))))
+        stats = {"mean": total / n, "max": float(aggregations["max"][a, b]), "min": float(aggregations["min"][a, b]),
+                 "sum": total, "stdev": stdev}
+        ret[(labels[a], labels[b])] = stats if aggregation_measure == "all" else stats[aggregation_measure]
 
-    return ret_dict
+    return ret
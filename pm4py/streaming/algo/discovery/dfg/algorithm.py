@@ -19,13 +19,14 @@ visit <https://www.gnu.org/licenses/>.
 Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
-from pm4py.streaming.algo.discovery.dfg.variants import frequency
+from pm4py.streaming.algo.discovery.dfg.variants import frequency, sharded
 from enum import Enum
 from pm4py.util import exec_utils
 
 
 class Variants(Enum):
     FREQUENCY = frequency
+    SHARDED = sharded
 
 
 DEFAULT_VARIANT = Variants.FREQUENCY
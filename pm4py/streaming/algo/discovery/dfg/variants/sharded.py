@@ -0,0 +1,323 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+import logging
+import math
+import time
+import traceback
+from collections import Counter, OrderedDict
+from enum import Enum
+from threading import Lock
+
+from pm4py.streaming.algo.interface import StreamingAlgorithm
+from pm4py.util import exec_utils, constants, xes_constants
+
+
+class Parameters(Enum):
+    ACTIVITY_KEY = constants.PARAMETER_CONSTANT_ACTIVITY_KEY
+    CASE_ID_KEY = constants.PARAMETER_CONSTANT_CASEID_KEY
+    NUM_SHARDS = "num_shards"
+    MAX_CASES = "max_cases"
+    CASE_TTL = "case_ttl"
+    TTL_SWEEP_INTERVAL = "ttl_sweep_interval"
+
+
+class _Shard(object):
+    """
+    Portion of the cases of the stream (chosen by hashing the case identifier), with its own lock
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        # case identifier -> (last activity, time of the last event), in least-recently-used order
+        self.cases = OrderedDict()
+        # increments accumulated since the last snapshot
+        self.dfg = Counter()
+        self.activities = Counter()
+        self.start_activities = Counter()
+        self.end_activities = Counter()
+
+    def swap_pending(self):
+        """
+        Returns the increments accumulated since the last snapshot, and resets them
+        """
+        ret = (self.dfg, self.activities, self.start_activities, self.end_activities)
+        self.dfg = Counter()
+        self.activities = Counter()
+        self.start_activities = Counter()
+        self.end_activities = Counter()
+        return ret
+
+
+class ShardedStreamingDfgDiscovery(StreamingAlgorithm):
+    def __init__(self, parameters=None):
+        """
+        Initialize the ShardedStreamingDfgDiscovery object.
+
+        Activities are interned to integers, and the state of the cases is split in shards (by hashing the case
+        identifier), each one protected by its own lock, so events of different shards do not contend.
+        The inactive cases are evicted (least-recently-used and/or time-to-live policies), and every snapshot
+        only merges the increments accumulated since the previous one.
+
+        Parameters
+        ---------------
+        parameters of the algorithm, including:
+         - Parameters.ACTIVITY_KEY: the key of the event to use as activity
+         - Parameters.CASE_ID_KEY: the key of the event to use as case identifier
+         - Parameters.NUM_SHARDS: number of shards (default: 16)
+         - Parameters.MAX_CASES: maximum number of cases kept in memory (default: None, i.e., no limit)
+         - Parameters.CASE_TTL: seconds of inactivity after which a case is evicted (default: None, i.e., no limit)
+         - Parameters.TTL_SWEEP_INTERVAL: seconds between two evictions of the expired cases of all the shards
+         (default: the time-to-live)
+        """
+        if parameters is None:
+            parameters = {}
+
+        self.parameters = parameters
+        self.activity_key = exec_utils.get_param_value(Parameters.ACTIVITY_KEY, parameters,
+                                                       xes_constants.DEFAULT_NAME_KEY)
+        self.case_id_key = exec_utils.get_param_value(Parameters.CASE_ID_KEY, parameters,
+                                                      constants.CASE_CONCEPT_NAME)
+        self.num_shards = max(1, exec_utils.get_param_value(Parameters.NUM_SHARDS, parameters, 16))
+        max_cases = exec_utils.get_param_value(Parameters.MAX_CASES, parameters, None)
+        self.max_cases_per_shard = int(math.ceil(max_cases / self.num_shards)) if max_cases is not None else None
+        self.case_ttl = exec_utils.get_param_value(Parameters.CASE_TTL, parameters, None)
+        self.ttl_sweep_interval = exec_utils.get_param_value(Parameters.TTL_SWEEP_INTERVAL, parameters, self.case_ttl)
+
+        self._shards = [_Shard() for _ in range(self.num_shards)]
+
+        self._intern_lock = Lock()
+        self._activity_ids = {}
+        self._activity_labels = []
+
+        self._snapshot_lock = Lock()
+        self._dfg = {}
+        self._activities = {}
+        self._start_activities = {}
+        self._end_activities = {}
+        self._changed_edges = set()
+
+        self._eviction_lock = Lock()
+        self._evicted_lru = 0
+        self._evicted_ttl = 0
+        self._sweep_lock = Lock()
+        self._next_sweep = time.monotonic() + self.ttl_sweep_interval if self.case_ttl is not None else None
+
+        StreamingAlgorithm.__init__(self)
+
+    def event_without_activity_or_case(self, event):
+        """
+        Print an error message when an event is without the
+        activity or the case identifier
+
+        Parameters
+        ----------------
+        event
+            Event
+        """
+        logging.warning("event without activity or case: " + str(event))
+
+    def intern_activity(self, activity):
+        """
+        Gets the integer identifier of an activity (assigning a new one if the activity was never seen)
+        """
+        act_id = self._activity_ids.get(activity)
+        if act_id is None:
+            with self._intern_lock:
+                act_id = self._activity_ids.get(activity)
+                if act_id is None:
+                    act_id = len(self._activity_labels)
+                    self._activity_labels.append(activity)
+                    self._activity_ids[activity] = act_id
+        return act_id
+
+    def receive(self, event):
+        # the global lock of the streaming algorithm is not needed: every shard has its own lock
+        try:
+            self._process(event)
+        except:
+            traceback.print_exc()
+
+    def get(self):
+        try:
+            return self._current_result()
+        except:
+            traceback.print_exc()
+            return None
+
+    def _evict(self, shard, now):
+        """
+        Evicts the inactive cases of a shard (to be called while holding the lock of the shard)
+        """
+        evicted_ttl = 0
+        evicted_lru = 0
+        if self.case_ttl is not None:
+            while shard.cases:
+                case, (_, last_seen) = next(iter(shard.cases.items()))
+                if now - last_seen <= self.case_ttl:
+                    break
+                del shard.cases[case]
+                evicted_ttl += 1
+        if self.max_cases_per_shard is not None:
+            while len(shard.cases) > self.max_cases_per_shard:
+                shard.cases.popitem(last=False)
+                evicted_lru += 1
+        if evicted_ttl or evicted_lru:
+            with self._eviction_lock:
+                self._evicted_ttl += evicted_ttl
+                self._evicted_lru += evicted_lru
+
+    def _sweep(self, now):
+        """
+        Evicts the expired cases of all the shards (at most once every sweep interval), so that also the cases of
+        the shards which are not receiving events are evicted
+        """
+        if self.case_ttl is None or now < self._next_sweep or not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_sweep = now + self.ttl_sweep_interval
+            for shard in self._shards:
+                with shard.lock:
+                    self._evict(shard, now)
+        finally:
+            self._sweep_lock.release()
+
+    def _process(self, event):
+        """
+        Receives an event from the live event stream,
+        and appends it to the current DFG discovery
+
+        Parameters
+        ---------------
+        event
+            Event
+        """
+        if self.case_id_key in event and self.activity_key in event:
+            case = event[self.case_id_key]
+            activity = self.intern_activity(event[self.activity_key])
+            shard = self._shards[hash(case) % self.num_shards]
+            now = time.monotonic()
+            with shard.lock:
+                state = shard.cases.pop(case, None)
+                if state is None:
+                    shard.start_activities[activity] += 1
+                else:
+                    shard.dfg[(state[0], activity)] += 1
+                    shard.end_activities[state[0]] -= 1
+                shard.activities[activity] += 1
+                shard.end_activities[activity] += 1
+                shard.cases[case] = (activity, now)
+                self._evict(shard, now)
+            self._sweep(now)
+        else:
+            self.event_without_activity_or_case(event)
+
+    def __merge_pending(self):
+        """
+        Merges the increments of the shards in the snapshot (to be called while holding the snapshot lock).
+        The cost is proportional to the number of edges/activities changed since the last merge.
+        """
+        labels = self._activity_labels
+        for shard in self._shards:
+            with shard.lock:
+                dfg, activities, start_activities, end_activities = shard.swap_pending()
+            for (a, b), count in dfg.items():
+                edge = (labels[a], labels[b])
+                self._dfg[edge] = self._dfg.get(edge, 0) + count
+                self._changed_edges.add(edge)
+            for target, source in ((self._activities, activities), (self._start_activities, start_activities),
+                                   (self._end_activities, end_activities)):
+                for act, count in source.items():
+                    if count:
+                        label = labels[act]
+                        value = target.get(label, 0) + count
+                        if value:
+                            target[label] = value
+                        else:
+                            del target[label]
+
+    def _current_result(self):
+        """
+        Gets the current state of the DFG
+
+        Returns
+        ----------------
+        dfg
+            Directly-Follows Graph
+        activities
+            Activities
+        start_activities
+            Start activities
+        end_activities
+            End activities (the last activity of every case, including the evicted ones)
+        """
+        self._sweep(time.monotonic())
+        with self._snapshot_lock:
+            self.__merge_pending()
+            return dict(self._dfg), dict(self._activities), dict(self._start_activities), dict(self._end_activities)
+
+    def get_changed_edges(self):
+        """
+        Gets the edges of the DFG that changed since the previous call of this method,
+        without materializing the entire DFG
+
+        Returns
+        ----------------
+        changed_edges
+            Dictionary associating to every changed edge its current frequency
+        """
+        with self._snapshot_lock:
+            self.__merge_pending()
+            ret = {edge: self._dfg[edge] for edge in self._changed_edges}
+            self._changed_edges = set()
+            return ret
+
+    def get_eviction_counters(self):
+        """
+        Gets the counters of the evictions and the number of cases currently kept in memory
+
+        Returns
+        ----------------
+        counters
+            Dictionary with the keys "evicted_lru", "evicted_ttl" and "active_cases"
+        """
+        self._sweep(time.monotonic())
+        active_cases = 0
+        for shard in self._shards:
+            with shard.lock:
+                active_cases += len(shard.cases)
+        with self._eviction_lock:
+            return {"evicted_lru": self._evicted_lru, "evicted_ttl": self._evicted_ttl, "active_cases": active_cases}
+
+
+def apply(parameters=None):
+    """
+    Creates a ShardedStreamingDfgDiscovery object
+
+    Parameters
+    --------------
+    parameters
+        Parameters of the algorithm
+    """
+    if parameters is None:
+        parameters = {}
+
+    return ShardedStreamingDfgDiscovery(parameters=parameters)
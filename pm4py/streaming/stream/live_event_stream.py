@@ -20,6 +20,8 @@ Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
 import collections
+import logging
+import queue
 import threading
 from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
@@ -34,31 +36,109 @@ class StreamState(Enum):
 
 class Parameters(Enum):
     THREAD_POOL_SIZE = "thread_pool_size"
+    BATCHED_DELIVERY = "batched_delivery"
+    BATCH_SIZE = "batch_size"
+    MAX_QUEUE_SIZE = "max_queue_size"
+    OVERFLOW_POLICY = "overflow_policy"
+
+
+class OverflowPolicy(Enum):
+    BLOCK = "block"
+    DROP = "drop"
+
+
+class _ObserverChannel(object):
+    """
+    Dedicated queue (and thread) delivering the batches of events to an observer, in order
+    """
+
+    def __init__(self, algo, max_batches):
+        self.algo = algo
+        self.queue = queue.Queue(maxsize=max_batches)
+        self.dispatched = 0
+        self.delivered = 0
+        self.thread = threading.Thread(target=self._consume, daemon=True)
+        self.thread.start()
+
+    def _consume(self):
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                return
+            for event in batch:
+                try:
+                    self.algo.receive(event)
+                except Exception as e:
+                    # the consumer thread is kept alive, otherwise the stream would block on the full queue
+                    logging.error("exception while delivering the event " + str(event) + ": " + repr(e))
+                self.delivered += 1
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
 
 
 class LiveEventStream:
 
     def __init__(self, parameters=None):
+        """
+        Live event stream, delivering the appended events to the registered algorithms
+
+        Parameters
+        ---------------
+        parameters
+            Parameters of the stream, including:
+            - Parameters.THREAD_POOL_SIZE => size of the thread pool (default delivery)
+            - Parameters.BATCHED_DELIVERY => drains the events in micro-batches, which are delivered in order
+            to every observer through a dedicated queue (default: False)
+            - Parameters.BATCH_SIZE => maximum number of events of a micro-batch (default: 1000)
+            - Parameters.MAX_QUEUE_SIZE => maximum number of events waiting in the stream (default: None, i.e.,
+            unbounded). With the batched delivery, it bounds also the events waiting in the queue of every observer
+            - Parameters.OVERFLOW_POLICY => behavior of append when the stream is full: OverflowPolicy.BLOCK waits
+            for the delivery of the events, OverflowPolicy.DROP discards the event (default: OverflowPolicy.BLOCK)
+        """
         self._dq = collections.deque()
         self._state = StreamState.INACTIVE
         self._lock = threading.Lock()
         self._cond = threading.Condition(self._lock)
         self._observers = set()
         self._mail_man = None
-        self._tp = ThreadPoolExecutor(exec_utils.get_param_value(Parameters.THREAD_POOL_SIZE, parameters, 6))
+        self._batched = exec_utils.get_param_value(Parameters.BATCHED_DELIVERY, parameters, False)
+        self._batch_size = max(1, exec_utils.get_param_value(Parameters.BATCH_SIZE, parameters, 1000))
+        self._max_queue_size = exec_utils.get_param_value(Parameters.MAX_QUEUE_SIZE, parameters, None)
+        self._overflow_policy = OverflowPolicy(
+            exec_utils.get_param_value(Parameters.OVERFLOW_POLICY, parameters, OverflowPolicy.BLOCK))
+        self._channels = {}
+        self._appended = 0
+        self._dropped = 0
+        self._tp = None
+        if not self._batched:
+            self._tp = ThreadPoolExecutor(exec_utils.get_param_value(Parameters.THREAD_POOL_SIZE, parameters, 6))
 
     def append(self, event):
         self._cond.acquire()
+        if self._max_queue_size is not None:
+            while len(self._dq) >= self._max_queue_size and self._state != StreamState.FINISHED:
+                if self._overflow_policy == OverflowPolicy.DROP:
+                    self._dropped += 1
+                    self._cond.release()
+                    return
+                self._cond.wait()
         if self._state != StreamState.FINISHED:
             self._dq.append(event)
-            self._cond.notify()
+            self._appended += 1
+            self._notify()
         self._cond.release()
 
+    def _notify(self):
+        # producers may also wait on the condition (when the stream is full), hence all the waiters are woken up
+        self._cond.notify_all()
+
     def _deliver(self):
         while self._state != StreamState.INACTIVE:
             self._cond.acquire()
             while len(self._dq) == 0:
-                self._cond.notify()
+                self._cond.notify_all()
                 if self._state != StreamState.FINISHED:
                     self._cond.wait()
                 else:
@@ -67,12 +147,35 @@ class LiveEventStream:
             event = self._dq.popleft()
             for algo in self._observers:
                 self._tp.submit(algo.receive, event)
+            # wakes up the producers blocked on a full stream
+            if self._max_queue_size is not None:
+                self._cond.notify_all()
+            self._cond.release()
+
+    def _deliver_batched(self):
+        while True:
+            self._cond.acquire()
+            while len(self._dq) == 0:
+                self._cond.notify_all()
+                if self._state != StreamState.FINISHED:
+                    self._cond.wait()
+                else:
+                    self._cond.release()
+                    return
+            batch = [self._dq.popleft() for _ in range(min(self._batch_size, len(self._dq)))]
+            channels = list(self._channels.values())
+            # wakes up the producers blocked on a full stream
+            self._cond.notify_all()
             self._cond.release()
+            for channel in channels:
+                # blocks when the queue of the observer is full, propagating the backpressure to the stream
+                channel.dispatched += len(batch)
+                channel.queue.put(batch)
 
     def start(self):
         self._cond.acquire()
         self._state = StreamState.ACTIVE
-        self._mail_man = threading.Thread(target=self._deliver)
+        self._mail_man = threading.Thread(target=self._deliver_batched if self._batched else self._deliver)
         self._mail_man.start()
         self._cond.release()
 
@@ -80,25 +183,55 @@ class LiveEventStream:
         self._cond.acquire()
         while len(self._dq) > 0:
             self._cond.wait()
-        self._tp.shutdown()
+        if self._tp is not None:
+            self._tp.shutdown()
         if self._state == StreamState.ACTIVE:
             self._state = StreamState.FINISHED
-            self._cond.notify()
+            self._notify()
         self._cond.release()
+        if self._batched:
+            if self._mail_man is not None:
+                self._mail_man.join()
+            for channel in list(self._channels.values()):
+                channel.close()
 
     def register(self, algo):
         self._cond.acquire()
         self._observers.add(algo)
+        if self._batched and algo not in self._channels:
+            max_batches = 0
+            if self._max_queue_size is not None:
+                max_batches = max(1, self._max_queue_size // self._batch_size)
+            self._channels[algo] = _ObserverChannel(algo, max_batches)
         self._cond.release()
 
     async def deregister(self, algo):
         self._cond.acquire()
         self._observers.remove(algo)
+        channel = self._channels.pop(algo, None)
         self._cond.release()
+        if channel is not None:
+            channel.close()
+
+    def get_counters(self):
+        """
+        Gets the counters of the stream
+
+        Returns
+        ---------------
+        counters
+            Dictionary containing the number of appended events ("appended"), of dropped events ("dropped"),
+            the number of events waiting in the stream ("queue_depth") and, for the batched delivery,
+            the maximum number of events dispatched but not yet received by an observer ("lag")
+        """
+        self._cond.acquire()
+        counters = {"appended": self._appended, "dropped": self._dropped, "queue_depth": len(self._dq)}
+        channels = list(self._channels.values())
+        self._cond.release()
+        counters["lag"] = max([c.dispatched - c.delivered for c in channels], default=0)
+        return counters
 
     def _get_state(self):
         return self._state
 
     state = property(_get_state)
-
-
@@ -20,9 +20,12 @@ Website: https://processintelligence.solutions
 Contact: info@processintelligence.solutions
 '''
 import math
-from datetime import timedelta, datetime, time
+from datetime import timedelta, datetime, time, date
 from typing import List, Tuple
 
+import numpy as np
+import pandas as pd
+
 from pm4py.util import constants
 from pm4py.util.dt_parsing.variants import strpfromiso
 
@@ -78,14 +81,10 @@ class BusinessHours:
             "business_hour_slots"] if "business_hour_slots" in kwargs else constants.DEFAULT_BUSINESS_HOUR_SLOTS
 
         # union of business hour slots in order to avoid overlapping business hours
-        self.business_hour_slots_unified = []
-        for begin, end in sorted(self.business_hour_slots):
-            if self.business_hour_slots_unified and self.business_hour_slots_unified[-1][1] >= begin - 1:
-                self.business_hour_slots_unified[-1][1] = max(self.business_hour_slots_unified[-1][1], end)
-            else:
-                self.business_hour_slots_unified.append([begin, end])
+        self.business_hour_slots_unified = unify_business_hour_slots(self.business_hour_slots)
 
-        # work calendar (it permits querying if a given day is a working day in a given culture) - not used yet
+        # work calendar (it permits querying if a given day is a working day in a given culture, through
+        # its is_working_day method). The business hours falling in non-working days are not counted.
         self.work_calendar = kwargs[
             "work_calendar"] if "work_calendar" in kwargs else constants.DEFAULT_BUSINESS_HOURS_WORKCALENDAR
 
@@ -118,4 +117,193 @@ class BusinessHours:
 
                 sum += overlapping_time
 
+        if self.work_calendar is not None:
+            current_day = self.datetime1.date()
+            while current_day <= self.datetime2.date():
+                if not self.work_calendar.is_working_day(current_day):
+                    day_start = datetime.combine(current_day, time.min)
+                    lost = BusinessHours(max(self.datetime1, day_start),
+                                         min(self.datetime2, day_start + timedelta(days=1)),
+                                         business_hour_slots=self.business_hour_slots, work_calendar=None)
+                    sum -= lost.get_seconds()
+                current_day += timedelta(days=1)
+
         return sum
+
+
+class BusinessHoursEngine:
+    """
+    Batched computation of the business hours between arrays of timestamps.
+
+    The working seconds of a week are accumulated once (and, if a work calendar is provided,
+    the working seconds lost in every non-working day of the considered period), so the business
+    hours elapsed between two timestamps become the difference of two cumulative values,
+    computed with np.searchsorted on whole timestamp arrays.
+    """
+
+    # the cumulative working time is counted from Monday 1970-01-05
+    REFERENCE_OFFSET_US = 4 * 86400 * 10**6
+    DAY_US = 86400 * 10**6
+    WEEK_US = 7 * DAY_US
+    WEEK_SECONDS = 7 * 86400
+
+    def __init__(self, business_hour_slots=None, work_calendar=constants.DEFAULT_BUSINESS_HOURS_WORKCALENDAR):
+        if business_hour_slots is None:
+            business_hour_slots = constants.DEFAULT_BUSINESS_HOUR_SLOTS
+
+        # slots are considered as periodic (every week), hence the ones crossing the end of the week are split
+        periodic_slots = []
+        for begin, end in unify_business_hour_slots(business_hour_slots):
+            if end > self.WEEK_SECONDS:
+                periodic_slots.append((begin, self.WEEK_SECONDS))
+                periodic_slots.append((0, end - self.WEEK_SECONDS))
+            else:
+                periodic_slots.append((begin, end))
+        periodic_slots = unify_business_hour_slots(periodic_slots)
+
+        self.slot_begins = np.array([x[0] for x in periodic_slots], dtype=np.float64)
+        self.slot_ends = np.array([x[1] for x in periodic_slots], dtype=np.float64)
+        slot_lengths = self.slot_ends - self.slot_begins
+        # working seconds in the week before the beginning of every slot
+        self.slot_cumulative = np.concatenate(([0.0], np.cumsum(slot_lengths)))[:-1]
+        self.week_total = float(np.sum(slot_lengths))
+        self.work_calendar = work_calendar
+
+    def __week_cumulative(self, rel_us):
+        """
+        Working seconds elapsed from the reference Monday to the given instants (without the work calendar)
+        """
+        weeks = rel_us // self.WEEK_US
+        seconds_in_week = (rel_us - weeks * self.WEEK_US) / 10**6
+        ret = weeks * self.week_total
+        if len(self.slot_begins) > 0:
+            idx = np.searchsorted(self.slot_begins, seconds_in_week, side="right") - 1
+            valid = idx >= 0
+            idx = np.maximum(idx, 0)
+            within = np.clip(seconds_in_week - self.slot_begins[idx], 0, self.slot_ends[idx] - self.slot_begins[idx])
+            ret = ret + np.where(valid, self.slot_cumulative[idx] + within, 0.0)
+        return ret
+
+    def get_working_seconds(self, *timestamp_columns) -> List[np.ndarray]:
+        """
+        Computes the cumulative working seconds of the provided timestamp columns.
+        The values are comparable only between the columns provided in the same call.
+
+        Parameters
+        ----------------
+        timestamp_columns
+            Columns (Pandas series or NumPy datetime64 arrays) of timestamps. For timezone-aware columns,
+            the local time of the timestamps is considered.
+
+        Returns
+        ----------------
+        working_seconds
+            List containing, for each column, the array of cumulative working seconds (NaN for missing timestamps)
+        """
+        rel_columns = []
+        missing = []
+        for col in timestamp_columns:
+            values = _to_wall_clock_datetime64(col)
+            missing.append(np.isnat(values))
+            rel_columns.append(values.view(np.int64) - self.REFERENCE_OFFSET_US)
+
+        holidays = np.zeros(0, dtype=np.int64)
+        if self.work_calendar is not None:
+            valid_values = [rel[~miss] for rel, miss in zip(rel_columns, missing) if np.any(~miss)]
+            if valid_values:
+                first_day = min(int(np.min(x)) for x in valid_values) // self.DAY_US
+                last_day = max(int(np.max(x)) for x in valid_values) // self.DAY_US
+                reference_day = date(1970, 1, 5)
+                holidays = np.array([d for d in range(first_day, last_day + 1) if
+                                     not self.work_calendar.is_working_day(reference_day + timedelta(days=d))],
+                                    dtype=np.int64)
+
+        if len(holidays) > 0:
+            holiday_starts = self.__week_cumulative(holidays * self.DAY_US)
+            holiday_ends = self.__week_cumulative((holidays + 1) * self.DAY_US)
+            lost_before = np.concatenate(([0.0], np.cumsum(holiday_ends - holiday_starts)))
+
+        ret = []
+        for rel, miss in zip(rel_columns, missing):
+            rel = np.where(miss, 0, rel)
+            cumulative = self.__week_cumulative(rel)
+            if len(holidays) > 0:
+                days = rel // self.DAY_US
+                idx = np.searchsorted(holidays, days, side="left")
+                is_holiday = holidays[np.minimum(idx, len(holidays) - 1)] == days
+                cumulative = cumulative - lost_before[idx] - np.where(is_holiday, cumulative - holiday_starts[np.minimum(idx, len(holidays) - 1)], 0.0)
+            ret.append(np.where(miss, np.nan, cumulative))
+        return ret
+
+    def diff(self, st, et) -> np.ndarray:
+        """
+        Calculates the business hours between two columns of timestamps
+        (0 when the second timestamp precedes the first)
+
+        Parameters
+        ----------------
+        st
+            Column of start timestamps
+        et
+            Column of end timestamps
+
+        Returns
+        ----------------
+        diff
+            Array containing the business hours (in seconds) between the corresponding timestamps
+        """
+        st_ws, et_ws = self.get_working_seconds(st, et)
+        return np.maximum(et_ws - st_ws, 0.0)
+
+
+def soj_time_business_hours_diff_vectorized(st, et, business_hour_slots: List[Tuple[int]],
+                                            work_calendar=constants.DEFAULT_BUSINESS_HOURS_WORKCALENDAR) -> np.ndarray:
+    """
+    Calculates the difference between the provided columns of timestamps based on the business hours
+    (batched version of soj_time_business_hours_diff)
+
+    Parameters
+    -----------------
+    st
+        Column (Pandas series / NumPy array) of start timestamps
+    et
+        Column (Pandas series / NumPy array) of complete timestamps
+    business_hour_slots
+        work schedule of the company (see soj_time_business_hours_diff)
+    work_calendar
+        work calendar (it permits querying if a given day is a working day in a given culture)
+
+    Returns
+    -----------------
+    diff
+        Array containing the differences in business hours
+    """
+    return BusinessHoursEngine(business_hour_slots, work_calendar).diff(st, et)
+
+
+def unify_business_hour_slots(business_hour_slots: List[Tuple[int]]) -> List[List[int]]:
+    """
+    Computes the union of the business hour slots, in order to avoid overlapping business hours
+    """
+    unified = []
+    for begin, end in sorted(business_hour_slots):
+        if unified and unified[-1][1] >= begin - 1:
+            unified[-1][1] = max(unified[-1][1], end)
+        else:
+            unified.append([begin, end])
+    return unified
+
+
+def _to_wall_clock_datetime64(timestamps) -> np.ndarray:
+    """
+    Transforms a column of timestamps into a NumPy datetime64[us] array expressing the local (wall-clock) time
+    """
+    if isinstance(timestamps, pd.Series):
+        if pd.api.types.is_datetime64_any_dtype(timestamps):
+            if getattr(timestamps.dt, "tz", None) is not None:
+                timestamps = timestamps.dt.tz_localize(None)
+            return timestamps.to_numpy(dtype="datetime64[us]")
+        timestamps = timestamps.tolist()
+    if isinstance(timestamps, np.ndarray) and np.issubdtype(timestamps.dtype, np.datetime64):
+        return timestamps.astype("datetime64[us]")
+    return np.array([x.replace(tzinfo=None) if x is not None and x == x else None for x in timestamps], dtype="datetime64[us]")
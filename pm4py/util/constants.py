@@ -116,6 +116,10 @@ DEFAULT_TIMESTAMP_PARSE_FORMAT = get_param_from_env("PM4PY_DEFAULT_TIMESTAMP_PAR
 DEFAULT_XES_TIMESTAMP_PARSE_FORMAT = get_param_from_env("PM4PY_DEFAULT_XES_TIMESTAMP_PARSE_FORMAT", get_default_xes_timestamp_format())
 
 ENABLE_MULTIPROCESSING_DEFAULT = True if get_param_from_env("PM4PY_ENABLE_MULTIPROCESSING_DEFAULT", "False").lower() == "true" else False
+ENABLE_VECTORIZED_DFG_KERNEL = False if get_param_from_env("PM4PY_ENABLE_VECTORIZED_DFG_KERNEL", "True").lower() == "false" else True
+ENABLE_READ_CACHE = True if get_param_from_env("PM4PY_ENABLE_READ_CACHE", "False").lower() == "true" else False
+READ_CACHE_DIR = get_param_from_env("PM4PY_READ_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "pm4py"))
+READ_CACHE_MAX_SIZE = int(get_param_from_env("PM4PY_READ_CACHE_MAX_SIZE", str(10 * 1024 ** 3)))
 SHOW_PROGRESS_BAR = True if get_param_from_env("PM4PY_SHOW_PROGRESS_BAR", "True").lower() == "true" else False
 DEFAULT_READ_XES_LEGACY_OBJECT = True if get_param_from_env("PM4PY_DEFAULT_READ_XES_LEGACY_OBJECT", "False").lower() == "true" else False
 DEFAULT_RETURN_DIAGNOSTICS_DATAFRAME = True if get_param_from_env("PM4PY_DEFAULT_RETURN_DIAGNOSTICS_DATAFRAME", "False").lower() == "true" else False
@@ -0,0 +1,320 @@
+'''
+    PM4Py – A Process Mining Library for Python
+Copyright (C) 2024 Process Intelligence Solutions UG (haftungsbeschränkt)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program.  If not, see this software project's root or
+visit <https://www.gnu.org/licenses/>.
+
+Website: https://processintelligence.solutions
+Contact: info@processintelligence.solutions
+'''
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import uuid
+from enum import Enum
+from typing import Optional, Dict, Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from pm4py.util import constants, exec_utils
+
+# increase when the layout of the entries changes, so old entries are not reused
+CACHE_FORMAT_VERSION = 1
+
+META_FILE = "meta.pkl"
+
+OCEL_TABLES = ["events", "objects", "relations", "o2o", "e2e", "object_changes"]
+
+
+class Parameters(Enum):
+    CACHE_DIR = "cache_dir"
+    MAX_CACHE_SIZE = "max_cache_size"
+
+
+def get_key(file_path: str, reader: str, parameters: Optional[Dict[Any, Any]] = None) -> str:
+    """
+    Gets the key of the cache entry of a parsed file, from its path, size, modification time,
+    the reader used and its parameters
+
+    Parameters
+    ---------------
+    file_path
+        Path to the source file
+    reader
+        Identifier of the reader (importer and variant)
+    parameters
+        Parameters provided to the reader
+
+    Returns
+    ---------------
+    key
+        Key of the cache entry
+    """
+    if parameters is None:
+        parameters = {}
+
+    stat = os.stat(file_path)
+    fingerprint = [CACHE_FORMAT_VERSION, os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, reader,
+                   sorted((str(k), repr(v)) for k, v in parameters.items())]
+    return hashlib.sha256(json.dumps(fingerprint).encode("utf-8")).hexdigest()
+
+
+def _is_string_column(series: pd.Series) -> bool:
+    return (series.dtype == object or isinstance(series.dtype, pd.StringDtype)) and pd.api.types.infer_dtype(
+        series, skipna=True) in ("string", "empty")
+
+
+def _save_column(series: pd.Series, path: str) -> Dict[str, Any]:
+    """
+    Saves a column of a dataframe (numeric/boolean/datetime columns as NumPy arrays, which can be memory-mapped,
+    string columns as integer codes plus the distinct values, other columns pickled)
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+        np.save(path + ".npy", series.to_numpy())
+        return {"kind": "numpy"}
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        np.save(path + ".npy", series.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy())
+        return {"kind": "datetime_tz", "tz": dtype.tz}
+    if _is_string_column(series):
+        missing = series[series.isna()]
+        missing_values = set(type(x) for x in missing.tolist())
+        if len(missing_values) <= 1:
+            missing_value = missing.iloc[0] if len(missing) > 0 else np.nan
+            codes, uniques = pd.factorize(series)
+            np.save(path + ".npy", codes.astype(np.int32 if len(uniques) < 2 ** 31 else np.int64))
+            return {"kind": "strings", "uniques": list(uniques), "missing": missing_value, "dtype": dtype}
+    series.to_pickle(path + ".pkl")
+    return {"kind": "pickle"}
+
+
+def _load_column(entry: Dict[str, Any], path: str):
+    kind = entry["kind"]
+    if kind == "numpy":
+        # copy-on-write memory map: the dataframe can be modified without touching the cache
+        return np.load(path + ".npy", mmap_mode="c").view(np.ndarray)
+    if kind == "datetime_tz":
+        return pd.Series(np.load(path + ".npy")).dt.tz_localize("UTC").dt.tz_convert(entry["tz"])
+    if kind == "strings":
+        uniques = np.empty(len(entry["uniques"]) + 1, dtype=object)
+        uniques[:-1] = entry["uniques"]
+        uniques[-1] = entry["missing"]
+        values = uniques.take(np.load(path + ".npy", mmap_mode="r"))
+        if entry["dtype"] != object:
+            values = pd.array(values, dtype=entry["dtype"])
+        return values
+    return pd.read_pickle(path + ".pkl")
+
+
+def _save_dataframe(df: pd.DataFrame, directory: str) -> Dict[str, Any]:
+    os.makedirs(directory)
+    columns = []
+    for i, col in enumerate(df.columns):
+        entry = _save_column(df.iloc[:, i], os.path.join(directory, str(i)))
+        entry["name"] = col
+        columns.append(entry)
+    index = None
+    if not (isinstance(df.index, pd.RangeIndex) and df.index.start == 0 and df.index.step == 1):
+        index = df.index
+    return {"columns": columns, "index": index, "num_rows": len(df), "attrs": dict(df.attrs)}
+
+
+def _load_dataframe(meta: Dict[str, Any], directory: str) -> pd.DataFrame:
+    data = {}
+    for i, entry in enumerate(meta["columns"]):
+        data[entry["name"]] = _load_column(entry, os.path.join(directory, str(i)))
+    df = pd.DataFrame(data, columns=[entry["name"] for entry in meta["columns"]], copy=False)
+    if len(df.columns) == 0:
+        df = pd.DataFrame(index=pd.RangeIndex(meta["num_rows"]))
+    if meta["index"] is not None:
+        df.index = meta["index"]
+    df.attrs = meta["attrs"]
+    return df
+
+
+def _entry_size(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory) if
+               os.path.isfile(os.path.join(directory, f))) + sum(
+        _entry_size(os.path.join(directory, f)) for f in os.listdir(directory) if
+        os.path.isdir(os.path.join(directory, f)))
+
+
+def _evict(cache_dir: str, max_size: int, keep: Optional[str] = None):
+    """
+    Evicts the least recently used entries of the cache, until its size is lower than the maximum size
+    """
+    entries = []
+    for name in os.listdir(cache_dir):
+        directory = os.path.join(cache_dir, name)
+        meta_path = os.path.join(directory, META_FILE)
+        if os.path.isfile(meta_path):
+            entries.append((os.path.getmtime(meta_path), name, _entry_size(directory)))
+    total_size = sum(x[2] for x in entries)
+    for _, name, size in sorted(entries):
+        if total_size <= max_size:
+            break
+        if name == keep:
+            continue
+        shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+        total_size -= size
+
+
+def store(key: str, obj: Any, parameters: Optional[Dict[Any, Any]] = None) -> bool:
+    """
+    Stores a parsed object (Pandas dataframe or OCEL) in the cache
+
+    Parameters
+    ---------------
+    key
+        Key of the cache entry
+    obj
+        Pandas dataframe / OCEL
+    parameters
+        Parameters, including:
+        - Parameters.CACHE_DIR => directory of the cache
+        - Parameters.MAX_CACHE_SIZE => maximum size (in bytes) of the cache, enforced evicting the least recently used entries
+
+    Returns
+    ---------------
+    stored
+        Boolean value (True if the object has been stored)
+    """
+    from pm4py.objects.ocel.obj import OCEL
+
+    if parameters is None:
+        parameters = {}
+
+    cache_dir = exec_utils.get_param_value(Parameters.CACHE_DIR, parameters, constants.READ_CACHE_DIR)
+    max_size = exec_utils.get_param_value(Parameters.MAX_CACHE_SIZE, parameters, constants.READ_CACHE_MAX_SIZE)
+
+    if isinstance(obj, pd.DataFrame):
+        meta = {"type": "dataframe"}
+        tables = {"dataframe": obj}
+    elif isinstance(obj, OCEL):
+        meta = {"type": "ocel", "globals": obj.globals, "parameters": obj.parameters}
+        tables = {name: getattr(obj, name) for name in OCEL_TABLES}
+    else:
+        return False
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # the entry is written in a temporary directory, and then moved to its final location
+    tmp_directory = os.path.join(cache_dir, "tmp-" + uuid.uuid4().hex)
+    try:
+        meta["tables"] = {name: _save_dataframe(df, os.path.join(tmp_directory, name)) for name, df in
+                          tables.items()}
+        with open(os.path.join(tmp_directory, META_FILE), "wb") as f:
+            pickle.dump(meta, f)
+        os.replace(tmp_directory, os.path.join(cache_dir, key))
+    except OSError:
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+        return False
+
+    _evict(cache_dir, max_size, keep=key)
+    return True
+
+
+def load(key: str, parameters: Optional[Dict[Any, Any]] = None) -> Any:
+    """
+    Loads a parsed object from the cache (the numeric columns are memory-mapped)
+
+    Parameters
+    ---------------
+    key
+        Key of the cache entry
+    parameters
+        Parameters, including:
+        - Parameters.CACHE_DIR => directory of the cache
+
+    Returns
+    ---------------
+    obj
+        Pandas dataframe / OCEL (None if the entry is not in the cache)
+    """
+    from pm4py.objects.ocel.obj import OCEL
+
+    if parameters is None:
+        parameters = {}
+
+    cache_dir = exec_utils.get_param_value(Parameters.CACHE_DIR, parameters, constants.READ_CACHE_DIR)
+    directory = os.path.join(cache_dir, key)
+    meta_path = os.path.join(directory, META_FILE)
+    if not os.path.isfile(meta_path):
+        return None
+
+    with open(meta_path, "rb") as f:
+        meta = pickle.load(f)
+    # marks the entry as recently used
+    os.utime(meta_path)
+
+    tables = {name: _load_dataframe(table_meta, os.path.join(directory, name)) for name, table_meta in
+              meta["tables"].items()}
+    if meta["type"] == "dataframe":
+        return tables["dataframe"]
+    return OCEL(globals=meta["globals"], parameters=meta["parameters"], **tables)
+
+
+def cached_read(file_path: str, reader: str, read_function: Callable[[], Any],
+                reader_parameters: Optional[Dict[Any, Any]] = None, parameters: Optional[Dict[Any, Any]] = None) -> Any:
+    """
+    Reads a file through the cache: if the file (with the same size and modification time) was already parsed
+    by the same reader with the same parameters, the parsed object is loaded from the cache. Otherwise, the file
+    is parsed and the result is stored in the cache.
+
+    Parameters
+    ---------------
+    file_path
+        Path to the source file
+    reader
+        Identifier of the reader
+    read_function
+        Function (without arguments) parsing the file
+    reader_parameters
+        Parameters of the reader (part of the key of the cache entry)
+    parameters
+        Parameters of the cache (see store)
+
+    Returns
+    ---------------
+    obj
+        Parsed object
+    """
+    key = get_key(file_path, reader, reader_parameters)
+    obj = load(key, parameters=parameters)
+    if obj is None:
+        obj = read_function()
+        store(key, obj, parameters=parameters)
+    return obj
+
+
+def clear(parameters: Optional[Dict[Any, Any]] = None):
+    """
+    Removes all the entries of the cache
+
+    Parameters
+    ---------------
+    parameters
+        Parameters, including:
+        - Parameters.CACHE_DIR => directory of the cache
+    """
+    if parameters is None:
+        parameters = {}
+
+    cache_dir = exec_utils.get_param_value(Parameters.CACHE_DIR, parameters, constants.READ_CACHE_DIR)
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
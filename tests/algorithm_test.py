@@ -70,6 +70,39 @@ class AlgorithmTest(unittest.TestCase):
         generalization = generalization_evaluation.apply(log, net, im, fm,
                                                          variant=generalization_evaluation.Variants.GENERALIZATION_TOKEN)
 
+    def test_tokenreplay_prefix_trie(self):
+        log = xes_importer.apply(os.path.join("compressed_input_data", "04_reviewing.xes.gz"))
+        from pm4py.algo.discovery.inductive import algorithm as inductive_miner
+        net, im, fm = process_tree_converter.apply(inductive_miner.apply(log))
+        from pm4py.algo.conformance.tokenreplay.variants import token_replay
+        for parameters in [{}, {"enable_pltr_fitness": True, "disable_variants": False}]:
+            classic = token_replay.apply(log, net, im, fm, parameters=parameters)
+            trie = token_replay.apply(log, net, im, fm, parameters={**parameters, "use_prefix_trie": True})
+            if parameters:
+                self.assertEqual({p: (v["m"], v["r"], v["c"], v["p"], len(v["underfed_traces"])) for p, v in classic[1].items()},
+                                 {p: (v["m"], v["r"], v["c"], v["p"], len(v["underfed_traces"])) for p, v in trie[1].items()})
+                classic, trie = classic[0], trie[0]
+            self.assertEqual([x["trace_fitness"] for x in classic], [x["trace_fitness"] for x in trie])
+            self.assertEqual([x["activated_transitions"] for x in classic], [x["activated_transitions"] for x in trie])
+            self.assertEqual([x["enabled_transitions_in_marking"] for x in classic], [x["enabled_transitions_in_marking"] for x in trie])
+
+    def test_tokenreplay_worker_pool(self):
+        import pm4py
+        from pm4py.algo.conformance.tokenreplay.variants import token_replay
+        from pm4py.algo.conformance.tokenreplay.utils.worker_pool import TokenReplayWorkerPool
+        log = xes_importer.apply(os.path.join("compressed_input_data", "04_reviewing.xes.gz"))
+        net, im, fm = pm4py.discover_petri_net_inductive(log, noise_threshold=0.3)
+        serial = token_replay.apply(log, net, im, fm, parameters={"enable_pltr_fitness": True})
+        parallel = token_replay.apply(log, net, im, fm, parameters={"enable_pltr_fitness": True, "multiprocessing": True,
+                                                                    "cores": 2, "chunk_size": 5})
+        self.assertEqual([x["trace_fitness"] for x in serial[0]], [x["trace_fitness"] for x in parallel[0]])
+        self.assertEqual({p: (v["m"], v["r"], v["c"], v["p"], len(v["underfed_traces"])) for p, v in serial[1].items()},
+                         {p: (v["m"], v["r"], v["c"], v["p"], len(v["underfed_traces"])) for p, v in parallel[1].items()})
+        with TokenReplayWorkerPool(net, im, fm, parameters={"cores": 2}) as pool:
+            from_log = pool.apply(log)
+            from_df = pool.apply(pm4py.convert_to_dataframe(log))
+        self.assertEqual([x["trace_fitness"] for x in from_log], [x["trace_fitness"] for x in from_df])
+
     def test_evaluation(self):
         log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
         from pm4py.algo.discovery.alpha import algorithm as alpha_miner
@@ -86,6 +119,92 @@ class AlgorithmTest(unittest.TestCase):
         from pm4py.algo.simulation.playout.petri_net import algorithm
         log2 = algorithm.apply(net, im, fm)
 
+    def test_montecarlo_discrete_event(self):
+        from pm4py.objects.petri_net.importer import importer as pnml_importer
+        from pm4py.algo.simulation.montecarlo import algorithm as montecarlo_simulation
+        from pm4py.algo.simulation.montecarlo.variants import petri_discrete_event
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        net, im, fm = pnml_importer.apply(os.path.join("input_data", "running-example.pnml"))
+        parameters = {"enable_diagnostics": False, "num_simulations": 20, "random_seed": 7,
+                      "default_num_resources_per_place": 100}
+        log1, res1 = montecarlo_simulation.apply(log, net, im, fm, variant=montecarlo_simulation.Variants.PETRI_DISCRETE_EVENT,
+                                                 parameters=parameters)
+        log2, res2 = montecarlo_simulation.apply(log, net, im, fm, variant=montecarlo_simulation.Variants.PETRI_DISCRETE_EVENT,
+                                                 parameters=parameters)
+        self.assertEqual(len(log1), 20)
+        self.assertEqual(res1["cases_ex_time"], res2["cases_ex_time"])
+        self.assertEqual([[ev["concept:name"] for ev in trace] for trace in log1],
+                         [[ev["concept:name"] for ev in trace] for trace in log2])
+        serial = petri_discrete_event.apply_replications(log, net, im, fm, parameters={**parameters, "num_replications": 2, "cores": 1})
+        parallel = petri_discrete_event.apply_replications(log, net, im, fm, parameters={**parameters, "num_replications": 2, "cores": 2})
+        self.assertEqual(serial[0][1]["cases_ex_time"], res1["cases_ex_time"])
+        self.assertEqual([res["cases_ex_time"] for _, res in serial], [res["cases_ex_time"] for _, res in parallel])
+        self.assertEqual(set(parallel[0][1]["places_interval_trees"]), set(net.places))
+
+    def test_montecarlo_discrete_event_cases(self):
+        from pm4py.objects.petri_net.importer import importer as pnml_importer
+        from pm4py.algo.simulation.montecarlo import algorithm as montecarlo_simulation
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        net, im, fm = pnml_importer.apply(os.path.join("input_data", "running-example.pnml"))
+        for seed in [1, 11]:
+            parameters = {"enable_diagnostics": False, "num_simulations": 50, "random_seed": seed,
+                          "default_num_resources_per_place": 3}
+            simulated_log, res = montecarlo_simulation.apply(log, net, im, fm, variant=montecarlo_simulation.Variants.PETRI_DISCRETE_EVENT,
+                                                             parameters=parameters)
+            self.assertEqual(len(simulated_log), 50)
+            self.assertEqual(len(res["cases_ex_time"]), 50)
+        # with a single resource per place, the cases get in a deadlock that should be broken
+        for seed in [1, 2, 3]:
+            parameters = {"enable_diagnostics": False, "num_simulations": 50, "random_seed": seed}
+            simulated_log, res = montecarlo_simulation.apply(log, net, im, fm, variant=montecarlo_simulation.Variants.PETRI_DISCRETE_EVENT,
+                                                             parameters=parameters)
+            self.assertEqual(len(simulated_log), 50)
+
+    def test_montecarlo_discrete_event_fifo(self):
+        from pm4py.objects.petri_net.importer import importer as pnml_importer
+        from pm4py.algo.simulation.montecarlo import algorithm as montecarlo_simulation
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        net, im, fm = pnml_importer.apply(os.path.join("input_data", "running-example.pnml"))
+        # with a single resource per place, the threads of the FIFO variant may get in a deadlock
+        parameters = {"enable_diagnostics": False, "num_simulations": 20, "random_seed": 1,
+                      "default_num_resources_per_place": 3}
+        log1, res1 = montecarlo_simulation.apply(log, net, im, fm, variant=montecarlo_simulation.Variants.PETRI_DISCRETE_EVENT,
+                                                 parameters=parameters)
+        log2, res2 = montecarlo_simulation.apply(log, net, im, fm, variant=montecarlo_simulation.Variants.PETRI_SEMAPH_FIFO,
+                                                 parameters=parameters)
+        self.assertEqual(len(log1), len(log2))
+        self.assertEqual(set(res1), set(res2))
+        self.assertEqual({ev["concept:name"] for trace in log1 for ev in trace},
+                         {ev["concept:name"] for trace in log2 for ev in trace})
+        self.assertEqual({trace[-1]["concept:name"] for trace in log1}, {trace[-1]["concept:name"] for trace in log2})
+        # the throughput times are of the same order, the waiting times being computed differently
+        self.assertLess(res1["median_cases_ex_time"], 2 * res2["median_cases_ex_time"])
+        self.assertLess(res2["median_cases_ex_time"], 2 * res1["median_cases_ex_time"])
+
+    def test_declare_vectorized(self):
+        from pm4py.algo.discovery.declare import algorithm as declare_discovery
+        from pm4py.algo.conformance.declare import algorithm as declare_conformance
+        from pm4py.algo.discovery.declare import templates
+        log = pandas_utils.read_csv(os.path.join("input_data", "receipt.csv"))
+        log = dataframe_utils.convert_timestamp_columns_in_df(log, timest_format=constants.DEFAULT_TIMESTAMP_PARSE_FORMAT)
+        parameters = {"allowed_templates": {templates.EXISTENCE, templates.EXACTLY_ONE, templates.INIT, templates.RESPONSE,
+                                            templates.PRECEDENCE, templates.SUCCESSION, templates.ALTPRECEDENCE,
+                                            templates.ALTSUCCESSION, templates.CHAINRESPONSE, templates.CHAINPRECEDENCE,
+                                            templates.CHAINSUCCESSION, templates.ABSENCE}}
+        model = declare_discovery.apply(log, variant=declare_discovery.Variants.CLASSIC, parameters=parameters)
+        self.assertEqual(model, declare_discovery.apply(log, variant=declare_discovery.Variants.VECTORIZED, parameters=parameters))
+        chunked = declare_discovery.apply(log, variant=declare_discovery.Variants.VECTORIZED,
+                                          parameters={**parameters, "max_pairs_per_chunk": 100})
+        self.assertEqual(model, chunked)
+        parallel = declare_discovery.apply(log, variant=declare_discovery.Variants.VECTORIZED,
+                                           parameters={**parameters, "max_pairs_per_chunk": 100, "multiprocessing": True,
+                                                       "cores": 2})
+        self.assertEqual(model, parallel)
+        res1 = declare_conformance.apply(log, model, variant=declare_conformance.Variants.CLASSIC)
+        res2 = declare_conformance.apply(log, model, variant=declare_conformance.Variants.VECTORIZED,
+                                         parameters={"max_cells_per_chunk": 1000})
+        self.assertEqual([sorted(map(str, x["deviations"])) for x in res1], [sorted(map(str, x["deviations"])) for x in res2])
+
     def test_tree_generation(self):
         from pm4py.algo.simulation.tree_generator import algorithm as tree_simulator
         tree1 = tree_simulator.apply(variant=tree_simulator.Variants.BASIC)
@@ -100,6 +100,51 @@ class AlignmentTest(unittest.TestCase):
         net, im, fm = pm4py.discover_petri_net_inductive(log)
         align_alg.apply(log, net, im, fm, variant=align_alg.Variants.VERSION_TWEAKED_STATE_EQUATION_A_STAR)
 
+    def test_alignment_worker_pool(self):
+        import pm4py
+        from pm4py.algo.conformance.alignments.petri_net.utils.worker_pool import AlignmentWorkerPool
+        log = pm4py.read_xes("compressed_input_data/04_reviewing.xes.gz")
+        net, im, fm = pm4py.discover_petri_net_inductive(log, noise_threshold=0.3)
+        serial = align_alg.apply_log(log, net, im, fm)
+        with AlignmentWorkerPool(net, im, fm, parameters={"cores": 2, "chunk_size": 5}) as pool:
+            from_log = pool.apply(log)
+            from_df = pool.apply(pm4py.convert_to_dataframe(log))
+        self.assertEqual([x["cost"] for x in serial], [x["cost"] for x in from_log])
+        self.assertEqual([x["fitness"] for x in serial], [x["fitness"] for x in from_df])
+
+    def test_compiled_petri_net(self):
+        import pm4py
+        from pm4py.objects.petri_net.utils import reachability_graph
+        from pm4py.objects.petri_net.utils.compiled_net import CompiledSemantics
+        log = pm4py.read_xes("input_data/running-example.xes")
+        net, im, fm = pm4py.discover_petri_net_inductive(log)
+        variant = align_alg.Variants.VERSION_STATE_EQUATION_A_STAR
+        classic = align_alg.apply_log(log, net, im, fm, variant=variant)
+        compiled = align_alg.apply_log(log, net, im, fm, variant=variant, parameters={"use_compiled_net": True})
+        self.assertEqual([x["cost"] for x in classic], [x["cost"] for x in compiled])
+        classic_rg = reachability_graph.construct_reachability_graph(net, im)
+        compiled_rg = reachability_graph.construct_reachability_graph(
+            net, im, parameters={reachability_graph.Parameters.PETRI_SEMANTICS: CompiledSemantics()})
+        self.assertEqual(sorted(s.name for s in classic_rg.states), sorted(s.name for s in compiled_rg.states))
+        self.assertEqual(len(classic_rg.transitions), len(compiled_rg.transitions))
+
+    def test_lp_heuristic_cache(self):
+        import pm4py
+        from pm4py.algo.conformance.alignments.petri_net.utils.lp_heuristic import LpHeuristicCache
+        log = pm4py.read_xes("compressed_input_data/04_reviewing.xes.gz")
+        net, im, fm = pm4py.discover_petri_net_inductive(log, noise_threshold=0.3)
+        variant = align_alg.Variants.VERSION_STATE_EQUATION_A_STAR
+        dijkstra = align_alg.apply_log(log, net, im, fm, variant=align_alg.Variants.VERSION_DIJKSTRA_LESS_MEMORY)
+        cache = LpHeuristicCache()
+        first = align_alg.apply_log(log, net, im, fm, variant=variant, parameters={"lp_heuristic_cache": cache})
+        second = align_alg.apply_log(log, net, im, fm, variant=variant,
+                                     parameters={"lp_heuristic_cache": cache, "use_compiled_net": True})
+        self.assertEqual([x["fitness"] for x in dijkstra], [x["fitness"] for x in first])
+        self.assertEqual([x["cost"] for x in first], [x["cost"] for x in second])
+        self.assertGreater(sum(x["lp_cache_hits"] for x in first), 0)
+        self.assertLess(sum(x["lp_solved"] for x in second), sum(x["lp_solved"] for x in first))
+        self.assertTrue(all(x["lp_solve_time"] >= 0 for x in first))
+
 
 
 if __name__ == "__main__":
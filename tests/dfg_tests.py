@@ -18,6 +18,31 @@ class DfgTests(unittest.TestCase):
         act_count = pm4py.get_event_attribute_values(log, "concept:name")
         dfg_filtering.filter_dfg_on_paths_percentage(dfg, sa, ea, act_count, 0.3)
 
+    def test_vectorized_dfg_kernel(self):
+        from pm4py.util import constants
+        from pm4py.algo.discovery.dfg.adapters.pandas import df_statistics
+        df = pm4py.read_xes("input_data/interval_event_log.xes")
+        for kwargs in [{"measure": "both", "perf_aggregation_key": "all"},
+                       {"measure": "performance", "start_timestamp_key": "start_timestamp", "perf_aggregation_key": "median"},
+                       {"measure": "frequency", "keep_once_per_case": True, "window": 2}]:
+            constants.ENABLE_VECTORIZED_DFG_KERNEL = True
+            vectorized = df_statistics.get_dfg_graph(df.copy(), **kwargs)
+            constants.ENABLE_VECTORIZED_DFG_KERNEL = False
+            classic = df_statistics.get_dfg_graph(df.copy(), **kwargs)
+            constants.ENABLE_VECTORIZED_DFG_KERNEL = True
+            self.__assert_same_dfg(vectorized, classic)
+
+    def __assert_same_dfg(self, dfg1, dfg2):
+        if isinstance(dfg1, list):
+            for x, y in zip(dfg1, dfg2):
+                self.__assert_same_dfg(x, y)
+        elif isinstance(dfg1, dict):
+            self.assertEqual(list(dfg1), list(dfg2))
+            for key in dfg1:
+                self.__assert_same_dfg(dfg1[key], dfg2[key])
+        elif dfg1 == dfg1:
+            self.assertAlmostEqual(dfg1, dfg2, places=4)
+
 
 if __name__ == "__main__":
     unittest.main()
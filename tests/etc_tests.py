@@ -19,6 +19,15 @@ class ETCTest(unittest.TestCase):
         precision = etc_alg.apply(log, net, marking, final_marking, variant=etc_alg.ETCONFORMANCE_TOKEN)
         del precision
 
+    def test_etc_prefix_tree(self):
+        log = xes_importer.apply(os.path.join("compressed_input_data", "04_reviewing.xes.gz"))
+        net, marking, final_marking = process_tree_converter.apply(inductive_miner.apply(log))
+        for variant in [etc_alg.Variants.ETCONFORMANCE_TOKEN, etc_alg.Variants.ALIGN_ETCONFORMANCE]:
+            prefix_tree = etc_alg.apply(log, net, marking, final_marking, variant=variant)
+            per_prefix = etc_alg.apply(log, net, marking, final_marking, variant=variant,
+                                       parameters={"use_prefix_tree": False})
+            self.assertAlmostEqual(prefix_tree, per_prefix)
+
 
 if __name__ == "__main__":
     unittest.main()
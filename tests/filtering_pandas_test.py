@@ -155,6 +155,23 @@ class DataframePrefilteringTest(unittest.TestCase):
                                                                                     parameters={
                                                                                         ltl_checker.Parameters.POSITIVE: False})
 
+    def test_ltl_case_scan(self):
+        from pm4py.algo.filtering.pandas.ltl import case_scan
+        df = pandas_utils.read_csv(os.path.join("input_data", "running-example.csv"))
+        df = dataframe_utils.convert_timestamp_columns_in_df(df, timest_format=constants.DEFAULT_TIMESTAMP_PARSE_FORMAT)
+        pattern = ["register request", "check ticket", "decide", "reinitiate request", "check ticket", "decide"]
+        self.assertEqual(case_scan.eventually_follows_cases(df, pattern), {3, 5})
+        self.assertEqual(case_scan.eventually_follows_cases(df, ["check ticket", "pay compensation"],
+                                                            parameters={"timestamp_diff_boundaries": [(0, 86400)]}), set())
+        self.assertEqual(case_scan.eventually_follows_cases(df, ["check ticket", "pay compensation"],
+                                                            parameters={"timestamp_diff_boundaries": [(0, 86400 * 8)]}), {3})
+        self.assertEqual(case_scan.directly_follows_cases(df, ["check ticket", "decide", "pay compensation"]), {3, 6})
+        self.assertEqual(case_scan.directly_follows_cases(df, ["check ticket", "examine casually", "decide"]), {2, 5})
+        filtered = ltl_checker.eventually_follows(df, pattern, parameters={ltl_checker.Parameters.POSITIVE: False})
+        self.assertEqual(set(filtered["case:concept:name"]), {1, 2, 4, 6})
+        self.assertEqual(case_scan.four_eyes_violation_cases(df, "register request", "check ticket"), {2, 3, 5, 6})
+        self.assertEqual(case_scan.different_persons_cases(df, "check ticket"), {3, 5})
+
 
     def test_attr_value_repetition(self):
         from pm4py.algo.filtering.pandas.attr_value_repetition import filter
@@ -12,6 +12,31 @@ class Pm4pyImportPackageTest(unittest.TestCase):
             os.path.join("input_data", "running-example.xes"))
         self.assertEqual(len(log), 6)
 
+    def test_lazy_import(self):
+        import sys
+        import json
+        import inspect
+        import subprocess
+        import pm4py
+        code = "import sys, json; import pm4py; " \
+               "loaded = [m for m in ('pm4py.algo', 'pm4py.visualization', 'pandas', 'numpy', 'scipy', 'networkx', " \
+               "'lxml', 'graphviz') if m in sys.modules]; " \
+               "print(json.dumps({'loaded': loaded, 'names': dir(pm4py), 'version': pm4py.__version__, " \
+               "'read_xes': pm4py.read_xes.__module__}))"
+        env = dict(os.environ)
+        env["PM4PY_ENABLE_LAZY_IMPORTS"] = "true"
+        env["PYTHONPATH"] = os.pathsep.join([os.path.dirname(os.path.dirname(pm4py.__file__)), env.get("PYTHONPATH", "")])
+        res = json.loads(subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, check=True,
+                                        text=True).stdout.strip().split("\n")[-1])
+        # importing the package should not load the algorithms, the visualizations or their dependencies
+        self.assertEqual(res["loaded"], [])
+        self.assertEqual(res["version"], pm4py.__version__)
+        self.assertEqual(res["read_xes"], "pm4py.read")
+        # every function and class exposed by the eager import should also be exposed lazily
+        eager_names = set(x for x in dir(pm4py) if not x.startswith("_") and not inspect.ismodule(getattr(pm4py, x)))
+        eager_names.discard("ENABLE_LAZY_IMPORTS")
+        self.assertTrue(eager_names.issubset(set(res["names"])), eager_names.difference(res["names"]))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -100,6 +100,58 @@ class OcelDiscoveryTest(unittest.TestCase):
         ocel = pm4py.read_ocel(os.path.join("input_data", "ocel", "example_log.jsonocel"))
         saw_nets_disc.apply(ocel)
 
+    def test_discovery_ocdfg_counts(self):
+        from pm4py.algo.discovery.ocel.ocdfg import algorithm as ocdfg_discovery
+        ocel = pm4py.read_ocel(os.path.join("input_data", "ocel", "example_log.jsonocel"))
+        classic = ocdfg_discovery.apply(ocel, variant=ocdfg_discovery.Variants.CLASSIC)
+        counts = ocdfg_discovery.apply(ocel, variant=ocdfg_discovery.Variants.COUNTS)
+        materialized = ocdfg_discovery.apply(ocel, variant=ocdfg_discovery.Variants.COUNTS,
+                                             parameters={"materialize_sets": True})
+        self.assertEqual(classic["activities"], counts["activities"])
+        self.assertEqual(classic["object_types"], counts["object_types"])
+        for key in ["edges", "activities_indep", "activities_ot", "start_activities", "end_activities"]:
+            for metric in classic[key]:
+                values = [(classic[key][metric], counts[key][metric], materialized[key][metric])]
+                if key != "activities_indep":
+                    values = [(values[0][0][g], values[0][1][g], values[0][2][g]) for g in values[0][0]]
+                for cl, co, ma in values:
+                    for el in cl:
+                        self.assertEqual(len(cl[el]), co[el])
+                        self.assertEqual(sorted(cl[el]), sorted(ma[el]))
+        for metric in classic["edges_performance"]:
+            for ot, edges in classic["edges_performance"][metric].items():
+                for edge, performance in edges.items():
+                    self.assertEqual(sorted(performance), counts["edges_performance"][metric][ot][edge].tolist())
+        from pm4py.visualization.ocel.ocdfg import visualizer as ocdfg_visualizer
+        ocdfg_visualizer.apply(counts, parameters={"annotation": "performance", "edge_metric": "total_objects"})
+
+
+    def test_discovery_ocdfg_counts_work_calendar(self):
+        from pm4py.algo.discovery.ocel.ocdfg import algorithm as ocdfg_discovery
+        from pm4py.util.business_hours import BusinessHours
+
+        class NoWednesdayCalendar(object):
+            def is_working_day(self, day):
+                return day.weekday() != 2
+
+        ocel = pm4py.read_ocel(os.path.join("input_data", "ocel", "example_log.jsonocel"))
+        timestamps = ocel.events.set_index(ocel.event_id_column)[ocel.event_timestamp].to_dict()
+        calendar = NoWednesdayCalendar()
+        parameters = {"business_hours": True, "workcalendar": calendar, "materialize_sets": True}
+        counts = ocdfg_discovery.apply(ocel, variant=ocdfg_discovery.Variants.COUNTS, parameters=parameters)
+        default = ocdfg_discovery.apply(ocel, variant=ocdfg_discovery.Variants.COUNTS,
+                                        parameters={"business_hours": True})
+        differs = False
+        for ot, edges in counts["edges"]["total_objects"].items():
+            for edge, triples in edges.items():
+                expected = sorted(BusinessHours(timestamps[ev1], timestamps[ev2], work_calendar=calendar).get_seconds()
+                                  for ev1, ev2, obj in triples)
+                performance = counts["edges_performance"]["total_objects"][ot][edge]
+                self.assertEqual(len(performance), len(expected))
+                for value, expected_value in zip(performance.tolist(), expected):
+                    self.assertAlmostEqual(value, expected_value)
+                differs = differs or performance.tolist() != default["edges_performance"]["total_objects"][ot][edge].tolist()
+        self.assertTrue(differs)
 
 if __name__ == "__main__":
     unittest.main()
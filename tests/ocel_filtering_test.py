@@ -114,6 +114,34 @@ class OcelFilteringTest(unittest.TestCase):
         ocel = pm4py.read_ocel(input_path)
         pm4py.filter_ocel_events_timestamp(ocel, "1981-01-01 00:00:00", "1982-01-01 00:00:00")
 
+    def test_ocel_lazy_sqlite_filtering(self):
+        import shutil
+        from pm4py.objects.ocel.importer.sqlite.variants import ocel20_lazy
+        target_path = os.path.join("test_output_data", "ocel20_lazy.sqlite")
+        shutil.copy(os.path.join("input_data", "ocel", "ocel20_example.sqlite"), target_path)
+        ocel = pm4py.read_ocel2_sqlite(target_path)
+        with ocel20_lazy.apply(target_path) as lazy_ocel:
+            pairs = [
+                (ocel, lazy_ocel),
+                (pm4py.filter_ocel_object_types(ocel, ["Invoice"], positive=False),
+                 lazy_ocel.filter_object_types(["Invoice"], positive=False)),
+                (pm4py.filter_ocel_event_attribute(pm4py.filter_ocel_events_timestamp(
+                    ocel, "2022-01-30 23:00:00", "2022-03-01 00:00:00"), "ocel:activity", ["Insert Invoice"]),
+                 lazy_ocel.filter_events_timestamp("2022-01-30 23:00:00", "2022-03-01 00:00:00")
+                 .filter_event_attribute("ocel:activity", ["Insert Invoice"])),
+            ]
+            for expected, lazy in pairs:
+                lazy = lazy.to_ocel()
+                self.assertEqual(expected.events[ocel.event_id_column].tolist(),
+                                 lazy.events[ocel.event_id_column].tolist())
+                self.assertEqual(expected.objects[ocel.object_id_column].tolist(),
+                                 lazy.objects[ocel.object_id_column].tolist())
+                self.assertEqual(expected.relations[[ocel.event_id_column, ocel.object_id_column]].values.tolist(),
+                                 lazy.relations[[ocel.event_id_column, ocel.object_id_column]].values.tolist())
+            sampled = lazy_ocel.filter_object_types(["Invoice"]).sample_objects(2).to_ocel()
+            self.assertEqual(len(sampled.objects), 2)
+        os.remove(target_path)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -43,6 +43,28 @@ class OtherPartsTests(unittest.TestCase):
                                 parameters={algorithm.Variants.STOCHASTIC_PLAYOUT.value.Parameters.LOG: log}))
             emd = earth_mover_distance.apply(lang_model1, lang_log)
 
+    def test_emd_transport(self):
+        from pm4py.algo.evaluation.earth_mover_distance import algorithm as earth_mover_distance
+        from pm4py.algo.evaluation.earth_mover_distance.variants import transport
+        log = xes_importer.apply(os.path.join("input_data", "running-example.xes"))
+        lang_log = variants_get.get_language(log)
+        lang_sub = variants_get.get_language(log[::2])
+        reference = earth_mover_distance.apply(lang_log, lang_sub, variant=earth_mover_distance.Variants.PYEMD)
+        emd = earth_mover_distance.apply(lang_log, lang_sub, variant=earth_mover_distance.Variants.TRANSPORT)
+        self.assertAlmostEqual(emd, reference)
+        emd, lower_bound, upper_bound = transport.apply_with_bounds(lang_log, lang_sub, parameters={
+            transport.Parameters.SOLVER: transport.Solvers.SINKHORN})
+        self.assertTrue(lower_bound - 1e-9 <= reference <= upper_bound + 1e-9)
+        emd, lower_bound, upper_bound = transport.apply_with_bounds(lang_log, lang_sub, parameters={
+            transport.Parameters.MASS_THRESHOLD: 0.5})
+        self.assertTrue(lower_bound - 1e-9 <= reference <= upper_bound + 1e-9)
+        # more traces than a block of rows: the blocks are computed in the current process unless multiprocessing is enabled
+        traces = [tuple(ev["concept:name"] for ev in trace) for trace in log] * 20
+        serial = transport.normalized_levenshtein_matrix(traces, traces[:10])
+        parallel = transport.normalized_levenshtein_matrix(traces, traces[:10], parameters={
+            transport.Parameters.MULTIPROCESSING: True, transport.Parameters.CORES: 2})
+        self.assertTrue((serial == parallel).all())
+
     def test_importing_dfg(self):
         dfg, sa, ea = dfg_importer.apply(os.path.join("input_data", "running-example.dfg"))
 
@@ -194,6 +216,36 @@ class OtherPartsTests(unittest.TestCase):
         from pm4py.statistics.eventually_follows.pandas import get
         efg = get.apply(dataframe, parameters={get.Parameters.START_TIMESTAMP_KEY: "start_timestamp"})
 
+    def test_efg_pandas_prefix_counts(self):
+        dataframe = pandas_utils.read_csv(os.path.join("input_data", "interval_event_log.csv"))
+        from pm4py.objects.log.util import dataframe_utils
+        dataframe = dataframe_utils.convert_timestamp_columns_in_df(dataframe, timest_format=constants.DEFAULT_TIMESTAMP_PARSE_FORMAT)
+        from pm4py.statistics.eventually_follows.pandas import get
+        from pm4py.algo.discovery.dfg.adapters.pandas.df_statistics import get_partial_order_dataframe
+        partial_order = get_partial_order_dataframe(dataframe.copy(), start_timestamp_key="start_timestamp",
+                                                    keep_first_following=False)
+        grouped = partial_order.groupby(["concept:name", "concept:name_2"])[constants.DEFAULT_FLOW_TIME]
+        parameters = {get.Parameters.START_TIMESTAMP_KEY: "start_timestamp", get.Parameters.CHUNK_SIZE: 100}
+        efg = get.apply(dataframe, parameters=parameters)
+        self.assertEqual({k: int(v) for k, v in grouped.size().to_dict().items()}, efg)
+        parameters[get.Parameters.AGGREGATION_MEASURE] = "all"
+        efg_performance = get.apply_performance(dataframe, parameters=parameters)
+        for measure, expected in [("mean", grouped.mean()), ("min", grouped.min()), ("max", grouped.max())]:
+            for couple, value in expected.to_dict().items():
+                self.assertAlmostEqual(value, efg_performance[couple][measure], places=3)
+
+    def test_efg_pandas_default_start_timestamp(self):
+        import pm4py
+        dataframe = pandas_utils.read_csv(os.path.join("input_data", "interval_event_log.csv"))
+        from pm4py.objects.log.util import dataframe_utils
+        dataframe = dataframe_utils.convert_timestamp_columns_in_df(dataframe, timest_format=constants.DEFAULT_TIMESTAMP_PARSE_FORMAT)
+        from pm4py.statistics.eventually_follows.pandas import get
+        from pm4py.algo.discovery.dfg.adapters.pandas.df_statistics import get_partial_order_dataframe
+        partial_order = get_partial_order_dataframe(dataframe.copy(), keep_first_following=False)
+        expected = {k: int(v) for k, v in partial_order.groupby(["concept:name", "concept:name_2"]).size().to_dict().items()}
+        self.assertEqual(expected, get.apply(dataframe))
+        self.assertEqual(expected, pm4py.discover_eventually_follows_graph(dataframe))
+
     def test_dfg_playout(self):
         import pm4py
         from pm4py.algo.simulation.playout.dfg import algorithm as dfg_playout
@@ -382,12 +434,130 @@ class OtherPartsTests(unittest.TestCase):
         from pm4py.algo.transformation.ocel.graphs import object_codeath_graph
         object_codeath_graph.apply(ocel)
 
+    def test_ocel_object_incidence(self):
+        import pm4py
+        ocel = pm4py.read_ocel("input_data/ocel/example_log.jsonocel")
+        from pm4py.algo.transformation.ocel.graphs import object_incidence
+        incidence = object_incidence.apply(ocel)
+        expected = set()
+        for objs in ocel.relations.groupby(ocel.event_id_column)[ocel.object_id_column].agg(list):
+            expected.update((o1, o2) for o1 in objs for o2 in objs if o1 < o2)
+        self.assertEqual(incidence.to_set(incidence.interaction_edges()), expected)
+        components = incidence.interaction_connected_components()
+        self.assertEqual(set().union(*components), {o for edge in expected for o in edge})
+
     def test_ocel_description_non_simpl_interface(self):
         import pm4py
         ocel = pm4py.read_ocel("input_data/ocel/example_log.jsonocel")
         from pm4py.algo.transformation.ocel.description.variants import variant1
         variant1.apply(ocel)
 
+    def test_business_hours_engine(self):
+        import pandas as pd
+        from pm4py.util.business_hours import BusinessHours, BusinessHoursEngine
+
+        class NoFirstOfMonthCalendar(object):
+            def is_working_day(self, day):
+                return day.day != 1
+
+        st = pd.Series(pd.date_range("2023-01-01 05:00:00", periods=40, freq="37h"))
+        et = st + pd.Timedelta(days=9, hours=5)
+        for work_calendar in [None, NoFirstOfMonthCalendar()]:
+            batched = BusinessHoursEngine(constants.DEFAULT_BUSINESS_HOUR_SLOTS, work_calendar).diff(st, et)
+            for i in range(len(st)):
+                expected = BusinessHours(st[i], et[i], business_hour_slots=constants.DEFAULT_BUSINESS_HOUR_SLOTS,
+                                         work_calendar=work_calendar).get_seconds()
+                self.assertAlmostEqual(batched[i], expected)
+
+    def test_sharded_streaming_dfg(self):
+        import time
+        import pm4py
+        from pm4py.streaming.algo.discovery.dfg import algorithm as dfg_discovery
+        log = pm4py.read_xes("input_data/running-example.xes", return_legacy_log_object=True)
+        dfg, sa, ea = pm4py.discover_dfg(log)
+        streaming_dfg = dfg_discovery.apply(variant=dfg_discovery.Variants.SHARDED, parameters={"num_shards": 4})
+        for trace in log:
+            for event in trace:
+                streaming_dfg.receive({"case:concept:name": trace.attributes["concept:name"],
+                                       "concept:name": event["concept:name"]})
+        self.assertEqual(streaming_dfg.get_changed_edges(), dict(dfg))
+        self.assertEqual(streaming_dfg.get_changed_edges(), {})
+        res_dfg, res_act, res_sa, res_ea = streaming_dfg.get()
+        self.assertEqual((res_dfg, res_sa, res_ea), (dict(dfg), dict(sa), dict(ea)))
+        bounded_dfg = dfg_discovery.apply(variant=dfg_discovery.Variants.SHARDED,
+                                          parameters={"num_shards": 2, "max_cases": 2})
+        for case in range(10):
+            bounded_dfg.receive({"case:concept:name": str(case), "concept:name": "A"})
+        counters = bounded_dfg.get_eviction_counters()
+        self.assertEqual(counters["evicted_lru"] + counters["active_cases"], 10)
+        self.assertLessEqual(counters["active_cases"], 2)
+        ttl_dfg = dfg_discovery.apply(variant=dfg_discovery.Variants.SHARDED,
+                                      parameters={"num_shards": 16, "case_ttl": 0.05})
+        for case in range(50):
+            ttl_dfg.receive({"case:concept:name": str(case), "concept:name": "A"})
+        time.sleep(0.1)
+        # the expired cases of all the shards are evicted, not only the ones of the shard of the new event
+        ttl_dfg.receive({"case:concept:name": "new", "concept:name": "A"})
+        counters = ttl_dfg.get_eviction_counters()
+        self.assertEqual((counters["evicted_ttl"], counters["active_cases"]), (50, 1))
+
+    def test_live_event_stream_batched_delivery(self):
+        from pm4py.streaming.stream.live_event_stream import LiveEventStream, Parameters
+
+        class EventCollector(object):
+            def __init__(self):
+                self.events = []
+
+            def receive(self, event):
+                self.events.append(event)
+
+        live_stream = LiveEventStream(parameters={Parameters.BATCHED_DELIVERY: True, Parameters.BATCH_SIZE: 10,
+                                                  Parameters.MAX_QUEUE_SIZE: 20})
+        collector = EventCollector()
+        live_stream.register(collector)
+        live_stream.start()
+        for i in range(1000):
+            live_stream.append({"index": i})
+        live_stream.stop()
+        self.assertEqual([e["index"] for e in collector.events], list(range(1000)))
+        counters = live_stream.get_counters()
+        self.assertEqual((counters["appended"], counters["dropped"], counters["lag"]), (1000, 0, 0))
+
+    def test_live_event_stream_bounded_producers(self):
+        import threading
+        from pm4py.streaming.stream.live_event_stream import LiveEventStream, Parameters
+
+        class EventCounter(object):
+            def __init__(self, fail=False):
+                self.lock = threading.Lock()
+                self.count = 0
+                self.fail = fail
+
+            def receive(self, event):
+                with self.lock:
+                    self.count += 1
+                if self.fail and event["index"] % 7 == 0:
+                    raise Exception("failing observer")
+
+        # the exceptions of the failing observer are logged, and the delivery goes on
+        with self.assertLogs(level="ERROR") as logs:
+            for parameters in [{Parameters.MAX_QUEUE_SIZE: 5},
+                               {Parameters.BATCHED_DELIVERY: True, Parameters.BATCH_SIZE: 2, Parameters.MAX_QUEUE_SIZE: 5}]:
+                live_stream = LiveEventStream(parameters=parameters)
+                counter = EventCounter(fail=Parameters.BATCHED_DELIVERY in parameters)
+                live_stream.register(counter)
+                live_stream.start()
+                producers = [threading.Thread(target=lambda: [live_stream.append({"index": i}) for i in range(200)])
+                             for _ in range(6)]
+                for producer in producers:
+                    producer.start()
+                for producer in producers:
+                    producer.join(timeout=30)
+                self.assertFalse(any(producer.is_alive() for producer in producers))
+                live_stream.stop()
+                self.assertEqual(counter.count, 1200)
+        self.assertEqual(len(logs.output), 6 * len(range(0, 200, 7)))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -26,6 +26,49 @@ class RoleDetectionTest(unittest.TestCase):
         log = xes_importer.apply(os.path.join("..", "tests", "input_data", "receipt.xes"))
         roles = role_mining.apply(log)
 
+    def test_role_heap_aggregation(self):
+        import copy
+        from collections import Counter
+        from pm4py.algo.organizational_mining.roles.common import algorithm as roles_common
+        df = pandas_utils.read_csv(os.path.join("input_data", "receipt.csv"))
+        couples = Counter(df.groupby(["org:resource", "concept:name"]).size().to_dict())
+        roles = {}
+        for (res, act), count in couples.items():
+            roles.setdefault(act, Counter())[res] = count
+        roles = sorted([[[act], roles[act]] for act in roles], key=lambda x: (len(x[0]), len(x[1]), x[0][0]),
+                       reverse=True)
+        for threshold in [0.9, 0.65, 0.3]:
+            parameters = {roles_common.Parameters.ROLES_THRESHOLD_PARAMETER: threshold}
+            expected = roles_common.aggregate_roles_algorithm(copy.deepcopy(roles), parameters=parameters)
+            for sparse_candidates in [True, False]:
+                parameters[roles_common.Parameters.SPARSE_CANDIDATES] = sparse_candidates
+                self.assertEqual(expected, roles_common.aggregate_roles_heap(copy.deepcopy(roles),
+                                                                             parameters=parameters))
+
+    def test_role_heap_aggregation_thresholds(self):
+        import copy
+        import random
+        from collections import Counter
+        from pm4py.algo.organizational_mining.roles.common import algorithm as roles_common
+        for seed in range(20, 30):
+            rnd = random.Random(seed)
+            roles = [[["c"], Counter({"u": 3})]]
+            # couples of roles whose similarity is (in exact arithmetic) 0.3, 0.5, 0.65 and 0.9
+            for k, (x, y) in enumerate([(6, 7), (2, 1), (26, 7), (18, 1)]):
+                roles.append([["a" + str(k)], Counter({"r" + str(k): x, "s" + str(k): y})])
+                roles.append([["b" + str(k)], Counter({"r" + str(k): x, "t" + str(k): y})])
+            for k in range(12):
+                roles.append([["d" + str(k)], Counter({"r" + str(rnd.randrange(4)): rnd.choice([1, 2, 6, 7, 18, 26])
+                                                       for _ in range(rnd.randrange(1, 4))})])
+            rnd.shuffle(roles)
+            for threshold in [0, 0.3, 0.5, 0.65, 0.9]:
+                parameters = {roles_common.Parameters.ROLES_THRESHOLD_PARAMETER: threshold}
+                expected = roles_common.aggregate_roles_algorithm(copy.deepcopy(roles), parameters=parameters)
+                for sparse_candidates in [True, False]:
+                    parameters[roles_common.Parameters.SPARSE_CANDIDATES] = sparse_candidates
+                    self.assertEqual(expected, roles_common.aggregate_roles_heap(copy.deepcopy(roles),
+                                                                                 parameters=parameters))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -961,6 +961,27 @@ class SimplifiedInterfaceTest(unittest.TestCase):
 
         pm4py.extract_features_dataframe(dataframe, activity_key="Activity", case_id_key="CaseID", timestamp_key="Timestamp", resource_key="Resource")
 
+    def test_fea_ext_sparse(self):
+        dataframe = pm4py.read_xes("input_data/running-example.xes")
+        dataframe["costs"] = dataframe["Costs"].astype(float).where(dataframe["concept:name"] != "decide")
+        dataframe.loc[dataframe["case:concept:name"] == dataframe["case:concept:name"].iloc[0], "costs"] = None
+        for kwargs in [{}, {"include_case_id": True}, {"str_ev_attr": ["concept:name", "org:resource"], "num_ev_attr": ["costs"], "str_evsucc_attr": ["concept:name"]}]:
+            dense = pm4py.extract_features_dataframe(dataframe, **kwargs)
+            sparse = pm4py.extract_features_dataframe(dataframe, sparse=True, **kwargs)
+            self.assertEqual(list(sparse.columns), list(dense.columns))
+            sparse = pandas_utils.instantiate_dataframe({col: sparse[col].sparse.to_dense() if str(sparse[col].dtype).startswith("Sparse") else sparse[col] for col in sparse.columns})
+            self.assertTrue(sparse.equals(dense))
+        self.assertTrue(dense["costs"].isna().any())
+        log = pm4py.convert_to_event_log(dataframe)
+        dense = pm4py.extract_features_dataframe(log, str_ev_attr=["concept:name"], str_evsucc_attr=["concept:name"])
+        sparse = pm4py.extract_features_dataframe(log, str_ev_attr=["concept:name"], str_evsucc_attr=["concept:name"], sparse=True)
+        self.assertEqual(list(sparse.columns), list(dense.columns))
+        self.assertTrue((sparse.sparse.to_dense().to_numpy() == dense.to_numpy()).all())
+        from pm4py.algo.transformation.log_to_features.variants import trace_based_sparse
+        data, feature_names = trace_based_sparse.apply(dataframe, parameters={"chunk_size": 2, "num_ev_attr": ["costs"], "str_ev_attr": ["org:resource"]})
+        self.assertEqual(data.shape, (len(log), len(feature_names)))
+        self.assertIn("org:resource_Pete", feature_names)
+
     def test_new_alpha_miner_df(self):
         dataframe = pandas_utils.read_csv("input_data/running-example-transformed.csv")
         dataframe = dataframe_utils.convert_timestamp_columns_in_df(dataframe, timest_format=constants.DEFAULT_TIMESTAMP_PARSE_FORMAT, timest_columns=["Timestamp"])
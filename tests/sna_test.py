@@ -33,6 +33,43 @@ class SnaTests(unittest.TestCase):
         wt_values = sna_alg.apply(log, variant=sna_alg.Variants.WORKING_TOGETHER_PANDAS)
         sub_values = sna_alg.apply(log, variant=sna_alg.Variants.SUBCONTRACTING_PANDAS)
 
+    def test_sna_kernel(self):
+        import math
+        from pm4py.algo.organizational_mining.sna.common import kernel
+        log = xes_importer.apply(os.path.join("..", "tests", "input_data", "running-example.xes"))
+        df = pandas_utils.read_csv(os.path.join("..", "tests", "input_data", "running-example.csv"))
+        df = dataframe_utils.convert_timestamp_columns_in_df(df, timest_format=constants.DEFAULT_TIMESTAMP_PARSE_FORMAT)
+        chunked = {"chunk_size": 10}
+        expected_values = []
+        for log_variant, pandas_variant, parameters in [(sna_alg.Variants.HANDOVER_LOG, sna_alg.Variants.HANDOVER_PANDAS, {}),
+                                                        (sna_alg.Variants.HANDOVER_LOG, sna_alg.Variants.HANDOVER_PANDAS, {"beta": 0.5}),
+                                                        (sna_alg.Variants.JOINTACTIVITIES_LOG, sna_alg.Variants.JOINTACTIVITIES_PANDAS, {})]:
+            expected = sna_alg.apply(df, variant=pandas_variant, parameters=parameters)
+            expected_values.append((log_variant, parameters, expected.is_directed, expected.connections))
+        # values of the implementation iterating over the couples of events of the cases
+        working_together = {("Ellen", "Mike"): 5 / 6, ("Ellen", "Pete"): 1 / 2, ("Ellen", "Sara"): 5 / 6,
+                            ("Ellen", "Sean"): 1 / 2, ("Ellen", "Sue"): 1 / 6, ("Mike", "Pete"): 2 / 3,
+                            ("Mike", "Sara"): 1.0, ("Mike", "Sean"): 1 / 2, ("Mike", "Sue"): 1 / 3,
+                            ("Pete", "Sara"): 2 / 3, ("Pete", "Sean"): 1 / 3, ("Pete", "Sue"): 1 / 3,
+                            ("Sara", "Sean"): 1 / 2, ("Sara", "Sue"): 1 / 3}
+        working_together.update({(y, x): v for (x, y), v in working_together.items()})
+        expected_values.append((sna_alg.Variants.WORKING_TOGETHER_LOG, {}, False, working_together))
+        expected_values.append((sna_alg.Variants.SUBCONTRACTING_LOG, {}, True, {("Mike", "Ellen"): 1 / 6}))
+        metrics = {sna_alg.Variants.HANDOVER_LOG: kernel.HANDOVER, sna_alg.Variants.JOINTACTIVITIES_LOG: kernel.JOINT_ACTIVITIES,
+                   sna_alg.Variants.WORKING_TOGETHER_LOG: kernel.WORKING_TOGETHER,
+                   sna_alg.Variants.SUBCONTRACTING_LOG: kernel.SUBCONTRACTING}
+        for log_variant, parameters, is_directed, connections in expected_values:
+            for sna in [sna_alg.apply(log, variant=log_variant, parameters=parameters),
+                        sna_alg.apply(log, variant=log_variant, parameters={**parameters, **chunked})]:
+                self.assertEqual(is_directed, sna.is_directed)
+                self.assertEqual(set(connections), set(sna.connections))
+                for key, value in connections.items():
+                    if not math.isnan(value):
+                        self.assertAlmostEqual(value, sna.connections[key])
+            matrix, resources = sna_alg.apply(log, variant=log_variant, parameters={**parameters, "return_sparse": True})
+            self.assertEqual(sna.connections, kernel.to_sna(matrix, resources, metrics[log_variant]).connections)
+            self.assertEqual(sna.is_directed, kernel.to_sna(matrix, resources, metrics[log_variant]).is_directed)
+
     def test_log_orgmining_local_attr(self):
         from pm4py.algo.organizational_mining.local_diagnostics import algorithm
         log = xes_importer.apply(os.path.join("input_data", "receipt.xes"))
@@ -42,6 +42,55 @@ class StatisticsDfTest(unittest.TestCase):
         df = self.get_dataframe()
         get.get_variants_set(df)
 
+    def test_variant_index(self):
+        from pm4py.objects.log.util import pandas_numpy_variants
+        from pm4py.algo.filtering.pandas.variants import variants_filter
+        df = self.get_dataframe()
+        variants = df.groupby("case:concept:name")["concept:name"].agg(tuple)
+        variant_index = pandas_numpy_variants.get_variant_index(df)
+        self.assertIs(variant_index, pandas_numpy_variants.get_variant_index(df))
+        self.assertEqual(variant_index.to_case_variant_dict(), variants.to_dict())
+        self.assertEqual(variant_index.to_variants_dict(), dict(variants.value_counts()))
+        top_variant = variants.value_counts().index[0]
+        by_tuple = variants_filter.apply(df, [top_variant])
+        by_id = variants_filter.apply(df, list(variant_index.get_variant_ids([top_variant])))
+        self.assertTrue(by_tuple.index.equals(by_id.index))
+        self.assertEqual(by_tuple["case:concept:name"].nunique(), variants.value_counts().iloc[0])
+        df["concept:name"] = df["concept:name"].str.upper()
+        self.assertIsNot(variant_index, pandas_numpy_variants.get_variant_index(df))
+
+    def test_variant_index_in_place_changes(self):
+        import pm4py
+        df = self.get_dataframe()
+        self.assertEqual(pm4py.get_variants(df), pm4py.get_variants(df.copy()))
+        first_case = df["case:concept:name"].iloc[0]
+        df.loc[df["case:concept:name"] == first_case, "concept:name"] = "Changed Activity"
+        self.assertEqual(pm4py.get_variants(df), pm4py.get_variants(df.copy()))
+        self.assertTrue(any("Changed Activity" in variant for variant in pm4py.get_variants(df)))
+        df.replace({"concept:name": {"Changed Activity": "Another Activity"}}, inplace=True)
+        self.assertEqual(pm4py.get_variants(df), pm4py.get_variants(df.copy()))
+
+    def test_variant_index_cache_in_place_changes(self):
+        from pm4py.objects.log.util import pandas_numpy_variants
+        df = self.get_dataframe()
+        variant_index = pandas_numpy_variants.get_variant_index(df)
+        self.assertIs(variant_index, pandas_numpy_variants.get_variant_index(df))
+        df.loc[df.index[0], "concept:name"] = "Changed Activity"
+        variant_index = pandas_numpy_variants.get_variant_index(df)
+        self.assertIn("Changed Activity", variant_index.activities)
+        self.assertEqual(variant_index.to_variants_dict(), pandas_numpy_variants.build_variant_index(df).to_variants_dict())
+        df.replace({"concept:name": {"Changed Activity": "Another Activity"}}, inplace=True)
+        self.assertIn("Another Activity", pandas_numpy_variants.get_variant_index(df).activities)
+
+    def test_inductive_interleaved_cases(self):
+        import pandas as pd
+        import pm4py
+        df = pd.DataFrame({"case:concept:name": ["A", "B", "A", "B"], "concept:name": ["x", "y", "z", "w"],
+                           "time:timestamp": pd.to_datetime(["2020-01-05", "2020-01-01", "2020-01-02", "2020-01-03"])})
+        # the events of the case A are not sorted by timestamp, even if consecutive rows of the same case are
+        tree = pm4py.discover_process_tree_inductive(df)
+        self.assertEqual(str(tree), "X( ->( 'y', 'w' ), ->( 'z', 'x' ) )")
+
     def test_batch_detection(self):
         from pm4py.algo.discovery.batches.variants import pandas as pandas_batches
         dataframe = pandas_utils.read_csv(os.path.join("input_data", "receipt.csv"))
@@ -62,6 +62,39 @@ class XesImportExportTest(unittest.TestCase):
             log = xes_importer.apply(os.path.join(INPUT_DATA_DIR, "bpic2012.xes.gz"), variant=xes_importer.Variants.RUSTXES)
             self.assertEqual(len(log), 13087)
 
+    def test_chunk_parallel_import(self):
+        import pandas as pd
+        import pm4py
+        for path in [os.path.join(INPUT_DATA_DIR, "reviewing.xes"), os.path.join(COMPRESSED_INPUT_DATA, "03_repairExample.xes.gz")]:
+            expected = pm4py.read_xes(path, variant="chunk_regex")
+            df = pm4py.read_xes(path, variant="chunk_parallel", chunk_size=50000, cores=2)
+            pd.testing.assert_frame_equal(expected, df)
+            log = xes_importer.apply(path, variant=xes_importer.Variants.CHUNK_PARALLEL, parameters={"chunk_size": 50000})
+            self.assertEqual(len(log), expected["case:concept:name"].nunique())
+
+    def test_read_cache(self):
+        import tempfile
+        import pandas as pd
+        import pm4py
+        from pm4py.util import constants, read_cache
+        previous_dir = constants.READ_CACHE_DIR
+        with tempfile.TemporaryDirectory() as cache_dir:
+            constants.READ_CACHE_DIR = cache_dir
+            try:
+                path = os.path.join(INPUT_DATA_DIR, "running-example.xes")
+                expected = pm4py.read_xes(path)
+                pd.testing.assert_frame_equal(expected, pm4py.read_xes(path, use_cache=True))
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+                pd.testing.assert_frame_equal(expected, pm4py.read_xes(path, use_cache=True))
+                ocel = pm4py.read_ocel2(os.path.join(INPUT_DATA_DIR, "ocel", "ocel20_example.jsonocel"), use_cache=True)
+                cached = pm4py.read_ocel2(os.path.join(INPUT_DATA_DIR, "ocel", "ocel20_example.jsonocel"), use_cache=True)
+                pd.testing.assert_frame_equal(ocel.relations, cached.relations)
+                self.assertEqual(len(os.listdir(cache_dir)), 2)
+                read_cache._evict(cache_dir, 0)
+                self.assertEqual(len(os.listdir(cache_dir)), 0)
+            finally:
+                constants.READ_CACHE_DIR = previous_dir
+
 
 if __name__ == "__main__":
     unittest.main()